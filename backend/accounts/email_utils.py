@@ -15,7 +15,10 @@ from django.utils import timezone
 import datetime
 import logging
 
+from logitrack_backend.tracing import get_tracer
+
 logger = logging.getLogger(__name__)
+trace = get_tracer(__name__)
 
 
 class DirectSMTPEmailSender:
@@ -46,8 +49,8 @@ class DirectSMTPEmailSender:
         self.from_email = logitrack_settings.get('FROM_EMAIL', self.smtp_user)
         self.support_email = logitrack_settings.get('SUPPORT_EMAIL', self.smtp_user)
         
-        print(f"📧 SMTP DIRETO: Configurado para {self.smtp_host}:{self.smtp_port}")
-        print(f"📧 From: {self.from_name} <{self.from_email}>")
+        trace.debug("📧 SMTP DIRETO: Configurado para %s:%s", self.smtp_host, self.smtp_port)
+        trace.debug("📧 From: %s <%s>", self.from_name, self.from_email)
     
     def create_connection(self):
         """
@@ -59,7 +62,7 @@ class DirectSMTPEmailSender:
         Raises:
             Exception: Se não conseguir conectar ou autenticar
         """
-        print(f"📡 Conectando ao {self.smtp_host}:{self.smtp_port}...")
+        trace.debug("📡 Conectando ao %s:%s...", self.smtp_host, self.smtp_port)
         
         try:
             # Criar conexão
@@ -70,31 +73,31 @@ class DirectSMTPEmailSender:
             
             # TLS se necessário
             if self.use_tls and not self.use_ssl:
-                print("🔒 Iniciando TLS...")
+                trace.debug("🔒 Iniciando TLS...")
                 server.starttls()
             
-            print("✅ Conexão SMTP estabelecida")
+            trace.debug("✅ Conexão SMTP estabelecida")
             
             # Autenticação
             if self.smtp_user and self.smtp_password:
-                print(f"🔐 Autenticando como {self.smtp_user}...")
+                trace.debug("🔐 Autenticando como %s...", self.smtp_user)
                 server.login(self.smtp_user, self.smtp_password)
-                print("✅ Autenticação bem-sucedida")
+                trace.debug("✅ Autenticação bem-sucedida")
             
             return server
             
         except smtplib.SMTPAuthenticationError as e:
-            print(f"❌ Erro de autenticação SMTP: {e}")
+            trace.debug("❌ Erro de autenticação SMTP: %s", e)
             logger.error(f"Erro de autenticação SMTP: {e}")
             raise Exception(f"Falha na autenticação: {e}")
             
         except smtplib.SMTPConnectError as e:
-            print(f"❌ Erro de conexão SMTP: {e}")
+            trace.debug("❌ Erro de conexão SMTP: %s", e)
             logger.error(f"Erro de conexão SMTP: {e}")
             raise Exception(f"Falha na conexão: {e}")
             
         except Exception as e:
-            print(f"❌ Erro inesperado SMTP: {e}")
+            trace.debug("❌ Erro inesperado SMTP: %s", e)
             logger.error(f"Erro inesperado SMTP: {e}")
             raise Exception(f"Erro SMTP: {e}")
     
@@ -111,10 +114,10 @@ class DirectSMTPEmailSender:
         Returns:
             bool: True se enviado com sucesso, False caso contrário
         """
-        print(f"📧 ENVIANDO EMAIL DIRETO:")
-        print(f"   Para: {to_email}")
-        print(f"   Assunto: {subject}")
-        print(f"   HTML: {'Sim' if html_content else 'Não'}")
+        trace.debug("📧 ENVIANDO EMAIL DIRETO:")
+        trace.debug("   Para: %s", to_email)
+        trace.debug("   Assunto: %s", subject)
+        trace.debug("   HTML: %s", 'Sim' if html_content else 'Não')
         
         try:
             # Criar conexão
@@ -137,16 +140,16 @@ class DirectSMTPEmailSender:
             msg['Date'] = formataddr(('', timezone.now().strftime('%a, %d %b %Y %H:%M:%S %z')))
             
             # Enviar
-            print(f"📤 Enviando mensagem...")
+            trace.debug("📤 Enviando mensagem...")
             server.send_message(msg)
             server.quit()
             
-            print(f"✅ Email enviado com sucesso para {to_email}")
+            trace.debug("✅ Email enviado com sucesso para %s", to_email)
             logger.info(f"Email enviado com sucesso para {to_email}")
             return True
             
         except Exception as e:
-            print(f"❌ Erro no envio: {e}")
+            trace.debug("❌ Erro no envio: %s", e)
             logger.error(f"Erro no envio de email para {to_email}: {e}")
             return False
     
@@ -169,9 +172,8 @@ class DirectSMTPEmailSender:
         Returns:
             bool: True se enviado com sucesso
         """
-        print(f"🔑 ENVIANDO EMAIL DE CÓDIGO DE RESET para {user.email}")
-        print(f"🔑 Código: {reset_code}")
-        print(f"🔑 Expira em: {expires_minutes} minutos")
+        trace.debug("🔑 ENVIANDO EMAIL DE CÓDIGO DE RESET para %s", user.email)
+        trace.debug("🔑 Expira em: %s minutos", expires_minutes)
         
         try:
             # Preparar contexto para templates
@@ -187,24 +189,24 @@ class DirectSMTPEmailSender:
                 'current_year': datetime.datetime.now().year,
             }
             
-            print(f"📝 Renderizando templates de código...")
+            trace.debug("📝 Renderizando templates de código...")
             
             # Tentar renderizar templates
             try:
                 html_content = render_to_string('emails/password_reset_code.html', context)
-                print("✅ Template HTML de código renderizado")
+                trace.debug("✅ Template HTML de código renderizado")
             except Exception as e:
-                print(f"⚠️ Erro no template HTML: {e}")
+                trace.debug("⚠️ Erro no template HTML: %s", e)
                 html_content = self._get_fallback_code_html_template(context)
-                print("🔄 Usando template HTML de código fallback")
+                trace.debug("🔄 Usando template HTML de código fallback")
             
             try:
                 text_content = render_to_string('emails/password_reset_code.txt', context)
-                print("✅ Template texto de código renderizado")
+                trace.debug("✅ Template texto de código renderizado")
             except Exception as e:
-                print(f"⚠️ Erro no template texto: {e}")
+                trace.debug("⚠️ Erro no template texto: %s", e)
                 text_content = self._get_fallback_code_text_template(context)
-                print("🔄 Usando template texto de código fallback")
+                trace.debug("🔄 Usando template texto de código fallback")
             
             # Enviar email
             subject = f"Código de Redefinição de Senha - {context['company_name']}"
@@ -217,7 +219,7 @@ class DirectSMTPEmailSender:
             )
             
         except Exception as e:
-            print(f"❌ Erro ao preparar email de código: {e}")
+            trace.debug("❌ Erro ao preparar email de código: %s", e)
             logger.error(f"Erro ao preparar email de código para {user.email}: {e}")
             return False
     
@@ -500,14 +502,14 @@ def send_password_reset_email_direct(user, reset_token, reset_url, request_ip=No
     
     Use send_password_reset_code_email_direct() para o novo sistema de códigos.
     """
-    print("⚠️ ATENÇÃO: Usando função deprecada send_password_reset_email_direct")
-    print("⚠️ Use send_password_reset_code_email_direct() para o novo sistema de códigos")
+    trace.warning("⚠️ ATENÇÃO: Usando função deprecada send_password_reset_email_direct")
+    trace.warning("⚠️ Use send_password_reset_code_email_direct() para o novo sistema de códigos")
     
     # Por enquanto, extrair código do token se possível
     if len(reset_token) == 6 and reset_token.isdigit():
         return send_password_reset_code_email_direct(user, reset_token, request_ip)
     else:
-        print("⚠️ Token não é código de 6 dígitos, usando sistema antigo")
+        trace.debug("⚠️ Token não é código de 6 dígitos, usando sistema antigo")
         sender = DirectSMTPEmailSender()
         return sender.send_password_reset_email(user, reset_token, reset_url, request_ip)
 
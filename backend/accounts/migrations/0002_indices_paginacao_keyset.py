@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(fields=['-date_joined', 'id'], name='accounts_cu_date_jo_8892f8_idx'),
+        ),
+    ]
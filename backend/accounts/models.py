@@ -16,6 +16,10 @@ import random
 from datetime import timedelta
 from django.conf import settings
 
+from logitrack_backend.tracing import get_tracer
+
+trace = get_tracer(__name__)
+
 
 class CustomUserManager(BaseUserManager):
     """
@@ -296,6 +300,9 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'Usuário'
         verbose_name_plural = 'Usuários'
         ordering = ['-date_joined']
+        indexes = [
+            models.Index(fields=['-date_joined', 'id']),  # Paginação keyset
+        ]
         
     def __str__(self):
         """
@@ -547,11 +554,11 @@ class PasswordResetToken(models.Model):
         Returns:
             tuple: (PasswordResetToken, raw_code)
         """
-        print(f"🔑 RESET CODE: Gerando código para {user.email}")
+        trace.debug("🔑 RESET CODE: Gerando código para %s", user.email)
         
         # Remover códigos anteriores do usuário
         cls.objects.filter(user=user).delete()
-        print(f"🔑 Códigos anteriores removidos para {user.email}")
+        trace.debug("🔑 Códigos anteriores removidos para %s", user.email)
         
         # Gerar código de 6 dígitos (evitando sequências óbvias)
         attempts = 0
@@ -571,11 +578,9 @@ class PasswordResetToken(models.Model):
         if attempts >= max_attempts:
             raw_code = str(random.randint(100000, 999999))
         
-        print(f"🔑 Código gerado: {raw_code}")
         
         # Criar hash do código
         code_hash = hashlib.sha256(raw_code.encode()).hexdigest()
-        print(f"🔑 Hash criado: {code_hash[:10]}...{code_hash[-10:]}")
         
         # Criar registro no banco
         reset_token = cls.objects.create(
@@ -585,8 +590,8 @@ class PasswordResetToken(models.Model):
             ip_address=ip_address
         )
         
-        print(f"🔑 Código salvo no banco - ID: {reset_token.id}")
-        print(f"🔑 Expira em: {reset_token.expires_at}")
+        trace.debug("🔑 Código salvo no banco - ID: %s", reset_token.id)
+        trace.debug("🔑 Expira em: %s", reset_token.expires_at)
         
         return reset_token, raw_code
     
@@ -655,57 +660,56 @@ class PasswordResetToken(models.Model):
         Returns:
             PasswordResetToken or None: Token válido ou None
         """
-        print(f"🔑 VALIDATE CODE: Validando código {raw_code}")
+        trace.debug("🔑 VALIDATE CODE: Validando código")
         
         # Validar formato do código
         if not raw_code or len(raw_code) != 6 or not raw_code.isdigit():
-            print(f"❌ Código inválido - formato incorreto: {raw_code}")
+            trace.debug("❌ Código inválido - formato incorreto")
             return None
         
         # Criar hash do código fornecido
         code_hash = hashlib.sha256(raw_code.encode()).hexdigest()
-        print(f"🔑 Hash do código: {code_hash[:10]}...")
         
         try:
             # Buscar código no banco
             reset_token = cls.objects.get(code_hash=code_hash)
-            print(f"🔑 Código encontrado para: {reset_token.user.email}")
+            trace.debug("🔑 Código encontrado para: %s", reset_token.user.email)
             
             # Incrementar tentativas
             reset_token.attempts += 1
             reset_token.save(update_fields=['attempts'])
-            print(f"🔑 Tentativa #{reset_token.attempts}")
+            trace.debug("🔑 Tentativa #%s", reset_token.attempts)
             
             # Verificar se já foi usado
             if reset_token.used_at:
-                print(f"❌ Código já foi usado em: {reset_token.used_at}")
+                trace.debug("❌ Código já foi usado em: %s", reset_token.used_at)
                 return None
             
             # Verificar expiração
             if timezone.now() > reset_token.expires_at:
-                print(f"❌ Código expirado em: {reset_token.expires_at}")
+                trace.debug("❌ Código expirado em: %s", reset_token.expires_at)
                 return None
             
             # Verificar muitas tentativas (máximo 3)
             if reset_token.attempts > 3:
-                print(f"❌ Muitas tentativas: {reset_token.attempts}")
+                trace.debug("❌ Muitas tentativas: %s", reset_token.attempts)
                 return None
             
-            print(f"✅ Código válido!")
+            trace.debug("✅ Código válido!")
             return reset_token
             
         except cls.DoesNotExist:
-            print(f"❌ Código não encontrado no banco")
+            trace.debug("❌ Código não encontrado no banco")
             return None
         except Exception as e:
-            print(f"❌ Erro ao validar código: {e}")
+            trace.debug("❌ Erro ao validar código: %s", e)
             return None
     
     def mark_as_used(self):
         """
         Marca o código como usado.
         """
-        print(f"🔑 Marcando código como usado para: {self.user.email}")
+        trace.debug("🔑 Marcando código como usado para: %s", self.user.email)
         self.used_at = timezone.now()
         self.save(update_fields=['used_at'])
     
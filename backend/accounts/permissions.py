@@ -6,6 +6,9 @@
 # Crie este arquivo na pasta accounts/
 
 from rest_framework import permissions
+from logitrack_backend.tracing import get_tracer
+
+trace = get_tracer(__name__)
 
 
 class IsLogisticaOrAdmin(permissions.BasePermission):
@@ -31,21 +34,21 @@ class IsLogisticaOrAdmin(permissions.BasePermission):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver verificação de permissões
         """
-        print(f"🔐 PERMISSION CHECK: IsLogisticaOrAdmin")
-        print(f"🔐 Usuário: {request.user}")
-        print(f"🔐 Autenticado: {request.user.is_authenticated}")
+        trace.debug("🔐 PERMISSION CHECK: IsLogisticaOrAdmin")
+        trace.debug("🔐 Usuário: %s", request.user)
+        trace.debug("🔐 Autenticado: %s", request.user.is_authenticated)
         
         # Deve estar autenticado
         if not request.user.is_authenticated:
-            print(f"❌ Usuário não autenticado")
+            trace.debug("❌ Usuário não autenticado")
             return False
         
         # Verificar role
         user_role = request.user.role
-        print(f"🔐 Role do usuário: {user_role}")
+        trace.debug("🔐 Role do usuário: %s", user_role)
         
         is_allowed = user_role in ['logistica', 'admin']
-        print(f"🔐 Permissão concedida: {is_allowed}")
+        trace.debug("🔐 Permissão concedida: %s", is_allowed)
         
         return is_allowed
     
@@ -55,7 +58,7 @@ class IsLogisticaOrAdmin(permissions.BasePermission):
         
         🐛 DEBUGGING: Para operações em objetos específicos
         """
-        print(f"🔐 OBJECT PERMISSION CHECK: {obj}")
+        trace.debug("🔐 OBJECT PERMISSION CHECK: %s", obj)
         
         # Mesma lógica que has_permission para este caso
         return self.has_permission(request, view)
@@ -79,7 +82,7 @@ class IsOwnerOrLogisticaOrAdmin(permissions.BasePermission):
         """
         Permissão básica: usuário deve estar autenticado.
         """
-        print(f"🔐 PERMISSION CHECK: IsOwnerOrLogisticaOrAdmin")
+        trace.debug("🔐 PERMISSION CHECK: IsOwnerOrLogisticaOrAdmin")
         return request.user.is_authenticated
     
     def has_object_permission(self, request, view, obj):
@@ -88,37 +91,37 @@ class IsOwnerOrLogisticaOrAdmin(permissions.BasePermission):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"🔐 OBJECT PERMISSION CHECK:")
-        print(f"  - Usuário logado: {request.user.email}")
-        print(f"  - Objeto: {obj}")
-        print(f"  - Role: {request.user.role}")
+        trace.debug("🔐 OBJECT PERMISSION CHECK:")
+        trace.debug("  - Usuário logado: %s", request.user.email)
+        trace.debug("  - Objeto: %s", obj)
+        trace.debug("  - Role: %s", request.user.role)
         
         # Se é logística ou admin, pode tudo
         if request.user.role in ['logistica', 'admin']:
-            print(f"✅ Acesso por privilégio (logística/admin)")
+            trace.debug("✅ Acesso por privilégio (logística/admin)")
             return True
         
         # Se é o próprio usuário
         if hasattr(obj, 'id') and obj.id == request.user.id:
-            print(f"✅ Acesso por ownership (próprio usuário)")
+            trace.debug("✅ Acesso por ownership (próprio usuário)")
             return True
         
         # Se objeto tem user field (ex: OT tem motorista)
         if hasattr(obj, 'user') and obj.user == request.user:
-            print(f"✅ Acesso por ownership (campo user)")
+            trace.debug("✅ Acesso por ownership (campo user)")
             return True
         
         # Se objeto tem motorista_retirada field
         if hasattr(obj, 'motorista_retirada') and obj.motorista_retirada == request.user:
-            print(f"✅ Acesso por ownership (motorista_retirada)")
+            trace.debug("✅ Acesso por ownership (motorista_retirada)")
             return True
         
         # Se objeto tem motorista_entrega field
         if hasattr(obj, 'motorista_entrega') and obj.motorista_entrega == request.user:
-            print(f"✅ Acesso por ownership (motorista_entrega)")
+            trace.debug("✅ Acesso por ownership (motorista_entrega)")
             return True
         
-        print(f"❌ Acesso negado")
+        trace.debug("❌ Acesso negado")
         return False
 
 
@@ -139,15 +142,15 @@ class IsAdminOnly(permissions.BasePermission):
         """
         Verifica se usuário é administrador.
         """
-        print(f"🔐 PERMISSION CHECK: IsAdminOnly")
-        print(f"🔐 Usuário: {request.user.email if request.user.is_authenticated else 'Anônimo'}")
+        trace.debug("🔐 PERMISSION CHECK: IsAdminOnly")
+        trace.debug("🔐 Usuário: %s", request.user.email if request.user.is_authenticated else 'Anônimo')
         
         if not request.user.is_authenticated:
-            print(f"❌ Usuário não autenticado")
+            trace.debug("❌ Usuário não autenticado")
             return False
         
         is_admin = request.user.role == 'admin'
-        print(f"🔐 É admin: {is_admin}")
+        trace.debug("🔐 É admin: %s", is_admin)
         
         return is_admin
 
@@ -174,22 +177,22 @@ class IsSelfOrLogisticaOrAdmin(permissions.BasePermission):
         """
         Verifica se é o próprio usuário ou tem privilégios.
         """
-        print(f"🔐 SELF PERMISSION CHECK:")
-        print(f"  - Usuário logado: {request.user.email}")
-        print(f"  - Objeto usuário: {obj.email}")
-        print(f"  - Role: {request.user.role}")
+        trace.debug("🔐 SELF PERMISSION CHECK:")
+        trace.debug("  - Usuário logado: %s", request.user.email)
+        trace.debug("  - Objeto usuário: %s", obj.email)
+        trace.debug("  - Role: %s", request.user.role)
         
         # Se é logística ou admin, pode tudo
         if request.user.role in ['logistica', 'admin']:
-            print(f"✅ Acesso por privilégio")
+            trace.debug("✅ Acesso por privilégio")
             return True
         
         # Se é o próprio usuário
         if obj == request.user:
-            print(f"✅ Acesso próprio usuário")
+            trace.debug("✅ Acesso próprio usuário")
             return True
         
-        print(f"❌ Acesso negado")
+        trace.debug("❌ Acesso negado")
         return False
 
 
@@ -257,21 +260,24 @@ def debug_user_permissions(user, action=""):
         user: Instância do CustomUser
         action: String descrevendo a ação sendo testada
     """
-    print(f"\n🔐 === DEBUG PERMISSÕES ({action}) ===")
-    print(f"Usuário: {user.email if user.is_authenticated else 'Anônimo'}")
-    print(f"Autenticado: {user.is_authenticated}")
+    if not trace.enabled():
+        return
+    
+    trace.debug("\n🔐 === DEBUG PERMISSÕES (%s) ===", action)
+    trace.debug("Usuário: %s", user.email if user.is_authenticated else 'Anônimo')
+    trace.debug("Autenticado: %s", user.is_authenticated)
     
     if user.is_authenticated:
-        print(f"Role: {user.role}")
-        print(f"Ativo: {user.is_active}")
-        print(f"Pode gerenciar usuários: {user_can_manage_users(user)}")
-        print(f"Pode ver todos os dados: {user_can_view_all_data(user)}")
-        print(f"Pode aprovar transferências: {user_can_approve_transfers(user)}")
-        print(f"É motorista: {user.is_motorista()}")
-        print(f"É logística: {user.is_logistica()}")
-        print(f"É admin: {user.is_admin()}")
+        trace.debug("Role: %s", user.role)
+        trace.debug("Ativo: %s", user.is_active)
+        trace.debug(lambda: f"Pode gerenciar usuários: {user_can_manage_users(user)}")
+        trace.debug(lambda: f"Pode ver todos os dados: {user_can_view_all_data(user)}")
+        trace.debug(lambda: f"Pode aprovar transferências: {user_can_approve_transfers(user)}")
+        trace.debug(lambda: f"É motorista: {user.is_motorista()}")
+        trace.debug(lambda: f"É logística: {user.is_logistica()}")
+        trace.debug(lambda: f"É admin: {user.is_admin()}")
     
-    print(f"🔐 ==============================\n")
+    trace.debug("🔐 ==============================\n")
 
 
 # ==============================================================================
@@ -10,10 +10,24 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from .models import CustomUser
+from logitrack_backend.tracing import get_tracer
 import logging
+import traceback
 
 # Configurar logger para ver o que acontece
 logger = logging.getLogger(__name__)
+trace = get_tracer(__name__)
+
+# Campos que nunca vão para o log (senhas e códigos de reset)
+CAMPOS_SENSIVEIS = ('password', 'password_confirm', 'new_password', 'confirm_password', 'code')
+
+
+def sem_segredos(dados):
+    """Cópia dos dados para o log, com senhas e códigos mascarados."""
+    if not hasattr(dados, 'items'):
+        return dados
+    return {campo: '***' if campo in CAMPOS_SENSIVEIS else valor for campo, valor in dados.items()}
+
 
 # ==============================================================================
 # 📚 EXPLICAÇÃO: O QUE SÃO SERIALIZERS?
@@ -102,8 +116,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         - Limpar telefone: "(11) 99953-2631" → "11999532631"
         - Normalizar email: "JOSE@EMAIL.COM" → "jose@email.com"
         """
-        print(f"🔧 TO_INTERNAL_VALUE: Limpando dados antes das validações")
-        print(f"🔧 Dados originais: {data}")
+        trace.debug("🔧 TO_INTERNAL_VALUE: Limpando dados antes das validações")
+        trace.debug(lambda: f"🔧 Dados originais: {sem_segredos(data)}")
         
         # Fazer cópia dos dados para não modificar o original
         cleaned_data = data.copy() if hasattr(data, 'copy') else dict(data)
@@ -113,23 +127,23 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             cpf_original = cleaned_data['cpf']
             cpf_limpo = ''.join(filter(str.isdigit, cpf_original))
             cleaned_data['cpf'] = cpf_limpo
-            print(f"🔧 CPF: '{cpf_original}' → '{cpf_limpo}'")
+            trace.debug("🔧 CPF: '%s' → '%s'", cpf_original, cpf_limpo)
         
         # 2. Limpar telefone (remover parênteses, traços, espaços)
         if 'phone' in cleaned_data and cleaned_data['phone']:
             phone_original = cleaned_data['phone']
             phone_limpo = ''.join(filter(str.isdigit, phone_original))
             cleaned_data['phone'] = phone_limpo
-            print(f"🔧 Telefone: '{phone_original}' → '{phone_limpo}'")
+            trace.debug("🔧 Telefone: '%s' → '%s'", phone_original, phone_limpo)
         
         # 3. Normalizar email (minúsculo e remover espaços)
         if 'email' in cleaned_data and cleaned_data['email']:
             email_original = cleaned_data['email']
             email_limpo = email_original.strip().lower()
             cleaned_data['email'] = email_limpo
-            print(f"🔧 Email: '{email_original}' → '{email_limpo}'")
+            trace.debug("🔧 Email: '%s' → '%s'", email_original, email_limpo)
         
-        print(f"🔧 Dados após limpeza: {cleaned_data}")
+        trace.debug(lambda: f"🔧 Dados após limpeza: {sem_segredos(cleaned_data)}")
         
         # Chamar o método pai com dados limpos
         return super().to_internal_value(cleaned_data)
@@ -146,15 +160,15 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         - Coloque breakpoint AQUI na linha abaixo
         - Faça uma requisição e veja como o método é chamado
         """
-        print(f"🔍 VALIDATE_EMAIL chamado com: {value}")
-        print(f"🔍 Tipo do valor: {type(value)}")
+        trace.debug("🔍 VALIDATE_EMAIL chamado com: %s", value)
+        trace.debug("🔍 Tipo do valor: %s", type(value))
         
         # Verificar se email já existe
         if CustomUser.objects.filter(email=value).exists():
-            print(f"❌ Email {value} já existe no banco!")
+            trace.debug("❌ Email %s já existe no banco!", value)
             raise serializers.ValidationError("Este email já está em uso.")
         
-        print(f"✅ Email {value} está disponível")
+        trace.debug("✅ Email %s está disponível", value)
         return value.lower()  # Retorna email em minúsculo
 
     # 🔍 MÉTODO 2: Validação individual do CPF
@@ -167,23 +181,23 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         - Como é processado
         - Como é retornado
         """
-        print(f"🔍 VALIDATE_CPF chamado com: {value}")
+        trace.debug("🔍 VALIDATE_CPF chamado com: %s", value)
         
         # Limpar CPF (remover pontos e traços)
         cpf_limpo = ''.join(filter(str.isdigit, value))
-        print(f"🔍 CPF após limpeza: {cpf_limpo}")
+        trace.debug("🔍 CPF após limpeza: %s", cpf_limpo)
         
         # Validar tamanho
         if len(cpf_limpo) != 11:
-            print(f"❌ CPF tem {len(cpf_limpo)} dígitos, precisa ter 11")
+            trace.debug("❌ CPF tem %s dígitos, precisa ter 11", len(cpf_limpo))
             raise serializers.ValidationError("CPF deve ter exatamente 11 dígitos.")
         
         # Verificar se já existe
         if CustomUser.objects.filter(cpf=cpf_limpo).exists():
-            print(f"❌ CPF {cpf_limpo} já existe no banco!")
+            trace.debug("❌ CPF %s já existe no banco!", cpf_limpo)
             raise serializers.ValidationError("Este CPF já está cadastrado.")
         
-        print(f"✅ CPF {cpf_limpo} está válido")
+        trace.debug("✅ CPF %s está válido", cpf_limpo)
         return cpf_limpo
 
     # 🔍 MÉTODO 3: Validação geral (todos os campos juntos)
@@ -199,32 +213,32 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         - Inspecione a variável 'attrs'
         - Veja todos os dados validados juntos
         """
-        print(f"🔍 VALIDATE geral chamado!")
-        print(f"🔍 Dados recebidos: {attrs}")
+        trace.debug("🔍 VALIDATE geral chamado!")
+        trace.debug(lambda: f"🔍 Dados recebidos: {sem_segredos(attrs)}")
         
         # Verificar se senhas coincidem
         password = attrs.get('password')
         password_confirm = attrs.get('password_confirm')
         
-        print(f"🔍 Comparando senhas...")
+        trace.debug("🔍 Comparando senhas...")
         if password != password_confirm:
-            print(f"❌ Senhas não coincidem!")
+            trace.debug("❌ Senhas não coincidem!")
             raise serializers.ValidationError("As senhas não coincidem.")
         
         # Validar força da senha usando validadores do Django
         try:
-            print(f"🔍 Validando força da senha...")
+            trace.debug("🔍 Validando força da senha...")
             validate_password(password)
-            print(f"✅ Senha aprovada nos validadores Django")
+            trace.debug("✅ Senha aprovada nos validadores Django")
         except ValidationError as e:
-            print(f"❌ Senha rejeitada: {e.messages}")
+            trace.debug("❌ Senha rejeitada: %s", e.messages)
             raise serializers.ValidationError({"password": e.messages})
         
         # Remover confirmação da senha (não vamos salvá-la)
         attrs.pop('password_confirm', None)
-        print(f"🔍 password_confirm removido dos dados")
+        trace.debug("🔍 password_confirm removido dos dados")
         
-        print(f"🔍 Dados finais validados: {attrs}")
+        trace.debug(lambda: f"🔍 Dados finais validados: {sem_segredos(attrs)}")
         return attrs
 
     # 🔍 MÉTODO 4: Criação do objeto
@@ -239,23 +253,23 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         - Observe que validated_data já está limpo e validado
         - Acompanhe a criação do usuário
         """
-        print(f"🔍 CREATE chamado!")
-        print(f"🔍 Dados validados recebidos: {validated_data}")
+        trace.debug("🔍 CREATE chamado!")
+        trace.debug(lambda: f"🔍 Dados validados recebidos: {sem_segredos(validated_data)}")
         
         # Extrair senha dos dados
         password = validated_data.pop('password')
-        print(f"🔍 Senha extraída dos dados")
+        trace.debug("🔍 Senha extraída dos dados")
         
         # Criar usuário usando nosso manager customizado
-        print(f"🔍 Criando usuário com CustomUserManager...")
+        trace.debug("🔍 Criando usuário com CustomUserManager...")
         user = CustomUser.objects.create_user(
             password=password,
             **validated_data
         )
         
-        print(f"✅ Usuário criado com sucesso!")
-        print(f"🔍 ID do usuário: {user.id}")
-        print(f"🔍 Email do usuário: {user.email}")
+        trace.debug("✅ Usuário criado com sucesso!")
+        trace.debug("🔍 ID do usuário: %s", user.id)
+        trace.debug("🔍 Email do usuário: %s", user.email)
         
         return user
 
@@ -286,34 +300,33 @@ class UserLoginSerializer(serializers.Serializer):
         - Observe como o authenticate() funciona
         - Veja o que retorna quando credenciais estão corretas/erradas
         """
-        print(f"🔍 LOGIN - Validando credenciais...")
+        trace.debug("🔍 LOGIN - Validando credenciais...")
         
         email = attrs.get('email')
         password = attrs.get('password')
         
-        print(f"🔍 Email: {email}")
-        print(f"🔍 Senha fornecida: {'*' * len(password)}")
+        trace.debug("🔍 Email: %s", email)
         
         if email and password:
             # 🔑 FUNÇÃO MÁGICA: authenticate() do Django
-            print(f"🔍 Chamando authenticate()...")
+            trace.debug("🔍 Chamando authenticate()...")
             user = authenticate(
                 request=self.context.get('request'),
                 username=email,  # Nosso modelo usa email como username
                 password=password
             )
             
-            print(f"🔍 Resultado do authenticate(): {user}")
+            trace.debug("🔍 Resultado do authenticate(): %s", user)
             
             if not user:
-                print(f"❌ authenticate() retornou None - credenciais inválidas")
+                trace.debug("❌ authenticate() retornou None - credenciais inválidas")
                 raise serializers.ValidationError("Credenciais inválidas.")
             
             if not user.is_active:
-                print(f"❌ Usuário {user.email} está inativo")
+                trace.debug("❌ Usuário %s está inativo", user.email)
                 raise serializers.ValidationError("Conta desativada.")
             
-            print(f"✅ Login válido para: {user.email}")
+            trace.debug("✅ Login válido para: %s", user.email)
             attrs['user'] = user  # Adicionar usuário aos dados validados
             return attrs
         else:
@@ -359,16 +372,16 @@ class UserProfileSerializer(serializers.ModelSerializer):
         - Observe o 'instance' (usuário atual)
         - Observe 'validated_data' (novos dados)
         """
-        print(f"🔍 UPDATE - Atualizando usuário: {instance.email}")
-        print(f"🔍 Dados novos: {validated_data}")
+        trace.debug("🔍 UPDATE - Atualizando usuário: %s", instance.email)
+        trace.debug(lambda: f"🔍 Dados novos: {sem_segredos(validated_data)}")
         
         # Atualizar cada campo
         for attr, value in validated_data.items():
-            print(f"🔍 Atualizando {attr}: {getattr(instance, attr)} → {value}")
+            trace.debug("🔍 Atualizando %s: %s → %s", attr, getattr(instance, attr), value)
             setattr(instance, attr, value)
         
         instance.save()
-        print(f"✅ Usuário atualizado com sucesso!")
+        trace.debug("✅ Usuário atualizado com sucesso!")
         return instance
 
 
@@ -400,18 +413,18 @@ class PasswordResetSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo completo
         """
-        print(f"🔄 RESET REQUEST: Solicitação para email: {value}")
+        trace.debug("🔄 RESET REQUEST: Solicitação para email: %s", value)
         
         try:
             user = CustomUser.objects.get(email=value, is_active=True)
-            print(f"✅ Usuário encontrado: {user.email}")
+            trace.debug("✅ Usuário encontrado: %s", user.email)
             
             # Armazenar usuário no contexto para uso posterior
             self.context['reset_user'] = user
-            print(f"🔄 Usuário adicionado ao contexto")
+            trace.debug("🔄 Usuário adicionado ao contexto")
             
         except CustomUser.DoesNotExist:
-            print(f"❌ Email não encontrado ou usuário inativo: {value}")
+            trace.debug("❌ Email não encontrado ou usuário inativo: %s", value)
             # Por segurança, não revelamos se o email existe
             # Mas internamente não processamos
             pass
@@ -427,10 +440,10 @@ class PasswordResetSerializer(serializers.Serializer):
         # Verificar se usuário existe (foi validado anteriormente)
         user = self.context.get('reset_user')
         if not user:
-            print(f"⚠️ Usuário não encontrado no contexto - email pode não existir")
+            trace.debug("⚠️ Usuário não encontrado no contexto - email pode não existir")
             return False
         
-        print(f"📧 SEND CODE: Preparando envio de código para {user.email}")
+        trace.debug("📧 SEND CODE: Preparando envio de código para %s", user.email)
         
         # Obter IP da requisição
         request = self.context.get('request')
@@ -442,20 +455,20 @@ class PasswordResetSerializer(serializers.Serializer):
             else:
                 ip_address = request.META.get('REMOTE_ADDR')
         
-        print(f"📧 IP da solicitação: {ip_address}")
+        trace.debug("📧 IP da solicitação: %s", ip_address)
         
         # Gerar código de 6 dígitos usando nosso modelo
         try:
             from .models import PasswordResetToken
             reset_token, raw_code = PasswordResetToken.generate_code_for_user(user, ip_address)
-            print(f"📧 Código gerado - ID: {reset_token.id}, Código: {raw_code}")
+            trace.debug("📧 Código gerado - ID: %s", reset_token.id)
         except Exception as e:
-            print(f"❌ Erro ao gerar código: {e}")
+            trace.debug("❌ Erro ao gerar código: %s", e)
             return False
         
         # Enviar email com código
         try:
-            print(f"📧 Enviando email com código...")
+            trace.debug("📧 Enviando email com código...")
             
             # Importar nossa função de email para códigos
             from .email_utils import send_password_reset_code_email_direct
@@ -468,30 +481,26 @@ class PasswordResetSerializer(serializers.Serializer):
             )
             
             if email_sent:
-                print(f"✅ Email com código enviado com sucesso!")
+                trace.debug("✅ Email com código enviado com sucesso!")
                 return True
             else:
-                print(f"❌ Falha no envio do email")
+                trace.debug("❌ Falha no envio do email")
                 # Deletar código se email falhou
                 reset_token.delete()
-                print(f"🗑️ Código deletado devido falha no envio")
+                trace.debug("🗑️ Código deletado devido falha no envio")
                 return False
                 
         except Exception as e:
-            print(f"❌ Erro no envio de email: {e}")
-            print(f"❌ Tipo do erro: {type(e).__name__}")
+            trace.debug("❌ Erro no envio de email: %s", e)
+            trace.debug("❌ Tipo do erro: %s", type(e).__name__)
             
-            # Em desenvolvimento, mostrar detalhes do erro
-            from django.conf import settings
-            if settings.DEBUG:
-                import traceback
-                print(f"❌ Traceback completo:")
-                traceback.print_exc()
+            # Detalhes do erro só com o tracing ligado
+            trace.debug(lambda: f"❌ Traceback completo:\n{traceback.format_exc()}")
             
             # Deletar código se email falhou
             try:
                 reset_token.delete()
-                print(f"🗑️ Código deletado devido falha no envio")
+                trace.debug("🗑️ Código deletado devido falha no envio")
             except:
                 pass
                 
@@ -535,21 +544,21 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         """
         from .models import PasswordResetToken
         
-        print(f"🔑 CODE VALIDATION: Validando código {value}")
+        trace.debug("🔑 CODE VALIDATION: Validando código")
         
         # Validar formato básico
         if not value.isdigit() or len(value) != 6:
-            print(f"❌ Código com formato inválido: {value}")
+            trace.debug("❌ Código com formato inválido")
             raise serializers.ValidationError("Código deve ter exatamente 6 dígitos numéricos.")
         
         # Validar código
         reset_token = PasswordResetToken.validate_code(value)
         
         if not reset_token:
-            print(f"❌ Código inválido, expirado ou excedeu tentativas")
+            trace.debug("❌ Código inválido, expirado ou excedeu tentativas")
             raise serializers.ValidationError("Código inválido, expirado ou já usado.")
         
-        print(f"✅ Código válido para usuário: {reset_token.user.email}")
+        trace.debug("✅ Código válido para usuário: %s", reset_token.user.email)
         
         # Armazenar no contexto para uso posterior
         self.context['reset_token'] = reset_token
@@ -561,21 +570,21 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         """
         🔍 Validar senhas coincidem e força da senha
         """
-        print(f"🔍 PASSWORD VALIDATION: Validando nova senha")
+        trace.debug("🔍 PASSWORD VALIDATION: Validando nova senha")
         
         new_password = attrs.get('new_password')
         confirm_password = attrs.get('confirm_password')
         
         if new_password != confirm_password:
-            print(f"❌ Senhas não coincidem")
+            trace.debug("❌ Senhas não coincidem")
             raise serializers.ValidationError("As senhas não coincidem.")
         
         # Validar força da senha
         try:
             validate_password(new_password)
-            print(f"✅ Senha aprovada nos validadores Django")
+            trace.debug("✅ Senha aprovada nos validadores Django")
         except ValidationError as e:
-            print(f"❌ Senha rejeitada: {e.messages}")
+            trace.debug("❌ Senha rejeitada: %s", e.messages)
             raise serializers.ValidationError({"new_password": e.messages})
         
         return attrs
@@ -586,23 +595,23 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Processo de mudança de senha
         """
-        print(f"💾 SAVE PASSWORD: Salvando nova senha")
+        trace.debug("💾 SAVE PASSWORD: Salvando nova senha")
         
         # Obter dados do contexto
         reset_token = self.context['reset_token']
         user = self.context['reset_user']
         new_password = self.validated_data['new_password']
         
-        print(f"💾 Alterando senha para: {user.email}")
+        trace.debug("💾 Alterando senha para: %s", user.email)
         
         # Alterar senha
         user.set_password(new_password)
         user.save(update_fields=['password'])
-        print(f"✅ Senha alterada com sucesso")
+        trace.debug("✅ Senha alterada com sucesso")
         
         # Marcar código como usado
         reset_token.mark_as_used()
-        print(f"🔑 Código marcado como usado")
+        trace.debug("🔑 Código marcado como usado")
         
         return user
 
@@ -631,7 +640,7 @@ class PasswordResetCodeCheckSerializer(serializers.Serializer):
         """
         from .models import PasswordResetToken
         
-        print(f"🔍 CODE CHECK: Verificando código {value}")
+        trace.debug("🔍 CODE CHECK: Verificando código")
         
         # Validar formato básico
         if not value.isdigit() or len(value) != 6:
@@ -693,10 +702,10 @@ class UserActivationSerializer(serializers.ModelSerializer):
         - Quem está fazendo a ação
         - Estado antes e depois
         """
-        print(f"🔐 USER ACTIVATION: Atualizando status do usuário")
-        print(f"🔐 Usuário alvo: {instance.email}")
-        print(f"🔐 Status atual: {instance.is_active}")
-        print(f"🔐 Novo status: {validated_data.get('is_active')}")
+        trace.debug("🔐 USER ACTIVATION: Atualizando status do usuário")
+        trace.debug("🔐 Usuário alvo: %s", instance.email)
+        trace.debug("🔐 Status atual: %s", instance.is_active)
+        trace.debug("🔐 Novo status: %s", validated_data.get('is_active'))
         
         # Verificar se há mudança no status
         new_status = validated_data.get('is_active')
@@ -705,9 +714,9 @@ class UserActivationSerializer(serializers.ModelSerializer):
             instance.save(update_fields=['is_active'])
             
             action = "ativado" if new_status else "desativado"
-            print(f"✅ Usuário {instance.email} foi {action}")
+            trace.debug("✅ Usuário %s foi %s", instance.email, action)
         else:
-            print(f"ℹ️ Nenhuma mudança no status do usuário")
+            trace.debug("ℹ️ Nenhuma mudança no status do usuário")
         
         return instance
 
@@ -730,7 +739,7 @@ class UserListSerializer(serializers.ModelSerializer):
             'date_joined', 'cpf_formatted', 'phone',
             'cnh_numero', 'cnh_categoria', 'cnh_validade', 'cnh_vencida'
         ]
-        read_only_fields = '__all__'  # Apenas leitura para listagem
+        read_only_fields = fields  # Apenas leitura para listagem
 
 
 # ==============================================================================
@@ -748,13 +757,16 @@ def debug_serializer_flow(serializer_instance, step=""):
     if serializer.is_valid():
         debug_serializer_flow(serializer, "Após validação")
     """
-    print(f"\n{'='*50}")
-    print(f"🔍 DEBUG SERIALIZER: {step}")
-    print(f"{'='*50}")
+    if not trace.enabled():
+        return
+
+    trace.debug("\n" + "=" * 50)
+    trace.debug("🔍 DEBUG SERIALIZER: %s", step)
+    trace.debug("=" * 50)
     
     # Dados iniciais (o que chegou na requisição)
     initial_data = getattr(serializer_instance, 'initial_data', None)
-    print(f"📥 Dados iniciais: {initial_data}")
+    trace.debug(lambda: f"📥 Dados iniciais: {sem_segredos(initial_data)}")
     
     # Verificar se foi validado antes de acessar validated_data
     try:
@@ -762,21 +774,21 @@ def debug_serializer_flow(serializer_instance, step=""):
         has_validated_data = hasattr(serializer_instance, '_validated_data')
         if has_validated_data:
             validated_data = serializer_instance.validated_data
-            print(f"✅ Dados validados: {validated_data}")
+            trace.debug(lambda: f"✅ Dados validados: {sem_segredos(validated_data)}")
         else:
-            print(f"⏳ Dados validados: [Ainda não validado - chame is_valid() primeiro]")
+            trace.debug("⏳ Dados validados: [Ainda não validado - chame is_valid() primeiro]")
     except AssertionError:
-        print(f"⏳ Dados validados: [Ainda não validado - chame is_valid() primeiro]")
+        trace.debug("⏳ Dados validados: [Ainda não validado - chame is_valid() primeiro]")
     
     # Erros (só existem após validação)
     try:
         if hasattr(serializer_instance, '_errors'):
             errors = serializer_instance.errors
-            print(f"❌ Erros: {errors}")
+            trace.debug("❌ Erros: %s", errors)
         else:
-            print(f"❌ Erros: [Nenhuma validação executada ainda]")
+            trace.debug("❌ Erros: [Nenhuma validação executada ainda]")
     except:
-        print(f"❌ Erros: [Nenhuma validação executada ainda]")
+        trace.debug("❌ Erros: [Nenhuma validação executada ainda]")
     
     # Status de validação
     has_validated = hasattr(serializer_instance, '_validated_data')
@@ -784,21 +796,21 @@ def debug_serializer_flow(serializer_instance, step=""):
     
     if has_validated and has_errors:
         is_valid = len(serializer_instance.errors) == 0
-        print(f"🔍 Status: {'✅ VÁLIDO' if is_valid else '❌ INVÁLIDO'}")
+        trace.debug("🔍 Status: %s", '✅ VÁLIDO' if is_valid else '❌ INVÁLIDO')
     else:
-        print(f"🔍 Status: ⏳ Aguardando validação")
+        trace.debug("🔍 Status: ⏳ Aguardando validação")
     
     # Se tem instância (para updates)
     instance = getattr(serializer_instance, 'instance', None)
     if instance:
-        print(f"📄 Instância: {instance} (para UPDATE)")
+        trace.debug("📄 Instância: %s (para UPDATE)", instance)
     else:
-        print(f"📄 Instância: None (para CREATE)")
+        trace.debug("📄 Instância: None (para CREATE)")
     
     # Informações do serializer
-    print(f"🏷️ Tipo: {type(serializer_instance).__name__}")
+    trace.debug("🏷️ Tipo: %s", type(serializer_instance).__name__)
     
-    print(f"{'='*50}\n")
+    trace.debug("=" * 50 + "\n")
 
 
 # ==============================================================================
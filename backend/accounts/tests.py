@@ -1,3 +1,126 @@
+# ==============================================================================
+# TESTES DO APP ACCOUNTS
+# ==============================================================================
+
+# Arquivo: backend/accounts/tests.py
+
+"""
+Listagem de usuários (GET /api/auth/users/) com paginação por cursor e
+o que os fluxos de login/reset de senha deixam no log.
+
+🚀 python manage.py test accounts
+"""
+
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.dados_sinteticos import GeradorDadosSinteticos
+from .models import CustomUser, PasswordResetToken
+
+
+class UserListPaginacaoTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.motoristas, logistica = GeradorDadosSinteticos(seed=9).criar_usuarios(8, 1)
+        cls.logistica = logistica[0]
+        cls.admin = CustomUser.objects.create_user(
+            email='admin.teste@logitrack.local', cpf='52998224725', password='senha-teste', role='admin'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.api = APIClient()
+        self.api.force_authenticate(self.logistica)
+
+    def listar(self, url):
+        resposta = self.api.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.data['data']
+
+    def test_cursor_percorre_todos_sem_admins(self):
+        esperados = list(
+            CustomUser.objects.exclude(role='admin').order_by('-date_joined', 'id').values_list('id', flat=True)
+        )
+
+        vistos, url = [], '/api/auth/users/?page_size=4'
+        while url:
+            pagina = self.listar(url)
+            self.assertEqual(pagina['count'], len(esperados))
+            vistos.extend(usuario['id'] for usuario in pagina['results'])
+            url = pagina['next']
+
+        self.assertEqual(vistos, esperados)
+        self.assertNotIn(self.admin.id, vistos)
+
+    def test_page_legado(self):
+        pagina = self.listar('/api/auth/users/?page=1')
+        self.assertEqual(pagina['count'], 9)
+        self.assertEqual(len(pagina['results']), 9)
+        self.assertIsNone(pagina['next'])
+
+    def test_motorista_nao_lista(self):
+        self.api.force_authenticate(self.motoristas[0])
+        self.assertEqual(self.api.get('/api/auth/users/').status_code, 403)
+
+
+class LogSemSegredosTest(TestCase):
+    """Com o tracing ligado, nada vai para stdout e nem senha nem código de reset vão para o log."""
+
+    SENHA = 'senha-secreta-123'
+
+    @classmethod
+    def setUpTestData(cls):
+        motoristas, _ = GeradorDadosSinteticos(seed=13, senha=cls.SENHA).criar_usuarios(1, 0)
+        cls.usuario = motoristas[0]
+
+    def executar_com_trace(self, requisicao):
+        saida = StringIO()
+        with redirect_stdout(saida), self.assertLogs('accounts', 'DEBUG') as logs:
+            resposta = requisicao()
+        self.assertEqual(saida.getvalue(), '')
+        return resposta, '\n'.join(logs.output)
+
+    def test_login(self):
+        resposta, log = self.executar_com_trace(lambda: APIClient().post(
+            '/api/auth/login/', {'email': self.usuario.email, 'password': self.SENHA}, format='json'
+        ))
+        self.assertEqual(resposta.status_code, 200)
+        self.assertIn('LOGIN', log)
+        self.assertNotIn(self.SENHA, log)
+
+    def test_reset_de_senha(self):
+        api = APIClient()
+        gerados = []
+        gerar = PasswordResetToken.generate_code_for_user
+
+        def gerar_e_guardar(*args, **kwargs):
+            gerados.append(gerar(*args, **kwargs))
+            return gerados[-1]
+
+        with mock.patch.object(PasswordResetToken, 'generate_code_for_user', side_effect=gerar_e_guardar), \
+                mock.patch('accounts.email_utils.send_password_reset_code_email_direct', return_value=True):
+            resposta, log_pedido = self.executar_com_trace(lambda: api.post(
+                '/api/auth/password/reset/', {'email': self.usuario.email}, format='json'
+            ))
+        self.assertEqual(resposta.status_code, 200)
+        (_token, codigo), = gerados
+
+        nova_senha = 'Nova-Senha-2025!'
+        resposta, log_confirmacao = self.executar_com_trace(lambda: api.post(
+            '/api/auth/password/confirm/',
+            {'code': codigo, 'new_password': nova_senha, 'confirm_password': nova_senha},
+            format='json'
+        ))
+        self.assertEqual(resposta.status_code, 200, resposta.data)
 
-# Create your tests here.
+        for log in (log_pedido, log_confirmacao):
+            self.assertNotIn(codigo, log)
+            self.assertNotIn(nova_senha, log)
+        self.usuario.refresh_from_db()
+        self.assertTrue(self.usuario.check_password(nova_senha))
@@ -28,7 +28,8 @@ from .serializers import (
     UserActivationSerializer,
     UserListSerializer,
     PasswordResetCodeCheckSerializer,
-    debug_serializer_flow  # Nossa função helper
+    debug_serializer_flow,  # Nossa função helper
+    sem_segredos
 )
 from .permissions import (
     IsLogisticaOrAdmin,
@@ -37,9 +38,12 @@ from .permissions import (
     IsSelfOrLogisticaOrAdmin,
     debug_user_permissions
 )
+from logitrack_backend.pagination import UsuarioKeysetPagination
+from logitrack_backend.tracing import get_tracer
 
 # Configurar logger
 logger = logging.getLogger(__name__)
+trace = get_tracer(__name__)
 
 # ==============================================================================
 # 📚 EXPLICAÇÃO: COMO AS VIEWS FUNCIONAM COM SERIALIZERS
@@ -81,7 +85,7 @@ class RegisterView(APIView):
     6. Retorna resposta com dados do usuário e tokens
     
     🐛 DEBUGGING STEP-BY-STEP:
-    1. Coloque breakpoint na linha: print("🎯 REGISTER VIEW: Iniciando registro")
+    1. Coloque breakpoint na linha: trace.debug("🎯 REGISTER VIEW: Iniciando registro")
     2. Coloque breakpoint na linha: serializer = UserRegistrationSerializer(data=request.data)
     3. Coloque breakpoint na linha: if serializer.is_valid():
     4. Faça requisição POST para /api/auth/register/
@@ -108,44 +112,44 @@ class RegisterView(APIView):
         """
         
         # 🐛 BREAKPOINT 1: Início da view
-        print("🎯 REGISTER VIEW: Iniciando registro")
-        print(f"🎯 Dados recebidos: {request.data}")
-        print(f"🎯 Método HTTP: {request.method}")
-        print(f"🎯 Content-Type: {request.content_type}")
+        trace.debug("🎯 REGISTER VIEW: Iniciando registro")
+        trace.debug(lambda: f"🎯 Dados recebidos: {sem_segredos(request.data)}")
+        trace.debug("🎯 Método HTTP: %s", request.method)
+        trace.debug("🎯 Content-Type: %s", request.content_type)
         
         logger.info(f"Tentativa de registro para: {request.data.get('email')}")
         
         # 🐛 BREAKPOINT 2: Criação do serializer
-        print("🎯 Criando UserRegistrationSerializer...")
+        trace.debug("🎯 Criando UserRegistrationSerializer...")
         serializer = UserRegistrationSerializer(data=request.data)
         
         # Debug do estado inicial do serializer
         debug_serializer_flow(serializer, "Serializer recém-criado")
         
         # 🐛 BREAKPOINT 3: Validação (AQUI ENTRA NOS MÉTODOS VALIDATE DO SERIALIZER!)
-        print("🎯 Chamando serializer.is_valid()...")
-        print("   ↳ Isso vai chamar os métodos validate_* do serializer")
+        trace.debug("🎯 Chamando serializer.is_valid()...")
+        trace.debug("   ↳ Isso vai chamar os métodos validate_* do serializer")
         
         if serializer.is_valid():
-            print("✅ Dados válidos! Prosseguindo...")
+            trace.debug("✅ Dados válidos! Prosseguindo...")
             debug_serializer_flow(serializer, "Após validação bem-sucedida")
             
             # 🐛 BREAKPOINT 4: Salvando (AQUI ENTRA NO CREATE DO SERIALIZER!)
-            print("🎯 Chamando serializer.save()...")
-            print("   ↳ Isso vai chamar o método create() do serializer")
+            trace.debug("🎯 Chamando serializer.save()...")
+            trace.debug("   ↳ Isso vai chamar o método create() do serializer")
             
             user = serializer.save()
             
-            print(f"✅ Usuário criado: {user.email} (ID: {user.id})")
+            trace.debug("✅ Usuário criado: %s (ID: %s)", user.email, user.id)
             
             # 🎯 Gerar tokens JWT
-            print("🎯 Gerando tokens JWT...")
+            trace.debug("🎯 Gerando tokens JWT...")
             refresh = RefreshToken.for_user(user)
             access_token = refresh.access_token
             
-            print(f"✅ Tokens gerados")
-            print(f"   ↳ Access token: {str(access_token)[:20]}...")
-            print(f"   ↳ Refresh token: {str(refresh)[:20]}...")
+            trace.debug("✅ Tokens gerados")
+            trace.debug(lambda: f"   ↳ Access token: {str(access_token)[:20]}...")
+            trace.debug(lambda: f"   ↳ Refresh token: {str(refresh)[:20]}...")
             
             # 🎯 Preparar resposta
             response_data = {
@@ -160,13 +164,13 @@ class RegisterView(APIView):
                 }
             }
             
-            print("✅ Registro concluído com sucesso!")
+            trace.debug("✅ Registro concluído com sucesso!")
             return Response(response_data, status=status.HTTP_201_CREATED)
         
         else:
             # 🐛 BREAKPOINT 5: Erros de validação
-            print("❌ Dados inválidos!")
-            print(f"❌ Erros: {serializer.errors}")
+            trace.debug("❌ Dados inválidos!")
+            trace.debug("❌ Erros: %s", serializer.errors)
             debug_serializer_flow(serializer, "Após validação com erros")
             
             return Response({
@@ -185,7 +189,7 @@ class LoginView(APIView):
     🎯 PROPÓSITO: Autenticar usuário e retornar tokens JWT
     
     🐛 DEBUGGING:
-    1. Coloque breakpoint na linha: print("🎯 LOGIN VIEW: Iniciando login")
+    1. Coloque breakpoint na linha: trace.debug("🎯 LOGIN VIEW: Iniciando login")
     2. Coloque breakpoint na linha: if serializer.is_valid():
     3. Observe como o serializer.validated_data['user'] é populado
     """
@@ -204,9 +208,8 @@ class LoginView(APIView):
         """
         
         # 🐛 BREAKPOINT 1: Início do login
-        print("🎯 LOGIN VIEW: Iniciando login")
-        print(f"🎯 Email tentativa: {request.data.get('email')}")
-        print(f"🎯 Senha fornecida: {'*' * len(request.data.get('password', ''))}")
+        trace.debug("🎯 LOGIN VIEW: Iniciando login")
+        trace.debug(lambda: f"🎯 Email tentativa: {request.data.get('email')}")
         
         logger.info(f"Tentativa de login: {request.data.get('email')}")
         
@@ -217,12 +220,12 @@ class LoginView(APIView):
         )
         
         # 🐛 BREAKPOINT 3: Validação (AQUI ENTRA NO VALIDATE DO LOGIN SERIALIZER!)
-        print("🎯 Validando credenciais...")
+        trace.debug("🎯 Validando credenciais...")
         
         if serializer.is_valid():
             # O serializer já fez authenticate() e colocou o user nos validated_data
             user = serializer.validated_data['user']
-            print(f"✅ Login válido para: {user.email}")
+            trace.debug("✅ Login válido para: %s", user.email)
             
             # Gerar tokens JWT
             refresh = RefreshToken.for_user(user)
@@ -243,8 +246,8 @@ class LoginView(APIView):
             }, status=status.HTTP_200_OK)
         
         else:
-            print("❌ Credenciais inválidas")
-            print(f"❌ Erros: {serializer.errors}")
+            trace.debug("❌ Credenciais inválidas")
+            trace.debug("❌ Erros: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -277,17 +280,17 @@ class LogoutView(APIView):
         }
         """
         
-        print("🎯 LOGOUT VIEW: Fazendo logout")
-        print(f"🎯 Usuário: {request.user.email}")
+        trace.debug("🎯 LOGOUT VIEW: Fazendo logout")
+        trace.debug("🎯 Usuário: %s", request.user.email)
         
         try:
             refresh_token = request.data.get('refresh')
             
             if refresh_token:
-                print(f"🎯 Adicionando token à blacklist...")
+                trace.debug("🎯 Adicionando token à blacklist...")
                 token = RefreshToken(refresh_token)
                 token.blacklist()
-                print(f"✅ Token adicionado à blacklist")
+                trace.debug("✅ Token adicionado à blacklist")
                 
                 return Response({
                     'success': True,
@@ -300,7 +303,7 @@ class LogoutView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            print(f"❌ Erro no logout: {e}")
+            trace.error("❌ Erro no logout: %s", e)
             return Response({
                 'success': False,
                 'message': 'Erro interno do servidor'
@@ -333,7 +336,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         
         🐛 BREAKPOINT: Coloque aqui para ver qual usuário está logado
         """
-        print(f"🎯 PROFILE VIEW: get_object() para {self.request.user.email}")
+        trace.debug("🎯 PROFILE VIEW: get_object() para %s", self.request.user.email)
         return self.request.user
 
     def get(self, request, *args, **kwargs):
@@ -341,7 +344,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         GET /api/auth/user/
         Retorna dados do usuário logado.
         """
-        print(f"🎯 PROFILE VIEW: GET para {request.user.email}")
+        trace.debug("🎯 PROFILE VIEW: GET para %s", request.user.email)
         
         user = self.get_object()
         serializer = self.get_serializer(user)
@@ -359,8 +362,8 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
         
         🐛 BREAKPOINT: Coloque aqui para ver atualizações
         """
-        print(f"🎯 PROFILE VIEW: UPDATE para {request.user.email}")
-        print(f"🎯 Novos dados: {request.data}")
+        trace.debug("🎯 PROFILE VIEW: UPDATE para %s", request.user.email)
+        trace.debug(lambda: f"🎯 Novos dados: {sem_segredos(request.data)}")
         
         # Chama o método update da classe pai
         response = super().update(request, *args, **kwargs)
@@ -391,7 +394,7 @@ class PasswordResetView(APIView):
     - Máximo 3 tentativas por código
     
     🐛 DEBUGGING:
-    1. Coloque breakpoint na linha: print("🎯 PASSWORD RESET: Solicitação de código")
+    1. Coloque breakpoint na linha: trace.debug("🎯 PASSWORD RESET: Solicitação de código")
     2. Acompanhe geração de código de 6 dígitos
     3. Observe envio de email com código
     4. Teste com diferentes emails (válidos e inválidos)
@@ -417,8 +420,8 @@ class PasswordResetView(APIView):
         3. Envia email com código
         4. Sempre retorna sucesso (segurança)
         """
-        print("🎯 PASSWORD RESET: Solicitação de código")
-        print(f"🎯 Email solicitado: {request.data.get('email')}")
+        trace.debug("🎯 PASSWORD RESET: Solicitação de código")
+        trace.debug(lambda: f"🎯 Email solicitado: {request.data.get('email')}")
         
         # Obter IP da requisição para logging
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
@@ -427,7 +430,7 @@ class PasswordResetView(APIView):
         else:
             ip_address = request.META.get('REMOTE_ADDR')
         
-        print(f"🎯 IP da solicitação: {ip_address}")
+        trace.debug("🎯 IP da solicitação: %s", ip_address)
         
         # TODO: Implementar rate limiting por IP aqui
         # Verificar se IP não está fazendo muitas solicitações
@@ -438,21 +441,21 @@ class PasswordResetView(APIView):
         )
         
         if serializer.is_valid():
-            print(f"🎯 Dados válidos, processando envio de código...")
+            trace.debug("🎯 Dados válidos, processando envio de código...")
             
             # Tentar enviar email com código (o serializer faz tudo)
             try:
                 email_sent = serializer.save()
                 
                 if email_sent:
-                    print(f"✅ Email com código enviado com sucesso")
+                    trace.debug("✅ Email com código enviado com sucesso")
                     message = "Se o email existir em nossa base, um código de redefinição foi enviado."
                     details = {
                         'email_sent': True,
                         'expires_in_minutes': 30,
                     }
                 else:
-                    print(f"❌ Falha no envio do email")
+                    trace.debug("❌ Falha no envio do email")
                     message = "Ocorreu um erro ao enviar o email. Tente novamente em alguns minutos."
                     details = {
                         'email_sent': False,
@@ -474,7 +477,7 @@ class PasswordResetView(APIView):
                 }, status=status.HTTP_200_OK)
                 
             except Exception as e:
-                print(f"❌ Erro inesperado no envio de código: {e}")
+                trace.error("❌ Erro inesperado no envio de código: %s", e)
                 logger.error(f"Erro no reset de senha: {e}")
                 
                 return Response({
@@ -486,7 +489,7 @@ class PasswordResetView(APIView):
                     }
                 }, status=status.HTTP_200_OK)
         
-        print(f"❌ Dados inválidos: {serializer.errors}")
+        trace.debug("❌ Dados inválidos: %s", serializer.errors)
         return Response({
             'success': False,
             'message': 'Email inválido',
@@ -505,7 +508,7 @@ class PasswordResetConfirmView(APIView):
     - Máximo 3 tentativas por código
     
     🐛 DEBUGGING:
-    1. Coloque breakpoint na linha: print("🎯 PASSWORD RESET CONFIRM")
+    1. Coloque breakpoint na linha: trace.debug("🎯 PASSWORD RESET CONFIRM")
     2. Observe validação de código
     3. Acompanhe mudança de senha
     4. Teste com códigos válidos e inválidos
@@ -529,19 +532,18 @@ class PasswordResetConfirmView(APIView):
         3. Valida nova senha
         4. Altera senha e marca código como usado
         """
-        print("🎯 PASSWORD RESET CONFIRM: Confirmando nova senha com código")
-        print(f"🎯 Código recebido: {request.data.get('code', '')}")
+        trace.debug("🎯 PASSWORD RESET CONFIRM: Confirmando nova senha com código")
         
         serializer = PasswordResetConfirmSerializer(data=request.data)
         
         if serializer.is_valid():
-            print(f"🎯 Dados válidos, alterando senha...")
+            trace.debug("🎯 Dados válidos, alterando senha...")
             
             try:
                 # Salvar nova senha (o serializer faz tudo)
                 user = serializer.save()
                 
-                print(f"✅ Senha alterada com sucesso para: {user.email}")
+                trace.debug("✅ Senha alterada com sucesso para: %s", user.email)
                 
                 return Response({
                     'success': True,
@@ -554,7 +556,7 @@ class PasswordResetConfirmView(APIView):
                 }, status=status.HTTP_200_OK)
                 
             except Exception as e:
-                print(f"❌ Erro ao salvar senha: {e}")
+                trace.error("❌ Erro ao salvar senha: %s", e)
                 logger.error(f"Erro ao confirmar reset de senha: {e}")
                 
                 return Response({
@@ -563,7 +565,7 @@ class PasswordResetConfirmView(APIView):
                     'errors': {'internal': ['Erro ao processar solicitação']}
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
         
-        print(f"❌ Erro na validação: {serializer.errors}")
+        trace.debug("❌ Erro na validação: %s", serializer.errors)
         
         # Verificar tipo de erro para resposta mais específica
         errors = serializer.errors
@@ -631,7 +633,7 @@ class PasswordResetCodeCheckView(APIView):
         """
         Lógica comum para verificar código.
         """
-        print(f"🔍 CODE CHECK: Verificando código {data.get('code', '')}")
+        trace.debug("🔍 CODE CHECK: Verificando código")
         
         serializer = PasswordResetCodeCheckSerializer(data=data)
         
@@ -640,7 +642,7 @@ class PasswordResetCodeCheckView(APIView):
             reset_user = serializer.context['reset_user']
             minutes_remaining = serializer.context['minutes_remaining']
             
-            print(f"✅ Código válido para: {reset_user.email}")
+            trace.debug("✅ Código válido para: %s", reset_user.email)
             
             return Response({
                 'success': True,
@@ -656,7 +658,7 @@ class PasswordResetCodeCheckView(APIView):
                 }
             })
         else:
-            print(f"❌ Código inválido: {serializer.errors}")
+            trace.debug("❌ Código inválido: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -682,7 +684,7 @@ def debug_password_reset_codes(request):
     
     🐛 Use este endpoint para debuggar códigos de reset em desenvolvimento
     """
-    print("🔍 DEBUG: Listando códigos de reset")
+    trace.debug("🔍 DEBUG: Listando códigos de reset")
     
     from .models import PasswordResetToken
     
@@ -727,7 +729,7 @@ def debug_generate_test_code(request):
     
     🐛 Use este endpoint para gerar códigos de teste em desenvolvimento
     """
-    print("🧪 DEBUG: Gerando código de teste")
+    trace.debug("🧪 DEBUG: Gerando código de teste")
     
     email = request.data.get('email')
     if not email:
@@ -745,7 +747,7 @@ def debug_generate_test_code(request):
             request.META.get('REMOTE_ADDR')
         )
         
-        print(f"✅ Código de teste gerado: {raw_code}")
+        trace.debug("✅ Código de teste gerado - ID: %s", reset_token.id)
         
         return Response({
             'success': True,
@@ -784,7 +786,7 @@ def test_password_reset_token(request, token):
     🐛 Use este endpoint para testar se um token está válido antes de mostrar
     o formulário de nova senha no frontend
     """
-    print(f"🔑 TOKEN TEST: Testando token {token[:10]}...")
+    trace.debug(lambda: f"🔑 TOKEN TEST: Testando token {token[:10]}...")
     
     from .models import PasswordResetToken
     
@@ -792,7 +794,7 @@ def test_password_reset_token(request, token):
     reset_token = PasswordResetToken.validate_token(token)
     
     if reset_token:
-        print(f"✅ Token válido para: {reset_token.user.email}")
+        trace.debug(lambda: f"✅ Token válido para: {reset_token.user.email}")
         
         return Response({
             'success': True,
@@ -806,7 +808,7 @@ def test_password_reset_token(request, token):
             }
         })
     else:
-        print(f"❌ Token inválido")
+        trace.debug("❌ Token inválido")
         
         return Response({
             'success': False,
@@ -827,7 +829,7 @@ def debug_password_reset_tokens(request):
     
     🐛 Use este endpoint para debuggar tokens de reset em desenvolvimento
     """
-    print("🔍 DEBUG: Listando tokens de reset")
+    trace.debug("🔍 DEBUG: Listando tokens de reset")
     
     from .models import PasswordResetToken
     
@@ -870,13 +872,13 @@ def debug_user_info(request): # type: ignore
     
     🐛 Use este endpoint para testar se a autenticação JWT está funcionando
     """
-    print("🎯 DEBUG VIEW: Informações do usuário")
+    trace.debug("🎯 DEBUG VIEW: Informações do usuário")
     
     user = request.user
-    print(f"🎯 Usuário autenticado: {user.email}")
-    print(f"🎯 Role: {user.role}")
-    print(f"🎯 Ativo: {user.is_active}")
-    print(f"🎯 JWT Token: {request.auth}")
+    trace.debug("🎯 Usuário autenticado: %s", user.email)
+    trace.debug("🎯 Role: %s", user.role)
+    trace.debug("🎯 Ativo: %s", user.is_active)
+    trace.debug("🎯 JWT Token: %s", request.auth)
     
     return Response({
         'success': True,
@@ -906,10 +908,13 @@ class UserListView(generics.ListAPIView):
     1. Coloque breakpoint em get_queryset()
     2. Teste com usuário motorista vs logística
     3. Observe como a permissão é verificada
+    
+    📄 PAGINAÇÃO: Cursor (keyset) em (-date_joined, id)
     """
     
     serializer_class = UserListSerializer
     permission_classes = [IsLogisticaOrAdmin]
+    pagination_class = UsuarioKeysetPagination
     
     def get_queryset(self):
         """
@@ -917,27 +922,27 @@ class UserListView(generics.ListAPIView):
         
         🐛 BREAKPOINT: Coloque aqui para ver filtragem
         """
-        print(f"🎯 USER LIST: Listando usuários")
-        print(f"🎯 Solicitante: {self.request.user.email} ({self.request.user.role})")
+        trace.debug("🎯 USER LIST: Listando usuários")
+        trace.debug("🎯 Solicitante: %s (%s)", self.request.user.email, self.request.user.role)
         
         debug_user_permissions(self.request.user, "Listagem de usuários")
         
         # Admin vê todos, logística vê todos exceto outros admins
-        queryset = CustomUser.objects.all().order_by('-date_joined')
+        queryset = CustomUser.objects.all().order_by('-date_joined', 'id')
         
         if self.request.user.role == 'logistica':
             # Logística não vê outros admins
             queryset = queryset.exclude(role='admin')
-            print(f"🎯 Filtrando admins para usuário logística")
+            trace.debug("🎯 Filtrando admins para usuário logística")
         
-        print(f"🎯 Total de usuários retornados: {queryset.count()}")
+        trace.debug(lambda: f"🎯 Total de usuários retornados: {queryset.count()}")
         return queryset
 
     def list(self, request, *args, **kwargs):
         """
         Override para personalizar resposta.
         """
-        print(f"🎯 USER LIST: GET solicitado por {request.user.email}")
+        trace.debug("🎯 USER LIST: GET solicitado por %s", request.user.email)
         
         response = super().list(request, *args, **kwargs)
         
@@ -945,7 +950,7 @@ class UserListView(generics.ListAPIView):
             'success': True,
             'message': 'Lista de usuários recuperada',
             'data': response.data,
-            'total': len(response.data)
+            'total': response.data.get('count') if isinstance(response.data, dict) else len(response.data)
         })
 
 
@@ -969,8 +974,8 @@ class UserDetailView(generics.RetrieveAPIView):
         🐛 BREAKPOINT: Coloque aqui para ver verificação de permissões
         """
         user_target = self.get_object()
-        print(f"🎯 USER DETAIL: Visualizando usuário {user_target.email}")
-        print(f"🎯 Solicitante: {request.user.email}")
+        trace.debug("🎯 USER DETAIL: Visualizando usuário %s", user_target.email)
+        trace.debug("🎯 Solicitante: %s", request.user.email)
         
         debug_user_permissions(request.user, f"Visualizar usuário {user_target.email}")
         
@@ -1006,10 +1011,10 @@ class UserActivationView(APIView):
         """
         try:
             user = CustomUser.objects.get(pk=pk)
-            print(f"🔐 TARGET USER: {user.email} (Status atual: {user.is_active})")
+            trace.debug("🔐 TARGET USER: %s (Status atual: %s)", user.email, user.is_active)
             return user
         except CustomUser.DoesNotExist:
-            print(f"❌ Usuário com ID {pk} não encontrado")
+            trace.debug("❌ Usuário com ID %s não encontrado", pk)
             raise Http404("Usuário não encontrado")
     
     def patch(self, request, pk, action):
@@ -1020,9 +1025,9 @@ class UserActivationView(APIView):
             pk: ID do usuário
             action: 'activate' ou 'deactivate'
         """
-        print(f"🔐 USER ACTIVATION: Ação '{action}' solicitada")
-        print(f"🔐 Solicitante: {request.user.email} ({request.user.role})")
-        print(f"🔐 Usuário alvo ID: {pk}")
+        trace.debug("🔐 USER ACTIVATION: Ação '%s' solicitada", action)
+        trace.debug("🔐 Solicitante: %s (%s)", request.user.email, request.user.role)
+        trace.debug("🔐 Usuário alvo ID: %s", pk)
         
         debug_user_permissions(request.user, f"Ação {action} em usuário {pk}")
         
@@ -1038,7 +1043,7 @@ class UserActivationView(APIView):
         
         # Verificar se não é tentativa de auto-desativação
         if action == 'deactivate' and target_user == request.user:
-            print(f"❌ Tentativa de auto-desativação bloqueada")
+            trace.debug("❌ Tentativa de auto-desativação bloqueada")
             return Response({
                 'success': False,
                 'message': 'Você não pode desativar sua própria conta'
@@ -1047,7 +1052,7 @@ class UserActivationView(APIView):
         # Verificar se logística está tentando mexer com admin
         if (request.user.role == 'logistica' and 
             target_user.role == 'admin'):
-            print(f"❌ Logística tentando modificar admin - bloqueado")
+            trace.debug("❌ Logística tentando modificar admin - bloqueado")
             return Response({
                 'success': False,
                 'message': 'Equipe de logística não pode modificar administradores'
@@ -1076,7 +1081,7 @@ class UserActivationView(APIView):
             updated_user = serializer.save()
             
             action_text = "ativado" if new_status else "desativado"
-            print(f"✅ Usuário {updated_user.email} foi {action_text}")
+            trace.debug("✅ Usuário %s foi %s", updated_user.email, action_text)
             
             return Response({
                 'success': True,
@@ -1106,13 +1111,13 @@ def debug_user_info(request):
     
     🐛 Use este endpoint para testar se a autenticação está funcionando
     """
-    print("🎯 DEBUG VIEW: Informações do usuário")
+    trace.debug("🎯 DEBUG VIEW: Informações do usuário")
     
     user = request.user
-    print(f"🎯 Usuário autenticado: {user.email}")
-    print(f"🎯 Role: {user.role}")
-    print(f"🎯 Ativo: {user.is_active}")
-    print(f"🎯 JWT Token: {request.auth}")
+    trace.debug("🎯 Usuário autenticado: %s", user.email)
+    trace.debug("🎯 Role: %s", user.role)
+    trace.debug("🎯 Ativo: %s", user.is_active)
+    trace.debug("🎯 JWT Token: %s", request.auth)
     
     debug_user_permissions(user, "Debug endpoint")
     
@@ -1149,7 +1154,7 @@ def debug_permissions_test(request):
     Este endpoint só funciona para logística/admin.
     Use para testar se as permissões estão funcionando.
     """
-    print("🔐 PERMISSION TEST: Endpoint restrito")
+    trace.debug("🔐 PERMISSION TEST: Endpoint restrito")
     
     debug_user_permissions(request.user, "Teste de permissões restritas")
     
@@ -1175,7 +1180,7 @@ def test_password_reset_token(request, token):
     🐛 Use este endpoint para testar se um token está válido antes de mostrar
     o formulário de nova senha no frontend
     """
-    print(f"🔑 TOKEN TEST: Testando token {token[:10]}...")
+    trace.debug(lambda: f"🔑 TOKEN TEST: Testando token {token[:10]}...")
     
     from .models import PasswordResetToken
     
@@ -1183,7 +1188,7 @@ def test_password_reset_token(request, token):
     reset_token = PasswordResetToken.validate_token(token)
     
     if reset_token:
-        print(f"✅ Token válido para: {reset_token.user.email}")
+        trace.debug(lambda: f"✅ Token válido para: {reset_token.user.email}")
         
         return Response({
             'success': True,
@@ -1197,7 +1202,7 @@ def test_password_reset_token(request, token):
             }
         })
     else:
-        print(f"❌ Token inválido")
+        trace.debug("❌ Token inválido")
         
         return Response({
             'success': False,
@@ -1218,7 +1223,7 @@ def debug_password_reset_tokens(request):
     
     🐛 Use este endpoint para debuggar tokens de reset em desenvolvimento
     """
-    print("🔍 DEBUG: Listando tokens de reset")
+    trace.debug("🔍 DEBUG: Listando tokens de reset")
     
     from .models import PasswordResetToken
     
@@ -1,5 +1,23 @@
+from django import forms
 from django.contrib import admin
-from .models import OrdemTransporte, Arquivo, TransferenciaOT, AtualizacaoOT
+from .models import OrdemTransporte, Arquivo, TransferenciaOT, AtualizacaoOT, SequenciaDiariaOT, ContadorStatusOT, PontoRastreamento, SegmentoRastreamento, PosicaoAtual, EstimativaETA
+from .transicoes import transicionar_status
+
+
+class OrdemTransporteAdminForm(forms.ModelForm):
+    """Mudança de status no admin segue as mesmas transições da API."""
+
+    def clean_status(self):
+        novo_status = self.cleaned_data['status']
+        anterior = self.initial.get('status')
+        if self.instance.pk and anterior and novo_status != anterior:
+            atual = OrdemTransporte(status=anterior)
+            if not atual.pode_transicionar_para(novo_status):
+                raise forms.ValidationError(
+                    f'Não é possível transicionar de {atual.get_status_display()} para {dict(OrdemTransporte.STATUS_CHOICES)[novo_status]}'
+                )
+        return novo_status
+
 
 @admin.register(OrdemTransporte)
 class OrdemTransporteAdmin(admin.ModelAdmin):
@@ -9,8 +27,18 @@ class OrdemTransporteAdmin(admin.ModelAdmin):
     )
     list_filter = ('status', 'ativa', 'data_criacao')
     search_fields = ('numero_ot', 'cliente_nome', 'motorista_criador__username', 'motorista_atual__username')
-    readonly_fields = ('data_criacao', 'data_atualizacao', 'data_finalizacao')
+    readonly_fields = ('data_criacao', 'data_atualizacao', 'data_finalizacao', 'status_alterado_em', 'geocerca_entrada_em')
     ordering = ('-data_criacao',)
+    form = OrdemTransporteAdminForm
+
+    def save_model(self, request, obj, form, change):
+        """Mudança de status vai pelo serviço de transição (histórico e contadores)."""
+        if not change or 'status' not in form.changed_data:
+            return super().save_model(request, obj, form, change)
+
+        campos = {campo: getattr(obj, campo) for campo in form.changed_data if campo != 'status'}
+        atual = OrdemTransporte.objects.get(pk=obj.pk)
+        transicionar_status(atual, obj.status, request.user, 'Alterado pelo admin', campos=campos)
 
 
 @admin.register(Arquivo)
@@ -45,3 +73,52 @@ class AtualizacaoOTAdmin(admin.ModelAdmin):
     list_filter = ('tipo_atualizacao', 'data_criacao')
     search_fields = ('ordem_transporte__numero_ot', 'descricao', 'usuario__username')
     readonly_fields = ('data_criacao',)
+
+
+@admin.register(SequenciaDiariaOT)
+class SequenciaDiariaOTAdmin(admin.ModelAdmin):
+    list_display = ('data', 'ultimo_numero')
+    ordering = ('-data',)
+
+
+@admin.register(ContadorStatusOT)
+class ContadorStatusOTAdmin(admin.ModelAdmin):
+    list_display = ('motorista', 'status', 'quantidade')
+    list_filter = ('status',)
+    readonly_fields = ('motorista', 'status', 'quantidade')
+
+
+@admin.register(PontoRastreamento)
+class PontoRastreamentoAdmin(admin.ModelAdmin):
+    list_display = ('ordem_transporte', 'motorista', 'registrado_em', 'latitude', 'longitude', 'velocidade')
+    list_filter = ('registrado_em',)
+    search_fields = ('ordem_transporte__numero_ot',)
+    raw_id_fields = ('ordem_transporte', 'motorista')
+    ordering = ('-registrado_em',)
+
+
+@admin.register(SegmentoRastreamento)
+class SegmentoRastreamentoAdmin(admin.ModelAdmin):
+    list_display = ('ordem_transporte', 'motorista', 'inicio', 'fim', 'quantidade', 'formato')
+    list_filter = ('inicio',)
+    search_fields = ('ordem_transporte__numero_ot',)
+    raw_id_fields = ('ordem_transporte', 'motorista')
+    exclude = ('dados',)
+    ordering = ('-inicio',)
+
+
+@admin.register(PosicaoAtual)
+class PosicaoAtualAdmin(admin.ModelAdmin):
+    list_display = ('usuario', 'registrado_em', 'origem', 'latitude', 'longitude', 'ordem_transporte')
+    list_filter = ('origem',)
+    search_fields = ('usuario__email',)
+    raw_id_fields = ('usuario', 'ordem_transporte')
+    ordering = ('-registrado_em',)
+
+
+@admin.register(EstimativaETA)
+class EstimativaETAAdmin(admin.ModelAdmin):
+    list_display = ('etapa', 'tipo', 'chave', 'valor', 'amostras', 'ajustado_em')
+    list_filter = ('etapa', 'tipo')
+    search_fields = ('chave',)
+    readonly_fields = ('etapa', 'tipo', 'chave', 'valor', 'amostras', 'ajustado_em')
@@ -1,6 +1,38 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models.signals import post_migrate
+
+from logitrack_backend.tracing import get_tracer
+
+trace = get_tracer(__name__)
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from .search import get_backend
+
+        # Backend de busca mal configurado falha aqui, não na primeira busca
+        get_backend()
+
+        # Cache em banco (padrão sem DEBUG): a tabela sai junto com o migrate
+        post_migrate.connect(criar_tabela_cache, sender=self)
+
+        # Snapshot da frota, versões da trilha, tiles do mapa de calor e
+        # geocercas dependem de um cache compartilhado entre os workers
+        backend = settings.CACHES['default']['BACKEND']
+        if not settings.DEBUG and backend.endswith('LocMemCache'):
+            trace.warning(
+                "⚠️ Cache em memória local (%s) com DEBUG desligado: cada processo "
+                "terá o próprio snapshot da frota e as invalidações não chegam aos "
+                "outros workers. Defina LOGITRACK_CACHE_BACKEND=banco ou redis.",
+                backend
+            )
+
+
+def criar_tabela_cache(using='default', verbosity=1, **kwargs):
+    """createcachetable após o migrate (não faz nada sem DatabaseCache)."""
+    call_command('createcachetable', database=using, verbosity=verbosity)
@@ -0,0 +1,203 @@
+# ==============================================================================
+# BENCHMARKS DE MODELOS, SERIALIZERS E ENDPOINTS
+# ==============================================================================
+
+# Arquivo: backend/core/benchmarks.py
+
+"""
+Casos de benchmark e utilitários usados por `python manage.py benchmark`.
+
+🎯 PROPÓSITO: Medir sempre as mesmas operações, sobre a mesma massa de
+dados (semente fixa), para comparar com um baseline versionado e
+detectar regressões de p50/p95.
+
+📋 CASOS:
+- gerar_numero_ot, atualizar_status, transferir_para (modelo)
+- serializer_detalhe (OrdemTransporteDetailSerializer)
+- listar_ots, listar_ots_motorista, estatisticas, buscar, login (API)
+"""
+
+import gc
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from .dados_sinteticos import GeradorDadosSinteticos
+from .models import OrdemTransporte
+from .serializers import OrdemTransporteDetailSerializer
+
+SENHA_BENCHMARK = 'benchmark123'
+
+
+# ==============================================================================
+# 🌱 MASSA DE DADOS
+# ==============================================================================
+
+@dataclass
+class Dataset:
+    """Referências para os objetos usados pelos casos."""
+    motoristas: list
+    logistica: CustomUser
+    ot_detalhe: OrdemTransporte
+
+
+def popular_dataset(tamanho, seed=42):
+    """
+    Cria `tamanho` OTs (e os usuários) com o gerador de dados sintéticos.
+
+    Mesma semente → mesma massa de dados, o que mantém os resultados
+    comparáveis com o baseline.
+    """
+    gerador = GeradorDadosSinteticos(seed=seed, senha=SENHA_BENCHMARK)
+    motoristas, logistica = gerador.criar_usuarios(max(5, tamanho // 20), 1)
+    gerador.criar_ots(tamanho, motoristas, logistica)
+    gerador.finalizar()
+
+    ot_detalhe = OrdemTransporte.objects.order_by('id').first()
+    return Dataset(motoristas=motoristas, logistica=logistica[0], ot_detalhe=ot_detalhe)
+
+
+# ==============================================================================
+# ⏱️ CASOS E MEDIÇÃO
+# ==============================================================================
+
+@dataclass
+class Caso:
+    """
+    Uma operação medida.
+
+    `preparar` roda antes de cada repetição, fora da medição, e o seu
+    retorno é passado para `executar`.
+    """
+    nome: str
+    executar: Callable
+    preparar: Optional[Callable] = None
+    fator_repeticoes: float = 1.0
+
+
+def criar_casos(dataset):
+    """Monta os casos sobre um dataset já populado."""
+    motorista, destino = dataset.motoristas[0], dataset.motoristas[1]
+    logistica = dataset.logistica
+
+    cliente_logistica = APIClient()
+    cliente_logistica.force_authenticate(logistica)
+    cliente_motorista = APIClient()
+    cliente_motorista.force_authenticate(motorista)
+    cliente_anonimo = APIClient()
+
+    def nova_ot():
+        return OrdemTransporte.objects.create(
+            motorista_criador=motorista, cliente_nome='Benchmark',
+            endereco_entrega='Rua do Teste, 1', cidade_entrega='São Paulo',
+        )
+
+    def get(cliente, url):
+        def executar(_):
+            response = cliente.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f'{url} respondeu {response.status_code}')
+        return executar
+
+    def login(_):
+        response = cliente_anonimo.post(
+            '/api/auth/login/',
+            {'email': motorista.email, 'password': SENHA_BENCHMARK},
+            format='json'
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f'Login respondeu {response.status_code}')
+
+    return [
+        Caso('gerar_numero_ot', lambda _: OrdemTransporte().gerar_numero_ot()),
+        Caso(
+            'atualizar_status',
+            lambda ot: ot.atualizar_status('EM_CARREGAMENTO', motorista),
+            preparar=nova_ot,
+        ),
+        Caso(
+            'transferir_para',
+            lambda ot: ot.transferir_para(destino, logistica, 'Benchmark'),
+            preparar=nova_ot,
+        ),
+        Caso(
+            'serializer_detalhe',
+            lambda ot: OrdemTransporteDetailSerializer(ot).data,
+            preparar=lambda: OrdemTransporte.objects.get(pk=dataset.ot_detalhe.pk),
+        ),
+        Caso('listar_ots', get(cliente_logistica, '/api/ots/')),
+        Caso('listar_ots_motorista', get(cliente_motorista, '/api/ots/')),
+        Caso('estatisticas', get(cliente_logistica, '/api/ots/stats/')),
+        Caso('buscar', get(cliente_logistica, '/api/ots/buscar/?q=mercado sao')),
+        # O hash da senha domina o login: menos repetições
+        Caso('login', login, fator_repeticoes=0.5),
+    ]
+
+
+def medir(caso, repeticoes, aquecimento=2):
+    """
+    Executa o caso e devolve as durações (ms) das repetições medidas.
+
+    O coletor de lixo fica desligado durante cada medição para que uma
+    coleta não caia aleatoriamente dentro de um caso.
+    """
+    total = max(3, int(repeticoes * caso.fator_repeticoes))
+    duracoes = []
+    for indice in range(aquecimento + total):
+        argumento = caso.preparar() if caso.preparar else None
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            caso.executar(argumento)
+            duracao = (time.perf_counter() - inicio) * 1000
+        finally:
+            gc.enable()
+        if indice >= aquecimento:
+            duracoes.append(duracao)
+    return duracoes
+
+
+def percentil(valores, p):
+    """Percentil por interpolação linear (p entre 0 e 100)."""
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+def resumir(duracoes):
+    return {
+        'n': len(duracoes),
+        'p50_ms': round(percentil(duracoes, 50), 3),
+        'p95_ms': round(percentil(duracoes, 95), 3),
+        'media_ms': round(sum(duracoes) / len(duracoes), 3),
+        'min_ms': round(min(duracoes), 3),
+        'max_ms': round(max(duracoes), 3),
+    }
+
+
+def comparar(resultados, baseline, limite, folga_ms):
+    """
+    Compara p50/p95 com o baseline.
+
+    Uma métrica regride quando passa de baseline * (1 + limite) e também
+    de baseline + folga_ms (evita falso alarme em casos de microssegundos).
+
+    Returns:
+        list: (caso, métrica, baseline, atual) de cada regressão
+    """
+    regressoes = []
+    for nome, atual in resultados.items():
+        referencia = baseline.get(nome)
+        if not referencia:
+            continue
+        for metrica in ('p50_ms', 'p95_ms'):
+            base = referencia[metrica]
+            if atual[metrica] > base * (1 + limite) and atual[metrica] > base + folga_ms:
+                regressoes.append((nome, metrica, base, atual[metrica]))
+    return regressoes
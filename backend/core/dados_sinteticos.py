@@ -0,0 +1,395 @@
+# ==============================================================================
+# GERADOR DE DADOS SINTÉTICOS
+# ==============================================================================
+
+# Arquivo: backend/core/dados_sinteticos.py
+
+"""
+Massa de dados realista para testes de volume e benchmarks.
+
+🎯 PROPÓSITO: Gerar milhares de motoristas e centenas de milhares de OTs
+em minutos, com a mesma saída para a mesma semente.
+
+⚡ DESEMPENHO:
+- bulk_create em lotes, um lote por transação
+- Um único hash de senha (PBKDF2) para todos os usuários
+- Sem CustomUser.save()/full_clean() e sem sinais por linha; contadores
+  e índice de busca são reconstruídos uma vez no final
+
+📋 O QUE É GERADO:
+- Motoristas (com CNH) e usuários de logística
+- OTs com mistura de status, datas espalhadas e coordenadas reais
+- Linha do tempo de AtualizacaoOT seguindo as transições válidas
+- Transferências aprovadas em parte das OTs
+"""
+
+import random
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import CustomUser
+from .models import (
+    OrdemTransporte, AtualizacaoOT, TransferenciaOT, SequenciaDiariaOT
+)
+from .posicoes import reconstruir_posicoes
+from .search import reconstruir_indice
+
+DOMINIO_SINTETICO = 'sintetico.logitrack.local'
+SENHA_PADRAO = 'sintetico123'
+
+# Peso de cada status final da OT (soma 100)
+MISTURA_STATUS = {
+    'ENTREGUE': 58,
+    'ENTREGUE_PARCIAL': 7,
+    'CANCELADA': 6,
+    'EM_TRANSITO': 13,
+    'EM_CARREGAMENTO': 7,
+    'INICIADA': 9,
+}
+
+# Caminho percorrido até cada status
+CAMINHOS_STATUS = {
+    'INICIADA': ['INICIADA'],
+    'EM_CARREGAMENTO': ['INICIADA', 'EM_CARREGAMENTO'],
+    'EM_TRANSITO': ['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO'],
+    'ENTREGUE': ['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO', 'ENTREGUE'],
+    'ENTREGUE_PARCIAL': ['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO', 'ENTREGUE_PARCIAL'],
+    'CANCELADA': ['INICIADA', 'EM_CARREGAMENTO', 'CANCELADA'],
+}
+
+STATUS_ATIVOS = {'INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO'}
+
+# (cidade, latitude, longitude)
+CIDADES = [
+    ('São Paulo', -23.5505, -46.6333),
+    ('Campinas', -22.9099, -47.0626),
+    ('Santos', -23.9608, -46.3336),
+    ('Sorocaba', -23.5015, -47.4526),
+    ('Ribeirão Preto', -21.1775, -47.8103),
+    ('São José dos Campos', -23.2237, -45.9009),
+    ('Jundiaí', -23.1857, -46.8978),
+    ('Rio de Janeiro', -22.9068, -43.1729),
+    ('Belo Horizonte', -19.9167, -43.9345),
+    ('Curitiba', -25.4284, -49.2733),
+]
+
+CLIENTES = [
+    'Mercado Bom Preço', 'Atacadão Central', 'Farmácia São João', 'Padaria Pão Quente',
+    'Distribuidora Norte', 'Loja das Tintas', 'Empresa Alfa Ltda', 'Construtora Beta',
+    'Supermercado Estrela', 'Auto Peças Rota', 'Hortifruti Verde', 'Papelaria Central',
+]
+RUAS = [
+    'Rua das Flores', 'Av. Paulista', 'Rua XV de Novembro', 'Av. Brasil', 'Rua da Praia',
+    'Rua Sete de Setembro', 'Av. das Nações', 'Rua do Comércio', 'Av. Independência',
+]
+OBSERVACOES = ['', '', '', 'Carga frágil', 'Entregar pela manhã', 'Ligar antes de chegar',
+               'Portão lateral', 'Conferir notas na entrega']
+NOMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fábio', 'Gabriela', 'Hugo', 'Isabel',
+         'João', 'Karina', 'Lucas', 'Marina', 'Nelson', 'Olívia', 'Paulo', 'Rafaela', 'Sérgio']
+SOBRENOMES = ['Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Rodrigues',
+              'Almeida', 'Nascimento', 'Araújo', 'Ferreira', 'Carvalho', 'Gomes']
+
+
+@contextmanager
+def sem_auto_now(*modelos):
+    """
+    Desliga auto_now/auto_now_add dos modelos durante o bloco.
+
+    Permite gravar datas de criação no passado com bulk_create.
+    """
+    campos = [
+        (campo, campo.auto_now, campo.auto_now_add)
+        for modelo in modelos
+        for campo in modelo._meta.concrete_fields
+        if getattr(campo, 'auto_now', False) or getattr(campo, 'auto_now_add', False)
+    ]
+    for campo, _, _ in campos:
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in campos:
+            campo.auto_now, campo.auto_now_add = auto_now, auto_now_add
+
+
+def _coordenada(valor):
+    return round(valor, 6)
+
+
+class GeradorDadosSinteticos:
+    """
+    Gera usuários e OTs de forma determinística a partir de `seed`.
+
+    Uso:
+        gerador = GeradorDadosSinteticos(seed=42)
+        motoristas, logistica = gerador.criar_usuarios(2000, 20)
+        gerador.criar_ots(200_000, motoristas, logistica)
+        gerador.finalizar()
+    """
+
+    def __init__(self, seed=42, lote=5000, dias=180, senha=SENHA_PADRAO,
+                 taxa_transferencia=0.05, agora=None):
+        self.aleatorio = random.Random(seed)
+        self.seed = seed
+        self.lote = lote
+        self.dias = dias
+        self.senha = senha
+        self.taxa_transferencia = taxa_transferencia
+        self.agora = agora or timezone.now()
+
+        self._status = list(MISTURA_STATUS)
+        self._pesos = list(MISTURA_STATUS.values())
+
+    # ==========================================================================
+    # 👥 USUÁRIOS
+    # ==========================================================================
+
+    def criar_usuarios(self, quantidade_motoristas, quantidade_logistica=1):
+        """
+        Cria motoristas e usuários de logística com bulk_create.
+
+        Returns:
+            tuple: (lista de motoristas, lista de logística)
+        """
+        senha = make_password(self.senha)  # Um único hash para todos
+        validade_cnh = (self.agora + timedelta(days=365 * 3)).date()
+
+        usuarios = []
+        for papel, quantidade in (('motorista', quantidade_motoristas),
+                                  ('logistica', quantidade_logistica)):
+            for indice in range(quantidade):
+                usuarios.append(CustomUser(
+                    email=f'{papel}{indice}.s{self.seed}@{DOMINIO_SINTETICO}',
+                    first_name=self.aleatorio.choice(NOMES),
+                    last_name=self.aleatorio.choice(SOBRENOMES),
+                    cpf=self._cpf(papel, indice),
+                    phone=f'119{self.aleatorio.randint(10000000, 99999999)}',
+                    role=papel,
+                    is_active=True,
+                    password=senha,
+                    date_joined=self.agora - timedelta(days=self.dias + self.aleatorio.randint(0, 365)),
+                    cnh_numero=f'{self.aleatorio.randint(10**10, 10**11 - 1)}' if papel == 'motorista' else '',
+                    cnh_categoria=self.aleatorio.choice(['C', 'D', 'E']) if papel == 'motorista' else '',
+                    cnh_validade=validade_cnh if papel == 'motorista' else None,
+                ))
+
+        for inicio in range(0, len(usuarios), self.lote):
+            with transaction.atomic():
+                CustomUser.objects.bulk_create(usuarios[inicio:inicio + self.lote])
+
+        criados = CustomUser.objects.filter(
+            email__endswith=f'.s{self.seed}@{DOMINIO_SINTETICO}'
+        ).order_by('id')
+        motoristas = [usuario for usuario in criados if usuario.role == 'motorista']
+        logistica = [usuario for usuario in criados if usuario.role == 'logistica']
+        return motoristas, logistica
+
+    def _cpf(self, papel, indice):
+        # 11 dígitos únicos por (seed, papel, índice) para até 1 milhão de usuários
+        return f"9{self.seed % 1000:03d}{0 if papel == 'motorista' else 1}{indice:06d}"
+
+    # ==========================================================================
+    # 🚚 ORDENS DE TRANSPORTE
+    # ==========================================================================
+
+    def criar_ots(self, quantidade, motoristas, logistica, progresso=None):
+        """
+        Cria `quantidade` OTs em lotes, com linha do tempo e transferências.
+
+        Cada motorista fica com no máximo uma OT ativa, como exige a
+        regra de negócio.
+
+        Args:
+            progresso: Callable opcional chamado com o total criado após cada lote
+
+        Returns:
+            int: Quantidade de OTs criadas
+        """
+        self._com_ot_ativa = set()
+        criadas = 0
+        while criadas < quantidade:
+            tamanho = min(self.lote, quantidade - criadas)
+            self._criar_lote(tamanho, motoristas, logistica)
+            criadas += tamanho
+            if progresso:
+                progresso(criadas)
+        return criadas
+
+    def _criar_lote(self, tamanho, motoristas, logistica):
+        planos = [self._planejar_ot(motoristas) for _ in range(tamanho)]
+        self._numerar(planos)
+
+        with transaction.atomic(), sem_auto_now(OrdemTransporte, AtualizacaoOT, TransferenciaOT):
+            ots = OrdemTransporte.objects.bulk_create(
+                [plano['ot'] for plano in planos], batch_size=1000
+            )
+            atualizacoes = []
+            transferencias = []
+            for ot, plano in zip(ots, planos):
+                atualizacoes.extend(self._linha_do_tempo(ot, plano))
+                if plano['transferencia']:
+                    transferencia, atualizacao = self._transferencia(ot, plano, logistica)
+                    transferencias.append(transferencia)
+                    atualizacoes.append(atualizacao)
+
+            AtualizacaoOT.objects.bulk_create(atualizacoes, batch_size=1000)
+            TransferenciaOT.objects.bulk_create(transferencias, batch_size=1000)
+
+    def _planejar_ot(self, motoristas):
+        aleatorio = self.aleatorio
+        status = aleatorio.choices(self._status, self._pesos)[0]
+        criador = aleatorio.choice(motoristas)
+
+        # Transferência aprovada: a OT termina com outro motorista
+        transferir = aleatorio.random() < self.taxa_transferencia and len(motoristas) > 1
+        atual = criador
+        if transferir:
+            while atual is criador:
+                atual = aleatorio.choice(motoristas)
+
+        if status in STATUS_ATIVOS:
+            if atual.id in self._com_ot_ativa:
+                status = 'ENTREGUE'
+            else:
+                self._com_ot_ativa.add(atual.id)
+
+        _, lat_o, lng_o = aleatorio.choice(CIDADES)
+        cidade, lat_e, lng_e = aleatorio.choice(CIDADES)
+        lat_o += aleatorio.uniform(-0.08, 0.08)
+        lng_o += aleatorio.uniform(-0.08, 0.08)
+        lat_e += aleatorio.uniform(-0.08, 0.08)
+        lng_e += aleatorio.uniform(-0.08, 0.08)
+
+        # Ativas são recentes; finalizadas se espalham pela janela
+        if status in STATUS_ATIVOS:
+            criacao = self.agora - timedelta(minutes=aleatorio.randint(10, 48 * 60))
+        else:
+            criacao = self.agora - timedelta(minutes=aleatorio.randint(60, self.dias * 24 * 60))
+
+        caminho = CAMINHOS_STATUS[status]
+        instantes = [criacao]
+        for _ in caminho[1:]:
+            proximo = instantes[-1] + timedelta(minutes=aleatorio.randint(10, 8 * 60))
+            instantes.append(min(proximo, self.agora))
+
+        # A transferência acontece logo após a criação, antes do segundo status
+        transferencia = None
+        if transferir:
+            limite = instantes[0] + (instantes[1] - instantes[0]) / 2 if len(instantes) > 1 else self.agora
+            transferencia = min(instantes[0] + timedelta(minutes=aleatorio.randint(1, 30)), limite)
+
+        finalizada = status not in STATUS_ATIVOS
+        entregue = status in ('ENTREGUE', 'ENTREGUE_PARCIAL')
+        rua = f'{aleatorio.choice(RUAS)}, {aleatorio.randint(1, 3000)}'
+
+        ot = OrdemTransporte(
+            motorista_criador=criador,
+            motorista_atual=atual,
+            status=status,
+            cliente_nome=aleatorio.choice(CLIENTES),
+            endereco_entrega=rua,
+            cidade_entrega=cidade,
+            observacoes=aleatorio.choice(OBSERVACOES),
+            observacoes_entrega='Entrega sem ocorrências' if entregue else '',
+            latitude_origem=_coordenada(lat_o),
+            longitude_origem=_coordenada(lng_o),
+            endereco_origem=f'{aleatorio.choice(RUAS)}, {aleatorio.randint(1, 3000)}',
+            latitude_entrega=_coordenada(lat_e) if entregue else None,
+            longitude_entrega=_coordenada(lng_e) if entregue else None,
+            endereco_entrega_real=rua if entregue else '',
+            data_criacao=criacao,
+            data_atualizacao=instantes[-1],
+            data_finalizacao=instantes[-1] if finalizada else None,
+            status_alterado_em=instantes[-1],
+        )
+        return {
+            'ot': ot,
+            'caminho': caminho,
+            'instantes': instantes,
+            'origem': (lat_o, lng_o),
+            'destino': (lat_e, lng_e),
+            'transferencia': transferencia,
+        }
+
+    def _numerar(self, planos):
+        """Reserva os números de OT de cada dia de criação de uma vez."""
+        por_dia = defaultdict(list)
+        for plano in planos:
+            por_dia[timezone.localdate(plano['ot'].data_criacao)].append(plano['ot'])
+
+        for dia, ots in por_dia.items():
+            prefixo = OrdemTransporte.prefixo_numero_ot(dia)
+            for ot, sequencia in zip(ots, SequenciaDiariaOT.reservar(dia, len(ots))):
+                ot.numero_ot = f'{prefixo}{sequencia:03d}'
+
+    def _linha_do_tempo(self, ot, plano):
+        """
+        Uma AtualizacaoOT por status percorrido, com posição interpolada.
+
+        Os status posteriores à transferência são do motorista que recebeu a OT.
+        """
+        (lat_o, lng_o), (lat_e, lng_e) = plano['origem'], plano['destino']
+        transferencia = plano['transferencia']
+        passos = len(plano['caminho'])
+        atualizacoes = []
+        anterior = None
+        for indice, (status, instante) in enumerate(zip(plano['caminho'], plano['instantes'])):
+            fracao = indice / max(passos - 1, 1)
+            transferida = transferencia is not None and instante > transferencia
+            atualizacoes.append(AtualizacaoOT(
+                ordem_transporte=ot,
+                usuario=ot.motorista_atual if transferida else ot.motorista_criador,
+                tipo_atualizacao='STATUS',
+                descricao='OT criada com status Iniciada' if anterior is None
+                else f'Status alterado para {status}',
+                status_anterior=anterior or '',
+                status_novo=status,
+                latitude=_coordenada(lat_o + (lat_e - lat_o) * fracao),
+                longitude=_coordenada(lng_o + (lng_e - lng_o) * fracao),
+                data_criacao=instante,
+            ))
+            anterior = status
+        return atualizacoes
+
+    def _transferencia(self, ot, plano, logistica):
+        aprovador = self.aleatorio.choice(logistica)
+        instante = plano['transferencia']
+        transferencia = TransferenciaOT(
+            ordem_transporte=ot,
+            motorista_origem=ot.motorista_criador,
+            motorista_destino=ot.motorista_atual,
+            solicitado_por=aprovador,
+            aprovado_por=aprovador,
+            status='APROVADA',
+            motivo='Redistribuição de rota',
+            data_solicitacao=instante,
+            data_resposta=instante,
+        )
+        atualizacao = AtualizacaoOT(
+            ordem_transporte=ot,
+            usuario=aprovador,
+            tipo_atualizacao='TRANSFERENCIA',
+            descricao='OT transferida entre motoristas',
+            observacao='Redistribuição de rota (Aprovada automaticamente por logistica)',
+            data_criacao=instante,
+        )
+        return transferencia, atualizacao
+
+    # ==========================================================================
+    # 🔄 PÓS-PROCESSAMENTO
+    # ==========================================================================
+
+    def finalizar(self):
+        """Reconstrói o que save() e os sinais manteriam: contadores, geohash, índice de busca e posições."""
+        call_command('recalcular_contadores_ot', stdout=StringIO())
+        call_command('preencher_geohash', stdout=StringIO())
+        with transaction.atomic():
+            reconstruir_indice()
+            reconstruir_posicoes()
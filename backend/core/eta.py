@@ -0,0 +1,249 @@
+# ==============================================================================
+# ETA - PREVISÃO DE ENTREGA A PARTIR DO HISTÓRICO DE STATUS
+# ==============================================================================
+
+# Arquivo: backend/core/eta.py
+
+"""
+Previsão do horário de entrega das OTs em andamento.
+
+🎯 PROPÓSITO: Estimar quando a OT será entregue a partir do tempo que
+OTs parecidas passaram em EM_CARREGAMENTO e EM_TRANSITO.
+
+📋 MODELO (ajustado offline por `python manage.py ajustar_eta`):
+- Duração de cada etapa = mediana por cidade de entrega, puxada para a
+  mediana global quando a cidade tem poucas amostras
+- Fator do motorista: mediana de (duração real / base da cidade), puxada
+  para 1 quando o motorista tem poucas amostras
+- Tudo gravado em EstimativaETA (uma linha por etapa × chave)
+
+⚡ SERVIR É O(1): A tabela inteira fica em memória (dict) e uma previsão
+são no máximo quatro consultas ao dict. O processo confere a cada
+INTERVALO_RECARGA_ETA_S se houve novo ajuste (uma query de MAX); nenhuma
+requisição varre o histórico.
+"""
+
+import time
+import unicodedata
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Max
+from django.utils import timezone
+
+from logitrack_backend.tracing import get_tracer
+from .models import EstimativaETA
+
+trace = get_tracer(__name__)
+
+# Etapas cronometradas, na ordem, e os status que encerram cada uma
+ETAPAS_ETA = ('EM_CARREGAMENTO', 'EM_TRANSITO')
+FIM_ETAPA = {
+    'EM_CARREGAMENTO': ('EM_TRANSITO',),
+    'EM_TRANSITO': ('ENTREGUE', 'ENTREGUE_PARCIAL'),
+}
+
+# Amostras "virtuais" da referência na média ponderada (cidade → global,
+# motorista → 1): com K amostras próprias o grupo pesa metade
+AMOSTRAS_REFERENCIA_ETA = 10
+
+INTERVALO_RECARGA_ETA_S = 60
+
+_tabela = {'valores': {}, 'ajustado_em': None, 'conferido_em': None}
+
+
+def normalizar_cidade(cidade):
+    """Chave da cidade: sem acentos, minúscula e sem espaços nas pontas."""
+    sem_acento = unicodedata.normalize('NFKD', cidade or '').encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(sem_acento.lower().split())[:100]
+
+
+# ==============================================================================
+# 📊 AJUSTE (usado pelo comando ajustar_eta)
+# ==============================================================================
+
+def duracoes_etapas(linhas):
+    """
+    Duração de cada passagem por uma etapa cronometrada.
+
+    Args:
+        linhas: Atualizações de STATUS ordenadas por (OT, data_criacao):
+            (ot_id, data_criacao, status_anterior, status_novo, cidade, motorista_id),
+            com motorista_id = motorista que registrou a atualização (ou None)
+
+    Returns:
+        dict: etapa → (duracoes_s, cidades, motoristas), arrays NumPy
+
+    Uma passagem vai da atualização que entrou na etapa até a seguinte da
+    mesma OT, desde que esta saia da etapa para o próximo status do
+    fluxo (cancelamentos e dados inconsistentes ficam de fora). Ela conta
+    para o motorista que registrou a entrada na etapa, que pode não ser o
+    motorista atual de uma OT transferida depois.
+    """
+    if len(linhas) < 2:
+        return {}
+
+    ots, instantes, anteriores, novos, cidades, motoristas = zip(*linhas)
+    ots = np.array(ots)
+    segundos = np.array([instante.timestamp() for instante in instantes])
+    anteriores = np.array(anteriores, dtype=object)
+    novos = np.array(novos, dtype=object)
+    cidades = np.array([normalizar_cidade(cidade) for cidade in cidades], dtype=object)
+    motoristas = np.array([motorista or 0 for motorista in motoristas])
+
+    mesma_ot = ots[:-1] == ots[1:]
+    duracoes = segundos[1:] - segundos[:-1]
+
+    resultado = {}
+    for etapa in ETAPAS_ETA:
+        passagem = (
+            mesma_ot
+            & (novos[:-1] == etapa)
+            & (anteriores[1:] == etapa)
+            & np.isin(novos[1:], FIM_ETAPA[etapa])
+            & (duracoes >= 0)
+        )
+        resultado[etapa] = (duracoes[passagem], cidades[:-1][passagem], motoristas[:-1][passagem])
+    return resultado
+
+
+def medianas_por_grupo(chaves, valores):
+    """{chave: (mediana, amostras)} — ordena uma vez e fatia por grupo."""
+    if not len(valores):
+        return {}
+    ordem = np.argsort(chaves, kind='stable')
+    chaves, valores = chaves[ordem], valores[ordem]
+    unicas, inicios = np.unique(chaves, return_index=True)
+    fins = np.append(inicios[1:], len(chaves))
+    return {
+        chave: (float(np.median(valores[inicio:fim])), int(fim - inicio))
+        for chave, inicio, fim in zip(unicas.tolist(), inicios, fins)
+    }
+
+
+def _ponderar(valor, amostras, referencia, k=AMOSTRAS_REFERENCIA_ETA):
+    """Média de `valor` e `referencia` pesada por amostras vs. k."""
+    return (valor * amostras + referencia * k) / (amostras + k)
+
+
+def ajustar_modelo(linhas, ajustado_em=None):
+    """
+    Ajusta as tabelas de ETA a partir do histórico de status.
+
+    Returns:
+        list[EstimativaETA]: Linhas prontas para bulk_create
+    """
+    ajustado_em = ajustado_em or timezone.now()
+    estimativas = []
+
+    for etapa, (duracoes, cidades, motoristas) in duracoes_etapas(linhas).items():
+        if not len(duracoes):
+            continue
+
+        base_global = float(np.median(duracoes))
+        estimativas.append(EstimativaETA(
+            etapa=etapa, tipo='GLOBAL', chave='', valor=base_global,
+            amostras=len(duracoes), ajustado_em=ajustado_em,
+        ))
+
+        base_cidade = {}
+        for cidade, (mediana, amostras) in medianas_por_grupo(cidades, duracoes).items():
+            base_cidade[cidade] = _ponderar(mediana, amostras, base_global)
+            estimativas.append(EstimativaETA(
+                etapa=etapa, tipo='CIDADE', chave=cidade, valor=base_cidade[cidade],
+                amostras=amostras, ajustado_em=ajustado_em,
+            ))
+
+        # Fator do motorista sobre a base da cidade de cada passagem
+        bases = np.array([base_cidade[cidade] for cidade in cidades.tolist()])
+        razoes = duracoes / np.maximum(bases, 1.0)
+        com_motorista = motoristas != 0
+        for motorista, (mediana, amostras) in medianas_por_grupo(
+            motoristas[com_motorista], razoes[com_motorista]
+        ).items():
+            estimativas.append(EstimativaETA(
+                etapa=etapa, tipo='MOTORISTA', chave=str(motorista),
+                valor=_ponderar(mediana, amostras, 1.0),
+                amostras=amostras, ajustado_em=ajustado_em,
+            ))
+
+    return estimativas
+
+
+# ==============================================================================
+# ⚡ CONSULTA
+# ==============================================================================
+
+def _valores():
+    """Tabela em memória, recarregada quando houver um ajuste mais novo."""
+    agora = time.monotonic()
+    conferido_em = _tabela['conferido_em']
+    if conferido_em is not None and agora - conferido_em < INTERVALO_RECARGA_ETA_S:
+        return _tabela['valores']
+
+    ajustado_em = EstimativaETA.objects.aggregate(ultimo=Max('ajustado_em'))['ultimo']
+    if ajustado_em != _tabela['ajustado_em'] or conferido_em is None:
+        with trace.span('eta.carregar'):
+            _tabela['valores'] = {
+                (etapa, tipo, chave): valor
+                for etapa, tipo, chave, valor in EstimativaETA.objects.values_list(
+                    'etapa', 'tipo', 'chave', 'valor'
+                )
+            }
+        _tabela['ajustado_em'] = ajustado_em
+        trace.debug("⏱️ Tabela de ETA carregada: %s linhas", len(_tabela['valores']))
+    _tabela['conferido_em'] = agora
+    return _tabela['valores']
+
+
+def invalidar_tabela():
+    """Força a releitura da tabela na próxima previsão (após um ajuste)."""
+    _tabela['conferido_em'] = None
+
+
+def duracao_etapa(etapa, cidade, motorista_id):
+    """
+    Duração esperada (segundos) da etapa para a cidade e o motorista.
+
+    Returns:
+        float | None: None se o modelo ainda não foi ajustado
+    """
+    valores = _valores()
+    base = valores.get((etapa, 'CIDADE', normalizar_cidade(cidade)))
+    if base is None:
+        base = valores.get((etapa, 'GLOBAL', ''))
+        if base is None:
+            return None
+    return base * valores.get((etapa, 'MOTORISTA', str(motorista_id)), 1.0)
+
+
+def estimar_entrega(ot, agora=None):
+    """
+    Horário previsto de entrega da OT.
+
+    - INICIADA: agora + carregamento + trânsito
+    - Etapa cronometrada: fim esperado da etapa atual (contado desde
+      status_alterado_em e nunca antes de agora) + etapas seguintes
+
+    Returns:
+        datetime | None: None para OTs finalizadas ou sem modelo ajustado
+    """
+    if ot.status == 'INICIADA':
+        restantes = ETAPAS_ETA
+        inicio = None
+    elif ot.status in ETAPAS_ETA:
+        restantes = ETAPAS_ETA[ETAPAS_ETA.index(ot.status):]
+        inicio = ot.status_alterado_em
+    else:
+        return None
+
+    agora = agora or timezone.now()
+    previsao = inicio or agora
+    for indice, etapa in enumerate(restantes):
+        duracao = duracao_etapa(etapa, ot.cidade_entrega, ot.motorista_atual_id)
+        if duracao is None:
+            return None
+        previsao += timedelta(seconds=duracao)
+        if indice == 0:
+            previsao = max(previsao, agora)
+    return previsao
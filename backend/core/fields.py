@@ -0,0 +1,79 @@
+# ==============================================================================
+# CAMPOS DE MODELO PERSONALIZADOS
+# ==============================================================================
+
+# Arquivo: backend/core/fields.py
+
+"""
+Campos de modelo do app core.
+
+📍 CoordenadaField: coordenada em graus gravada como inteiro.
+"""
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class CoordenadaField(models.FloatField):
+    """
+    Latitude/longitude gravada no banco como inteiro em 1e-7 grau.
+
+    🎯 PROPÓSITO: Substituir DecimalField(18, 15) nas coordenadas:
+    - Coluna inteira de 4 bytes (±180° × 1e7 cabe em 32 bits)
+    - Comparações inteiras nos filtros geográficos
+    - Python recebe float (sem criar um Decimal por linha carregada)
+
+    📋 PRECISÃO: 1e-7 grau ≈ 1,1 cm, bem abaixo do erro de qualquer GPS.
+
+    🔧 USO: Filtros (`latitude__gte=-23.5`) recebem graus; a conversão é
+    feita em get_prep_value. Expressões SQL sobre a coluna (F()) veem o
+    inteiro — divida por ESCALA (ver core/geo.py).
+
+    Args:
+        limite: Valor absoluto máximo (90 para latitude, 180 para
+            longitude); vira validação no admin e nos serializers
+    """
+
+    ESCALA = 10_000_000
+
+    description = 'Coordenada em graus (inteiro em 1e-7 grau no banco)'
+
+    def __init__(self, *args, limite=None, **kwargs):
+        self.limite = limite
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.limite is not None:
+            kwargs['limite'] = self.limite
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        validators = list(super().validators)
+        if self.limite is not None:
+            validators += [MinValueValidator(-self.limite), MaxValueValidator(self.limite)]
+        return validators
+
+    def get_internal_type(self):
+        return 'IntegerField'
+
+    def pre_save(self, model_instance, add):
+        """Arredonda a instância para o valor que fica no banco."""
+        value = super().pre_save(model_instance, add)
+        if value is not None:
+            value = round(float(value), 7)
+            setattr(model_instance, self.attname, value)
+        return value
+
+    def get_prep_value(self, value):
+        value = super().get_prep_value(value)
+        if value is None:
+            return None
+        return round(value * self.ESCALA)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return value / self.ESCALA
@@ -0,0 +1,112 @@
+# ==============================================================================
+# FROTA AO VIVO - SNAPSHOT PARA O MAPA DO DASHBOARD
+# ==============================================================================
+
+# Arquivo: backend/core/frota.py
+
+"""
+Snapshot das OTs em andamento com motorista, status e última posição.
+
+🎯 PROPÓSITO: O mapa do dashboard faz uma única chamada em vez de
+listar as OTs, abrir cada uma e procurar a localização do motorista.
+
+📋 FORMATO COMPACTO: Cabeçalho com os nomes das colunas e uma lista de
+linhas (arrays), sem repetir as chaves em cada OT:
+{
+    "gerado_em": "...",
+    "colunas": ["id", "numero_ot", "status", ...],
+    "ots": [[12, "OT2025...", "EM_TRANSITO", ...], ...]
+}
+
+⚡ CACHE COMPARTILHADO: O snapshot é reconstruído no máximo a cada
+INTERVALO_FROTA_S segundos, com uma única consulta (OT + motorista +
+PosicaoAtual em JOIN). Só quem obtém a trava reconstrói; as demais
+requisições no mesmo instante servem a cópia anterior. Com um cache
+compartilhado entre processos (LOGITRACK_CACHE_BACKEND), centenas de
+abas consultando custam uma consulta por intervalo.
+"""
+
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from logitrack_backend.tracing import get_tracer
+from .models import OrdemTransporte
+from .stats import STATUS_ATIVOS
+
+trace = get_tracer(__name__)
+
+INTERVALO_FROTA_S = 5
+
+# O snapshot sobrevive além do intervalo para ser servido enquanto outra
+# requisição reconstrói
+TEMPO_CACHE_FROTA = 60
+
+CHAVE_FROTA = 'frota:snapshot'
+CHAVE_TRAVA_FROTA = 'frota:reconstruindo'
+
+# (nome no payload, campo na consulta)
+COLUNAS_FROTA = (
+    ('id', 'id'),
+    ('numero_ot', 'numero_ot'),
+    ('status', 'status'),
+    ('motorista_id', 'motorista_atual_id'),
+    ('motorista_nome', 'motorista_atual__first_name'),
+    ('motorista_sobrenome', 'motorista_atual__last_name'),
+    ('latitude', 'motorista_atual__posicao_atual__latitude'),
+    ('longitude', 'motorista_atual__posicao_atual__longitude'),
+    ('posicao_em', 'motorista_atual__posicao_atual__registrado_em'),
+    ('velocidade', 'motorista_atual__posicao_atual__velocidade'),
+)
+
+
+def montar_snapshot():
+    """
+    Consulta as OTs em andamento (uma query) e monta o payload compacto.
+
+    Posições sem leitura ficam com latitude/longitude nulas; o
+    instante vai como timestamp em milissegundos.
+    """
+    linhas = OrdemTransporte.objects.filter(status__in=STATUS_ATIVOS).order_by('id').values_list(
+        *(campo for _, campo in COLUNAS_FROTA)
+    )
+
+    indice_instante = [nome for nome, _ in COLUNAS_FROTA].index('posicao_em')
+    ots = []
+    for linha in linhas:
+        linha = list(linha)
+        if linha[indice_instante] is not None:
+            linha[indice_instante] = int(linha[indice_instante].timestamp() * 1000)
+        ots.append(linha)
+
+    return {
+        'gerado_em': timezone.now().isoformat(),
+        'intervalo_s': INTERVALO_FROTA_S,
+        'colunas': [nome for nome, _ in COLUNAS_FROTA],
+        'ots': ots,
+    }
+
+
+def snapshot_frota():
+    """
+    Snapshot da frota, reconstruído no máximo a cada INTERVALO_FROTA_S.
+
+    Returns:
+        dict: Payload de montar_snapshot
+    """
+    guardado = cache.get(CHAVE_FROTA)
+    agora = time.time()
+
+    if guardado is not None and agora - guardado['montado_em'] < INTERVALO_FROTA_S:
+        return guardado['dados']
+
+    # cache.add é atômico: só uma requisição por intervalo reconstrói
+    if guardado is not None and not cache.add(CHAVE_TRAVA_FROTA, True, INTERVALO_FROTA_S):
+        return guardado['dados']
+
+    with trace.span('frota.snapshot'):
+        dados = montar_snapshot()
+    cache.set(CHAVE_FROTA, {'montado_em': agora, 'dados': dados}, TEMPO_CACHE_FROTA)
+    trace.debug("🗺️ Snapshot da frota: %s OTs", len(dados['ots']))
+    return dados
@@ -0,0 +1,249 @@
+# ==============================================================================
+# GEO - GEOHASH, DISTÂNCIAS E FILTRO DE PROXIMIDADE
+# ==============================================================================
+
+# Arquivo: backend/core/geo.py
+
+"""
+Funções geográficas usadas pelas OTs e pelo rastreamento.
+
+🎯 PROPÓSITO: Consultas como "OTs entregues perto deste ponto" sem
+varrer todas as coordenadas decimais da tabela.
+
+📋 ÍNDICE ESPACIAL:
+- Cada OT guarda o geohash (PRECISAO_GEOHASH caracteres) da origem e da
+  entrega, calculado no save() e indexado
+- Um geohash mais curto é prefixo de todos os geohashes dentro da sua
+  célula, então uma célula vira uma faixa (>= / <=) no índice
+- Busca por raio: células que cobrem o círculo (pré-filtro indexado) e
+  haversine exato no banco sobre o que sobrou
+
+Este módulo não importa modelos (é usado por core.models).
+"""
+
+import math
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+from .fields import CoordenadaField
+
+RAIO_TERRA_M = 6371008.8
+
+BASE32_GEOHASH = '0123456789bcdefghjkmnpqrstuvwxyz'
+_LETRAS_GEOHASH = np.frombuffer(BASE32_GEOHASH.encode('ascii'), dtype=np.uint8)
+
+# 8 caracteres: células de ~38 m × 19 m
+PRECISAO_GEOHASH = 8
+
+# Máximo de células (faixas no índice) no pré-filtro de uma busca por raio
+MAXIMO_CELULAS_BUSCA = 16
+
+RAIO_PADRAO_KM = 5
+RAIO_MAXIMO_KM = 500
+
+CAMPOS_PROXIMIDADE = ('origem', 'entrega')
+
+
+# ==============================================================================
+# 📐 DISTÂNCIA
+# ==============================================================================
+
+def haversine_m(latitude_1, longitude_1, latitude_2, longitude_2):
+    """Distância em metros entre arrays de coordenadas (graus)."""
+    lat1, lng1, lat2, lng2 = map(np.radians, (latitude_1, longitude_1, latitude_2, longitude_2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * RAIO_TERRA_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# ==============================================================================
+# 🔢 GEOHASH
+# ==============================================================================
+
+def _bits_geohash(precisao):
+    """(bits de longitude, bits de latitude) de um geohash com `precisao` caracteres."""
+    total = 5 * precisao
+    return (total + 1) // 2, total // 2
+
+
+def codificar_geohashes(latitudes, longitudes, precisao=PRECISAO_GEOHASH):
+    """
+    Geohash de arrays de coordenadas, vetorizado.
+
+    Latitude e longitude viram inteiros de bits_lat/bits_lng bits; os
+    bits são intercalados (longitude primeiro) e lidos em grupos de 5.
+    Coordenadas ausentes (NaN) geram ''.
+
+    Returns:
+        list[str]
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    if not len(latitudes):
+        return []
+
+    bits_lng, bits_lat = _bits_geohash(precisao)
+    validos = ~(np.isnan(latitudes) | np.isnan(longitudes))
+    latitudes = np.nan_to_num(latitudes)
+    longitudes = np.nan_to_num(longitudes)
+
+    indice_lat = np.clip(np.floor((latitudes + 90) / 180 * (1 << bits_lat)), 0, (1 << bits_lat) - 1).astype(np.int64)
+    indice_lng = np.clip(np.floor((longitudes + 180) / 360 * (1 << bits_lng)), 0, (1 << bits_lng) - 1).astype(np.int64)
+
+    codigo = np.zeros(len(latitudes), dtype=np.int64)
+    for k in range(5 * precisao):
+        if k % 2 == 0:
+            bit = (indice_lng >> (bits_lng - 1 - k // 2)) & 1
+        else:
+            bit = (indice_lat >> (bits_lat - 1 - k // 2)) & 1
+        codigo = (codigo << 1) | bit
+
+    deslocamentos = 5 * np.arange(precisao - 1, -1, -1, dtype=np.int64)
+    letras = _LETRAS_GEOHASH[(codigo[:, None] >> deslocamentos) & 31]
+    geohashes = letras.view(f'S{precisao}').ravel().astype(str)
+
+    return [geohash if valido else '' for geohash, valido in zip(geohashes.tolist(), validos.tolist())]
+
+
+def codificar_geohash(latitude, longitude, precisao=PRECISAO_GEOHASH):
+    """Geohash de uma coordenada ('' se latitude ou longitude for None)."""
+    if latitude is None or longitude is None:
+        return ''
+    return codificar_geohashes([float(latitude)], [float(longitude)], precisao)[0]
+
+
+def celulas_na_caixa(lat_min, lat_max, lng_min, lng_max, maximo=MAXIMO_CELULAS_BUSCA):
+    """
+    Prefixos de geohash cujas células cobrem a caixa.
+
+    Usa a maior precisão em que a caixa cabe em até `maximo` células.
+    Longitudes fora de -180..180 dão a volta no antimeridiano.
+
+    Returns:
+        list[str]: Prefixos (todos do mesmo tamanho)
+    """
+    lat_min, lat_max = max(lat_min, -90.0), min(lat_max, 90.0)
+    volta_inteira = lng_max - lng_min >= 360
+
+    for precisao in range(PRECISAO_GEOHASH, 0, -1):
+        bits_lng, bits_lat = _bits_geohash(precisao)
+        altura, largura = 180 / (1 << bits_lat), 360 / (1 << bits_lng)
+        celulas_lng = 1 << bits_lng
+
+        linhas = range(
+            min(int((lat_min + 90) // altura), (1 << bits_lat) - 1),
+            min(int((lat_max + 90) // altura), (1 << bits_lat) - 1) + 1
+        )
+        if volta_inteira:
+            colunas = range(celulas_lng)
+        else:
+            colunas = range(int((lng_min + 180) // largura), int((lng_max + 180) // largura) + 1)
+        if len(linhas) * min(len(colunas), celulas_lng) <= maximo or precisao == 1:
+            break
+
+    colunas = sorted({coluna % celulas_lng for coluna in colunas})
+    centros_lat = [-90 + (linha + 0.5) * altura for linha in linhas for _ in colunas]
+    centros_lng = [-180 + (coluna + 0.5) * largura for _ in linhas for coluna in colunas]
+    return sorted(set(codificar_geohashes(centros_lat, centros_lng, precisao)))
+
+
+def celulas_no_raio(latitude, longitude, raio_m, maximo=MAXIMO_CELULAS_BUSCA):
+    """Prefixos de geohash cujas células cobrem o círculo (ver celulas_na_caixa)."""
+    delta_lat = math.degrees(raio_m / RAIO_TERRA_M)
+    lat_min, lat_max = latitude - delta_lat, latitude + delta_lat
+
+    cosseno = max(math.cos(math.radians(min(max(abs(lat_min), abs(lat_max)), 90.0))), 1e-12)
+    delta_lng = min(math.degrees(raio_m / (RAIO_TERRA_M * cosseno)), 180.0)
+
+    return celulas_na_caixa(lat_min, lat_max, longitude - delta_lng, longitude + delta_lng, maximo)
+
+
+def filtro_geohash(coluna, prefixos):
+    """
+    Q com uma faixa do índice por prefixo de geohash.
+
+    Os limites têm o tamanho completo do geohash, então a comparação é
+    correta em qualquer collation (sem LIKE).
+    """
+    faixas = Q()
+    for prefixo in prefixos:
+        completar = PRECISAO_GEOHASH - len(prefixo)
+        faixas |= Q(**{
+            f'{coluna}__gte': prefixo + BASE32_GEOHASH[0] * completar,
+            f'{coluna}__lte': prefixo + BASE32_GEOHASH[-1] * completar,
+        })
+    return faixas
+
+
+# ==============================================================================
+# 🔍 FILTRO DE PROXIMIDADE (QUERYSETS DE OT)
+# ==============================================================================
+
+def ler_parametros_proximidade(parametros):
+    """
+    Lê near=lat,lng, radius (km) e near_field (origem/entrega).
+
+    Returns:
+        dict | None: latitude, longitude, raio_km e campo (None sem `near`)
+
+    Raises:
+        ValidationError: Parâmetros inválidos (dict campo → mensagens)
+    """
+    near = parametros.get('near')
+    if not near:
+        return None
+
+    erros = {}
+    try:
+        latitude, longitude = (float(valor) for valor in near.split(','))
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError
+    except ValueError:
+        erros['near'] = ['Use near=latitude,longitude (graus decimais).']
+        latitude = longitude = None
+
+    try:
+        raio_km = float(parametros.get('radius', RAIO_PADRAO_KM))
+        if not (0 < raio_km <= RAIO_MAXIMO_KM):
+            raise ValueError
+    except ValueError:
+        erros['radius'] = [f'Informe o raio em km (maior que 0 e até {RAIO_MAXIMO_KM}).']
+        raio_km = None
+
+    campo = parametros.get('near_field', 'origem')
+    if campo not in CAMPOS_PROXIMIDADE:
+        erros['near_field'] = [f'Use um de: {", ".join(CAMPOS_PROXIMIDADE)}.']
+
+    if erros:
+        raise ValidationError(erros)
+
+    return {'latitude': latitude, 'longitude': longitude, 'raio_km': raio_km, 'campo': campo}
+
+
+def filtrar_proximidade(queryset, latitude, longitude, raio_km, campo='origem'):
+    """
+    OTs com a coordenada de `campo` a até `raio_km` do ponto.
+
+    1. Pré-filtro: faixas de geohash das células que cobrem o círculo
+       (usa o índice de geohash_<campo>)
+    2. Refinamento: haversine exato calculado no banco, só sobre as
+       linhas que passaram pelo pré-filtro
+    """
+    raio_m = raio_km * 1000
+    faixas = filtro_geohash(f'geohash_{campo}', celulas_no_raio(latitude, longitude, raio_m))
+
+    # A coluna guarda inteiros em 1e-7 grau (CoordenadaField)
+    lat = Radians(F(f'latitude_{campo}') / Value(float(CoordenadaField.ESCALA)))
+    lng = Radians(F(f'longitude_{campo}') / Value(float(CoordenadaField.ESCALA)))
+    lat_ponto = math.radians(latitude)
+    lng_ponto = math.radians(longitude)
+
+    a = (
+        Power(Sin((lat - Value(lat_ponto)) / 2), 2)
+        + Value(math.cos(lat_ponto)) * Cos(lat) * Power(Sin((lng - Value(lng_ponto)) / 2), 2)
+    )
+    distancia = Value(2 * RAIO_TERRA_M) * ASin(Sqrt(a))
+
+    return queryset.filter(faixas).alias(distancia_m=distancia).filter(distancia_m__lte=raio_m)
@@ -0,0 +1,317 @@
+# ==============================================================================
+# GEOCERCAS - CHEGADA AO LOCAL DE ENTREGA
+# ==============================================================================
+
+# Arquivo: backend/core/geocercas.py
+
+"""
+Geocercas dos locais de entrega das OTs em andamento.
+
+🎯 PROPÓSITO: Registrar sozinho quando o motorista chega (e sai) do
+local de entrega, sem a logística ficar consultando a posição de cada
+um. Cada cruzamento vira uma AtualizacaoOT do tipo LOCALIZACAO.
+
+📋 REGRAS:
+- Cerca: OT em andamento (ativa) com latitude/longitude_entrega, raio
+  raio_geocerca_m
+- Só o motorista atual da OT dispara a cerca dela
+- Entrada: ponto a até raio_geocerca_m; saída: ponto além de
+  raio × FATOR_SAIDA_GEOCERCA (a faixa intermediária evita eventos
+  repetidos com o GPS oscilando na borda)
+- Estado (dentro/fora) em OrdemTransporte.geocerca_entrada_em, gravado
+  com UPDATE condicional: dois lotes simultâneos não duplicam o evento
+
+⚡ ÍNDICE EM GRADE: As cercas ativas ficam em memória, distribuídas em
+células de TAMANHO_CELULA_GEOCERCA graus (cada cerca em todas as células
+que sua caixa toca). Cada ponto do lote consulta só a própria célula:
+o custo é O(pontos), não O(pontos × OTs ativas). O índice é remontado
+(uma consulta) quando uma OT com cerca muda — no máximo uma vez a cada
+INTERVALO_MINIMO_RECARGA_GEOCERCAS_S — e a cada INTERVALO_RECARGA_GEOCERCAS_S.
+"""
+
+import math
+import time
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from logitrack_backend.tracing import get_tracer
+from .compactacao import de_ms
+from .geo import RAIO_TERRA_M, haversine_m
+from .models import AtualizacaoOT, OrdemTransporte
+from .stats import STATUS_ATIVOS
+
+trace = get_tracer(__name__)
+
+# Saída só além de raio × fator (histerese)
+FATOR_SAIDA_GEOCERCA = 1.5
+
+# ~1,1 km de lado no equador
+TAMANHO_CELULA_GEOCERCA = 0.01
+
+_COLUNAS_GRADE = int(round(360 / TAMANHO_CELULA_GEOCERCA))
+
+INTERVALO_RECARGA_GEOCERCAS_S = 60
+
+# Com muitas OTs mudando, o índice é remontado no máximo uma vez por
+# intervalo; cercas recém-encerradas são descartadas na leitura do estado
+INTERVALO_MINIMO_RECARGA_GEOCERCAS_S = 2
+
+CHAVE_VERSAO_GEOCERCAS = 'geocercas:versao'
+
+# Campos da OT que mudam as cercas ativas
+CAMPOS_CERCA = {'status', 'ativa', 'motorista_atual', 'latitude_entrega', 'longitude_entrega', 'raio_geocerca_m'}
+
+# Códigos por ponto na máquina de estados
+DENTRO, FAIXA, FORA = 0, 1, 2
+
+_grade = {'indice': None, 'versao': None, 'montado_em': None}
+
+
+# ==============================================================================
+# 🗂️ ÍNDICE EM GRADE
+# ==============================================================================
+
+def _celulas(latitudes, longitudes):
+    """Chave inteira da célula de cada coordenada (arrays)."""
+    linha = np.floor((np.asarray(latitudes, dtype=np.float64) + 90) / TAMANHO_CELULA_GEOCERCA)
+    coluna = np.floor((np.asarray(longitudes, dtype=np.float64) + 180) / TAMANHO_CELULA_GEOCERCA)
+    return linha.astype(np.int64) * _COLUNAS_GRADE + np.clip(coluna.astype(np.int64), 0, _COLUNAS_GRADE - 1)
+
+
+class GradeGeocercas:
+    """
+    Cercas ativas em arrays (uma posição por cerca) e buckets por célula.
+
+    Attributes:
+        ot_ids, motoristas, latitudes, longitudes, raios: Arrays por cerca
+        por_celula: {chave da célula: array de índices de cercas}
+        por_motorista: {motorista_id: [índices de cercas]}
+    """
+
+    def __init__(self, linhas):
+        ot_ids, motoristas, latitudes, longitudes, raios = zip(*linhas) if linhas else ((),) * 5
+        self.ot_ids = np.array(ot_ids, dtype=np.int64)
+        self.motoristas = np.array(motoristas, dtype=np.int64)
+        self.latitudes = np.array(latitudes, dtype=np.float64)
+        self.longitudes = np.array(longitudes, dtype=np.float64)
+        self.raios = np.array(raios, dtype=np.float64)
+
+        self.por_motorista = {}
+        for indice, motorista in enumerate(self.motoristas.tolist()):
+            self.por_motorista.setdefault(motorista, []).append(indice)
+
+        # Caixa de cada cerca no raio de saída → células que ela toca
+        alcance = self.raios * FATOR_SAIDA_GEOCERCA
+        delta_lat = np.degrees(alcance / RAIO_TERRA_M)
+        cosseno = np.maximum(np.cos(np.radians(np.minimum(np.abs(self.latitudes) + delta_lat, 90))), 1e-6)
+        delta_lng = np.degrees(alcance / (RAIO_TERRA_M * cosseno))
+
+        buckets = {}
+        for indice, (lat, lng, d_lat, d_lng) in enumerate(zip(
+            self.latitudes.tolist(), self.longitudes.tolist(), delta_lat.tolist(), delta_lng.tolist()
+        )):
+            linhas_celula = range(
+                math.floor((lat - d_lat + 90) / TAMANHO_CELULA_GEOCERCA),
+                math.floor((lat + d_lat + 90) / TAMANHO_CELULA_GEOCERCA) + 1,
+            )
+            colunas_celula = range(
+                max(math.floor((lng - d_lng + 180) / TAMANHO_CELULA_GEOCERCA), 0),
+                min(math.floor((lng + d_lng + 180) / TAMANHO_CELULA_GEOCERCA), _COLUNAS_GRADE - 1) + 1,
+            )
+            for linha in linhas_celula:
+                for coluna in colunas_celula:
+                    buckets.setdefault(linha * _COLUNAS_GRADE + coluna, []).append(indice)
+        self.por_celula = {celula: np.array(indices, dtype=np.int64) for celula, indices in buckets.items()}
+
+    def __len__(self):
+        return len(self.ot_ids)
+
+    def acertos(self, latitudes, longitudes):
+        """
+        Pares (ponto, cerca) com o ponto a até raio × FATOR_SAIDA_GEOCERCA.
+
+        Pontos são agrupados por célula; cada grupo só é comparado com as
+        cercas do bucket da célula.
+
+        Returns:
+            tuple: (índices dos pontos, índices das cercas, distâncias em m)
+        """
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        vazio = np.zeros(0, dtype=np.int64)
+        if not len(self) or not len(latitudes):
+            return vazio, vazio, np.zeros(0)
+
+        # Pontos ordenados por célula: cada célula é uma fatia contínua
+        celulas = _celulas(latitudes, longitudes)
+        ordem = np.argsort(celulas, kind='stable')
+        unicas, inicios = np.unique(celulas[ordem], return_index=True)
+        fins = np.append(inicios[1:], len(ordem))
+
+        pontos, cercas = [], []
+        for celula, inicio, fim in zip(unicas.tolist(), inicios.tolist(), fins.tolist()):
+            candidatas = self.por_celula.get(celula)
+            if candidatas is None:
+                continue
+            no_grupo = ordem[inicio:fim]
+            pontos.append(np.repeat(no_grupo, len(candidatas)))
+            cercas.append(np.tile(candidatas, len(no_grupo)))
+
+        if not pontos:
+            return vazio, vazio, np.zeros(0)
+
+        pontos, cercas = np.concatenate(pontos), np.concatenate(cercas)
+        distancias = haversine_m(latitudes[pontos], longitudes[pontos], self.latitudes[cercas], self.longitudes[cercas])
+        perto = distancias <= self.raios[cercas] * FATOR_SAIDA_GEOCERCA
+        return pontos[perto], cercas[perto], distancias[perto]
+
+
+def montar_grade():
+    """Índice das cercas ativas (uma consulta)."""
+    linhas = list(
+        OrdemTransporte.objects.filter(
+            status__in=STATUS_ATIVOS,
+            ativa=True,
+            motorista_atual__isnull=False,
+            latitude_entrega__isnull=False,
+            longitude_entrega__isnull=False,
+        ).values_list('id', 'motorista_atual_id', 'latitude_entrega', 'longitude_entrega', 'raio_geocerca_m')
+    )
+    return GradeGeocercas(linhas)
+
+
+def grade_geocercas():
+    """Índice em memória, remontado se a versão mudou ou ficou velho."""
+    versao = cache.get_or_set(CHAVE_VERSAO_GEOCERCAS, time.time_ns, None)
+    agora = time.monotonic()
+    idade = agora - _grade['montado_em'] if _grade['indice'] is not None else None
+    if (
+        idade is None
+        or idade >= INTERVALO_RECARGA_GEOCERCAS_S
+        or (_grade['versao'] != versao and idade >= INTERVALO_MINIMO_RECARGA_GEOCERCAS_S)
+    ):
+        with trace.span('geocercas.montar'):
+            _grade['indice'] = montar_grade()
+        _grade.update(versao=versao, montado_em=agora)
+        trace.debug("📍 Índice de geocercas: %s cercas", len(_grade['indice']))
+    return _grade['indice']
+
+
+def invalidar_geocercas():
+    """Troca a versão: todos os processos remontam o índice na próxima consulta."""
+    cache.set(CHAVE_VERSAO_GEOCERCAS, time.time_ns(), None)
+
+
+def afeta_geocercas(ot, update_fields=None):
+    """True se salvar/remover a OT pode mudar as cercas ativas."""
+    if update_fields is not None and not CAMPOS_CERCA & set(update_fields):
+        return False
+    tem_cerca = ot.latitude_entrega is not None and ot.longitude_entrega is not None
+    indice = _grade['indice']
+    return tem_cerca or (indice is not None and ot.pk in indice.ot_ids)
+
+
+# ==============================================================================
+# 🚦 CRUZAMENTOS
+# ==============================================================================
+
+def _transicoes(codigos, dentro):
+    """
+    Percorre os códigos (DENTRO/FAIXA/FORA) de uma cerca em ordem.
+
+    Returns:
+        list[tuple]: (evento, índice do ponto), evento ENTRADA ou SAIDA
+    """
+    eventos = []
+    inicio = 0
+    while inicio < len(codigos):
+        procurado = FORA if dentro else DENTRO
+        proximos = np.flatnonzero(codigos[inicio:] == procurado)
+        if not len(proximos):
+            break
+        inicio += int(proximos[0])
+        eventos.append(('SAIDA' if dentro else 'ENTRADA', inicio))
+        dentro = not dentro
+    return eventos
+
+
+def processar_pontos(ot_id, motorista_id, latitudes, longitudes, timestamps):
+    """
+    Confere pontos novos de um motorista contra as cercas ativas.
+
+    Args:
+        ot_id: OT do lote (vai nas atualizações de evento)
+        motorista_id: Motorista que enviou os pontos
+        latitudes, longitudes, timestamps: Arrays em ordem cronológica
+            (timestamp em ms)
+
+    Returns:
+        list[AtualizacaoOT]: Eventos de entrada/saída gravados
+    """
+    grade = grade_geocercas()
+    if motorista_id not in grade.por_motorista:
+        return []
+
+    pontos, cercas, distancias = grade.acertos(latitudes, longitudes)
+
+    # Só o motorista da OT dispara a cerca; as cercas em que ele já está
+    # entram mesmo sem acerto (todos os pontos longe = saída)
+    proprias = grade.motoristas[cercas] == motorista_id
+    pontos, cercas, distancias = pontos[proprias], cercas[proprias], distancias[proprias]
+    relevantes = sorted(set(cercas.tolist()) | set(grade.por_motorista[motorista_id]))
+
+    estados = dict(OrdemTransporte.objects.filter(
+        pk__in=grade.ot_ids[relevantes].tolist(),
+        motorista_atual_id=motorista_id,
+        status__in=STATUS_ATIVOS,
+        ativa=True,
+    ).values_list('pk', 'geocerca_entrada_em'))
+
+    eventos = []
+    for cerca in relevantes:
+        cerca_ot = int(grade.ot_ids[cerca])
+        if cerca_ot not in estados:
+            continue
+        entrada_em = estados[cerca_ot]
+
+        codigos = np.full(len(latitudes), FORA, dtype=np.int8)
+        desta = cercas == cerca
+        codigos[pontos[desta]] = np.where(distancias[desta] <= grade.raios[cerca], DENTRO, FAIXA)
+
+        transicoes = _transicoes(codigos, entrada_em is not None)
+        if not transicoes:
+            continue
+
+        # Estado final: só quem troca o estado gravado registra os eventos
+        evento_final, indice_final = transicoes[-1]
+        dentro_final = evento_final == 'ENTRADA'
+        if dentro_final != (entrada_em is not None):
+            trocou = OrdemTransporte.objects.filter(
+                pk=cerca_ot, geocerca_entrada_em__isnull=entrada_em is None
+            ).update(geocerca_entrada_em=de_ms(int(timestamps[indice_final])) if dentro_final else None)
+            if not trocou:
+                continue
+
+        for evento, indice in transicoes:
+            instante = timezone.localtime(de_ms(int(timestamps[indice])))
+            eventos.append(AtualizacaoOT(
+                ordem_transporte_id=cerca_ot,
+                usuario_id=motorista_id,
+                tipo_atualizacao='LOCALIZACAO',
+                descricao=(
+                    'Motorista chegou ao local de entrega' if evento == 'ENTRADA'
+                    else 'Motorista saiu do local de entrega'
+                ),
+                observacao=f'Geocerca de {int(grade.raios[cerca])} m; ponto GPS de {instante:%d/%m/%Y %H:%M:%S}',
+                latitude=float(latitudes[indice]),
+                longitude=float(longitudes[indice]),
+            ))
+
+    # bulk_create sem sinais: a posição atual já foi gravada pelo lote
+    # com o ponto mais recente
+    if eventos:
+        AtualizacaoOT.objects.bulk_create(eventos)
+    trace.debug("📍 Geocercas (OT %s): %s cercas conferidas, %s eventos", ot_id, len(relevantes), len(eventos))
+    return eventos
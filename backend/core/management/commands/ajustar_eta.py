@@ -0,0 +1,89 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - AJUSTAR MODELO DE ETA
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/ajustar_eta.py
+#
+# 🎯 PROPÓSITO:
+# - Medir quanto tempo as OTs passaram em EM_CARREGAMENTO e EM_TRANSITO
+#   (atualizações de STATUS: status_anterior/status_novo)
+# - Gravar as tabelas de previsão (EstimativaETA) por cidade de entrega
+#   e por motorista, usadas por core/eta.py
+# - Cada passagem conta para o motorista que registrou a entrada na etapa
+#   (usuario da AtualizacaoOT), não para o motorista atual da OT
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py ajustar_eta               (últimos 90 dias)
+# python manage.py ajustar_eta --dias 30
+#
+# ⏰ Rodar periodicamente (ex.: cron diário). Os servidores recarregam a
+#    tabela sozinhos em até um minuto.
+#
+# ============================================================================
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, F, When
+from django.utils import timezone
+
+from core.eta import ajustar_modelo, invalidar_tabela
+from core.models import AtualizacaoOT, EstimativaETA
+
+
+class Command(BaseCommand):
+    """
+    Ajusta o modelo de previsão de entrega.
+
+    Este comando:
+    1. Lê as atualizações de STATUS da janela, ordenadas por OT
+    2. Calcula a duração de cada passagem pelas etapas (NumPy)
+    3. Substitui a tabela EstimativaETA em uma transação
+    """
+
+    help = 'Ajusta as tabelas de previsão de entrega (ETA) a partir do histórico de status'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument('--dias', type=int, default=90,
+                            help='Janela do histórico em dias (padrão: 90)')
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        if options['dias'] < 1:
+            raise CommandError('--dias deve ser >= 1')
+
+        inicio = time.perf_counter()
+        corte = timezone.now() - timedelta(days=options['dias'])
+
+        # Motorista de quem registrou a mudança; logística/admin (ex.: status
+        # em lote) não entram no fator de motorista
+        motorista = Case(When(usuario__role='motorista', then=F('usuario_id')), default=None)
+
+        linhas = list(
+            AtualizacaoOT.objects.filter(tipo_atualizacao='STATUS', data_criacao__gte=corte)
+            .order_by('ordem_transporte_id', 'data_criacao', 'id')
+            .values_list(
+                'ordem_transporte_id', 'data_criacao', 'status_anterior', 'status_novo',
+                'ordem_transporte__cidade_entrega', motorista,
+            )
+            .iterator(chunk_size=5000)
+        )
+        estimativas = ajustar_modelo(linhas)
+
+        with transaction.atomic():
+            EstimativaETA.objects.all().delete()
+            EstimativaETA.objects.bulk_create(estimativas, batch_size=1000)
+        invalidar_tabela()
+
+        por_tipo = {}
+        for estimativa in estimativas:
+            por_tipo[estimativa.tipo] = por_tipo.get(estimativa.tipo, 0) + 1
+        resumo = ', '.join(f'{tipo}: {quantidade}' for tipo, quantidade in sorted(por_tipo.items())) or 'sem dados'
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ ETA ajustada com {len(linhas)} atualizações ({resumo}) '
+            f'em {time.perf_counter() - inicio:.1f}s'
+        ))
@@ -0,0 +1,159 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - BENCHMARK
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/benchmark.py
+#
+# 🎯 PROPÓSITO:
+# - Medir modelos, serializers e endpoints sobre uma massa de dados fixa
+# - Gravar os resultados em JSON
+# - Falhar quando p50/p95 regredirem além do limite em relação ao baseline
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py benchmark                          (compara com o baseline)
+# python manage.py benchmark --tamanho 5000 --saida resultados.json
+# python manage.py benchmark --gravar-baseline        (atualiza o baseline)
+#
+# ⚠️ Roda em um banco de teste criado na hora; o banco real não é tocado.
+#    O baseline depende da máquina: regrave-o ao trocar o ambiente de CI.
+#
+# ============================================================================
+
+import json
+import platform
+import tempfile
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    override_settings, setup_test_environment, teardown_test_environment
+)
+from django.utils import timezone
+
+BASELINE_PADRAO = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    """
+    Executa a suíte de benchmarks de core/benchmarks.py.
+
+    Este comando:
+    1. Cria um banco de teste e popula a massa de dados (semente fixa)
+    2. Executa cada caso com aquecimento e N repetições
+    3. Escreve p50/p95/média por caso (e o JSON, com --saida)
+    4. Compara com o baseline e falha se houver regressão
+    """
+
+    help = 'Executa os benchmarks e compara com o baseline versionado'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument('--tamanho', type=int, default=500,
+                            help='Quantidade de OTs na massa de dados (padrão: 500)')
+        parser.add_argument('--repeticoes', type=int, default=30,
+                            help='Repetições medidas por caso (padrão: 30)')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Semente da massa de dados (padrão: 42)')
+        parser.add_argument('--casos', nargs='*',
+                            help='Executa apenas os casos informados')
+        parser.add_argument('--saida',
+                            help='Arquivo JSON com os resultados')
+        parser.add_argument('--baseline', default=str(BASELINE_PADRAO),
+                            help='Arquivo de baseline (padrão: benchmarks/baseline.json)')
+        parser.add_argument('--limite', type=float, default=0.5,
+                            help='Regressão tolerada sobre o baseline (padrão: 0.5 = 50%%)')
+        parser.add_argument('--folga-ms', type=float, default=1.0,
+                            help='Diferença mínima, em ms, para contar como regressão')
+        parser.add_argument('--gravar-baseline', action='store_true',
+                            help='Grava os resultados como novo baseline')
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        self.stdout.write(self.style.HTTP_INFO('⏱️  BENCHMARKS LOGITRACK'))
+
+        resultados = self.executar(options)
+
+        documento = {
+            'meta': {
+                'data': timezone.now().isoformat(),
+                'tamanho': options['tamanho'],
+                'repeticoes': options['repeticoes'],
+                'seed': options['seed'],
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'banco': connection.vendor,
+            },
+            'casos': resultados,
+        }
+
+        if options['saida']:
+            Path(options['saida']).write_text(json.dumps(documento, indent=2, ensure_ascii=False))
+            self.stdout.write(f"📄 Resultados gravados em {options['saida']}")
+
+        baseline_path = Path(options['baseline'])
+        if options['gravar_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(documento, indent=2, ensure_ascii=False) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✅ Baseline gravado em {baseline_path}'))
+            return
+
+        self.comparar(documento, baseline_path, options)
+
+    def executar(self, options):
+        """Cria o banco de teste, popula e mede os casos."""
+        from core.benchmarks import criar_casos, medir, popular_dataset, resumir
+
+        setup_test_environment()
+        nome_original = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            # Métricas da suíte não devem ir para o diretório de produção
+            with tempfile.TemporaryDirectory() as diretorio, \
+                    override_settings(LOGITRACK_METRICS_DIR=diretorio):
+                self.stdout.write(f"🌱 Populando {options['tamanho']} OTs (seed {options['seed']})...")
+                dataset = popular_dataset(options['tamanho'], options['seed'])
+
+                resultados = {}
+                for caso in criar_casos(dataset):
+                    if options['casos'] and caso.nome not in options['casos']:
+                        continue
+                    resumo = resumir(medir(caso, options['repeticoes']))
+                    resultados[caso.nome] = resumo
+                    self.stdout.write(
+                        f"   {caso.nome:<22} p50 {resumo['p50_ms']:>9.2f} ms   "
+                        f"p95 {resumo['p95_ms']:>9.2f} ms   (n={resumo['n']})"
+                    )
+                return resultados
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+
+    def comparar(self, documento, baseline_path, options):
+        """Falha (CommandError) se algum caso regrediu."""
+        from core.benchmarks import comparar
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'⚠️  Baseline não encontrado: {baseline_path}'))
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        for chave in ('tamanho', 'seed'):
+            if baseline['meta'].get(chave) != documento['meta'][chave]:
+                self.stdout.write(self.style.WARNING(
+                    f"⚠️  {chave} diferente do baseline ({baseline['meta'].get(chave)} x "
+                    f"{documento['meta'][chave]}): a comparação não é equivalente"
+                ))
+
+        regressoes = comparar(documento['casos'], baseline['casos'], options['limite'], options['folga_ms'])
+
+        if not regressoes:
+            self.stdout.write(self.style.SUCCESS('✅ Nenhuma regressão em relação ao baseline'))
+            return
+
+        for nome, metrica, base, atual in regressoes:
+            self.stdout.write(self.style.ERROR(
+                f'   ↳ {nome} {metrica}: {base:.2f} ms → {atual:.2f} ms (+{(atual / base - 1) * 100:.0f}%)'
+            ))
+        raise CommandError(f'{len(regressoes)} regressões de desempenho')
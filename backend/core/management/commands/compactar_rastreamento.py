@@ -0,0 +1,75 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - COMPACTAR RASTREAMENTO
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/compactar_rastreamento.py
+#
+# 🎯 PROPÓSITO:
+# - Dobrar os PontoRastreamento antigos em SegmentoRastreamento
+#   (delta + varint, ver core/compactacao.py)
+# - Manter a tabela de pontos pequena, só com o rastreamento recente
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py compactar_rastreamento
+# python manage.py compactar_rastreamento --idade 30 --janela 60
+#
+# ⏰ Feito para rodar em segundo plano (cron a cada 15-30 min). Cada OT é
+#    compactada em uma transação própria; interromper é seguro.
+#
+# ============================================================================
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.compactacao import compactar_ot, de_ms, ots_para_compactar, para_ms
+
+
+class Command(BaseCommand):
+    """
+    Compacta o rastreamento GPS antigo em segmentos.
+
+    Este comando:
+    1. Calcula o corte (agora - idade, alinhado ao início da janela)
+    2. Lista as OTs com pontos anteriores ao corte
+    3. Para cada OT, grava um segmento por janela e remove os pontos
+    """
+
+    help = 'Compacta pontos de rastreamento antigos em segmentos binários'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument('--idade', type=int, default=120,
+                            help='Compacta pontos com mais de N minutos (padrão: 120)')
+        parser.add_argument('--janela', type=int, default=60,
+                            help='Duração de cada segmento, em minutos (padrão: 60)')
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        if options['idade'] < 0 or options['janela'] < 1:
+            raise CommandError('--idade deve ser >= 0 e --janela >= 1')
+
+        janela = timedelta(minutes=options['janela'])
+        janela_ms = janela // timedelta(milliseconds=1)
+
+        # Corte alinhado à janela: a janela em andamento não é cortada ao meio
+        limite = para_ms(timezone.now() - timedelta(minutes=options['idade']))
+        antes_de = de_ms(limite - limite % janela_ms)
+
+        inicio = time.perf_counter()
+        total_pontos = total_segmentos = 0
+        ots = ots_para_compactar(antes_de)
+
+        self.stdout.write(f'🗜️  Compactando pontos anteriores a {antes_de:%d/%m/%Y %H:%M} UTC ({len(ots)} OTs)')
+
+        for ot_id in ots:
+            pontos, segmentos = compactar_ot(ot_id, antes_de, janela)
+            total_pontos += pontos
+            total_segmentos += segmentos
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {total_pontos} pontos em {total_segmentos} segmentos '
+            f'({time.perf_counter() - inicio:.1f}s)'
+        ))
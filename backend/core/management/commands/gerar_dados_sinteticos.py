@@ -0,0 +1,120 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - GERAR DADOS SINTÉTICOS
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/gerar_dados_sinteticos.py
+#
+# 🎯 PROPÓSITO:
+# - Popular o banco com volume de produção (milhares de motoristas,
+#   centenas de milhares de OTs) para testes de carga e benchmarks
+# - Mesma semente → mesmos dados
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py gerar_dados_sinteticos --motoristas 2000 --ots 200000
+# python manage.py gerar_dados_sinteticos --seed 7 --limpar
+#
+# 🔑 Todos os usuários gerados usam a senha de --senha (padrão: sintetico123)
+#    e emails em @sintetico.logitrack.local
+#
+# ============================================================================
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from accounts.models import CustomUser
+from core.dados_sinteticos import DOMINIO_SINTETICO, SENHA_PADRAO, GeradorDadosSinteticos
+from core.models import OrdemTransporte
+
+
+class Command(BaseCommand):
+    """
+    Gera usuários, OTs, linhas do tempo e transferências sintéticas.
+
+    Este comando:
+    1. (Opcional) remove os dados sintéticos de execuções anteriores
+    2. Cria motoristas e usuários de logística com bulk_create
+    3. Cria as OTs em lotes, cada lote em uma transação
+    4. Reconstrói contadores e índice de busca
+    """
+
+    help = 'Gera dados sintéticos em volume, de forma determinística'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument('--motoristas', type=int, default=1000,
+                            help='Quantidade de motoristas (padrão: 1000)')
+        parser.add_argument('--logistica', type=int, default=10,
+                            help='Quantidade de usuários de logística (padrão: 10)')
+        parser.add_argument('--ots', type=int, default=100000,
+                            help='Quantidade de OTs (padrão: 100000)')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Semente do gerador (padrão: 42)')
+        parser.add_argument('--lote', type=int, default=5000,
+                            help='OTs por lote/transação (padrão: 5000)')
+        parser.add_argument('--dias', type=int, default=180,
+                            help='Janela de datas de criação, em dias (padrão: 180)')
+        parser.add_argument('--senha', default=SENHA_PADRAO,
+                            help='Senha dos usuários gerados')
+        parser.add_argument('--limpar', action='store_true',
+                            help='Remove os dados sintéticos existentes antes de gerar')
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        self.stdout.write(self.style.HTTP_INFO('🌱 GERANDO DADOS SINTÉTICOS'))
+        inicio = time.perf_counter()
+
+        if options['limpar']:
+            self.limpar()
+
+        if options['motoristas'] < 1 or options['logistica'] < 1:
+            raise CommandError('São necessários pelo menos 1 motorista e 1 usuário de logística')
+
+        sufixo = f".s{options['seed']}@{DOMINIO_SINTETICO}"
+        if CustomUser.objects.filter(email__endswith=sufixo).exists():
+            raise CommandError(
+                f"Já existem dados sintéticos com seed {options['seed']}. Use --limpar ou outra --seed."
+            )
+
+        gerador = GeradorDadosSinteticos(
+            seed=options['seed'], lote=options['lote'], dias=options['dias'], senha=options['senha']
+        )
+
+        motoristas, logistica = gerador.criar_usuarios(options['motoristas'], options['logistica'])
+        self.stdout.write(f'👥 {len(motoristas)} motoristas e {len(logistica)} usuários de logística')
+
+        total = options['ots']
+
+        def progresso(criadas):
+            decorrido = time.perf_counter() - inicio
+            self.stdout.write(f'🚚 {criadas}/{total} OTs ({criadas / decorrido:.0f} OTs/s)')
+
+        gerador.criar_ots(total, motoristas, logistica, progresso=progresso)
+
+        self.stdout.write('🔄 Reconstruindo contadores e índice de busca...')
+        gerador.finalizar()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Concluído em {time.perf_counter() - inicio:.1f}s'
+        ))
+
+    def limpar(self):
+        """Remove OTs e usuários sintéticos (de qualquer seed)."""
+        with transaction.atomic():
+            usuarios = CustomUser.objects.filter(email__endswith=f'@{DOMINIO_SINTETICO}')
+            ots = OrdemTransporte.objects.filter(motorista_criador__in=usuarios)
+            quantidade_ots = ots.count()
+            # _raw_delete: sem sinais por linha; contadores e índice são reconstruídos depois
+            for relacionado in ('transferencias', 'atualizacoes', 'arquivos',
+                                'pontos_rastreamento', 'segmentos_rastreamento'):
+                modelo = OrdemTransporte._meta.get_field(relacionado).related_model
+                modelo.objects.filter(ordem_transporte__in=ots)._raw_delete(modelo.objects.db)
+            ots._raw_delete(ots.db)
+            quantidade_usuarios = usuarios.count()
+            usuarios.delete()
+
+        GeradorDadosSinteticos().finalizar()
+        self.stdout.write(self.style.WARNING(
+            f'🗑️  Removidos {quantidade_ots} OTs e {quantidade_usuarios} usuários sintéticos'
+        ))
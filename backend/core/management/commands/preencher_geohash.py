@@ -0,0 +1,97 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - PREENCHER GEOHASH DAS OTs
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/preencher_geohash.py
+#
+# 🎯 PROPÓSITO:
+# - Calcular geohash_origem e geohash_entrega das OTs existentes
+#   (OTs salvas depois da migração já recebem o geohash no save())
+# - Corrigir OTs cujas coordenadas foram alteradas sem save()
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py preencher_geohash               (só OTs sem geohash)
+# python manage.py preencher_geohash --todas       (recalcula todas)
+#
+# ⏰ Cada lote é gravado em uma transação própria; interromper e rodar de
+#    novo continua de onde parou.
+#
+# ============================================================================
+
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from core.geo import codificar_geohashes
+from core.models import OrdemTransporte
+
+
+class Command(BaseCommand):
+    """
+    Preenche o índice espacial (geohash) das OTs.
+
+    Este comando:
+    1. Seleciona as OTs com coordenadas e sem geohash (ou todas)
+    2. Percorre por ID em lotes
+    3. Calcula os geohashes do lote de uma vez (NumPy) e grava com bulk_update
+    """
+
+    help = 'Preenche geohash_origem/geohash_entrega das OTs (backfill do índice espacial)'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument('--todas', action='store_true',
+                            help='Recalcula todas as OTs, não só as sem geohash')
+        parser.add_argument('--lote', type=int, default=2000,
+                            help='OTs por lote (padrão: 2000)')
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser >= 1')
+
+        ots = OrdemTransporte.objects.all()
+        if not options['todas']:
+            pendentes = Q()
+            for campo_geohash, (latitude, longitude) in OrdemTransporte.CAMPOS_GEOHASH.items():
+                pendentes |= Q(**{
+                    campo_geohash: '',
+                    f'{latitude}__isnull': False,
+                    f'{longitude}__isnull': False,
+                })
+            ots = ots.filter(pendentes)
+
+        campos = [
+            campo for coordenadas in OrdemTransporte.CAMPOS_GEOHASH.values() for campo in coordenadas
+        ]
+        inicio = time.perf_counter()
+        ultimo_id = 0
+        total = 0
+
+        while True:
+            lote = list(ots.filter(id__gt=ultimo_id).order_by('id').only('id', *campos)[:options['lote']])
+            if not lote:
+                break
+
+            for campo_geohash, (latitude, longitude) in OrdemTransporte.CAMPOS_GEOHASH.items():
+                geohashes = codificar_geohashes(
+                    np.array([getattr(ot, latitude) for ot in lote], dtype=np.float64),  # None → NaN
+                    np.array([getattr(ot, longitude) for ot in lote], dtype=np.float64),
+                )
+                for ot, geohash in zip(lote, geohashes):
+                    setattr(ot, campo_geohash, geohash)
+
+            # bulk_update: sem save() nem sinais (não mexe em data_atualizacao)
+            with transaction.atomic():
+                OrdemTransporte.objects.bulk_update(lote, list(OrdemTransporte.CAMPOS_GEOHASH))
+
+            ultimo_id = lote[-1].id
+            total += len(lote)
+            self.stdout.write(f'   {total} OTs...', ending='\r')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Geohash de {total} OTs preenchido ({time.perf_counter() - inicio:.1f}s)'
+        ))
@@ -0,0 +1,126 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - RECALCULAR CONTADORES DE OTs
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/recalcular_contadores_ot.py
+#
+# 🎯 PROPÓSITO:
+# - Reconstruir ContadorStatusOT a partir da tabela de OTs
+# - Reportar desvios entre os contadores e as contagens reais
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py recalcular_contadores_ot            (recalcula)
+# python manage.py recalcular_contadores_ot --check    (só reporta)
+#
+# ============================================================================
+
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from core.models import OrdemTransporte, ContadorStatusOT
+
+
+class Command(BaseCommand):
+    """
+    Recalcula os contadores materializados de OTs por status.
+
+    Este comando:
+    1. Conta as OTs por (motorista_atual, status) e por status
+    2. Compara com os valores gravados em ContadorStatusOT
+    3. Reporta cada desvio encontrado
+    4. Regrava todos os contadores (exceto com --check)
+    """
+
+    help = 'Recalcula os contadores de OTs por status e reporta desvios'
+
+    def add_arguments(self, parser):
+        """Adiciona argumentos opcionais ao comando."""
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas reporta desvios, sem alterar os contadores',
+        )
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        self.stdout.write(
+            self.style.HTTP_INFO('📊 RECALCULANDO CONTADORES DE OTs')
+        )
+
+        with transaction.atomic():
+            reais = self.contar_ots()
+            gravados = Counter({
+                (motorista_id, status): quantidade
+                for motorista_id, status, quantidade in ContadorStatusOT.objects.select_for_update().values_list(
+                    'motorista_id', 'status', 'quantidade'
+                )
+            })
+
+            desvios = self.reportar_desvios(reais, gravados)
+
+            if options['check']:
+                self.stdout.write('🔍 Modo --check: nenhum contador foi alterado')
+            else:
+                ContadorStatusOT.objects.all().delete()
+                ContadorStatusOT.objects.bulk_create(
+                    [
+                        ContadorStatusOT(motorista_id=motorista_id, status=status, quantidade=quantidade)
+                        for (motorista_id, status), quantidade in reais.items()
+                    ],
+                    batch_size=1000
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ {len(reais)} contadores regravados')
+                )
+
+        if desvios:
+            self.stdout.write(
+                self.style.WARNING(f'⚠️  {desvios} contadores com desvio')
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS('✅ Nenhum desvio encontrado')
+            )
+
+    def contar_ots(self):
+        """
+        Conta as OTs direto na tabela.
+
+        Returns:
+            Counter: {(motorista_id, status): quantidade}, com motorista_id
+            None para as linhas globais
+        """
+        reais = Counter()
+        por_motorista = OrdemTransporte.objects.order_by().values(
+            'motorista_atual_id', 'status'
+        ).annotate(total=Count('id'))
+
+        for linha in por_motorista:
+            reais[(linha['motorista_atual_id'], linha['status'])] += linha['total']
+            reais[(None, linha['status'])] += linha['total']
+
+        return reais
+
+    def reportar_desvios(self, reais, gravados):
+        """
+        Escreve cada contador cujo valor gravado difere do real.
+
+        Returns:
+            int: Quantidade de contadores com desvio
+        """
+        desvios = 0
+        for chave in sorted(set(reais) | set(gravados), key=lambda c: (c[0] or 0, c[1])):
+            if reais[chave] == gravados[chave]:
+                continue
+
+            desvios += 1
+            motorista_id, status = chave
+            dono = f'motorista {motorista_id}' if motorista_id else 'global'
+            self.stdout.write(
+                f'   ↳ {dono} / {status}: gravado {gravados[chave]}, real {reais[chave]}'
+            )
+
+        return desvios
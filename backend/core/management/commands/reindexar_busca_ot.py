@@ -0,0 +1,43 @@
+# ============================================================================
+# DJANGO MANAGEMENT COMMAND - REINDEXAR BUSCA DE OTs
+# ============================================================================
+#
+# 📁 Salvar em: backend/core/management/commands/reindexar_busca_ot.py
+#
+# 🎯 PROPÓSITO:
+# - Reconstruir o índice de busca textual das OTs (core/search.py)
+# - Necessário após alterações em massa que não disparam sinais
+#   (queryset.update, bulk_create, imports direto no banco)
+#
+# 🚀 COMANDO PARA EXECUTAR:
+# python manage.py reindexar_busca_ot
+#
+# ============================================================================
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core.models import OrdemTransporte
+from core.search import get_backend
+
+
+class Command(BaseCommand):
+    """
+    Recria o índice de busca textual a partir da tabela de OTs.
+    """
+
+    help = 'Reconstrói o índice de busca textual das OTs'
+
+    def handle(self, *args, **options):
+        """Método principal do comando."""
+        backend = get_backend()
+        self.stdout.write(
+            self.style.HTTP_INFO(f'🔍 REINDEXANDO BUSCA DE OTs ({type(backend).__name__})')
+        )
+
+        with transaction.atomic():
+            backend.reconstruir()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {OrdemTransporte.objects.count()} OTs indexadas')
+        )
@@ -0,0 +1,192 @@
+# ==============================================================================
+# MAPA DE CALOR - AGREGAÇÃO DAS ENTREGAS EM TILES
+# ==============================================================================
+
+# Arquivo: backend/core/mapa_calor.py
+
+"""
+Densidade de entregas por tile do mapa (Web Mercator, z/x/y).
+
+🎯 PROPÓSITO: O mapa do dashboard mostra densidade, não 100 mil
+marcadores. Cada tile devolve no máximo GRADE_TILE × GRADE_TILE células
+com a contagem por status, qualquer que seja o volume de OTs.
+
+📋 ETAPAS:
+1. OTs com coordenadas de entrega dentro do tile (pré-filtro pelo
+   índice de geohash_entrega + caixa exata)
+2. Projeção Mercator e binning vetorizado: índice da célula × status
+   contados com um único np.bincount
+3. Só as células não vazias vão no payload (colunas + linhas em arrays)
+
+⚡ CACHE: Um tile fica em cache até uma entrega cair nele. Cada tile tem
+sua versão; ao salvar uma OT com coordenadas de entrega, as versões dos
+tiles que contêm o ponto (um por zoom) são trocadas. A troca só chega aos
+outros workers com cache compartilhado (banco/redis); com cache em
+memória local tiles e versões expiram em TEMPO_CACHE_MAPA_CALOR_LOCAL.
+"""
+
+import math
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from logitrack_backend.tracing import get_tracer
+from .geo import celulas_na_caixa, filtro_geohash
+from .models import OrdemTransporte
+
+trace = get_tracer(__name__)
+
+ZOOM_MAXIMO_MAPA_CALOR = 18
+
+# Células por lado do tile (tile de 256 px → células de 4 px)
+GRADE_TILE = 64
+
+LATITUDE_MAXIMA_MERCATOR = 85.0511287798
+
+TEMPO_CACHE_MAPA_CALOR = 24 * 60 * 60  # 1 dia (a versão invalida antes)
+
+# Cache por processo: os outros workers não veem a troca de versão
+TEMPO_CACHE_MAPA_CALOR_LOCAL = 60
+
+STATUS_MAPA_CALOR = [codigo for codigo, _ in OrdemTransporte.STATUS_CHOICES]
+
+
+# ==============================================================================
+# 🌐 WEB MERCATOR
+# ==============================================================================
+
+def posicao_no_mundo(latitude, longitude):
+    """
+    Coordenadas → posição Mercator normalizada (0..1, origem no canto
+    superior esquerdo). Aceita arrays.
+    """
+    latitude = np.clip(latitude, -LATITUDE_MAXIMA_MERCATOR, LATITUDE_MAXIMA_MERCATOR)
+    x = (np.asarray(longitude, dtype=np.float64) + 180) / 360
+    seno = np.sin(np.radians(latitude))
+    y = 0.5 - np.log((1 + seno) / (1 - seno)) / (4 * math.pi)
+    return x, y
+
+
+def limites_tile(z, x, y):
+    """(lat_min, lat_max, lng_min, lng_max) do tile."""
+    n = 1 << z
+
+    def latitude(linha):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * linha / n))))
+
+    return latitude(y + 1), latitude(y), x / n * 360 - 180, (x + 1) / n * 360 - 180
+
+
+def tile_valido(z, x, y):
+    return 0 <= z <= ZOOM_MAXIMO_MAPA_CALOR and 0 <= x < (1 << z) and 0 <= y < (1 << z)
+
+
+# ==============================================================================
+# 🔥 AGREGAÇÃO
+# ==============================================================================
+
+def agregar_tile(z, x, y):
+    """
+    Conta as OTs com entrega no tile, por célula da grade e status.
+
+    Returns:
+        dict: z, x, y, grade, colunas, celulas e total
+    """
+    lat_min, lat_max, lng_min, lng_max = limites_tile(z, x, y)
+
+    ots = OrdemTransporte.objects.filter(
+        filtro_geohash('geohash_entrega', celulas_na_caixa(lat_min, lat_max, lng_min, lng_max)),
+        latitude_entrega__gte=lat_min, latitude_entrega__lte=lat_max,
+        longitude_entrega__gte=lng_min, longitude_entrega__lte=lng_max,
+    ).order_by().values_list('latitude_entrega', 'longitude_entrega', 'status')
+
+    linhas = list(ots)
+    colunas = ['x', 'y', 'total', *STATUS_MAPA_CALOR]
+    if not linhas:
+        return {'z': z, 'x': x, 'y': y, 'grade': GRADE_TILE, 'colunas': colunas, 'celulas': [], 'total': 0}
+
+    latitudes, longitudes, status = zip(*linhas)
+    mundo_x, mundo_y = posicao_no_mundo(
+        np.array(latitudes, dtype=np.float64), np.array(longitudes, dtype=np.float64)
+    )
+
+    # Posição dentro do tile → célula da grade (bordas caem na última célula)
+    escala = (1 << z) * GRADE_TILE
+    celula_x = np.clip(np.floor(mundo_x * escala) - x * GRADE_TILE, 0, GRADE_TILE - 1).astype(np.int64)
+    celula_y = np.clip(np.floor(mundo_y * escala) - y * GRADE_TILE, 0, GRADE_TILE - 1).astype(np.int64)
+
+    indice_status = {codigo: i for i, codigo in enumerate(STATUS_MAPA_CALOR)}
+    codigos = np.array([indice_status[s] for s in status], dtype=np.int64)
+
+    quantidade_status = len(STATUS_MAPA_CALOR)
+    celula = celula_y * GRADE_TILE + celula_x
+    contagens = np.bincount(
+        celula * quantidade_status + codigos, minlength=GRADE_TILE * GRADE_TILE * quantidade_status
+    ).reshape(GRADE_TILE * GRADE_TILE, quantidade_status)
+
+    totais = contagens.sum(axis=1)
+    ocupadas = np.flatnonzero(totais)
+    tabela = np.column_stack([ocupadas % GRADE_TILE, ocupadas // GRADE_TILE, totais[ocupadas], contagens[ocupadas]])
+
+    return {
+        'z': z, 'x': x, 'y': y,
+        'grade': GRADE_TILE,
+        'colunas': colunas,
+        'celulas': tabela.tolist(),
+        'total': len(linhas),
+    }
+
+
+# ==============================================================================
+# ⚡ CACHE POR TILE
+# ==============================================================================
+
+def _chave_versao(z, x, y):
+    return f'mapa_calor:versao:{z}:{x}:{y}'
+
+
+def _cache_local():
+    return settings.CACHES['default']['BACKEND'].endswith('LocMemCache')
+
+
+def _tempos_cache():
+    """(timeout do tile, timeout da versão) conforme o cache é compartilhado ou não."""
+    if _cache_local():
+        return TEMPO_CACHE_MAPA_CALOR_LOCAL, TEMPO_CACHE_MAPA_CALOR_LOCAL
+    return TEMPO_CACHE_MAPA_CALOR, None
+
+
+def tile_mapa_calor(z, x, y):
+    """Tile agregado, do cache enquanto nenhuma entrega nova cair nele."""
+    tempo_tile, tempo_versao = _tempos_cache()
+    versao = cache.get_or_set(_chave_versao(z, x, y), time.time_ns, tempo_versao)
+    chave = f'mapa_calor:{z}:{x}:{y}:{versao}'
+
+    resultado = cache.get(chave)
+    if resultado is None:
+        with trace.span('mapa_calor.tile', z=z, x=x, y=y):
+            resultado = agregar_tile(z, x, y)
+        cache.set(chave, resultado, tempo_tile)
+    return resultado
+
+
+def invalidar_tiles(latitude, longitude):
+    """Troca a versão dos tiles (um por zoom) que contêm a coordenada."""
+    invalidar_tiles_pontos([(latitude, longitude)])
+
+
+def invalidar_tiles_pontos(pontos):
+    """invalidar_tiles para várias coordenadas com um único set_many."""
+    versao = time.time_ns()
+    versoes = {}
+    for latitude, longitude in pontos:
+        mundo_x, mundo_y = posicao_no_mundo(float(latitude), float(longitude))
+        for z in range(ZOOM_MAXIMO_MAPA_CALOR + 1):
+            n = 1 << z
+            x = min(int(mundo_x * n), n - 1)
+            y = min(int(mundo_y * n), n - 1)
+            versoes[_chave_versao(z, x, y)] = versao
+    if versoes:
+        cache.set_many(versoes, _tempos_cache()[1])
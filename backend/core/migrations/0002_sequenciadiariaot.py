@@ -0,0 +1,26 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SequenciaDiariaOT',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.DateField(help_text='Dia ao qual o contador pertence', unique=True, verbose_name='Data')),
+                ('ultimo_numero', models.PositiveIntegerField(default=0, help_text='Último sequencial reservado no dia', verbose_name='Último Número')),
+            ],
+            options={
+                'verbose_name': 'Sequência Diária de OT',
+                'verbose_name_plural': 'Sequências Diárias de OT',
+                'ordering': ['-data'],
+            },
+        ),
+    ]
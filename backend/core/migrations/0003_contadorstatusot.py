@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def popular_contadores(apps, schema_editor):
+    """Preenche os contadores com as OTs já existentes."""
+    OrdemTransporte = apps.get_model('core', 'OrdemTransporte')
+    ContadorStatusOT = apps.get_model('core', 'ContadorStatusOT')
+
+    contadores = {}
+    linhas = OrdemTransporte.objects.order_by().values(
+        'motorista_atual_id', 'status'
+    ).annotate(total=Count('id'))
+
+    for linha in linhas:
+        for chave in ((linha['motorista_atual_id'], linha['status']), (None, linha['status'])):
+            contadores[chave] = contadores.get(chave, 0) + linha['total']
+
+    ContadorStatusOT.objects.bulk_create(
+        [
+            ContadorStatusOT(motorista_id=motorista_id, status=status, quantidade=quantidade)
+            for (motorista_id, status), quantidade in contadores.items()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_sequenciadiariaot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorStatusOT',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('INICIADA', 'Iniciada'), ('EM_CARREGAMENTO', 'Em Carregamento'), ('EM_TRANSITO', 'Em Trânsito'), ('ENTREGUE', 'Entregue'), ('ENTREGUE_PARCIAL', 'Entregue Parcialmente'), ('CANCELADA', 'Cancelada')], max_length=20, verbose_name='Status')),
+                ('quantidade', models.IntegerField(default=0, verbose_name='Quantidade')),
+                ('motorista', models.ForeignKey(blank=True, help_text='Motorista atual das OTs (vazio = contador global)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='contadores_ot', to=settings.AUTH_USER_MODEL, verbose_name='Motorista')),
+            ],
+            options={
+                'verbose_name': 'Contador de OTs por Status',
+                'verbose_name_plural': 'Contadores de OTs por Status',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('motorista__isnull', False)), fields=('motorista', 'status'), name='contador_ot_motorista_status_unico'), models.UniqueConstraint(condition=models.Q(('motorista__isnull', True)), fields=('status',), name='contador_ot_global_status_unico')],
+            },
+        ),
+        migrations.RunPython(popular_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_contadorstatusot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ordemtransporte',
+            name='core_ordemt_data_cr_48d481_idx',
+        ),
+        migrations.AddIndex(
+            model_name='ordemtransporte',
+            index=models.Index(fields=['-data_criacao', 'id'], name='core_ordemt_data_cr_00a5d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transferenciaot',
+            index=models.Index(fields=['-data_solicitacao', 'id'], name='core_transf_data_so_a14444_idx'),
+        ),
+    ]
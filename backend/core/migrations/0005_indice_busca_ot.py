@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+def criar_indice_busca(apps, schema_editor):
+    """Cria a tabela FTS5 de busca de OTs e indexa as OTs existentes (só SQLite)."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS core_ot_busca USING fts5("
+            "numero_ot, cliente_nome, endereco_entrega, cidade_entrega, observacoes, "
+            "tokenize = 'unicode61 remove_diacritics 2', "
+            "prefix = '2 3')"
+        )
+        cursor.execute(
+            "INSERT INTO core_ot_busca "
+            "(rowid, numero_ot, cliente_nome, endereco_entrega, cidade_entrega, observacoes) "
+            "SELECT id, COALESCE(numero_ot, ''), COALESCE(cliente_nome, ''), "
+            "COALESCE(endereco_entrega, ''), COALESCE(cidade_entrega, ''), "
+            "COALESCE(observacoes, '') "
+            "FROM core_ordemtransporte"
+        )
+
+
+def remover_indice_busca(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS core_ot_busca')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_indices_paginacao_keyset'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_indice_busca_ot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PontoRastreamento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('latitude', models.FloatField(verbose_name='Latitude')),
+                ('longitude', models.FloatField(verbose_name='Longitude')),
+                ('registrado_em', models.DateTimeField(help_text='Instante da leitura no aparelho', verbose_name='Registrado em')),
+                ('precisao', models.FloatField(blank=True, help_text='Raio de precisão informado pelo GPS, em metros', null=True, verbose_name='Precisão (m)')),
+                ('velocidade', models.FloatField(blank=True, null=True, verbose_name='Velocidade (m/s)')),
+                ('motorista', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='pontos_rastreamento', to=settings.AUTH_USER_MODEL, verbose_name='Motorista')),
+                ('ordem_transporte', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pontos_rastreamento', to='core.ordemtransporte', verbose_name='Ordem de Transporte')),
+            ],
+            options={
+                'verbose_name': 'Ponto de Rastreamento',
+                'verbose_name_plural': 'Pontos de Rastreamento',
+                'ordering': ['registrado_em'],
+                'indexes': [models.Index(fields=['ordem_transporte', 'registrado_em'], name='ponto_ot_registro_idx')],
+            },
+        ),
+    ]
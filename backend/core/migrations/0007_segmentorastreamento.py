@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_pontorastreamento'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SegmentoRastreamento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inicio', models.DateTimeField(help_text='Instante do primeiro ponto do segmento', verbose_name='Início')),
+                ('fim', models.DateTimeField(help_text='Instante do último ponto do segmento', verbose_name='Fim')),
+                ('quantidade', models.PositiveIntegerField(verbose_name='Quantidade de Pontos')),
+                ('formato', models.PositiveSmallIntegerField(default=1, help_text='Versão da codificação do blob', verbose_name='Formato')),
+                ('dados', models.BinaryField(help_text='Pontos codificados (delta + varint)', verbose_name='Dados')),
+                ('motorista', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='segmentos_rastreamento', to=settings.AUTH_USER_MODEL, verbose_name='Motorista')),
+                ('ordem_transporte', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='segmentos_rastreamento', to='core.ordemtransporte', verbose_name='Ordem de Transporte')),
+            ],
+            options={
+                'verbose_name': 'Segmento de Rastreamento',
+                'verbose_name_plural': 'Segmentos de Rastreamento',
+                'ordering': ['inicio'],
+                'indexes': [models.Index(fields=['ordem_transporte', 'inicio'], name='segmento_ot_inicio_idx')],
+            },
+        ),
+    ]
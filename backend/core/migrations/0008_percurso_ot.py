@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_segmentorastreamento'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='distancia_km',
+            field=models.FloatField(default=0, editable=False, verbose_name='Distância Percorrida (km)'),
+        ),
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='estado_percurso',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Até onde o rastreamento já foi processado (uso interno)', verbose_name='Estado do Cálculo de Percurso'),
+        ),
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='paradas',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Paradas detectadas: inicio, fim, duracao_s, latitude, longitude', verbose_name='Paradas'),
+        ),
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='tempo_movimento_s',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Tempo em Movimento (s)'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_indices_paginacao_keyset'),
+        ('core', '0008_percurso_ot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PosicaoAtual',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='posicao_atual', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+                ('latitude', models.FloatField(verbose_name='Latitude')),
+                ('longitude', models.FloatField(verbose_name='Longitude')),
+                ('registrado_em', models.DateTimeField(db_index=True, help_text='Instante da leitura que originou a posição', verbose_name='Registrado em')),
+                ('origem', models.CharField(choices=[('RASTREAMENTO', 'Rastreamento GPS'), ('ATUALIZACAO', 'Atualização de OT'), ('TRANSFERENCIA', 'Transferência')], max_length=20, verbose_name='Origem')),
+                ('precisao', models.FloatField(blank=True, null=True, verbose_name='Precisão (m)')),
+                ('velocidade', models.FloatField(blank=True, null=True, verbose_name='Velocidade (m/s)')),
+                ('ordem_transporte', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.ordemtransporte', verbose_name='Ordem de Transporte')),
+            ],
+            options={
+                'verbose_name': 'Posição Atual',
+                'verbose_name_plural': 'Posições Atuais',
+            },
+        ),
+    ]
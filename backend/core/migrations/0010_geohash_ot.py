@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_posicaoatual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='geohash_entrega',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=8, verbose_name='Geohash de Entrega'),
+        ),
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='geohash_origem',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=8, verbose_name='Geohash de Origem'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Coordenadas em inteiro (1e-7 grau) - etapa 1 de 3: colunas novas
+#
+# As colunas *_e7 recebem os valores em 0012 e substituem as
+# DecimalField em 0013.
+
+import core.fields
+from django.db import migrations
+
+# (modelo, campo, verbose_name, limite, help_text)
+COORDENADAS = [
+    ('ordemtransporte', 'latitude_origem', 'Latitude de Origem', 90,
+     'Latitude do local de criação da OT (-90 a +90)'),
+    ('ordemtransporte', 'longitude_origem', 'Longitude de Origem', 180,
+     'Longitude do local de criação da OT (-180 a +180)'),
+    ('ordemtransporte', 'latitude_entrega', 'Latitude de Entrega', 90,
+     'Latitude do local de entrega (-90 a +90)'),
+    ('ordemtransporte', 'longitude_entrega', 'Longitude de Entrega', 180,
+     'Longitude do local de entrega (-180 a +180)'),
+    ('transferenciaot', 'latitude', 'Latitude', 90, ''),
+    ('transferenciaot', 'longitude', 'Longitude', 180, ''),
+    ('atualizacaoot', 'latitude', 'Latitude', 90, ''),
+    ('atualizacaoot', 'longitude', 'Longitude', 180, ''),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_geohash_ot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name=modelo,
+            name=f'{campo}_e7',
+            field=core.fields.CoordenadaField(
+                verbose_name, limite=limite, null=True, blank=True, help_text=help_text
+            ),
+        )
+        for modelo, campo, verbose_name, limite, help_text in COORDENADAS
+    ]
@@ -0,0 +1,75 @@
+# Coordenadas em inteiro (1e-7 grau) - etapa 2 de 3: cópia dos valores
+#
+# ⏰ Em lotes, cada um na sua transação (atomic = False): interromper e
+# rodar `migrate` de novo continua de onde parou, porque só as linhas com
+# a coluna nova vazia e a antiga preenchida são copiadas.
+
+from django.db import migrations, transaction
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast
+
+from core.fields import CoordenadaField
+
+LOTE = 2000
+
+CAMPOS = {
+    'ordemtransporte': ['latitude_origem', 'longitude_origem', 'latitude_entrega', 'longitude_entrega'],
+    'transferenciaot': ['latitude', 'longitude'],
+    'atualizacaoot': ['latitude', 'longitude'],
+}
+
+
+def _copiar(apps, de, para, escala=1):
+    """
+    Copia os campos `de(campo)` → `para(campo)` das linhas pendentes.
+
+    Os valores são lidos como float no próprio SQL (sem criar nem
+    validar Decimal) e divididos por `escala` — a coluna inteira guarda
+    1e-7 grau e o Cast não passa pelo from_db_value do campo.
+    """
+    for nome_modelo, campos in CAMPOS.items():
+        modelo = apps.get_model('core', nome_modelo)
+
+        pendentes = Q()
+        for campo in campos:
+            pendentes |= Q(**{f'{para(campo)}__isnull': True, f'{de(campo)}__isnull': False})
+        linhas = modelo.objects.filter(pendentes).order_by('pk')
+
+        valores = {f'_{campo}': Cast(de(campo), FloatField()) / escala for campo in campos}
+
+        ultimo_pk = 0
+        while True:
+            lote = list(
+                linhas.filter(pk__gt=ultimo_pk).annotate(**valores).values_list('pk', *valores)[:LOTE]
+            )
+            if not lote:
+                break
+
+            objetos = [
+                modelo(pk=pk, **{para(campo): valor for campo, valor in zip(campos, linha)})
+                for pk, *linha in lote
+            ]
+            with transaction.atomic():
+                modelo.objects.bulk_update(objetos, [para(campo) for campo in campos])
+            ultimo_pk = lote[-1][0]
+
+
+def copiar_para_inteiro(apps, schema_editor):
+    _copiar(apps, de=lambda campo: campo, para=lambda campo: f'{campo}_e7')
+
+
+def copiar_para_decimal(apps, schema_editor):
+    _copiar(apps, de=lambda campo: f'{campo}_e7', para=lambda campo: campo, escala=CoordenadaField.ESCALA)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0011_coordenadas_inteiras_campos'),
+    ]
+
+    operations = [
+        migrations.RunPython(copiar_para_inteiro, copiar_para_decimal),
+    ]
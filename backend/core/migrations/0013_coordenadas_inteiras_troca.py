@@ -0,0 +1,31 @@
+# Coordenadas em inteiro (1e-7 grau) - etapa 3 de 3: troca das colunas
+#
+# Remove as DecimalField e dá os nomes originais às colunas *_e7.
+
+from django.db import migrations
+
+CAMPOS = [
+    ('ordemtransporte', 'latitude_origem'),
+    ('ordemtransporte', 'longitude_origem'),
+    ('ordemtransporte', 'latitude_entrega'),
+    ('ordemtransporte', 'longitude_entrega'),
+    ('transferenciaot', 'latitude'),
+    ('transferenciaot', 'longitude'),
+    ('atualizacaoot', 'latitude'),
+    ('atualizacaoot', 'longitude'),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_coordenadas_inteiras_dados'),
+    ]
+
+    operations = [
+        migrations.RemoveField(model_name=modelo, name=campo)
+        for modelo, campo in CAMPOS
+    ] + [
+        migrations.RenameField(model_name=modelo, old_name=f'{campo}_e7', new_name=campo)
+        for modelo, campo in CAMPOS
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.1 on 2026-10-18 04:57
+
+from django.db import migrations, models
+from django.db.models import Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def preencher_status_alterado_em(apps, schema_editor):
+    """
+    status_alterado_em das OTs existentes: última atualização de STATUS
+    que levou a OT ao status atual; sem ela, a criação da OT.
+    """
+    OrdemTransporte = apps.get_model('core', 'OrdemTransporte')
+    AtualizacaoOT = apps.get_model('core', 'AtualizacaoOT')
+
+    entrada_no_status = AtualizacaoOT.objects.filter(
+        ordem_transporte=OuterRef('pk'),
+        tipo_atualizacao='STATUS',
+        status_novo=OuterRef('status'),
+    ).order_by().values('ordem_transporte').annotate(ultima=Max('data_criacao')).values('ultima')
+
+    OrdemTransporte.objects.filter(status_alterado_em__isnull=True).update(
+        status_alterado_em=Coalesce(Subquery(entrada_no_status), 'data_criacao')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_coordenadas_inteiras_troca'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='status_alterado_em',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Quando a OT entrou no status atual (base da previsão de entrega)', null=True, verbose_name='Status Alterado em'),
+        ),
+        migrations.CreateModel(
+            name='EstimativaETA',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('etapa', models.CharField(choices=[('INICIADA', 'Iniciada'), ('EM_CARREGAMENTO', 'Em Carregamento'), ('EM_TRANSITO', 'Em Trânsito'), ('ENTREGUE', 'Entregue'), ('ENTREGUE_PARCIAL', 'Entregue Parcialmente'), ('CANCELADA', 'Cancelada')], max_length=20, verbose_name='Etapa')),
+                ('tipo', models.CharField(choices=[('GLOBAL', 'Global'), ('CIDADE', 'Cidade de Entrega'), ('MOTORISTA', 'Motorista')], max_length=10, verbose_name='Tipo')),
+                ('chave', models.CharField(blank=True, help_text="Cidade normalizada, ID do motorista ou '' (global)", max_length=100, verbose_name='Chave')),
+                ('valor', models.FloatField(help_text='Segundos (GLOBAL/CIDADE) ou fator sobre a cidade (MOTORISTA)', verbose_name='Valor')),
+                ('amostras', models.PositiveIntegerField(help_text='Transições usadas no ajuste', verbose_name='Amostras')),
+                ('ajustado_em', models.DateTimeField(verbose_name='Ajustado em')),
+            ],
+            options={
+                'verbose_name': 'Estimativa de ETA',
+                'verbose_name_plural': 'Estimativas de ETA',
+                'ordering': ['etapa', 'tipo', 'chave'],
+                'constraints': [models.UniqueConstraint(fields=('etapa', 'tipo', 'chave'), name='estimativa_eta_unica')],
+            },
+        ),
+        migrations.RunPython(preencher_status_alterado_em, migrations.RunPython.noop),
+    ]
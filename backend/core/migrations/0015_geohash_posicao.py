@@ -0,0 +1,33 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+from core.geo import codificar_geohashes
+
+
+def preencher_geohash(apps, schema_editor):
+    """Geohash das posições existentes (uma linha por usuário: cabe em memória)."""
+    PosicaoAtual = apps.get_model('core', 'PosicaoAtual')
+    posicoes = list(PosicaoAtual.objects.only('pk', 'latitude', 'longitude'))
+    geohashes = codificar_geohashes(
+        [posicao.latitude for posicao in posicoes], [posicao.longitude for posicao in posicoes]
+    )
+    for posicao, geohash in zip(posicoes, geohashes):
+        posicao.geohash = geohash
+    PosicaoAtual.objects.bulk_update(posicoes, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_eta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='posicaoatual',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='Índice espacial da posição (busca de motoristas próximos)', max_length=8, verbose_name='Geohash'),
+        ),
+        migrations.RunPython(preencher_geohash, migrations.RunPython.noop),
+    ]
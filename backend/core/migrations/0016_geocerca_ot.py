@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:03
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_geohash_posicao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='geocerca_entrada_em',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Instante em que o motorista entrou na geocerca (vazio se fora)', null=True, verbose_name='Dentro da Geocerca desde'),
+        ),
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='raio_geocerca_m',
+            field=models.PositiveIntegerField(default=150, help_text='Distância do local de entrega que conta como chegada', validators=[django.core.validators.MinValueValidator(20), django.core.validators.MaxValueValidator(5000)], verbose_name='Raio da Geocerca (m)'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 05:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_geocerca_ot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ordemtransporte',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incrementada a cada alteração (ETag / If-Match na API)', verbose_name='Versão'),
+        ),
+        migrations.AddField(
+            model_name='transferenciaot',
+            name='versao',
+            field=models.PositiveIntegerField(default=1, editable=False, help_text='Incrementada a cada alteração (ETag / If-Match na API)', verbose_name='Versão'),
+        ),
+    ]
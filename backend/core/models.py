@@ -4,19 +4,94 @@
 # MODELOS DO CORE - SISTEMA DE ORDENS DE TRANSPORTE SIMPLIFICADO
 # ==============================================================================
 
-from django.db import models
+from django.db import models, transaction, IntegrityError
 from django.utils import timezone
-from django.core.validators import MinLengthValidator
+from django.core.validators import MaxValueValidator, MinLengthValidator, MinValueValidator
 from django.core.exceptions import ValidationError
 from accounts.models import CustomUser
+from logitrack_backend.tracing import get_tracer
+from .fields import CoordenadaField
+from .geo import PRECISAO_GEOHASH, codificar_geohash
 import uuid
 from datetime import datetime
 
+trace = get_tracer(__name__)
+
+# ==============================================================================
+# 🔒 CONCORRÊNCIA OTIMISTA (COLUNA DE VERSÃO)
+# ==============================================================================
+
+class ConflitoVersao(Exception):
+    """O registro foi alterado por outra operação desde que foi lido."""
+
+
+class ModeloVersionado(models.Model):
+    """
+    Base para modelos com controle de concorrência otimista.
+
+    🎯 PROPÓSITO: Dois atores salvando o mesmo registro (motorista
+    finalizando enquanto a logística cancela) não se sobrescrevem: o
+    segundo save() recebe ConflitoVersao em vez de gravar por cima.
+
+    📋 FUNCIONAMENTO:
+    - `versao` começa em 1 e sobe a cada save() de um registro existente
+    - O UPDATE do save() leva `AND versao = <versão lida>`; nenhuma linha
+      afetada com o registro ainda existente → ConflitoVersao
+    - Sem locks (select_for_update): a checagem é a própria escrita
+
+    ⚠️ UPDATEs diretos de estado mantido pelo sistema (percurso,
+    geocerca) não mudam a versão, para não gerar conflitos com o
+    rastreamento chegando.
+    """
+
+    versao = models.PositiveIntegerField(
+        'Versão',
+        default=1,
+        editable=False,
+        help_text='Incrementada a cada alteração (ETag / If-Match na API)'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        """Incrementa a versão e grava só se a versão lida ainda for a do banco."""
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'versao' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'versao']
+
+        self._versao_lida = self.versao
+        self.versao += 1
+        try:
+            super().save(*args, **kwargs)
+        except BaseException:
+            self.versao = self._versao_lida
+            raise
+        finally:
+            self._versao_lida = None
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        versao_lida = getattr(self, '_versao_lida', None)
+        if versao_lida is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+        if super()._do_update(base_qs.filter(versao=versao_lida), using, pk_val, values, update_fields, forced_update):
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise ConflitoVersao(
+                f'{self._meta.verbose_name} #{self.pk} foi alterada por outra operação (versão lida: {versao_lida})'
+            )
+        return False
+
+
 # ==============================================================================
 # 🚚 MODELO PRINCIPAL: ORDEM DE TRANSPORTE (CORRIGIDO PARA GPS)
 # ==============================================================================
 
-class OrdemTransporte(models.Model):
+class OrdemTransporte(ModeloVersionado):
     """
     Modelo principal para Ordens de Transporte (OT).
     
@@ -123,20 +198,19 @@ class OrdemTransporte(models.Model):
     # 🌍 LOCALIZAÇÃO (GPS) - CORRIGIDO PARA SUPORTAR COORDENADAS REAIS
     # ==============================================================================
     
+    # 📍 Coordenadas gravadas como inteiro em 1e-7 grau (CoordenadaField, core/fields.py)
     # Localização de Origem (onde a OT foi criada)
-    latitude_origem = models.DecimalField(
+    latitude_origem = CoordenadaField(
         'Latitude de Origem',
-        max_digits=18,         # 🔧 NOVO: Suporta até -XX.XXXXXXXXXXXXXXX (15 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=90,
         null=True,
         blank=True,
         help_text='Latitude do local de criação da OT (-90 a +90)'
     )
     
-    longitude_origem = models.DecimalField(
+    longitude_origem = CoordenadaField(
         'Longitude de Origem',
-        max_digits=17,         # 🔧 NOVO: Suporta até -XXX.XXXXXXXXXXXXXX (14 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=180,
         null=True,
         blank=True,
         help_text='Longitude do local de criação da OT (-180 a +180)'
@@ -150,19 +224,17 @@ class OrdemTransporte(models.Model):
     )
     
     # Localização de Entrega (onde foi finalizada)
-    latitude_entrega = models.DecimalField(
+    latitude_entrega = CoordenadaField(
         'Latitude de Entrega',
-        max_digits=18,         # 🔧 NOVO: Suporta até -XX.XXXXXXXXXXXXXXX (15 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=90,
         null=True,
         blank=True,
         help_text='Latitude do local de entrega (-90 a +90)'
     )
     
-    longitude_entrega = models.DecimalField(
+    longitude_entrega = CoordenadaField(
         'Longitude de Entrega',
-        max_digits=17,         # 🔧 NOVO: Suporta até -XXX.XXXXXXXXXXXXXX (14 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=180,
         null=True,
         blank=True,
         help_text='Longitude do local de entrega (-180 a +180)'
@@ -174,7 +246,87 @@ class OrdemTransporte(models.Model):
         blank=True,
         help_text='Endereço onde realmente foi entregue (geocoding reverso)'
     )
-    
+
+    # 🧭 Índice espacial: geohash das coordenadas, recalculado no save()
+    # (ver core/geo.py; backfill: python manage.py preencher_geohash)
+    CAMPOS_GEOHASH = {
+        'geohash_origem': ('latitude_origem', 'longitude_origem'),
+        'geohash_entrega': ('latitude_entrega', 'longitude_entrega'),
+    }
+
+    geohash_origem = models.CharField(
+        'Geohash de Origem',
+        max_length=PRECISAO_GEOHASH,
+        blank=True,
+        db_index=True,
+        editable=False
+    )
+
+    geohash_entrega = models.CharField(
+        'Geohash de Entrega',
+        max_length=PRECISAO_GEOHASH,
+        blank=True,
+        db_index=True,
+        editable=False
+    )
+
+    # ==============================================================================
+    # 📍 GEOCERCA DO LOCAL DE ENTREGA (ver core/geocercas.py)
+    # ==============================================================================
+
+    # Estado mantido por core.geocercas (UPDATE condicional); não editar à mão
+    CAMPOS_GEOCERCA = ('geocerca_entrada_em',)
+
+    raio_geocerca_m = models.PositiveIntegerField(
+        'Raio da Geocerca (m)',
+        default=150,
+        validators=[MinValueValidator(20), MaxValueValidator(5000)],
+        help_text='Distância do local de entrega que conta como chegada'
+    )
+
+    geocerca_entrada_em = models.DateTimeField(
+        'Dentro da Geocerca desde',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Instante em que o motorista entrou na geocerca (vazio se fora)'
+    )
+
+    # ==============================================================================
+    # 📏 PERCURSO (CALCULADO DO RASTREAMENTO GPS)
+    # ==============================================================================
+
+    # Mantidos por core.percurso a cada lote de pontos; não editar à mão
+    CAMPOS_PERCURSO = ('distancia_km', 'tempo_movimento_s', 'paradas', 'estado_percurso')
+
+    distancia_km = models.FloatField(
+        'Distância Percorrida (km)',
+        default=0,
+        editable=False
+    )
+
+    tempo_movimento_s = models.PositiveIntegerField(
+        'Tempo em Movimento (s)',
+        default=0,
+        editable=False
+    )
+
+    paradas = models.JSONField(
+        'Paradas',
+        default=list,
+        blank=True,
+        editable=False,
+        help_text='Paradas detectadas: inicio, fim, duracao_s, latitude, longitude'
+    )
+
+    estado_percurso = models.JSONField(
+        'Estado do Cálculo de Percurso',
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text='Até onde o rastreamento já foi processado (uso interno)'
+    )
+
     # ==============================================================================
     # DATAS E CONTROLE
     # ==============================================================================
@@ -198,6 +350,14 @@ class OrdemTransporte(models.Model):
         help_text='Data e hora de finalização da OT'
     )
     
+    status_alterado_em = models.DateTimeField(
+        'Status Alterado em',
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Quando a OT entrou no status atual (base da previsão de entrega)'
+    )
+    
     ativa = models.BooleanField(
         'Ativa',
         default=True,
@@ -216,7 +376,7 @@ class OrdemTransporte(models.Model):
             models.Index(fields=['numero_ot']),
             models.Index(fields=['status']),
             models.Index(fields=['motorista_atual']),
-            models.Index(fields=['-data_criacao']),
+            models.Index(fields=['-data_criacao', 'id']),  # Paginação keyset
         ]
     
     def __str__(self):
@@ -233,47 +393,133 @@ class OrdemTransporte(models.Model):
         1. Gerar número de OT automaticamente
         2. Definir motorista_atual como motorista_criador na criação
         3. Atualizar data_finalizacao quando finalizada
+
+        🔧 A reserva do número e o INSERT rodam na mesma transação,
+        então o contador diário fica travado só durante a criação.
+        📊 Os contadores materializados (ContadorStatusOT) são ajustados
+        na mesma transação quando status ou motorista_atual mudam.
         """
-        # Gerar número de OT se for nova
-        if not self.numero_ot:
-            self.numero_ot = self.gerar_numero_ot()
-        
-        # Se for nova OT, motorista_atual = motorista_criador
-        if not self.pk and not self.motorista_atual_id:
-            self.motorista_atual = self.motorista_criador
-        
-        # Atualizar data_finalizacao se status for final
-        if self.status in ['ENTREGUE', 'ENTREGUE_PARCIAL', 'CANCELADA']:
-            if not self.data_finalizacao:
-                self.data_finalizacao = timezone.now()
-        else:
-            self.data_finalizacao = None
-        
-        super().save(*args, **kwargs)
-    
+        with transaction.atomic():
+            # Gerar número de OT se for nova
+            if not self.numero_ot:
+                self.numero_ot = self.gerar_numero_ot()
+
+            # Se for nova OT, motorista_atual = motorista_criador
+            if not self.pk and not self.motorista_atual_id:
+                self.motorista_atual = self.motorista_criador
+
+            # Atualizar data_finalizacao se status for final
+            if self.status in ['ENTREGUE', 'ENTREGUE_PARCIAL', 'CANCELADA']:
+                if not self.data_finalizacao:
+                    self.data_finalizacao = timezone.now()
+            else:
+                self.data_finalizacao = None
+
+            # Geohash acompanha as coordenadas (inclusive em saves com update_fields)
+            update_fields = kwargs.get('update_fields')
+            for campo_geohash, coordenadas in self.CAMPOS_GEOHASH.items():
+                setattr(self, campo_geohash, codificar_geohash(*(getattr(self, c) for c in coordenadas)))
+                if update_fields is not None and set(coordenadas) & set(update_fields):
+                    kwargs['update_fields'] = update_fields = [*update_fields, campo_geohash]
+
+            estado_anterior = None if self._state.adding else self._get_estado_contador()
+
+            # Instante de entrada no status atual (ver core/eta.py)
+            grava_status = update_fields is None or 'status' in update_fields
+            if grava_status and (estado_anterior is None or estado_anterior[1] != self.status):
+                self.status_alterado_em = timezone.now()
+                if update_fields is not None and 'status_alterado_em' not in update_fields:
+                    kwargs['update_fields'] = update_fields = [*update_fields, 'status_alterado_em']
+
+            # Percurso e geocerca são gravados só por core.percurso e
+            # core.geocercas (UPDATE direto): um save() com a instância
+            # desatualizada não pode sobrescrevê-los
+            if not self._state.adding and kwargs.get('update_fields') is None:
+                kwargs['update_fields'] = [
+                    campo.name for campo in self._meta.concrete_fields
+                    if not campo.primary_key
+                    and campo.name not in self.CAMPOS_PERCURSO + self.CAMPOS_GEOCERCA
+                ]
+
+            super().save(*args, **kwargs)
+
+            estado_novo = self._estado_salvo(estado_anterior, kwargs.get('update_fields'))
+            ContadorStatusOT.registrar_mudanca(estado_anterior, estado_novo)
+            self._estado_contador = estado_novo
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Guarda (motorista_atual, status) lidos do banco para os contadores."""
+        instance = super().from_db(db, field_names, values)
+        if 'motorista_atual_id' in instance.__dict__ and 'status' in instance.__dict__:
+            instance._estado_contador = (instance.motorista_atual_id, instance.status)
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs):
+        """Recarrega a OT e sincroniza o estado usado pelos contadores."""
+        super().refresh_from_db(*args, **kwargs)
+        self._estado_contador = (self.motorista_atual_id, self.status)
+
+    def _get_estado_contador(self):
+        """
+        Retorna (motorista_atual_id, status) gravados no banco.
+
+        Usa o valor guardado no carregamento; só consulta o banco se a
+        instância não foi carregada por uma query completa.
+        """
+        estado = getattr(self, '_estado_contador', None)
+        if estado is None:
+            estado = OrdemTransporte.objects.filter(pk=self.pk).values_list(
+                'motorista_atual_id', 'status'
+            ).first()
+        return estado
+
+    def _estado_salvo(self, estado_anterior, update_fields):
+        """Retorna (motorista_atual_id, status) efetivamente gravados pelo save()."""
+        if update_fields is None or estado_anterior is None:
+            return (self.motorista_atual_id, self.status)
+
+        update_fields = set(update_fields)
+        motorista_id, status = estado_anterior
+        if update_fields & {'motorista_atual', 'motorista_atual_id'}:
+            motorista_id = self.motorista_atual_id
+        if 'status' in update_fields:
+            status = self.status
+        return (motorista_id, status)
+
     def gerar_numero_ot(self):
         """
         Gera número único para a OT.
-        Formato: OT + AAAAMMDD + XXXX (sequencial)
-        Exemplo: OT20250606001
+        Formato: OT + AAAAMMDD + XXX (sequencial, cresce além de 999)
+        Exemplo: OT20250606001, OT202506061000
+
+        🔧 Usa o contador diário SequenciaDiariaOT (UPDATE atômico),
+        seguro com vários workers criando OTs ao mesmo tempo.
+        """
+        return OrdemTransporte.gerar_numeros_ot(1)[0]
+
+    @classmethod
+    def gerar_numeros_ot(cls, quantidade):
+        """
+        Reserva `quantidade` números de OT do dia em uma única ida ao banco.
+
+        Usado na criação em lote (bulk_create), onde o save() não roda.
+
+        Args:
+            quantidade: Quantos números reservar
+
+        Returns:
+            list: Números de OT na ordem da sequência
         """
-        from django.db.models import Max
-        
         hoje = timezone.now().date()
-        prefixo = f"OT{hoje.strftime('%Y%m%d')}"
-        
-        # Buscar último número do dia
-        ultima_ot = OrdemTransporte.objects.filter(
-            numero_ot__startswith=prefixo
-        ).aggregate(Max('numero_ot'))['numero_ot__max']
-        
-        if ultima_ot:
-            ultimo_seq = int(ultima_ot[-3:])
-            novo_seq = ultimo_seq + 1
-        else:
-            novo_seq = 1
-        
-        return f"{prefixo}{novo_seq:03d}"
+        prefixo = cls.prefixo_numero_ot(hoje)
+        sequencias = SequenciaDiariaOT.reservar(hoje, quantidade)
+        return [f"{prefixo}{seq:03d}" for seq in sequencias]
+
+    @staticmethod
+    def prefixo_numero_ot(data):
+        """Retorna o prefixo dos números de OT de uma data (OTAAAAMMDD)."""
+        return f"OT{data.strftime('%Y%m%d')}"
 
     @property
     def pode_ser_editada(self):
@@ -364,53 +610,29 @@ class OrdemTransporte(models.Model):
         
         return novo_status in transicoes_validas.get(self.status, [])
     
-    def atualizar_status(self, novo_status, usuario, observacao=''):    
+    def atualizar_status(self, novo_status, usuario, observacao=''):
         """
         Atualiza o status da OT com validação e cria registro de atualização.
-        
+
+        Delega para core.transicoes.transicionar_status (UPDATE condicional
+        + histórico na mesma transação).
+
         Args:
             novo_status: Novo status desejado
             usuario: Usuário que está fazendo a atualização
             observacao: Observação sobre a mudança
-            
+
         Returns:
             bool: True se atualizado com sucesso
-            
+
         Raises:
             ValidationError: Se a transição não for válida
+            TransicaoConcorrente: Se a OT mudou desde a leitura
         """
-        print(f"🔄 ATUALIZAR STATUS: {self.numero_ot}")
-        print(f"🔄 Status atual: {self.status}")
-        print(f"🔄 Novo status: {novo_status}")
-        
-        # 🔧 CORREÇÃO: Capturar status anterior ANTES de validar/alterar
-        status_anterior = self.status
-        
-        # Validar transição
-        if not self.pode_transicionar_para(novo_status):
-            raise ValidationError(
-                f'Não é possível transicionar de {self.get_status_display()} para {dict(self.STATUS_CHOICES)[novo_status]}'
-            )
-        
-        # 🔧 CORREÇÃO: Atualizar status APENAS após validação
-        self.status = novo_status
-        self.save()
-        
-        print(f"✅ Status atualizado: {status_anterior} → {novo_status}")
-        
-        # 🔧 CORREÇÃO: Usar status_anterior capturado e novo_status real
-        # Criar registro de atualização
-        AtualizacaoOT.objects.create(
-            ordem_transporte=self,
-            usuario=usuario,
-            tipo_atualizacao='STATUS',
-            descricao=f'Status alterado para {self.get_status_display()}',
-            observacao=observacao,
-            status_anterior=status_anterior,  # ✅ Status anterior correto
-            status_novo=novo_status           # ✅ Status novo correto
-        )
-        
-        print(f"📝 Atualização registrada: {status_anterior} → {novo_status}")
+        from .transicoes import transicionar_status  # transicoes depende deste módulo
+
+        trace.debug("🔄 ATUALIZAR STATUS: %s (%s → %s)", self.numero_ot, self.status, novo_status)
+        transicionar_status(self, novo_status, usuario, observacao)
         return True
     
     def transferir_para(self, novo_motorista, usuario_solicitante, motivo=''):
@@ -436,52 +658,53 @@ class OrdemTransporte(models.Model):
         # Determinar status inicial baseado em quem está transferindo
         if usuario_solicitante.role in ['logistica', 'admin']:
             # Logística/Admin podem transferir diretamente
-            print(f"🔄 Transferência por logística/admin - aprovação automática")
+            trace.debug("🔄 Transferência por logística/admin - aprovação automática")
             status_inicial = 'APROVADA'
             aprovado_por = usuario_solicitante
             data_resposta = timezone.now()
             
         elif usuario_solicitante == self.motorista_atual:
             # Motorista atual transfere - aguarda aceitação do destino
-            print(f"🔄 Transferência direta - aguardando aceitação do motorista destino")
+            trace.debug("🔄 Transferência direta - aguardando aceitação do motorista destino")
             status_inicial = 'AGUARDANDO_ACEITACAO'
             aprovado_por = None
             data_resposta = None
             
         else:
             # Outro motorista solicita - aguarda aprovação da logística
-            print(f"🔄 Solicitação de transferência - aguarda aprovação da logística")
+            trace.debug("🔄 Solicitação de transferência - aguarda aprovação da logística")
             status_inicial = 'PENDENTE'
             aprovado_por = None
             data_resposta = None
         
-        # Criar registro de transferência
-        transferencia = TransferenciaOT.objects.create(
-            ordem_transporte=self,
-            motorista_origem=self.motorista_atual,
-            motorista_destino=novo_motorista,
-            solicitado_por=usuario_solicitante,
-            aprovado_por=aprovado_por,
-            motivo=motivo,
-            status=status_inicial,
-            data_resposta=data_resposta
-        )
-        
-        # Se for aprovação automática (logística/admin), atualizar OT imediatamente
-        if status_inicial == 'APROVADA':
-            self.motorista_atual = novo_motorista
-            self.save(update_fields=['motorista_atual'])
-            
-            # Criar registro de atualização
-            AtualizacaoOT.objects.create(
+        # Transferência e troca de motorista juntas (conflito de versão desfaz as duas)
+        with transaction.atomic():
+            transferencia = TransferenciaOT.objects.create(
                 ordem_transporte=self,
-                usuario=usuario_solicitante,
-                tipo_atualizacao='TRANSFERENCIA',
-                descricao=f'OT transferida de {transferencia.motorista_origem.full_name} para {transferencia.motorista_destino.full_name}',
-                observacao=f'{motivo} (Aprovada automaticamente por {usuario_solicitante.role})'
+                motorista_origem=self.motorista_atual,
+                motorista_destino=novo_motorista,
+                solicitado_por=usuario_solicitante,
+                aprovado_por=aprovado_por,
+                motivo=motivo,
+                status=status_inicial,
+                data_resposta=data_resposta
             )
-        
-        print(f"✅ Transferência criada com status: {status_inicial}")
+            
+            # Se for aprovação automática (logística/admin), atualizar OT imediatamente
+            if status_inicial == 'APROVADA':
+                self.motorista_atual = novo_motorista
+                self.save(update_fields=['motorista_atual'])
+                
+                # Criar registro de atualização
+                AtualizacaoOT.objects.create(
+                    ordem_transporte=self,
+                    usuario=usuario_solicitante,
+                    tipo_atualizacao='TRANSFERENCIA',
+                    descricao=f'OT transferida de {transferencia.motorista_origem.full_name} para {transferencia.motorista_destino.full_name}',
+                    observacao=f'{motivo} (Aprovada automaticamente por {usuario_solicitante.role})'
+                )
+        
+        trace.debug("✅ Transferência criada com status: %s", status_inicial)
         return transferencia
     
     def adicionar_arquivo(self, arquivo, tipo, usuario, descricao=''):
@@ -620,7 +843,7 @@ class Arquivo(models.Model):
 # 🔄 MODELO DE TRANSFERÊNCIAS ENTRE MOTORISTAS
 # ==============================================================================
 
-class TransferenciaOT(models.Model):
+class TransferenciaOT(ModeloVersionado):
     """
     Modelo para transferências de OT entre motoristas.
     
@@ -703,18 +926,16 @@ class TransferenciaOT(models.Model):
     )
     
     # 🌍 LOCALIZAÇÃO DA TRANSFERÊNCIA (GPS CORRIGIDO)
-    latitude = models.DecimalField(
+    latitude = CoordenadaField(
         'Latitude',
-        max_digits=18,         # 🔧 NOVO: Suporta até -XX.XXXXXXXXXXXXXXX (15 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=90,
         null=True,
         blank=True,
     )
     
-    longitude = models.DecimalField(
+    longitude = CoordenadaField(
         'Longitude',
-        max_digits=17,         # 🔧 NOVO: Suporta até -XXX.XXXXXXXXXXXXXX (14 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=180,
         null=True,
         blank=True,
     )
@@ -729,6 +950,9 @@ class TransferenciaOT(models.Model):
         verbose_name = 'Transferência de OT'
         verbose_name_plural = 'Transferências de OT'
         ordering = ['-data_solicitacao']
+        indexes = [
+            models.Index(fields=['-data_solicitacao', 'id']),  # Paginação keyset
+        ]
     
     def __str__(self):
         return f'Transferência OT {self.ordem_transporte.numero_ot}: {self.motorista_origem} → {self.motorista_destino} ({self.get_status_display()})'
@@ -744,7 +968,7 @@ class TransferenciaOT(models.Model):
         Raises:
             ValidationError: Se não pode aceitar
         """
-        print(f"✅ ACEITAR TRANSFERENCIA: {self.id}")
+        trace.debug("✅ ACEITAR TRANSFERENCIA: %s", self.id)
         
         # Validações
         if self.status != 'AGUARDANDO_ACEITACAO':
@@ -758,22 +982,25 @@ class TransferenciaOT(models.Model):
         self.aprovado_por = usuario_aceitador
         self.data_resposta = timezone.now()
         self.observacao_aprovacao = observacao or 'Transferência aceita pelo motorista de destino'
-        self.save()
-        
-        # Atualizar motorista atual da OT
-        self.ordem_transporte.motorista_atual = self.motorista_destino
-        self.ordem_transporte.save()
         
-        # Criar registro de atualização
-        AtualizacaoOT.objects.create(
-            ordem_transporte=self.ordem_transporte,
-            usuario=usuario_aceitador,
-            tipo_atualizacao='TRANSFERENCIA',
-            descricao=f'Transferência aceita: OT passou de {self.motorista_origem.full_name} para {self.motorista_destino.full_name}',
-            observacao=self.observacao_aprovacao
-        )
+        # Transferência e OT na mesma transação
+        with transaction.atomic():
+            self.save()
+            
+            # Atualizar motorista atual da OT
+            self.ordem_transporte.motorista_atual = self.motorista_destino
+            self.ordem_transporte.save(update_fields=['motorista_atual', 'data_atualizacao'])
+            
+            # Criar registro de atualização
+            AtualizacaoOT.objects.create(
+                ordem_transporte=self.ordem_transporte,
+                usuario=usuario_aceitador,
+                tipo_atualizacao='TRANSFERENCIA',
+                descricao=f'Transferência aceita: OT passou de {self.motorista_origem.full_name} para {self.motorista_destino.full_name}',
+                observacao=self.observacao_aprovacao
+            )
         
-        print(f"✅ Transferência {self.id} aceita com sucesso")
+        trace.debug("✅ Transferência %s aceita com sucesso", self.id)
     
     def recusar(self, usuario_recusador, observacao):
         """
@@ -786,7 +1013,7 @@ class TransferenciaOT(models.Model):
         Raises:
             ValidationError: Se não pode recusar
         """
-        print(f"❌ RECUSAR TRANSFERENCIA: {self.id}")
+        trace.debug("❌ RECUSAR TRANSFERENCIA: %s", self.id)
         
         # Validações
         if self.status != 'AGUARDANDO_ACEITACAO':
@@ -807,7 +1034,7 @@ class TransferenciaOT(models.Model):
         
         # OT continua com motorista original (não alterar motorista_atual)
         
-        print(f"❌ Transferência {self.id} recusada")
+        trace.debug("❌ Transferência %s recusada", self.id)
     
     def cancelar(self, usuario_cancelador, observacao=''):
         """
@@ -820,7 +1047,7 @@ class TransferenciaOT(models.Model):
         Raises:
             ValidationError: Se não pode cancelar
         """
-        print(f"🚫 CANCELAR TRANSFERENCIA: {self.id}")
+        trace.debug("🚫 CANCELAR TRANSFERENCIA: %s", self.id)
         
         # Validações
         if self.status not in ['PENDENTE', 'AGUARDANDO_ACEITACAO']:
@@ -845,7 +1072,7 @@ class TransferenciaOT(models.Model):
         
         # OT continua com motorista original (não alterar motorista_atual)
         
-        print(f"🚫 Transferência {self.id} cancelada")
+        trace.debug("🚫 Transferência %s cancelada", self.id)
     
     # ==============================================================================
     # 🔧 MÉTODOS EXISTENTES MANTIDOS E MELHORADOS
@@ -859,7 +1086,7 @@ class TransferenciaOT(models.Model):
             usuario_aprovador: Usuário que está aprovando (logística/admin)
             observacao: Observação sobre a aprovação
         """
-        print(f"✅ APROVAR TRANSFERENCIA LOGISTICA: {self.id}")
+        trace.debug("✅ APROVAR TRANSFERENCIA LOGISTICA: %s", self.id)
         
         if self.status != 'PENDENTE':
             raise ValidationError(f'Apenas transferências pendentes podem ser aprovadas pela logística. Status atual: {self.status}')
@@ -871,22 +1098,25 @@ class TransferenciaOT(models.Model):
         self.aprovado_por = usuario_aprovador
         self.data_resposta = timezone.now()
         self.observacao_aprovacao = observacao or 'Aprovada pela logística'
-        self.save()
         
-        # Atualizar motorista_atual da OT
-        self.ordem_transporte.motorista_atual = self.motorista_destino
-        self.ordem_transporte.save()
-        
-        # Criar registro de atualização
-        AtualizacaoOT.objects.create(
-            ordem_transporte=self.ordem_transporte,
-            usuario=usuario_aprovador,
-            tipo_atualizacao='TRANSFERENCIA',
-            descricao=f'Transferência aprovada pela logística: {self.motorista_origem.full_name} → {self.motorista_destino.full_name}',
-            observacao=self.observacao_aprovacao
-        )
+        # Transferência e OT na mesma transação
+        with transaction.atomic():
+            self.save()
+            
+            # Atualizar motorista_atual da OT
+            self.ordem_transporte.motorista_atual = self.motorista_destino
+            self.ordem_transporte.save(update_fields=['motorista_atual', 'data_atualizacao'])
+            
+            # Criar registro de atualização
+            AtualizacaoOT.objects.create(
+                ordem_transporte=self.ordem_transporte,
+                usuario=usuario_aprovador,
+                tipo_atualizacao='TRANSFERENCIA',
+                descricao=f'Transferência aprovada pela logística: {self.motorista_origem.full_name} → {self.motorista_destino.full_name}',
+                observacao=self.observacao_aprovacao
+            )
         
-        print(f"✅ Transferência {self.id} aprovada pela logística")
+        trace.debug("✅ Transferência %s aprovada pela logística", self.id)
     
     def rejeitar(self, usuario_rejeitador, observacao):
         """
@@ -896,7 +1126,7 @@ class TransferenciaOT(models.Model):
             usuario_rejeitador: Usuário que está rejeitando (logística/admin)
             observacao: Motivo da rejeição (obrigatório)
         """
-        print(f"❌ REJEITAR TRANSFERENCIA LOGISTICA: {self.id}")
+        trace.debug("❌ REJEITAR TRANSFERENCIA LOGISTICA: %s", self.id)
         
         if self.status != 'PENDENTE':
             raise ValidationError(f'Apenas transferências pendentes podem ser rejeitadas pela logística. Status atual: {self.status}')
@@ -913,7 +1143,7 @@ class TransferenciaOT(models.Model):
         self.observacao_aprovacao = observacao
         self.save()
         
-        print(f"❌ Transferência {self.id} rejeitada pela logística")
+        trace.debug("❌ Transferência %s rejeitada pela logística", self.id)
     
     # ==============================================================================
     # 🔍 MÉTODOS DE VERIFICAÇÃO
@@ -1047,18 +1277,16 @@ class AtualizacaoOT(models.Model):
     )
     
     # 🌍 LOCALIZAÇÃO NO MOMENTO DA ATUALIZAÇÃO (GPS CORRIGIDO)
-    latitude = models.DecimalField(
+    latitude = CoordenadaField(
         'Latitude',
-        max_digits=18,         # 🔧 NOVO: Suporta até -XX.XXXXXXXXXXXXXXX (15 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=90,
         null=True,
         blank=True,
     )
     
-    longitude = models.DecimalField(
+    longitude = CoordenadaField(
         'Longitude',
-        max_digits=17,         # 🔧 NOVO: Suporta até -XXX.XXXXXXXXXXXXXX (14 decimais)
-        decimal_places=15,     # 🔧 NOVO: Precisão submilimétrica
+        limite=180,
         null=True,
         blank=True,
     )
@@ -1084,13 +1312,494 @@ class AtualizacaoOT(models.Model):
         return f'{self.get_tipo_atualizacao_display()} - OT {self.ordem_transporte.numero_ot}'
 
 
+# ==============================================================================
+# 🔢 SEQUÊNCIA DIÁRIA DE NÚMEROS DE OT
+# ==============================================================================
+
+class SequenciaDiariaOT(models.Model):
+    """
+    Contador de números de OT por dia.
+
+    🎯 PROPÓSITO: Gerar numero_ot sem varrer a tabela de OTs
+    🔒 CONCORRÊNCIA: O incremento é um UPDATE atômico na linha do dia,
+    que trava a linha até o fim da transação de criação da OT.
+    """
+
+    data = models.DateField(
+        'Data',
+        unique=True,
+        help_text='Dia ao qual o contador pertence'
+    )
+
+    ultimo_numero = models.PositiveIntegerField(
+        'Último Número',
+        default=0,
+        help_text='Último sequencial reservado no dia'
+    )
+
+    class Meta:
+        verbose_name = 'Sequência Diária de OT'
+        verbose_name_plural = 'Sequências Diárias de OT'
+        ordering = ['-data']
+
+    def __str__(self):
+        return f'{self.data:%d/%m/%Y}: {self.ultimo_numero}'
+
+    @classmethod
+    def reservar(cls, data, quantidade=1):
+        """
+        Reserva um bloco de sequenciais para o dia.
+
+        Args:
+            data: Dia da sequência
+            quantidade: Quantos sequenciais reservar
+
+        Returns:
+            range: Sequenciais reservados (ex: range(4, 7) para 3 números)
+        """
+        if quantidade < 1:
+            raise ValueError('A quantidade de números reservados deve ser positiva')
+
+        with transaction.atomic():
+            atualizados = cls.objects.filter(data=data).update(
+                ultimo_numero=models.F('ultimo_numero') + quantidade
+            )
+
+            if not atualizados:
+                # Primeira OT do dia: criar a linha do contador
+                inicial = cls._ultimo_numero_existente(data)
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(data=data, ultimo_numero=inicial + quantidade)
+                    return range(inicial + 1, inicial + quantidade + 1)
+                except IntegrityError:
+                    # Outro processo criou a linha primeiro - incrementar a dele
+                    cls.objects.filter(data=data).update(
+                        ultimo_numero=models.F('ultimo_numero') + quantidade
+                    )
+
+            ultimo = cls.objects.filter(data=data).values_list('ultimo_numero', flat=True).get()
+
+        return range(ultimo - quantidade + 1, ultimo + 1)
+
+    @staticmethod
+    def _ultimo_numero_existente(data):
+        """
+        Maior sequencial já usado no dia antes de existir o contador.
+
+        Só roda uma vez por dia (na criação da linha), para continuar a
+        numeração de OTs criadas antes da sequência existir.
+        """
+        prefixo = OrdemTransporte.prefixo_numero_ot(data)
+        numeros = OrdemTransporte.objects.filter(
+            numero_ot__startswith=prefixo
+        ).values_list('numero_ot', flat=True)
+
+        return max(
+            (int(numero[len(prefixo):]) for numero in numeros if numero[len(prefixo):].isdigit()),
+            default=0
+        )
+
+
+# ==============================================================================
+# 📊 CONTADORES MATERIALIZADOS DE OTs POR STATUS
+# ==============================================================================
+
+class ContadorStatusOT(models.Model):
+    """
+    Quantidade de OTs por (motorista_atual, status).
+
+    🎯 PROPÓSITO: Estatísticas do dashboard sem varrer a tabela de OTs
+    📋 LINHAS:
+    - motorista preenchido → OTs do motorista naquele status
+    - motorista vazio → linha global do status (todas as OTs)
+
+    Mantido por OrdemTransporte.save() e pelo sinal de exclusão.
+    Recalcule com: python manage.py recalcular_contadores_ot
+    """
+
+    motorista = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='contadores_ot',
+        verbose_name='Motorista',
+        null=True,
+        blank=True,
+        help_text='Motorista atual das OTs (vazio = contador global)'
+    )
+
+    status = models.CharField(
+        'Status',
+        max_length=20,
+        choices=OrdemTransporte.STATUS_CHOICES
+    )
+
+    quantidade = models.IntegerField(
+        'Quantidade',
+        default=0
+    )
+
+    class Meta:
+        verbose_name = 'Contador de OTs por Status'
+        verbose_name_plural = 'Contadores de OTs por Status'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['motorista', 'status'],
+                condition=models.Q(motorista__isnull=False),
+                name='contador_ot_motorista_status_unico'
+            ),
+            models.UniqueConstraint(
+                fields=['status'],
+                condition=models.Q(motorista__isnull=True),
+                name='contador_ot_global_status_unico'
+            ),
+        ]
+
+    def __str__(self):
+        dono = self.motorista_id or 'global'
+        return f'{dono} - {self.status}: {self.quantidade}'
+
+    @classmethod
+    def registrar_mudanca(cls, antes, depois):
+        """
+        Ajusta os contadores para uma OT que mudou de estado.
+
+        Args:
+            antes: (motorista_id, status) anterior, ou None se a OT é nova
+            depois: (motorista_id, status) atual, ou None se a OT foi excluída
+        """
+        if antes == depois:
+            return
+
+        if antes is not None:
+            cls.incrementar(antes[0], antes[1], -1)
+        if depois is not None:
+            cls.incrementar(depois[0], depois[1], 1)
+
+        status_antes = antes[1] if antes else None
+        status_depois = depois[1] if depois else None
+        if status_antes != status_depois:
+            if status_antes is not None:
+                cls.incrementar(None, status_antes, -1)
+            if status_depois is not None:
+                cls.incrementar(None, status_depois, 1)
+
+    @classmethod
+    def incrementar(cls, motorista_id, status, delta):
+        """
+        Soma `delta` ao contador (motorista_id, status) com UPDATE atômico.
+
+        Cria a linha se ela ainda não existe; decrementos em linhas
+        ausentes são ignorados (o recálculo corrige o desvio).
+        """
+        if not delta:
+            return
+
+        contador = cls.objects.filter(motorista_id=motorista_id, status=status)
+        if contador.update(quantidade=models.F('quantidade') + delta) or delta < 0:
+            return
+
+        try:
+            with transaction.atomic():
+                cls.objects.create(motorista_id=motorista_id, status=status, quantidade=delta)
+        except IntegrityError:
+            # Outro processo criou a linha primeiro
+            contador.update(quantidade=models.F('quantidade') + delta)
+
+
+# ==============================================================================
+# 📍 RASTREAMENTO GPS (BREADCRUMBS)
+# ==============================================================================
+
+class PontoRastreamento(models.Model):
+    """
+    Ponto de GPS enviado pelo app durante a viagem.
+
+    🎯 PROPÓSITO: Rastreamento contínuo do motorista, recebido em lotes
+    💾 COMPACTO: Coordenadas em float e nenhuma AtualizacaoOT por ponto;
+    a timeline continua registrando só os eventos da OT.
+
+    Gravado por core.rastreamento.registrar_pontos (bulk_create).
+    """
+
+    ordem_transporte = models.ForeignKey(
+        OrdemTransporte,
+        on_delete=models.CASCADE,
+        related_name='pontos_rastreamento',
+        verbose_name='Ordem de Transporte',
+        db_index=False  # Coberto pelo índice (ordem_transporte, registrado_em)
+    )
+
+    motorista = models.ForeignKey(
+        CustomUser,
+        on_delete=models.PROTECT,
+        related_name='pontos_rastreamento',
+        verbose_name='Motorista'
+    )
+
+    latitude = models.FloatField('Latitude')
+
+    longitude = models.FloatField('Longitude')
+
+    registrado_em = models.DateTimeField(
+        'Registrado em',
+        help_text='Instante da leitura no aparelho'
+    )
+
+    precisao = models.FloatField(
+        'Precisão (m)',
+        null=True,
+        blank=True,
+        help_text='Raio de precisão informado pelo GPS, em metros'
+    )
+
+    velocidade = models.FloatField(
+        'Velocidade (m/s)',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Ponto de Rastreamento'
+        verbose_name_plural = 'Pontos de Rastreamento'
+        ordering = ['registrado_em']
+        indexes = [
+            models.Index(fields=['ordem_transporte', 'registrado_em'], name='ponto_ot_registro_idx'),
+        ]
+
+    def __str__(self):
+        return f'OT {self.ordem_transporte_id} @ {self.registrado_em:%d/%m/%Y %H:%M:%S}'
+
+
+class SegmentoRastreamento(models.Model):
+    """
+    Bloco compactado de pontos de GPS de uma OT.
+
+    🎯 PROPÓSITO: Armazenamento de longo prazo do rastreamento
+    💾 FORMATO: Timestamps e coordenadas (microgrados inteiros) codificados
+    em delta + varint em um único blob (ver core/compactacao.py)
+
+    Criado pelo comando compactar_rastreamento a partir dos
+    PontoRastreamento antigos, que são então removidos.
+    """
+
+    ordem_transporte = models.ForeignKey(
+        OrdemTransporte,
+        on_delete=models.CASCADE,
+        related_name='segmentos_rastreamento',
+        verbose_name='Ordem de Transporte',
+        db_index=False  # Coberto pelo índice (ordem_transporte, inicio)
+    )
+
+    motorista = models.ForeignKey(
+        CustomUser,
+        on_delete=models.PROTECT,
+        related_name='segmentos_rastreamento',
+        verbose_name='Motorista'
+    )
+
+    inicio = models.DateTimeField(
+        'Início',
+        help_text='Instante do primeiro ponto do segmento'
+    )
+
+    fim = models.DateTimeField(
+        'Fim',
+        help_text='Instante do último ponto do segmento'
+    )
+
+    quantidade = models.PositiveIntegerField(
+        'Quantidade de Pontos'
+    )
+
+    formato = models.PositiveSmallIntegerField(
+        'Formato',
+        default=1,
+        help_text='Versão da codificação do blob'
+    )
+
+    dados = models.BinaryField(
+        'Dados',
+        help_text='Pontos codificados (delta + varint)'
+    )
+
+    class Meta:
+        verbose_name = 'Segmento de Rastreamento'
+        verbose_name_plural = 'Segmentos de Rastreamento'
+        ordering = ['inicio']
+        indexes = [
+            models.Index(fields=['ordem_transporte', 'inicio'], name='segmento_ot_inicio_idx'),
+        ]
+
+    def __str__(self):
+        return f'OT {self.ordem_transporte_id}: {self.quantidade} pontos desde {self.inicio:%d/%m/%Y %H:%M}'
+
+
+class PosicaoAtual(models.Model):
+    """
+    Última posição conhecida de cada usuário (uma linha por usuário).
+
+    🎯 PROPÓSITO: Ler a frota ao vivo com uma varredura indexada, sem
+    procurar o último ponto de cada motorista no rastreamento.
+
+    🔄 ATUALIZADA POR: lotes de rastreamento, atualizações de OT com
+    coordenadas (criação, status, entrega) e transferências com
+    localização — sempre via core.posicoes.atualizar_posicao, que só
+    avança a posição (eventos atrasados não sobrescrevem os mais novos).
+
+    📍 O geohash da posição é gravado junto e indexado (motoristas
+    próximos, ver core.posicoes.motoristas_proximos).
+    """
+
+    ORIGEM_CHOICES = [
+        ('RASTREAMENTO', 'Rastreamento GPS'),
+        ('ATUALIZACAO', 'Atualização de OT'),
+        ('TRANSFERENCIA', 'Transferência'),
+    ]
+
+    usuario = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='posicao_atual',
+        verbose_name='Usuário'
+    )
+
+    latitude = models.FloatField('Latitude')
+
+    longitude = models.FloatField('Longitude')
+
+    geohash = models.CharField(
+        'Geohash',
+        max_length=PRECISAO_GEOHASH,
+        blank=True,
+        db_index=True,
+        editable=False,
+        help_text='Índice espacial da posição (busca de motoristas próximos)'
+    )
+
+    registrado_em = models.DateTimeField(
+        'Registrado em',
+        db_index=True,
+        help_text='Instante da leitura que originou a posição'
+    )
+
+    origem = models.CharField(
+        'Origem',
+        max_length=20,
+        choices=ORIGEM_CHOICES
+    )
+
+    ordem_transporte = models.ForeignKey(
+        OrdemTransporte,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Ordem de Transporte'
+    )
+
+    precisao = models.FloatField(
+        'Precisão (m)',
+        null=True,
+        blank=True
+    )
+
+    velocidade = models.FloatField(
+        'Velocidade (m/s)',
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Posição Atual'
+        verbose_name_plural = 'Posições Atuais'
+
+    def __str__(self):
+        return f'{self.usuario_id} @ {self.registrado_em:%d/%m/%Y %H:%M:%S}'
+
+
+class EstimativaETA(models.Model):
+    """
+    Tabela de consulta da previsão de entrega (uma linha por etapa e chave).
+
+    🎯 PROPÓSITO: Servir a ETA de uma OT com uma leitura em memória, sem
+    varrer o histórico de status a cada requisição.
+
+    📋 TIPOS:
+    - GLOBAL: mediana da duração da etapa em todas as OTs (chave '')
+    - CIDADE: mediana por cidade de entrega, já puxada para a global
+      quando há poucas amostras (chave = cidade normalizada)
+    - MOTORISTA: fator multiplicativo do motorista sobre a base da
+      cidade (chave = ID do motorista)
+
+    🔄 GERADA POR: python manage.py ajustar_eta (substitui a tabela inteira)
+    """
+
+    TIPO_CHOICES = [
+        ('GLOBAL', 'Global'),
+        ('CIDADE', 'Cidade de Entrega'),
+        ('MOTORISTA', 'Motorista'),
+    ]
+
+    etapa = models.CharField(
+        'Etapa',
+        max_length=20,
+        choices=OrdemTransporte.STATUS_CHOICES
+    )
+
+    tipo = models.CharField(
+        'Tipo',
+        max_length=10,
+        choices=TIPO_CHOICES
+    )
+
+    chave = models.CharField(
+        'Chave',
+        max_length=100,
+        blank=True,
+        help_text="Cidade normalizada, ID do motorista ou '' (global)"
+    )
+
+    valor = models.FloatField(
+        'Valor',
+        help_text='Segundos (GLOBAL/CIDADE) ou fator sobre a cidade (MOTORISTA)'
+    )
+
+    amostras = models.PositiveIntegerField(
+        'Amostras',
+        help_text='Transições usadas no ajuste'
+    )
+
+    ajustado_em = models.DateTimeField(
+        'Ajustado em'
+    )
+
+    class Meta:
+        verbose_name = 'Estimativa de ETA'
+        verbose_name_plural = 'Estimativas de ETA'
+        ordering = ['etapa', 'tipo', 'chave']
+        constraints = [
+            models.UniqueConstraint(fields=['etapa', 'tipo', 'chave'], name='estimativa_eta_unica'),
+        ]
+
+    def __str__(self):
+        return f'{self.etapa} / {self.tipo} {self.chave}: {self.valor:.2f}'
+
+
 # ==============================================================================
 # 🎯 SINAIS (SIGNALS) - Para automatizações
 # ==============================================================================
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from .geocercas import afeta_geocercas, invalidar_geocercas
+from .mapa_calor import invalidar_tiles
+from .percurso import finalizar_percurso
+from .posicoes import atualizar_posicao
+from .search import CAMPOS_BUSCA, indexar_ot, remover_ot
+
 @receiver(post_save, sender=OrdemTransporte)
 def criar_atualizacao_inicial(sender, instance, created, **kwargs):
     """
@@ -1109,3 +1818,100 @@ def criar_atualizacao_inicial(sender, instance, created, **kwargs):
             endereco=instance.endereco_origem
         )
 
+
+@receiver(post_delete, sender=OrdemTransporte)
+def descontar_ot_excluida(sender, instance, **kwargs):
+    """
+    Remove a OT excluída dos contadores materializados.
+    """
+    estado = getattr(instance, '_estado_contador', None) or (instance.motorista_atual_id, instance.status)
+    ContadorStatusOT.registrar_mudanca(estado, None)
+
+
+@receiver(post_save, sender=OrdemTransporte)
+def indexar_ot_busca(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Mantém o índice de busca textual em dia com a OT salva.
+
+    Saves com update_fields que não tocam campos buscáveis não reindexam.
+    """
+    if created or update_fields is None or set(update_fields) & set(CAMPOS_BUSCA):
+        indexar_ot(instance)
+
+
+@receiver(post_delete, sender=OrdemTransporte)
+def remover_ot_busca(sender, instance, **kwargs):
+    """
+    Remove a OT excluída do índice de busca textual.
+    """
+    remover_ot(instance.pk)
+
+
+@receiver(post_save, sender=OrdemTransporte)
+def fechar_percurso(sender, instance, created, **kwargs):
+    """
+    Fecha as métricas de percurso quando a OT é finalizada.
+
+    Processa os últimos pontos (ainda pendentes) e a parada em aberto.
+    """
+    if created or not instance.esta_finalizada or (instance.estado_percurso or {}).get('final'):
+        return
+
+    for campo, valor in finalizar_percurso(instance.pk).items():
+        setattr(instance, campo, valor)
+
+
+@receiver(post_save, sender=OrdemTransporte)
+@receiver(post_delete, sender=OrdemTransporte)
+def invalidar_mapa_calor(sender, instance, **kwargs):
+    """
+    OT com coordenadas de entrega (finalizada, alterada ou excluída)
+    invalida os tiles do mapa de calor que contêm o ponto.
+    """
+    if instance.latitude_entrega is not None and instance.longitude_entrega is not None:
+        invalidar_tiles(instance.latitude_entrega, instance.longitude_entrega)
+
+
+@receiver(post_save, sender=OrdemTransporte)
+def atualizar_geocercas(sender, instance, update_fields=None, **kwargs):
+    """
+    OT que ganha, perde ou muda a cerca do local de entrega (status,
+    motorista, coordenadas, raio) troca a versão do índice de geocercas.
+    """
+    if afeta_geocercas(instance, update_fields):
+        invalidar_geocercas()
+
+
+@receiver(post_delete, sender=OrdemTransporte)
+def remover_geocerca(sender, instance, **kwargs):
+    """OT excluída sai do índice de geocercas."""
+    if afeta_geocercas(instance):
+        invalidar_geocercas()
+
+
+@receiver(post_save, sender=AtualizacaoOT)
+def registrar_posicao_atualizacao(sender, instance, created, **kwargs):
+    """
+    Atualização com coordenadas (criação, status, entrega) move a
+    posição atual de quem a registrou.
+    """
+    if created and instance.latitude is not None and instance.longitude is not None:
+        atualizar_posicao(
+            instance.usuario_id, instance.latitude, instance.longitude,
+            instance.data_criacao, 'ATUALIZACAO', instance.ordem_transporte_id
+        )
+
+
+@receiver(post_save, sender=TransferenciaOT)
+def registrar_posicao_transferencia(sender, instance, **kwargs):
+    """
+    Transferência com localização move a posição atual de quem a
+    solicitou. A localização é preenchida depois da criação, então
+    qualquer save conta; saves seguintes (aceite, recusa...) repetem o
+    mesmo instante e não alteram nada.
+    """
+    if instance.latitude is not None and instance.longitude is not None:
+        atualizar_posicao(
+            instance.solicitado_por_id, instance.latitude, instance.longitude,
+            instance.data_solicitacao, 'TRANSFERENCIA', instance.ordem_transporte_id
+        )
@@ -0,0 +1,239 @@
+# ==============================================================================
+# PERCURSO DA OT - DISTÂNCIA, TEMPO EM MOVIMENTO E PARADAS
+# ==============================================================================
+
+# Arquivo: backend/core/percurso.py
+
+"""
+Métricas de percurso calculadas do rastreamento GPS.
+
+🎯 PROPÓSITO: Guardar na OT os km percorridos, o tempo em movimento e
+as paradas, para que o serializer de detalhe e os relatórios só leiam
+valores prontos.
+
+📋 REGRAS:
+- Um ponto está parado quando, olhando JANELA_PARADA_S para frente ou
+  para trás, o deslocamento é menor que RAIO_PARADA_M (ignora o
+  "tremor" do GPS com o veículo parado)
+- Trechos entre dois pontos parados não contam distância nem tempo
+- Trechos acima de VELOCIDADE_MAXIMA_MS são saltos do GPS e são ignorados
+- Lacunas de sinal maiores que LACUNA_MAXIMA_S contam distância, não tempo
+- Sequência de pontos parados com DURACAO_MINIMA_PARADA_S ou mais vira
+  uma parada (centroide + início/fim)
+
+⚡ DESEMPENHO: Haversine e classificação vetorizados com NumPy sobre a
+array inteira; laço Python só sobre as sequências de parada.
+
+🔄 INCREMENTAL: Cada lote processa só os pontos novos (mais o contexto
+de 2 janelas). Os últimos JANELA_PARADA_S segundos ficam pendentes até
+o próximo lote — ou até a OT ser finalizada (finalizar_percurso).
+"""
+
+import numpy as np
+from django.db import transaction
+
+from logitrack_backend.tracing import get_tracer
+from .compactacao import de_ms
+from .geo import haversine_m
+from .models import OrdemTransporte, PontoRastreamento, SegmentoRastreamento
+from .rastreamento import carregar_trilha
+
+trace = get_tracer(__name__)
+
+JANELA_PARADA_S = 120
+RAIO_PARADA_M = 50
+DURACAO_MINIMA_PARADA_S = 300
+LACUNA_MAXIMA_S = 600
+VELOCIDADE_MAXIMA_MS = 70  # ~250 km/h
+
+
+# ==============================================================================
+# 📐 CÁLCULOS VETORIZADOS
+# ==============================================================================
+
+def classificar_parados(timestamp, latitude, longitude):
+    """
+    Marca os pontos parados (ver regras no topo do módulo).
+
+    O ponto de referência JANELA_PARADA_S à frente/atrás de cada ponto
+    é encontrado com searchsorted sobre os timestamps ordenados.
+    """
+    quantidade = len(timestamp)
+    janela_ms = JANELA_PARADA_S * 1000
+    parado = np.zeros(quantidade, dtype=bool)
+
+    frente = np.searchsorted(timestamp, timestamp + janela_ms, side='left')
+    tras = np.searchsorted(timestamp, timestamp - janela_ms, side='right') - 1
+
+    for referencia, valido in ((frente, frente < quantidade), (tras, tras >= 0)):
+        origem = np.flatnonzero(valido)
+        destino = referencia[valido]
+        parado[origem] |= haversine_m(
+            latitude[origem], longitude[origem], latitude[destino], longitude[destino]
+        ) < RAIO_PARADA_M
+
+    return parado
+
+
+# ==============================================================================
+# 🔄 ATUALIZAÇÃO INCREMENTAL
+# ==============================================================================
+
+def _fechar_parada(parada, paradas):
+    duracao_s = (parada['fim'] - parada['inicio']) // 1000
+    if duracao_s >= DURACAO_MINIMA_PARADA_S:
+        paradas.append({
+            'inicio': de_ms(parada['inicio']).isoformat(),
+            'fim': de_ms(parada['fim']).isoformat(),
+            'duracao_s': int(duracao_s),
+            'latitude': round(parada['soma_latitude'] / parada['pontos'], 6),
+            'longitude': round(parada['soma_longitude'] / parada['pontos'], 6),
+        })
+
+
+def atualizar_percurso(ot_id, final=False):
+    """
+    Processa os pontos novos da OT e acumula as métricas nela.
+
+    Grava com UPDATE direto (sem OrdemTransporte.save(): não mexe em
+    data_atualizacao, contadores nem índice de busca).
+
+    Args:
+        ot_id: ID da OT
+        final: Processa também os pontos pendentes e fecha a parada em
+            aberto; depois disso a OT não é mais atualizada
+
+    Returns:
+        dict: Campos gravados (vazio se não havia nada a fazer)
+    """
+    with transaction.atomic():
+        atual = OrdemTransporte.objects.select_for_update().filter(pk=ot_id).values(
+            'distancia_km', 'tempo_movimento_s', 'paradas', 'estado_percurso'
+        ).first()
+        if atual is None:
+            return {}
+
+        estado = dict(atual['estado_percurso'] or {})
+        if estado.get('final'):
+            return {}
+
+        processado_ate = estado.get('processado_ate')
+        inicio = None
+        if processado_ate is not None:
+            # Contexto para a janela de parada e o trecho anterior ao 1º ponto novo
+            inicio = de_ms(processado_ate - 2 * JANELA_PARADA_S * 1000)
+
+        trilha = carregar_trilha(ot_id, inicio)
+        timestamp, latitude, longitude = trilha['timestamp'], trilha['latitude'], trilha['longitude']
+
+        novos = np.ones(len(timestamp), dtype=bool)
+        if processado_ate is not None:
+            novos &= timestamp > processado_ate
+        if not final and len(timestamp):
+            # Sem pontos à frente ainda não dá para saber se estão parados
+            novos &= timestamp <= timestamp[-1] - JANELA_PARADA_S * 1000
+        indices = np.flatnonzero(novos)
+
+        distancia_m = 0.0
+        tempo_s = 0.0
+        paradas = list(atual['paradas'] or [])
+        aberta = estado.get('parada_aberta')
+
+        if len(indices):
+            parado = classificar_parados(timestamp, latitude, longitude)
+
+            # Trechos que terminam em um ponto novo
+            fim = indices[indices > 0]
+            comeco = fim - 1
+            distancias = haversine_m(latitude[comeco], longitude[comeco], latitude[fim], longitude[fim])
+            duracoes = (timestamp[fim] - timestamp[comeco]) / 1000
+            em_movimento = (
+                ~(parado[comeco] & parado[fim])
+                & (distancias <= VELOCIDADE_MAXIMA_MS * duracoes)
+            )
+            distancia_m = float(distancias[em_movimento].sum())
+            tempo_s = float(duracoes[em_movimento & (duracoes <= LACUNA_MAXIMA_S)].sum())
+
+            # Sequências de pontos parados entre os novos (contínuos no array)
+            sequencia = parado[indices]
+            cortes = np.flatnonzero(np.diff(sequencia.astype(np.int8))) + 1
+            limites = [0, *cortes.tolist(), len(indices)]
+            for a, b in zip(limites[:-1], limites[1:]):
+                if not sequencia[a]:
+                    if aberta:
+                        _fechar_parada(aberta, paradas)
+                        aberta = None
+                    continue
+
+                trecho = indices[a:b]
+                if aberta is None:
+                    aberta = {'inicio': int(timestamp[trecho[0]]), 'soma_latitude': 0.0,
+                              'soma_longitude': 0.0, 'pontos': 0}
+                aberta['fim'] = int(timestamp[trecho[-1]])
+                aberta['soma_latitude'] += float(latitude[trecho].sum())
+                aberta['soma_longitude'] += float(longitude[trecho].sum())
+                aberta['pontos'] += len(trecho)
+
+            estado['processado_ate'] = int(timestamp[indices[-1]])
+
+        if final:
+            if aberta:
+                _fechar_parada(aberta, paradas)
+                aberta = None
+            estado['final'] = True
+        elif not len(indices):
+            return {}
+
+        estado['parada_aberta'] = aberta
+        campos = {
+            'distancia_km': atual['distancia_km'] + distancia_m / 1000,
+            'tempo_movimento_s': atual['tempo_movimento_s'] + int(round(tempo_s)),
+            'paradas': paradas,
+            'estado_percurso': estado,
+        }
+        OrdemTransporte.objects.filter(pk=ot_id).update(**campos)
+
+    trace.debug(
+        "📏 OT %s: +%.0f m, +%.0f s em movimento, %s paradas",
+        ot_id, distancia_m, tempo_s, len(paradas)
+    )
+    return campos
+
+
+def finalizar_percurso(ot_id):
+    """Fecha o cálculo da OT finalizada (pontos pendentes e parada aberta)."""
+    return atualizar_percurso(ot_id, final=True)
+
+
+def finalizar_percursos(ot_ids):
+    """
+    finalizar_percurso para várias OTs (status em lote).
+
+    OTs sem nenhum ponto de rastreamento nem estado de percurso são
+    fechadas juntas, com um único UPDATE; as demais passam por
+    finalizar_percurso uma a uma.
+    """
+    estados = dict(OrdemTransporte.objects.filter(pk__in=ot_ids).values_list('pk', 'estado_percurso'))
+    abertas = [pk for pk, estado in estados.items() if not (estado or {}).get('final')]
+    if not abertas:
+        return
+
+    com_trilha = set(
+        PontoRastreamento.objects.filter(ordem_transporte_id__in=abertas)
+        .values_list('ordem_transporte_id', flat=True).distinct()
+    ) | set(
+        SegmentoRastreamento.objects.filter(ordem_transporte_id__in=abertas)
+        .values_list('ordem_transporte_id', flat=True).distinct()
+    )
+
+    vazias = [pk for pk in abertas if pk not in com_trilha and not estados[pk]]
+    if vazias:
+        OrdemTransporte.objects.filter(pk__in=vazias).update(
+            estado_percurso={'final': True, 'parada_aberta': None}
+        )
+
+    vazias = set(vazias)
+    for pk in abertas:
+        if pk not in vazias:
+            finalizar_percurso(pk)
+    trace.debug("📏 %s percursos fechados (%s sem rastreamento)", len(abertas), len(vazias))
@@ -6,8 +6,11 @@
 # CRIE este arquivo na pasta core/
 
 from rest_framework import permissions
+from logitrack_backend.tracing import get_tracer
 from .models import OrdemTransporte
 
+trace = get_tracer(__name__)
+
 
 class IsOwnerOrLogisticaOrAdmin(permissions.BasePermission):
     """
@@ -29,8 +32,8 @@ class IsOwnerOrLogisticaOrAdmin(permissions.BasePermission):
         """
         Permissão básica: usuário deve estar autenticado.
         """
-        print(f"🔐 OT PERMISSION: Verificando permissão básica")
-        print(f"🔐 Usuário: {request.user.email if request.user.is_authenticated else 'Anônimo'}")
+        trace.debug("🔐 OT PERMISSION: Verificando permissão básica")
+        trace.debug("🔐 Usuário: %s", request.user.email if request.user.is_authenticated else 'Anônimo')
         
         return request.user.is_authenticated
     
@@ -40,28 +43,28 @@ class IsOwnerOrLogisticaOrAdmin(permissions.BasePermission):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver verificação
         """
-        print(f"🔐 OT OBJECT PERMISSION:")
-        print(f"  - Usuário: {request.user.email}")
-        print(f"  - OT: {obj.numero_ot}")
-        print(f"  - Motorista atual: {obj.motorista_atual.email}")
-        print(f"  - Role do usuário: {request.user.role}")
+        trace.debug("🔐 OT OBJECT PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email)
+        trace.debug("  - OT: %s", obj.numero_ot)
+        trace.debug(lambda: f"  - Motorista atual: {obj.motorista_atual.email}")
+        trace.debug("  - Role do usuário: %s", request.user.role)
         
         # Se é logística ou admin, pode tudo
         if request.user.role in ['logistica', 'admin']:
-            print(f"✅ Acesso liberado - Logística/Admin")
+            trace.debug("✅ Acesso liberado - Logística/Admin")
             return True
         
         # Se é o motorista atual da OT
         if obj.motorista_atual == request.user:
-            print(f"✅ Acesso liberado - Motorista atual")
+            trace.debug("✅ Acesso liberado - Motorista atual")
             return True
         
         # Se é o motorista que criou a OT
         if obj.motorista_criador == request.user:
-            print(f"✅ Acesso liberado - Motorista criador")
+            trace.debug("✅ Acesso liberado - Motorista criador")
             return True
         
-        print(f"❌ Acesso negado")
+        trace.debug("❌ Acesso negado")
         return False
 
 
@@ -83,24 +86,24 @@ class CanCreateOT(permissions.BasePermission):
         """
         Verifica se usuário pode criar OTs.
         """
-        print(f"🔐 CREATE OT PERMISSION:")
-        print(f"  - Usuário: {request.user.email if request.user.is_authenticated else 'Anônimo'}")
-        print(f"  - Role: {request.user.role if request.user.is_authenticated else 'N/A'}")
-        print(f"  - Ativo: {request.user.is_active if request.user.is_authenticated else 'N/A'}")
+        trace.debug("🔐 CREATE OT PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email if request.user.is_authenticated else 'Anônimo')
+        trace.debug("  - Role: %s", request.user.role if request.user.is_authenticated else 'N/A')
+        trace.debug("  - Ativo: %s", request.user.is_active if request.user.is_authenticated else 'N/A')
         
         if not request.user.is_authenticated:
-            print(f"❌ Usuário não autenticado")
+            trace.debug("❌ Usuário não autenticado")
             return False
         
         if request.user.role != 'motorista':
-            print(f"❌ Usuário não é motorista: {request.user.role}")
+            trace.debug("❌ Usuário não é motorista: %s", request.user.role)
             return False
         
         if not request.user.is_active:
-            print(f"❌ Usuário inativo")
+            trace.debug("❌ Usuário inativo")
             return False
         
-        print(f"✅ Pode criar OT")
+        trace.debug("✅ Pode criar OT")
         return True
 
 
@@ -131,28 +134,28 @@ class CanTransferOT(permissions.BasePermission):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"🔐 TRANSFER PERMISSION:")
-        print(f"  - Usuário: {request.user.email}")
-        print(f"  - OT: {obj.numero_ot}")
-        print(f"  - Motorista atual: {obj.motorista_atual.email}")
-        print(f"  - OT pode ser transferida: {obj.pode_ser_transferida}")
+        trace.debug("🔐 TRANSFER PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email)
+        trace.debug("  - OT: %s", obj.numero_ot)
+        trace.debug(lambda: f"  - Motorista atual: {obj.motorista_atual.email}")
+        trace.debug("  - OT pode ser transferida: %s", obj.pode_ser_transferida)
         
         # Verificar se OT pode ser transferida
         if not obj.pode_ser_transferida:
-            print(f"❌ OT não pode ser transferida no status: {obj.status}")
+            trace.debug("❌ OT não pode ser transferida no status: %s", obj.status)
             return False
         
         # Logística e admin podem sempre transferir
         if request.user.role in ['logistica', 'admin']:
-            print(f"✅ Pode transferir - Logística/Admin")
+            trace.debug("✅ Pode transferir - Logística/Admin")
             return True
         
         # Motoristas podem transferir/solicitar
         if request.user.role == 'motorista':
-            print(f"✅ Pode transferir/solicitar - Motorista")
+            trace.debug("✅ Pode transferir/solicitar - Motorista")
             return True
         
-        print(f"❌ Sem permissão para transferir")
+        trace.debug("❌ Sem permissão para transferir")
         return False
 
 
@@ -174,19 +177,19 @@ class CanApproveTransfer(permissions.BasePermission):
         """
         Verifica se usuário pode aprovar transferências.
         """
-        print(f"🔐 APPROVE TRANSFER PERMISSION:")
-        print(f"  - Usuário: {request.user.email if request.user.is_authenticated else 'Anônimo'}")
-        print(f"  - Role: {request.user.role if request.user.is_authenticated else 'N/A'}")
+        trace.debug("🔐 APPROVE TRANSFER PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email if request.user.is_authenticated else 'Anônimo')
+        trace.debug("  - Role: %s", request.user.role if request.user.is_authenticated else 'N/A')
         
         if not request.user.is_authenticated:
-            print(f"❌ Usuário não autenticado")
+            trace.debug("❌ Usuário não autenticado")
             return False
         
         if request.user.role not in ['logistica', 'admin']:
-            print(f"❌ Usuário não é logística/admin: {request.user.role}")
+            trace.debug("❌ Usuário não é logística/admin: %s", request.user.role)
             return False
         
-        print(f"✅ Pode aprovar transferências")
+        trace.debug("✅ Pode aprovar transferências")
         return True
 
 
@@ -215,28 +218,28 @@ class CanUpdateOTStatus(permissions.BasePermission):
         """
         Verifica se pode atualizar status da OT.
         """
-        print(f"🔐 UPDATE STATUS PERMISSION:")
-        print(f"  - Usuário: {request.user.email}")
-        print(f"  - OT: {obj.numero_ot}")
-        print(f"  - Motorista atual: {obj.motorista_atual.email}")
-        print(f"  - OT pode ser editada: {obj.pode_ser_editada}")
+        trace.debug("🔐 UPDATE STATUS PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email)
+        trace.debug("  - OT: %s", obj.numero_ot)
+        trace.debug(lambda: f"  - Motorista atual: {obj.motorista_atual.email}")
+        trace.debug("  - OT pode ser editada: %s", obj.pode_ser_editada)
         
         # Verificar se OT pode ser editada
         if not obj.pode_ser_editada:
-            print(f"❌ OT finalizada, não pode ser editada")
+            trace.debug("❌ OT finalizada, não pode ser editada")
             return False
         
         # Logística e admin podem sempre
         if request.user.role in ['logistica', 'admin']:
-            print(f"✅ Pode atualizar - Logística/Admin")
+            trace.debug("✅ Pode atualizar - Logística/Admin")
             return True
         
         # Motorista atual pode atualizar
         if obj.motorista_atual == request.user:
-            print(f"✅ Pode atualizar - Motorista atual")
+            trace.debug("✅ Pode atualizar - Motorista atual")
             return True
         
-        print(f"❌ Sem permissão para atualizar status")
+        trace.debug("❌ Sem permissão para atualizar status")
         return False
 
 
@@ -262,18 +265,72 @@ class CanViewAllOTs(permissions.BasePermission):
         🔍 NOTA: A filtragem real acontece na view, não aqui.
         Esta permission apenas verifica se usuário está autenticado.
         """
-        print(f"🔐 VIEW ALL OTS PERMISSION:")
-        print(f"  - Usuário: {request.user.email if request.user.is_authenticated else 'Anônimo'}")
-        print(f"  - Role: {request.user.role if request.user.is_authenticated else 'N/A'}")
+        trace.debug("🔐 VIEW ALL OTS PERMISSION:")
+        trace.debug("  - Usuário: %s", request.user.email if request.user.is_authenticated else 'Anônimo')
+        trace.debug("  - Role: %s", request.user.role if request.user.is_authenticated else 'N/A')
         
         if not request.user.is_authenticated:
-            print(f"❌ Usuário não autenticado")
+            trace.debug("❌ Usuário não autenticado")
             return False
         
-        print(f"✅ Pode listar OTs (filtradas na view)")
+        trace.debug("✅ Pode listar OTs (filtradas na view)")
         return True
 
 
+class CanSendTracking(permissions.BasePermission):
+    """
+    Permissão: Enviar pontos de GPS da OT.
+
+    🎯 USADO PARA:
+    - POST /api/ots/{id}/rastreamento/
+
+    🔐 REGRAS:
+    - Apenas o motorista atual da OT (é o aparelho dele que rastreia)
+    """
+
+    message = "Apenas o motorista atual pode enviar o rastreamento desta OT."
+
+    def has_permission(self, request, view):
+        """
+        Permissão básica: usuário autenticado.
+        """
+        return request.user.is_authenticated
+
+    def has_object_permission(self, request, view, obj):
+        """
+        Verifica se o usuário é o motorista atual da OT.
+        """
+        pode = obj.motorista_atual_id == request.user.id
+        trace.debug("🔐 TRACKING PERMISSION: OT %s, usuário %s → %s", obj.pk, request.user.email, pode)
+        return pode
+
+
+class CanViewFleet(permissions.BasePermission):
+    """
+    Permissão: Ver os mapas globais (frota ao vivo e mapa de calor).
+
+    🎯 USADO PARA:
+    - GET /api/ots/frota/
+    - GET /api/ots/mapa-calor/{z}/{x}/{y}/
+
+    🔐 REGRAS:
+    - Apenas logística e admin
+    """
+
+    message = "Apenas logística e administradores podem ver os mapas da frota."
+
+    def has_permission(self, request, view):
+        """
+        Verifica se o usuário é logística ou admin.
+        """
+        if not request.user.is_authenticated:
+            return False
+
+        pode = request.user.role in ['logistica', 'admin']
+        trace.debug("🔐 FLEET PERMISSION: %s → %s", request.user.email, pode)
+        return pode
+
+
 # ==============================================================================
 # 🛠️ FUNÇÕES HELPER PARA VERIFICAR PERMISSÕES
 # ==============================================================================
@@ -403,24 +460,27 @@ def debug_ot_permissions(user, ot, action=""):
         ot: Instância da OrdemTransporte
         action: String descrevendo a ação sendo testada
     """
-    print(f"\n🔐 === DEBUG OT PERMISSIONS ({action}) ===")
-    print(f"Usuário: {user.email if user.is_authenticated else 'Anônimo'}")
-    print(f"Role: {user.role if user.is_authenticated else 'N/A'}")
-    print(f"OT: {ot.numero_ot}")
-    print(f"Status OT: {ot.status} ({ot.get_status_display()})")
-    print(f"Motorista atual: {ot.motorista_atual.email}")
-    print(f"Motorista criador: {ot.motorista_criador.email}")
+    if not trace.enabled():
+        return
+    
+    trace.debug("\n🔐 === DEBUG OT PERMISSIONS (%s) ===", action)
+    trace.debug("Usuário: %s", user.email if user.is_authenticated else 'Anônimo')
+    trace.debug("Role: %s", user.role if user.is_authenticated else 'N/A')
+    trace.debug("OT: %s", ot.numero_ot)
+    trace.debug(lambda: f"Status OT: {ot.status} ({ot.get_status_display()})")
+    trace.debug(lambda: f"Motorista atual: {ot.motorista_atual.email}")
+    trace.debug(lambda: f"Motorista criador: {ot.motorista_criador.email}")
     
     if user.is_authenticated:
-        print(f"\n📋 Permissões calculadas:")
-        print(f"Pode visualizar: {user_can_view_ot(user, ot)}")
-        print(f"Pode editar: {user_can_edit_ot(user, ot)}")
-        print(f"Pode transferir: {user_can_transfer_ot(user, ot)}")
-        print(f"OT pode ser editada: {ot.pode_ser_editada}")
-        print(f"OT pode ser transferida: {ot.pode_ser_transferida}")
-        print(f"OT está finalizada: {ot.esta_finalizada}")
+        trace.debug("\n📋 Permissões calculadas:")
+        trace.debug(lambda: f"Pode visualizar: {user_can_view_ot(user, ot)}")
+        trace.debug(lambda: f"Pode editar: {user_can_edit_ot(user, ot)}")
+        trace.debug(lambda: f"Pode transferir: {user_can_transfer_ot(user, ot)}")
+        trace.debug("OT pode ser editada: %s", ot.pode_ser_editada)
+        trace.debug("OT pode ser transferida: %s", ot.pode_ser_transferida)
+        trace.debug("OT está finalizada: %s", ot.esta_finalizada)
     
-    print(f"🔐 ==============================\n")
+    trace.debug("🔐 ==============================\n")
 
 
 # ==============================================================================
@@ -491,4 +551,48 @@ class TransferirOTView(APIView):
 
 # Para debugging:
 debug_ot_permissions(request.user, ot, "Tentativa de edição")
-"""
\ No newline at end of file
+"""
+
+
+class CanPlanRoutes(permissions.BasePermission):
+    """
+    Permissão: Sequenciar entregas (roteirização).
+
+    🎯 USADO PARA:
+    - POST /api/ots/roteirizar/
+
+    🔐 REGRAS:
+    - Apenas logística e admin
+    """
+
+    message = "Apenas logística e administradores podem planejar rotas."
+
+    def has_permission(self, request, view):
+        """
+        Verifica se o usuário é logística ou admin.
+        """
+        if not request.user.is_authenticated:
+            return False
+        return request.user.role in ['logistica', 'admin']
+
+
+class CanBulkUpdateOTStatus(permissions.BasePermission):
+    """
+    Permissão: Mudar o status de várias OTs de uma vez.
+
+    🎯 USADO PARA:
+    - POST /api/ots/status-em-lote/
+
+    🔐 REGRAS:
+    - Apenas logística e admin
+    """
+
+    message = "Apenas logística e administradores podem atualizar status em lote."
+
+    def has_permission(self, request, view):
+        """
+        Verifica se o usuário é logística ou admin.
+        """
+        if not request.user.is_authenticated:
+            return False
+        return request.user.role in ['logistica', 'admin']
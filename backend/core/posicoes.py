@@ -0,0 +1,252 @@
+# ==============================================================================
+# POSIÇÃO ATUAL DOS USUÁRIOS (ÚLTIMA POSIÇÃO CONHECIDA)
+# ==============================================================================
+
+# Arquivo: backend/core/posicoes.py
+
+"""
+Manutenção da tabela PosicaoAtual.
+
+🎯 PROPÓSITO: Cada evento com localização (lote de rastreamento,
+atualização de OT com coordenadas, transferência com localização)
+grava a posição do usuário em uma linha única por usuário. Ler a
+frota ao vivo vira uma varredura na tabela, sem agregações sobre o
+rastreamento.
+
+📋 REGRAS:
+- Upsert: UPDATE condicional e, se a linha não existir, INSERT
+- A posição só avança: eventos com instante anterior ao já gravado
+  (lotes atrasados, reprocessamentos) são ignorados
+- Nenhum lock na OT: duas gravações simultâneas do mesmo usuário
+  resolvem-se pela condição do UPDATE
+
+⚡ DESEMPENHO: No caso comum (linha existente) é um único UPDATE pela
+chave primária.
+
+📍 MOTORISTAS PRÓXIMOS: O geohash de cada posição é indexado; a busca
+dos k motoristas disponíveis mais próximos expande o raio até achar k
+(no máximo RAIO_MAXIMO_KM) e filtra a disponibilidade (sem OT ativa) na
+mesma consulta.
+"""
+
+import numpy as np
+from django.db.models import Exists, OuterRef, Subquery
+
+from logitrack_backend.tracing import get_tracer
+from .geo import RAIO_MAXIMO_KM, celulas_no_raio, codificar_geohash, filtro_geohash, haversine_m
+from .models import AtualizacaoOT, OrdemTransporte, PontoRastreamento, PosicaoAtual
+
+trace = get_tracer(__name__)
+
+K_PADRAO_PROXIMOS = 5
+K_MAXIMO_PROXIMOS = 50
+
+# Primeiro raio da busca; cresce RAIO_CRESCIMENTO_PROXIMOS vezes por rodada
+RAIO_INICIAL_PROXIMOS_KM = 5
+RAIO_CRESCIMENTO_PROXIMOS = 4
+
+STATUS_OT_ATIVA = ['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO']
+
+
+def atualizar_posicao(usuario_id, latitude, longitude, registrado_em, origem,
+                      ot_id=None, precisao=None, velocidade=None):
+    """
+    Grava a posição do usuário se for mais recente que a atual.
+
+    Args:
+        usuario_id: ID do CustomUser
+        latitude, longitude: Coordenadas (graus; Decimal é aceito)
+        registrado_em: Instante da leitura (datetime)
+        origem: Uma das PosicaoAtual.ORIGEM_CHOICES
+        ot_id: OT em que o evento aconteceu (opcional)
+        precisao, velocidade: Dados do GPS, quando houver
+
+    Returns:
+        bool: True se a posição foi gravada
+    """
+    campos = {
+        'latitude': float(latitude),
+        'longitude': float(longitude),
+        'geohash': codificar_geohash(latitude, longitude),
+        'registrado_em': registrado_em,
+        'origem': origem,
+        'ordem_transporte_id': ot_id,
+        'precisao': precisao,
+        'velocidade': velocidade,
+    }
+    mais_antigas = PosicaoAtual.objects.filter(usuario_id=usuario_id, registrado_em__lt=registrado_em)
+
+    if mais_antigas.update(**campos):
+        return True
+
+    # Nenhuma linha mais antiga: ou o usuário ainda não tem posição, ou a
+    # gravada é mais nova (nesse caso o INSERT é ignorado pelo conflito)
+    PosicaoAtual.objects.bulk_create(
+        [PosicaoAtual(usuario_id=usuario_id, **campos)], ignore_conflicts=True
+    )
+    # Outra gravação pode ter inserido uma posição mais antiga entre as duas consultas
+    mais_antigas.update(**campos)
+
+    gravada = PosicaoAtual.objects.filter(usuario_id=usuario_id, registrado_em=registrado_em).exists()
+    trace.debug("📌 Usuário %s: posição %s (%s)", usuario_id, 'gravada' if gravada else 'ignorada', origem)
+    return gravada
+
+
+def posicoes_recentes(desde=None):
+    """
+    Posições atuais, opcionalmente só as registradas a partir de `desde`.
+
+    Returns:
+        QuerySet: PosicaoAtual ordenado da mais recente para a mais antiga
+    """
+    posicoes = PosicaoAtual.objects.order_by('-registrado_em')
+    if desde is not None:
+        posicoes = posicoes.filter(registrado_em__gte=desde)
+    return posicoes
+
+
+def reconstruir_posicoes():
+    """
+    Recria a tabela a partir da última AtualizacaoOT com coordenadas e
+    do último PontoRastreamento de cada usuário (backfill e dados
+    sintéticos). Segmentos compactados não são lidos: um motorista com
+    pontos só em segmentos fica com a posição da última atualização.
+
+    Returns:
+        int: Quantidade de posições na tabela
+    """
+    com_coordenadas = AtualizacaoOT.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    ultimas = com_coordenadas.filter(
+        pk=Subquery(
+            com_coordenadas.filter(usuario_id=OuterRef('usuario_id'))
+            .order_by('-data_criacao', '-pk').values('pk')[:1]
+        )
+    ).values_list('usuario_id', 'latitude', 'longitude', 'data_criacao', 'ordem_transporte_id')
+
+    posicoes = [
+        PosicaoAtual(
+            usuario_id=usuario_id,
+            latitude=float(latitude),
+            longitude=float(longitude),
+            geohash=codificar_geohash(latitude, longitude),
+            registrado_em=data_criacao,
+            origem='ATUALIZACAO',
+            ordem_transporte_id=ot_id,
+        )
+        for usuario_id, latitude, longitude, data_criacao, ot_id in ultimas
+    ]
+
+    PosicaoAtual.objects.all().delete()
+    PosicaoAtual.objects.bulk_create(posicoes, batch_size=1000)
+
+    ultimos_pontos = PontoRastreamento.objects.filter(
+        pk=Subquery(
+            PontoRastreamento.objects.filter(motorista_id=OuterRef('motorista_id'))
+            .order_by('-registrado_em', '-pk').values('pk')[:1]
+        )
+    )
+    for ponto in ultimos_pontos:
+        atualizar_posicao(ponto.motorista_id, ponto.latitude, ponto.longitude, ponto.registrado_em,
+                          'RASTREAMENTO', ponto.ordem_transporte_id, ponto.precisao, ponto.velocidade)
+
+    return PosicaoAtual.objects.count()
+
+
+# ==============================================================================
+# 📍 MOTORISTAS DISPONÍVEIS MAIS PRÓXIMOS
+# ==============================================================================
+
+def motoristas_disponiveis():
+    """
+    Posições de motoristas ativos sem OT ativa.
+
+    Mesma regra de PodeCreateOTView (OT INICIADA, EM_CARREGAMENTO ou
+    EM_TRANSITO com ativa=True), como NOT EXISTS na própria consulta —
+    nenhuma query por candidato.
+    """
+    ot_ativa = OrdemTransporte.objects.filter(
+        motorista_atual_id=OuterRef('usuario_id'),
+        status__in=STATUS_OT_ATIVA,
+        ativa=True,
+    )
+    return PosicaoAtual.objects.filter(
+        usuario__role='motorista',
+        usuario__is_active=True,
+    ).exclude(Exists(ot_ativa))
+
+
+def motoristas_proximos(latitude, longitude, k=K_PADRAO_PROXIMOS, excluir=()):
+    """
+    Os k motoristas disponíveis mais próximos do ponto, pela última posição.
+
+    📋 BUSCA EM RAIO CRESCENTE:
+    1. Células de geohash que cobrem o raio → faixas no índice
+    2. Distância exata (NumPy) dos candidatos; os que estão dentro do raio
+       são exatos (toda posição no círculo está nas células)
+    3. Menos de k dentro do raio: a próxima rodada usa a distância do
+       k-ésimo candidato já visto (limite garantido) ou o raio ×
+       RAIO_CRESCIMENTO_PROXIMOS, até RAIO_MAXIMO_KM
+
+    Args:
+        latitude, longitude: Ponto de referência (graus)
+        k: Quantidade de motoristas
+        excluir: IDs de usuários fora da busca (ex.: motorista atual da OT)
+
+    Returns:
+        dict: motoristas (do mais próximo ao mais distante), raio_km
+            (raio efetivamente buscado) e incompleto (menos de k dentro
+            de RAIO_MAXIMO_KM: pode haver motoristas disponíveis além dele)
+    """
+    disponiveis = motoristas_disponiveis().exclude(usuario_id__in=list(excluir))
+    colunas = (
+        'usuario_id', 'usuario__email', 'usuario__first_name', 'usuario__last_name',
+        'latitude', 'longitude', 'registrado_em', 'origem',
+    )
+
+    raio_m = RAIO_INICIAL_PROXIMOS_KM * 1000
+    raio_maximo_m = RAIO_MAXIMO_KM * 1000
+    rodadas = 0
+    while True:
+        rodadas += 1
+        candidatos = list(disponiveis.filter(
+            filtro_geohash('geohash', celulas_no_raio(latitude, longitude, raio_m))
+        ).values_list(*colunas))
+
+        distancias = haversine_m(
+            latitude, longitude,
+            np.array([linha[4] for linha in candidatos], dtype=np.float64),
+            np.array([linha[5] for linha in candidatos], dtype=np.float64),
+        )
+        ordem = np.argsort(distancias, kind='stable')
+        dentro = ordem[distancias[ordem] <= raio_m]
+
+        if len(dentro) >= k or raio_m >= raio_maximo_m:
+            break
+        if len(ordem) >= k:
+            raio_m = min(float(distancias[ordem[k - 1]]), raio_maximo_m)
+        else:
+            raio_m = min(raio_m * RAIO_CRESCIMENTO_PROXIMOS, raio_maximo_m)
+
+    trace.debug("📍 Motoristas próximos: %s candidatos, raio %.1f km, %s rodadas",
+                len(candidatos), raio_m / 1000, rodadas)
+
+    motoristas = []
+    for indice in dentro[:k].tolist():
+        usuario_id, email, nome, sobrenome, lat, lng, registrado_em, origem = candidatos[indice]
+        motoristas.append({
+            'motorista': {
+                'id': usuario_id,
+                'email': email,
+                'full_name': f'{nome} {sobrenome}'.strip() if nome else email,
+            },
+            'distancia_km': round(float(distancias[indice]) / 1000, 3),
+            'latitude': lat,
+            'longitude': lng,
+            'posicao_em': registrado_em,
+            'origem_posicao': origem,
+        })
+    return {
+        'motoristas': motoristas,
+        'raio_km': round(raio_m / 1000, 3),
+        'incompleto': len(motoristas) < k,
+    }
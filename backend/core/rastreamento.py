@@ -0,0 +1,343 @@
+# ==============================================================================
+# RASTREAMENTO GPS - INGESTÃO DE PONTOS EM LOTE
+# ==============================================================================
+
+# Arquivo: backend/core/rastreamento.py
+
+"""
+Validação e gravação dos pontos de GPS enviados pelo app.
+
+🎯 PROPÓSITO: Receber milhares de pontos por segundo da frota inteira
+sem criar uma AtualizacaoOT por ponto.
+
+⚡ DESEMPENHO:
+- O lote vira arrays NumPy; faixas, valores finitos, janela e ordem
+  dos timestamps são validados de uma vez, sem laço por ponto
+- Um único bulk_create por lote
+- Pontos já recebidos (reenvio do app após falha de rede) são ignorados
+  comparando com o último instante gravado da OT
+
+📋 FORMATO DO LOTE:
+[
+    {"latitude": -23.55, "longitude": -46.63, "timestamp": 1760000000000,
+     "precisao": 8.0, "velocidade": 13.2},
+    ...
+]
+timestamp em milissegundos desde a época (Date.now() no app);
+precisao (m) e velocidade (m/s) são opcionais.
+"""
+
+import math
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from logitrack_backend.tracing import get_tracer
+from .compactacao import COLUNAS, de_ms, decodificar_segmento, para_ms
+from .geocercas import processar_pontos
+from .models import OrdemTransporte, PontoRastreamento, SegmentoRastreamento
+from .posicoes import atualizar_posicao
+from .stats import STATUS_ATIVOS
+
+trace = get_tracer(__name__)
+
+LIMITE_PONTOS_LOTE = 1000
+
+# Relógio do aparelho pode estar um pouco adiantado
+TOLERANCIA_FUTURO = timedelta(minutes=5)
+
+# App offline reenvia o buffer na volta; pontos mais antigos são lixo do relógio
+MAXIMO_ATRASO = timedelta(days=7)
+
+# Quantos índices inválidos devolver na mensagem de erro
+MAXIMO_INDICES_ERRO = 10
+
+
+# ==============================================================================
+# ✅ VALIDAÇÃO VETORIZADA
+# ==============================================================================
+
+def _coluna(pontos, campo, obrigatorio=True):
+    """Extrai um campo de todos os pontos como array float64 (None → NaN)."""
+    if obrigatorio:
+        valores = (ponto[campo] for ponto in pontos)
+    else:
+        valores = (ponto.get(campo) for ponto in pontos)
+    return np.fromiter(
+        (math.nan if valor is None else valor for valor in valores),
+        dtype=np.float64,
+        count=len(pontos)
+    )
+
+
+def _indices(mascara, deslocamento=0):
+    return (np.flatnonzero(mascara)[:MAXIMO_INDICES_ERRO] + deslocamento).tolist()
+
+
+def validar_pontos(pontos, agora=None):
+    """
+    Valida um lote de pontos e devolve as colunas como arrays.
+
+    Args:
+        pontos: Lista de dicts no formato descrito no módulo
+        agora: Instante de referência da janela de timestamps aceitos
+
+    Returns:
+        dict: latitude, longitude, timestamp (ms, int64), precisao, velocidade
+
+    Raises:
+        ValidationError: {'pontos': [...]} com os índices dos pontos inválidos
+    """
+    if not isinstance(pontos, list) or not pontos:
+        raise ValidationError({'pontos': ['Envie uma lista com pelo menos um ponto.']})
+
+    if len(pontos) > LIMITE_PONTOS_LOTE:
+        raise ValidationError({
+            'pontos': [f'Máximo de {LIMITE_PONTOS_LOTE} pontos por lote (recebidos {len(pontos)}).']
+        })
+
+    try:
+        latitude = _coluna(pontos, 'latitude')
+        longitude = _coluna(pontos, 'longitude')
+        timestamp = _coluna(pontos, 'timestamp')
+        precisao = _coluna(pontos, 'precisao', obrigatorio=False)
+        velocidade = _coluna(pontos, 'velocidade', obrigatorio=False)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        raise ValidationError({
+            'pontos': ['Cada ponto precisa de latitude, longitude e timestamp numéricos.']
+        })
+
+    # A janela é conferida ainda em float64: fora dela o cast para int64
+    # estoura (1e20) ou gera datas absurdas (-5e13 → ano 385)
+    agora = agora or timezone.now()
+    invalidos = (
+        ~np.isfinite(latitude) | ~np.isfinite(longitude) | ~np.isfinite(timestamp)
+        | (np.abs(latitude) > 90) | (np.abs(longitude) > 180)
+        | ((latitude == 0) & (longitude == 0))  # Leitura nula do GPS
+        | (precisao < 0) | (velocidade < 0)  # NaN (ausente) compara como False
+        | (timestamp < para_ms(agora - MAXIMO_ATRASO))
+        | (timestamp > para_ms(agora + TOLERANCIA_FUTURO))
+    )
+    if invalidos.any():
+        raise ValidationError({
+            'pontos': [f'Coordenadas, horários ou valores fora da faixa nos pontos {_indices(invalidos)}.']
+        })
+
+    timestamp = timestamp.astype(np.int64)
+
+    # diff[i] compara o ponto i + 1 com o anterior
+    fora_de_ordem = np.diff(timestamp) <= 0
+    if fora_de_ordem.any():
+        raise ValidationError({'pontos': [
+            f'Timestamps devem ser estritamente crescentes (pontos {_indices(fora_de_ordem, deslocamento=1)}).'
+        ]})
+
+    return {
+        'latitude': latitude,
+        'longitude': longitude,
+        'timestamp': timestamp,
+        'precisao': precisao,
+        'velocidade': velocidade,
+    }
+
+
+# ==============================================================================
+# 💾 GRAVAÇÃO EM LOTE
+# ==============================================================================
+
+def _opcional(valor):
+    return None if math.isnan(valor) else valor
+
+
+def ultimo_instante(ot_id):
+    """Instante do último ponto da OT, compactado ou não."""
+    ultimo_ponto = PontoRastreamento.objects.filter(
+        ordem_transporte_id=ot_id
+    ).aggregate(ultimo=Max('registrado_em'))['ultimo']
+    if ultimo_ponto:
+        return ultimo_ponto
+
+    # Sem pontos recentes: tudo já foi compactado
+    return SegmentoRastreamento.objects.filter(
+        ordem_transporte_id=ot_id
+    ).aggregate(ultimo=Max('fim'))['ultimo']
+
+
+def registrar_pontos(ot, motorista, colunas):
+    """
+    Grava um lote já validado com um único bulk_create.
+
+    A linha da OT fica travada durante a gravação para que dois lotes
+    simultâneos da mesma OT não gravem o mesmo intervalo duas vezes.
+
+    Args:
+        ot: OrdemTransporte que recebe os pontos
+        motorista: Usuário que enviou o lote
+        colunas: Retorno de validar_pontos
+
+    Returns:
+        dict: recebidos, gravados, ignorados e ultimo_timestamp (ms)
+    """
+    timestamp = colunas['timestamp']
+
+    with transaction.atomic():
+        list(OrdemTransporte.objects.select_for_update().filter(pk=ot.pk).values_list('pk'))
+
+        ultimo = ultimo_instante(ot.pk)
+        if ultimo:
+            novos = timestamp > para_ms(ultimo)
+        else:
+            novos = np.ones(len(timestamp), dtype=bool)
+
+        linhas = zip(
+            colunas['latitude'][novos].tolist(),
+            colunas['longitude'][novos].tolist(),
+            timestamp[novos].tolist(),
+            colunas['precisao'][novos].tolist(),
+            colunas['velocidade'][novos].tolist(),
+        )
+        PontoRastreamento.objects.bulk_create([
+            PontoRastreamento(
+                ordem_transporte_id=ot.pk,
+                motorista_id=motorista.pk,
+                latitude=latitude,
+                longitude=longitude,
+                registrado_em=de_ms(ms),
+                precisao=_opcional(precisao),
+                velocidade=_opcional(velocidade),
+            )
+            for latitude, longitude, ms, precisao, velocidade in linhas
+        ])
+
+    gravados = int(novos.sum())
+    if gravados:
+        from .percurso import atualizar_percurso  # percurso depende deste módulo
+
+        invalidar_trilha(ot.pk)
+        atualizar_percurso(ot.pk)
+        processar_pontos(
+            ot.pk, motorista.pk, colunas['latitude'][novos], colunas['longitude'][novos], timestamp[novos]
+        )
+        atualizar_posicao(
+            motorista.pk, colunas['latitude'][-1], colunas['longitude'][-1], de_ms(int(timestamp[-1])),
+            'RASTREAMENTO', ot.pk, _opcional(colunas['precisao'][-1]), _opcional(colunas['velocidade'][-1])
+        )
+    trace.debug("📍 OT %s: %s pontos gravados, %s ignorados", ot.pk, gravados, len(timestamp) - gravados)
+
+    # Timestamps crescentes: os novos são sempre o final do lote
+    if gravados:
+        ultimo_timestamp = int(timestamp[-1])
+    else:
+        ultimo_timestamp = para_ms(ultimo) if ultimo else None
+
+    return {
+        'recebidos': len(timestamp),
+        'gravados': gravados,
+        'ignorados': len(timestamp) - gravados,
+        'ultimo_timestamp': ultimo_timestamp,
+    }
+
+
+def pode_receber_pontos(ot):
+    """OTs só recebem pontos enquanto estão em andamento."""
+    return ot.status in STATUS_ATIVOS
+
+
+# ==============================================================================
+# 🔄 VERSÃO DA TRILHA (INVALIDAÇÃO DE CACHE)
+# ==============================================================================
+
+def _chave_versao(ot_id):
+    return f'trilha:versao:{ot_id}'
+
+
+def versao_trilha(ot_id):
+    """
+    Versão atual da trilha da OT, usada nas chaves de cache derivadas.
+
+    Começa em um valor baseado no relógio: se a chave for despejada do
+    cache, a nova versão não coincide com uma antiga.
+    """
+    chave = _chave_versao(ot_id)
+    cache.add(chave, time.time_ns(), None)
+    return cache.get(chave)
+
+
+def invalidar_trilha(ot_id):
+    """Muda a versão da trilha; caches antigos deixam de ser lidos."""
+    try:
+        cache.incr(_chave_versao(ot_id))
+    except ValueError:
+        cache.add(_chave_versao(ot_id), time.time_ns(), None)
+
+
+# ==============================================================================
+# 🗺️ LEITURA DA TRILHA
+# ==============================================================================
+
+def carregar_trilha(ot_id, inicio=None, fim=None):
+    """
+    Pontos da OT em ordem cronológica, como arrays NumPy.
+
+    Junta os segmentos compactados e os pontos ainda não compactados.
+
+    Args:
+        ot_id: ID da OT
+        inicio, fim: Intervalo opcional (datetime, inclusivo)
+
+    Returns:
+        dict: Uma array por coluna (ver compactacao.COLUNAS); timestamp em ms
+    """
+    segmentos = SegmentoRastreamento.objects.filter(ordem_transporte_id=ot_id)
+    pontos = PontoRastreamento.objects.filter(ordem_transporte_id=ot_id)
+    if inicio:
+        segmentos = segmentos.filter(fim__gte=inicio)
+        pontos = pontos.filter(registrado_em__gte=inicio)
+    if fim:
+        segmentos = segmentos.filter(inicio__lte=fim)
+        pontos = pontos.filter(registrado_em__lte=fim)
+
+    partes = [
+        decodificar_segmento(dados, quantidade, formato)
+        for dados, quantidade, formato in segmentos.order_by('inicio').values_list(
+            'dados', 'quantidade', 'formato'
+        )
+    ]
+
+    linhas = list(pontos.order_by('registrado_em').values_list(
+        'registrado_em', 'latitude', 'longitude', 'precisao', 'velocidade'
+    ))
+    if linhas:
+        instantes, latitude, longitude, precisao, velocidade = zip(*linhas)
+        partes.append({
+            'timestamp': np.array([para_ms(instante) for instante in instantes], dtype=np.int64),
+            'latitude': np.array(latitude, dtype=np.float64),
+            'longitude': np.array(longitude, dtype=np.float64),
+            'precisao': np.array(precisao, dtype=np.float64),  # None → NaN
+            'velocidade': np.array(velocidade, dtype=np.float64),
+        })
+
+    if not partes:
+        return {
+            coluna: np.zeros(0, dtype=np.int64 if coluna == 'timestamp' else np.float64)
+            for coluna in COLUNAS
+        }
+
+    trilha = {coluna: np.concatenate([parte[coluna] for parte in partes]) for coluna in COLUNAS}
+
+    # Segmentos nas bordas do intervalo trazem pontos de fora dele
+    if inicio or fim:
+        dentro = np.ones(len(trilha['timestamp']), dtype=bool)
+        if inicio:
+            dentro &= trilha['timestamp'] >= para_ms(inicio)
+        if fim:
+            dentro &= trilha['timestamp'] <= para_ms(fim)
+        trilha = {coluna: valores[dentro] for coluna, valores in trilha.items()}
+
+    return trilha
@@ -0,0 +1,312 @@
+# ==============================================================================
+# ROTEIRIZAÇÃO - ORDEM DE VISITA DAS ENTREGAS
+# ==============================================================================
+
+# Arquivo: backend/core/roteirizacao.py
+
+"""
+Sequenciamento de paradas: dada a partida e os locais de entrega, uma
+ordem de visita de distância total próxima da mínima.
+
+🎯 PROPÓSITO: A logística planeja várias entregas por cidade; a ordem
+deixa de ser montada à mão.
+
+📋 ALGORITMO (sobre a matriz de distâncias NumPy):
+1. Semente: vizinho mais próximo a partir da partida
+2. Melhoria local, alternando até não haver ganho ou o prazo acabar:
+   - 2-opt: inverte o trecho rota[i..j] (ganho de todos os j de uma vez)
+   - Or-opt: move blocos de 1 a BLOCO_MAXIMO_OR_OPT paradas para outra
+     posição, na ordem ou invertidos (todas as posições de uma vez)
+3. Conjuntos grandes: reinícios com sementes aleatórias rodam no pool de
+   processos enquanto este processo otimiza a semente determinística;
+   vence a menor distância entregue dentro do prazo
+
+📐 ROTA ABERTA: A partida é fixa e a rota termina na última parada. Um
+nó fictício no fim (distância 0 de todos, ou a distância de volta à
+partida com retornar=True) faz as duas variantes usarem o mesmo código.
+
+⏰ PRAZO: Todas as buscas conferem o mesmo instante absoluto
+(time.time()); a resposta sai dentro do tempo pedido mesmo com o pool
+ainda subindo.
+
+Este módulo não usa modelos nem o banco (roda nos processos do pool).
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from logitrack_backend.tracing import get_tracer
+from .geo import haversine_m
+
+trace = get_tracer(__name__)
+
+LIMITE_PARADAS_ROTEIRO = 1000
+
+TEMPO_LIMITE_PADRAO_MS = 2000
+TEMPO_LIMITE_MAXIMO_MS = 10000
+
+# A partir de quantas paradas os reinícios vão para o pool de processos
+MINIMO_PARADAS_PROCESSOS = 150
+
+PROCESSOS_ROTEIRIZACAO = min(4, os.cpu_count() or 1)
+
+BLOCO_MAXIMO_OR_OPT = 3
+
+# Ganhos menores que isso (metros) são ruído de ponto flutuante
+GANHO_MINIMO_M = 1e-6
+
+# Semente aleatória: escolhe entre os N vizinhos mais próximos ainda livres
+VIZINHOS_SEMENTE_ALEATORIA = 3
+
+# Folga para recolher os resultados do pool depois do prazo
+FOLGA_POOL_S = 0.05
+
+_pool = {'executor': None}
+
+
+# ==============================================================================
+# 📐 MATRIZ E CUSTO
+# ==============================================================================
+
+def matriz_distancias(latitudes, longitudes, retornar=False):
+    """
+    Distâncias em metros entre a partida (índice 0) e as paradas (1..n),
+    mais o nó fictício de fim (n + 1).
+
+    Returns:
+        np.ndarray: Matriz (n + 2) × (n + 2)
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    pontos = len(latitudes)
+
+    matriz = np.zeros((pontos + 1, pontos + 1))
+    matriz[:pontos, :pontos] = haversine_m(
+        latitudes[:, None], longitudes[:, None], latitudes[None, :], longitudes[None, :]
+    )
+    if retornar:
+        matriz[:pontos, pontos] = matriz[pontos, :pontos] = matriz[:pontos, 0]
+    return matriz
+
+
+def custo_rota(matriz, rota):
+    """Distância total (m): partida → paradas → nó de fim."""
+    return float(matriz[rota[:-1], rota[1:]].sum())
+
+
+# ==============================================================================
+# 🌱 SEMENTE
+# ==============================================================================
+
+def vizinho_mais_proximo(matriz, aleatorio=None):
+    """
+    Rota gulosa a partir da partida.
+
+    Com `aleatorio` (np.random.Generator), cada passo sorteia entre os
+    VIZINHOS_SEMENTE_ALEATORIA mais próximos (sementes dos reinícios).
+
+    Returns:
+        np.ndarray: [0, paradas..., n + 1]
+    """
+    fim = len(matriz) - 1
+    livres = np.ones(fim, dtype=bool)
+    livres[0] = False
+    rota = [0]
+    atual = 0
+    for _ in range(fim - 1):
+        distancias = np.where(livres, matriz[atual, :fim], np.inf)
+        if aleatorio is None:
+            proximo = int(np.argmin(distancias))
+        else:
+            quantidade = min(VIZINHOS_SEMENTE_ALEATORIA, int(livres.sum()))
+            candidatos = np.argpartition(distancias, quantidade - 1)[:quantidade]
+            proximo = int(aleatorio.choice(candidatos))
+        rota.append(proximo)
+        livres[proximo] = False
+        atual = proximo
+    rota.append(fim)
+    return np.array(rota, dtype=np.int64)
+
+
+# ==============================================================================
+# 🔧 MELHORIA LOCAL
+# ==============================================================================
+
+def dois_opt(matriz, rota, prazo):
+    """
+    Uma passada de 2-opt (melhor j para cada i), alterando `rota`.
+
+    Inverter rota[i..j] troca as arestas (a, b) e (c, d) por (a, c) e
+    (b, d); o ganho de todos os j é calculado de uma vez.
+
+    Returns:
+        bool: True se alguma inversão foi aplicada
+    """
+    ultima = len(rota) - 2  # Última parada (o nó de fim não se move)
+    melhorou = False
+    for i in range(1, ultima):
+        if time.time() >= prazo:
+            break
+        a, b = rota[i - 1], rota[i]
+        j = np.arange(i + 1, ultima + 1)
+        c, d = rota[j], rota[j + 1]
+        ganhos = matriz[a, b] + matriz[c, d] - matriz[a, c] - matriz[b, d]
+        melhor = int(np.argmax(ganhos))
+        if ganhos[melhor] > GANHO_MINIMO_M:
+            fim = j[melhor]
+            rota[i:fim + 1] = rota[i:fim + 1][::-1].copy()
+            melhorou = True
+    return melhorou
+
+
+def or_opt(matriz, rota, prazo):
+    """
+    Uma passada de Or-opt: cada bloco de 1 a BLOCO_MAXIMO_OR_OPT paradas
+    vai para a aresta (fora dele) onde a inserção custa menos, na ordem
+    ou invertido, se o total diminuir.
+
+    Returns:
+        tuple: (rota, bool se algum bloco foi movido)
+    """
+    melhorou = False
+    for tamanho in range(1, BLOCO_MAXIMO_OR_OPT + 1):
+        i = 1
+        while i + tamanho <= len(rota) - 1:
+            if time.time() >= prazo:
+                return rota, melhorou
+            bloco = rota[i:i + tamanho]
+            inicio, fim = bloco[0], bloco[-1]
+            anterior, seguinte = rota[i - 1], rota[i + tamanho]
+            ganho_remocao = matriz[anterior, inicio] + matriz[fim, seguinte] - matriz[anterior, seguinte]
+
+            restante = np.concatenate([rota[:i], rota[i + tamanho:]])
+            u, v = restante[:-1], restante[1:]
+            base = matriz[u, v]
+            na_ordem = matriz[u, inicio] + matriz[fim, v] - base
+            invertido = matriz[u, fim] + matriz[inicio, v] - base
+            # Inserir de volta no mesmo lugar não é movimento
+            na_ordem[i - 1] = invertido[i - 1] = np.inf
+
+            k_ordem, k_invertido = int(np.argmin(na_ordem)), int(np.argmin(invertido))
+            if invertido[k_invertido] < na_ordem[k_ordem]:
+                k, custo, bloco = k_invertido, invertido[k_invertido], bloco[::-1]
+            else:
+                k, custo = k_ordem, na_ordem[k_ordem]
+
+            if ganho_remocao - custo > GANHO_MINIMO_M:
+                rota = np.concatenate([restante[:k + 1], bloco, restante[k + 1:]])
+                melhorou = True
+            else:
+                i += 1
+    return rota, melhorou
+
+
+def busca_local(matriz, rota, prazo):
+    """2-opt e Or-opt alternados até não haver ganho ou o prazo acabar."""
+    melhorou = True
+    while melhorou and time.time() < prazo:
+        melhorou = dois_opt(matriz, rota, prazo)
+        rota, moveu = or_opt(matriz, rota, prazo)
+        melhorou = melhorou or moveu
+    return rota
+
+
+def otimizar(latitudes, longitudes, retornar, prazo, semente=None):
+    """
+    Uma busca completa: semente (determinística ou aleatória) + melhoria.
+
+    Função de topo para rodar nos processos do pool.
+
+    Returns:
+        tuple: (distância em m, rota como lista de índices)
+    """
+    matriz = matriz_distancias(latitudes, longitudes, retornar)
+    aleatorio = None if semente is None else np.random.default_rng(semente)
+    rota = busca_local(matriz, vizinho_mais_proximo(matriz, aleatorio), prazo)
+    return custo_rota(matriz, rota), rota.tolist()
+
+
+# ==============================================================================
+# 🚚 PLANEJAMENTO
+# ==============================================================================
+
+def _executor():
+    """Pool persistente (spawn: os processos não herdam conexões do Django)."""
+    if _pool['executor'] is None:
+        _pool['executor'] = ProcessPoolExecutor(
+            max_workers=PROCESSOS_ROTEIRIZACAO,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+    return _pool['executor']
+
+
+def planejar_rota(partida, paradas, retornar=False, tempo_limite_ms=TEMPO_LIMITE_PADRAO_MS):
+    """
+    Ordem de visita das paradas a partir da partida.
+
+    Args:
+        partida: (latitude, longitude)
+        paradas: Lista de (latitude, longitude)
+        retornar: Conta a volta até a partida no fim
+        tempo_limite_ms: Prazo total da otimização
+
+    Returns:
+        dict: ordem (índices em `paradas`), trechos_m (distância até cada
+        parada), distancia_m, distancia_inicial_m (vizinho mais
+        próximo) e reinicios (buscas do pool que terminaram a tempo)
+    """
+    inicio = time.time()
+    prazo = inicio + tempo_limite_ms / 1000
+    latitudes = np.array([partida[0]] + [parada[0] for parada in paradas], dtype=np.float64)
+    longitudes = np.array([partida[1]] + [parada[1] for parada in paradas], dtype=np.float64)
+
+    # Reinícios aleatórios no pool enquanto este processo otimiza a semente gulosa
+    futuros = []
+    if len(paradas) >= MINIMO_PARADAS_PROCESSOS and PROCESSOS_ROTEIRIZACAO > 1:
+        try:
+            executor = _executor()
+            futuros = [
+                executor.submit(otimizar, latitudes, longitudes, retornar, prazo, semente)
+                for semente in range(1, PROCESSOS_ROTEIRIZACAO + 1)
+            ]
+        except (BrokenProcessPool, RuntimeError):
+            _pool['executor'] = None
+
+    matriz = matriz_distancias(latitudes, longitudes, retornar)
+    semente = vizinho_mais_proximo(matriz)
+    distancia_inicial = custo_rota(matriz, semente)
+    rota = busca_local(matriz, semente.copy(), prazo)
+    melhor = (custo_rota(matriz, rota), rota.tolist())
+
+    reinicios = 0
+    if futuros:
+        prontos, pendentes = wait(futuros, timeout=max(prazo - time.time(), 0) + FOLGA_POOL_S)
+        for futuro in pendentes:
+            futuro.cancel()
+        for futuro in prontos:
+            try:
+                resultado = futuro.result()
+            except BrokenProcessPool:
+                _pool['executor'] = None
+                continue
+            reinicios += 1
+            melhor = min(melhor, resultado, key=lambda item: item[0])
+
+    distancia, rota = melhor
+    ordem = rota[1:-1]
+    trechos = matriz[rota[:-2], ordem]
+    trace.debug("🧭 Rota com %s paradas: %.0f m → %.0f m (%s reinícios, %.0f ms)",
+                len(paradas), distancia_inicial, distancia, reinicios, (time.time() - inicio) * 1000)
+
+    return {
+        'ordem': [indice - 1 for indice in ordem],
+        'trechos_m': trechos.tolist(),
+        'distancia_m': distancia,
+        'distancia_inicial_m': distancia_inicial,
+        'reinicios': reinicios,
+    }
@@ -0,0 +1,244 @@
+# ==============================================================================
+# ÍNDICE DE BUSCA TEXTUAL DAS ORDENS DE TRANSPORTE
+# ==============================================================================
+
+# Arquivo: backend/core/search.py
+
+"""
+Busca textual de OTs por numero_ot, cliente_nome, endereco_entrega,
+cidade_entrega e observacoes.
+
+🎯 PROPÓSITO: Trocar os filtros icontains (que varrem a tabela inteira)
+por um índice full-text com ranking e busca por prefixo.
+
+🔌 BACKENDS:
+- SQLiteFTS5Backend: tabela virtual FTS5 (padrão no SQLite)
+- IcontainsBackend: fallback genérico, sem índice, para outros bancos
+
+Para usar outro backend, aponte LOGITRACK_BUSCA_BACKEND (settings) para
+o caminho de uma subclasse de BackendBusca, por exemplo
+'meuapp.busca.PostgresBackend'. O backend é carregado na inicialização
+(CoreConfig.ready): um caminho errado ou uma classe incompleta derruba o
+processo na subida, não na primeira busca.
+
+🔄 SINCRONIA: Os sinais de OrdemTransporte chamam indexar_ot/remover_ot
+em cada save/delete. Alterações em massa (queryset.update) não disparam
+sinais; depois delas rode `python manage.py reindexar_busca_ot`.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import Q
+from django.utils.module_loading import import_string
+
+# Campos indexados, na ordem das colunas do índice
+CAMPOS_BUSCA = (
+    'numero_ot',
+    'cliente_nome',
+    'endereco_entrega',
+    'cidade_entrega',
+    'observacoes',
+)
+
+# Peso de cada campo no ranking (mesma ordem de CAMPOS_BUSCA)
+PESOS_BUSCA = (10.0, 5.0, 1.0, 2.0, 0.5)
+
+_TERMO_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def extrair_termos(texto):
+    """Quebra o texto digitado em termos (letras e dígitos)."""
+    return _TERMO_RE.findall(texto or '')
+
+
+# ==============================================================================
+# 🔌 BACKENDS
+# ==============================================================================
+
+class BackendBusca(ABC):
+    """
+    Interface dos backends de busca.
+
+    `buscar` recebe um queryset de OTs (já filtrado por permissão) e um
+    dict {campo: texto}; o campo especial 'q' busca em todos os campos.
+    Retorna o queryset filtrado e ordenado por relevância.
+
+    indexar/remover/reconstruir são opcionais (no-op para backends sem
+    índice próprio).
+    """
+
+    @abstractmethod
+    def buscar(self, queryset, criterios):
+        """Filtra e ordena o queryset de OTs pelos critérios."""
+
+    def indexar(self, ot):
+        """Grava (ou regrava) a OT no índice."""
+
+    def remover(self, ot_id):
+        """Remove a OT do índice."""
+
+    def reconstruir(self):
+        """Recria o índice inteiro a partir da tabela de OTs."""
+
+
+class IcontainsBackend(BackendBusca):
+    """
+    Fallback sem índice: AND entre os termos, cada termo em qualquer campo.
+
+    Ordena por data de criação (não há ranking).
+    """
+
+    def buscar(self, queryset, criterios):
+        for campo, texto in criterios.items():
+            campos = CAMPOS_BUSCA if campo == 'q' else (campo,)
+            for termo in extrair_termos(texto):
+                queryset = queryset.filter(
+                    reduce(or_, (Q(**{f'{nome}__icontains': termo}) for nome in campos))
+                )
+        return queryset.order_by('-data_criacao', 'id')
+
+
+class SQLiteFTS5Backend(BackendBusca):
+    """
+    Índice em uma tabela virtual FTS5, com rowid = id da OT.
+
+    - Tokenizer unicode61 sem acentos ("São" encontra "sao")
+    - Índices de prefixo de 2 e 3 caracteres para buscas curtas
+    - Ranking bm25 com os pesos de PESOS_BUSCA
+    """
+
+    tabela = 'core_ot_busca'
+
+    def criar_tabela(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.tabela} USING fts5("
+            f"{', '.join(CAMPOS_BUSCA)}, "
+            "tokenize = 'unicode61 remove_diacritics 2', "
+            "prefix = '2 3')"
+        )
+
+    def montar_consulta(self, criterios):
+        """
+        Converte {campo: texto} em uma expressão MATCH do FTS5.
+
+        Cada termo vira '"termo"*' (prefixo); termos são combinados com
+        AND. Ex.: {'cliente_nome': 'emp abc'} →
+        'cliente_nome : ("emp"* "abc"*)'
+        """
+        partes = []
+        for campo, texto in criterios.items():
+            termos = ' '.join(f'"{termo}"*' for termo in extrair_termos(texto))
+            if not termos:
+                continue
+            partes.append(f'({termos})' if campo == 'q' else f'{campo} : ({termos})')
+        return ' AND '.join(partes)
+
+    def buscar(self, queryset, criterios):
+        consulta = self.montar_consulta(criterios)
+        if not consulta:
+            return queryset.none()
+
+        tabela_ot = queryset.model._meta.db_table
+        pesos = ', '.join(str(peso) for peso in PESOS_BUSCA)
+
+        # Join direto com a tabela virtual: o FTS5 resolve o MATCH e o
+        # rowid liga cada hit à OT, sem varrer core_ordemtransporte.
+        return queryset.extra(
+            select={'relevancia': f'bm25({self.tabela}, {pesos})'},
+            tables=[self.tabela],
+            where=[
+                f'{self.tabela} MATCH %s',
+                f'{self.tabela}.rowid = {tabela_ot}.id',
+            ],
+            params=[consulta],
+        ).order_by('relevancia', '-data_criacao', 'id')
+
+    def indexar(self, ot):
+        valores = [getattr(ot, campo) or '' for campo in CAMPOS_BUSCA]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.tabela} WHERE rowid = %s', [ot.pk])
+            cursor.execute(
+                f"INSERT INTO {self.tabela} (rowid, {', '.join(CAMPOS_BUSCA)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(CAMPOS_BUSCA))})",
+                [ot.pk, *valores]
+            )
+
+    def remover(self, ot_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.tabela} WHERE rowid = %s', [ot_id])
+
+    def reconstruir(self):
+        tabela_ot = 'core_ordemtransporte'
+        colunas = ', '.join(CAMPOS_BUSCA)
+        valores = ', '.join(f"COALESCE({campo}, '')" for campo in CAMPOS_BUSCA)
+        with connection.cursor() as cursor:
+            self.criar_tabela(cursor)
+            cursor.execute(f'DELETE FROM {self.tabela}')
+            cursor.execute(
+                f'INSERT INTO {self.tabela} (rowid, {colunas}) '
+                f'SELECT id, {valores} FROM {tabela_ot}'
+            )
+            cursor.execute(f"INSERT INTO {self.tabela} ({self.tabela}) VALUES ('optimize')")
+
+
+# ==============================================================================
+# 🎯 API DO MÓDULO
+# ==============================================================================
+
+_backend = None
+
+
+def get_backend():
+    """
+    Backend de busca configurado (instanciado uma única vez).
+
+    Sem LOGITRACK_BUSCA_BACKEND, usa FTS5 no SQLite e o fallback
+    icontains nos demais bancos.
+    """
+    global _backend
+    if _backend is None:
+        caminho = getattr(settings, 'LOGITRACK_BUSCA_BACKEND', '')
+        if caminho:
+            _backend = _carregar_backend(caminho)
+        elif connection.vendor == 'sqlite':
+            _backend = SQLiteFTS5Backend()
+        else:
+            _backend = IcontainsBackend()
+    return _backend
+
+
+def _carregar_backend(caminho):
+    """Instancia a classe de LOGITRACK_BUSCA_BACKEND, validando a interface."""
+    try:
+        classe = import_string(caminho)
+    except ImportError as e:
+        raise ImproperlyConfigured(f'LOGITRACK_BUSCA_BACKEND inválido ({caminho}): {e}') from e
+    if not (isinstance(classe, type) and issubclass(classe, BackendBusca)):
+        raise ImproperlyConfigured(f'LOGITRACK_BUSCA_BACKEND ({caminho}) não é uma subclasse de BackendBusca')
+    try:
+        return classe()
+    except TypeError as e:  # Métodos abstratos não implementados
+        raise ImproperlyConfigured(f'LOGITRACK_BUSCA_BACKEND ({caminho}): {e}') from e
+
+
+def buscar_ots(queryset, criterios):
+    """Filtra e ordena o queryset de OTs por relevância."""
+    return get_backend().buscar(queryset, criterios)
+
+
+def indexar_ot(ot):
+    get_backend().indexar(ot)
+
+
+def remover_ot(ot_id):
+    get_backend().remover(ot_id)
+
+
+def reconstruir_indice():
+    get_backend().reconstruir()
@@ -9,10 +9,15 @@ from rest_framework import serializers
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from .models import OrdemTransporte, Arquivo, TransferenciaOT, AtualizacaoOT
+from .eta import estimar_entrega
+from .roteirizacao import LIMITE_PARADAS_ROTEIRO, TEMPO_LIMITE_MAXIMO_MS, TEMPO_LIMITE_PADRAO_MS
+from .transicoes import LIMITE_LOTE_STATUS, transicionar_status
 from accounts.models import CustomUser
+from logitrack_backend.tracing import get_tracer
 import logging
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(__name__)
 
 # ==============================================================================
 # 🔧 SERIALIZER SIMPLES PARA USUÁRIO (SEM DEPENDÊNCIAS EXTERNAS)
@@ -69,11 +74,11 @@ class OrdemTransporteCreateSerializer(serializers.ModelSerializer):
         - Status ativos: INICIADA, EM_CARREGAMENTO, EM_TRANSITO
         - Status finais: ENTREGUE, ENTREGUE_PARCIAL, CANCELADA
         """
-        print(f"🚫 VALIDAÇÃO: Verificando se motorista pode criar OT")
+        trace.debug("🚫 VALIDAÇÃO: Verificando se motorista pode criar OT")
         
         # Obter usuário da requisição
         user = self.context['request'].user
-        print(f"🚫 Motorista: {user.email} (ID: {user.id})")
+        trace.debug("🚫 Motorista: %s (ID: %s)", user.email, user.id)
         
         # Verificar se já tem OT ativa
         ots_ativas = OrdemTransporte.objects.filter(
@@ -82,14 +87,12 @@ class OrdemTransporteCreateSerializer(serializers.ModelSerializer):
             ativa=True
         ).select_related('motorista_atual')
         
-        count_ativas = ots_ativas.count()
-        print(f"🚫 OTs ativas encontradas: {count_ativas}")
+        trace.debug(lambda: f"🚫 OTs ativas encontradas: {ots_ativas.count()}")
         
-        if ots_ativas.exists():
-            ot_ativa = ots_ativas.first()
-            
-            print(f"❌ VALIDAÇÃO FALHOU: Motorista já tem OT ativa: {ot_ativa.numero_ot}")
-            print(f"❌ Status da OT ativa: {ot_ativa.status} ({ot_ativa.get_status_display()})")
+        ot_ativa = ots_ativas.first()
+        if ot_ativa is not None:
+            trace.debug("❌ VALIDAÇÃO FALHOU: Motorista já tem OT ativa: %s", ot_ativa.numero_ot)
+            trace.debug(lambda: f"❌ Status da OT ativa: {ot_ativa.status} ({ot_ativa.get_status_display()})")
             
             raise serializers.ValidationError({
                 'non_field_errors': [
@@ -99,7 +102,7 @@ class OrdemTransporteCreateSerializer(serializers.ModelSerializer):
                 ]
             })
         
-        print(f"✅ VALIDAÇÃO PASSOU: Motorista pode criar nova OT")
+        trace.debug("✅ VALIDAÇÃO PASSOU: Motorista pode criar nova OT")
         return attrs
     
     def create(self, validated_data):
@@ -108,12 +111,12 @@ class OrdemTransporteCreateSerializer(serializers.ModelSerializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo de criação
         """
-        print(f"🚚 CREATE OT: Criando nova OT")
-        print(f"🚚 Dados: {validated_data}")
+        trace.debug("🚚 CREATE OT: Criando nova OT")
+        trace.debug("🚚 Dados: %s", validated_data)
         
         # Obter usuário da requisição
         user = self.context['request'].user
-        print(f"🚚 Motorista criador: {user.email}")
+        trace.debug("🚚 Motorista criador: %s", user.email)
         
         # Criar OT com motorista criador
         ot = OrdemTransporte.objects.create(
@@ -121,7 +124,7 @@ class OrdemTransporteCreateSerializer(serializers.ModelSerializer):
             **validated_data
         )
         
-        print(f"✅ OT criada: {ot.numero_ot} (ID: {ot.id})")
+        trace.debug("✅ OT criada: %s (ID: %s)", ot.numero_ot, ot.id)
         return ot
 
 
@@ -140,6 +143,7 @@ class OrdemTransporteListSerializer(serializers.ModelSerializer):
     pode_ser_editada = serializers.ReadOnlyField()
     pode_ser_transferida = serializers.ReadOnlyField()
     esta_finalizada = serializers.ReadOnlyField()
+    previsao_entrega = serializers.SerializerMethodField()
     
     class Meta:
         model = OrdemTransporte
@@ -148,8 +152,14 @@ class OrdemTransporteListSerializer(serializers.ModelSerializer):
             'cliente_nome', 'cidade_entrega', 'observacoes',
             'data_criacao', 'data_finalizacao',
             'motorista_criador', 'motorista_atual',
-            'pode_ser_editada', 'pode_ser_transferida', 'esta_finalizada'
+            'pode_ser_editada', 'pode_ser_transferida', 'esta_finalizada',
+            'previsao_entrega'
         ]
+    
+    def get_previsao_entrega(self, obj):
+        """Horário previsto de entrega (core/eta.py) ou None."""
+        previsao = estimar_entrega(obj)
+        return serializers.DateTimeField().to_representation(previsao) if previsao else None
 
 
 class OrdemTransporteDetailSerializer(serializers.ModelSerializer):
@@ -185,21 +195,27 @@ class OrdemTransporteDetailSerializer(serializers.ModelSerializer):
     arquivos_count = serializers.SerializerMethodField()
     arquivos_por_tipo = serializers.SerializerMethodField()
     
+    # Previsão de entrega (core/eta.py)
+    previsao_entrega = serializers.SerializerMethodField()
+    
     class Meta:
         model = OrdemTransporte
         fields = [
-            'id', 'numero_ot', 'status', 'status_display',
+            'id', 'numero_ot', 'versao', 'status', 'status_display',
             'cliente_nome', 'endereco_entrega', 'cidade_entrega',
             'observacoes', 'observacoes_entrega',
             'data_criacao', 'data_atualizacao', 'data_finalizacao',
+            'status_alterado_em', 'previsao_entrega',
             'latitude_origem', 'longitude_origem', 'endereco_origem',
             'latitude_entrega', 'longitude_entrega', 'endereco_entrega_real',
+            'raio_geocerca_m', 'geocerca_entrada_em',  # Geocerca (core/geocercas.py)
             'motorista_criador', 'motorista_atual',
             'pode_ser_editada', 'pode_ser_transferida', 'esta_finalizada',
             'pode_ser_finalizada', 'motivo_nao_finalizar',  # 🔧 NOVOS
             'tem_canhoto', 'tem_foto_entrega',              # 🔧 NOVOS
             'arquivos', 'arquivos_count', 'arquivos_por_tipo',  # 🔧 NOVOS
-            'transferencias', 'atualizacoes_recentes'
+            'transferencias', 'atualizacoes_recentes',
+            'distancia_km', 'tempo_movimento_s', 'paradas'  # Percurso (core/percurso.py)
         ]
     
     def get_arquivos(self, obj):
@@ -230,6 +246,11 @@ class OrdemTransporteDetailSerializer(serializers.ModelSerializer):
         """Retorna atualizações recentes da OT."""
         atualizacoes = obj.atualizacoes.all()[:10]  # Últimas 10 atualizações
         return AtualizacaoOTSerializer(atualizacoes, many=True).data
+    
+    def get_previsao_entrega(self, obj):
+        """Horário previsto de entrega ou None (OT finalizada / modelo não ajustado)."""
+        previsao = estimar_entrega(obj)
+        return serializers.DateTimeField().to_representation(previsao) if previsao else None
 
 
 class OrdemTransporteUpdateSerializer(serializers.ModelSerializer):
@@ -246,7 +267,7 @@ class OrdemTransporteUpdateSerializer(serializers.ModelSerializer):
         fields = [
             'observacoes', 'observacoes_entrega',
             'latitude_entrega', 'longitude_entrega', 'endereco_entrega_real',
-            'status'
+            'raio_geocerca_m', 'status'
         ]
     
     def validate_status(self, value):
@@ -255,69 +276,53 @@ class OrdemTransporteUpdateSerializer(serializers.ModelSerializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver validação de status
         """
-        print(f"🚚 STATUS VALIDATION: Novo status: {value}")
+        trace.debug("🚚 STATUS VALIDATION: Novo status: %s", value)
         
         instance = self.instance
         if instance:
-            print(f"🚚 Status atual: {instance.status}")
+            trace.debug("🚚 Status atual: %s", instance.status)
             
             if not instance.pode_transicionar_para(value):
-                print(f"❌ Transição inválida: {instance.status} → {value}")
+                trace.debug("❌ Transição inválida: %s → %s", instance.status, value)
                 raise serializers.ValidationError(
                     f'Não é possível transicionar de {instance.get_status_display()} para {dict(OrdemTransporte.STATUS_CHOICES)[value]}'
                 )
             
-            print(f"✅ Transição válida: {instance.status} → {value}")
+            trace.debug("✅ Transição válida: %s → %s", instance.status, value)
         
         return value
     
     def update(self, instance, validated_data):
         """
         Atualiza a OT e registra as mudanças.
-        
+
+        ⚡ Uma escrita por requisição: com mudança de status, os demais
+        campos vão no mesmo UPDATE da transição (core.transicoes); sem
+        ela, save() grava só os campos enviados.
+
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo de atualização
         """
-        print(f"🚚 UPDATE OT: Atualizando {instance.numero_ot}")
-        print(f"🚚 Dados novos: {validated_data}")
-        print(f"🚚 Status atual: {instance.status}")
+        trace.debug("🚚 UPDATE OT: Atualizando %s", instance.numero_ot)
+        trace.debug("🚚 Dados novos: %s", validated_data)
+        trace.debug("🚚 Status atual: %s", instance.status)
+        
+        validated_data = validated_data.copy()
+        novo_status = validated_data.pop('status', None)
+        observacao = validated_data.pop('observacao', '')
         
-        # 🔧 CORREÇÃO: Verificar se há mudança de status REAL
-        novo_status = validated_data.get('status')
         if novo_status and novo_status != instance.status:
-            print(f"🚚 Mudança de status detectada: {instance.status} → {novo_status}")
-            
-            # Usar método do modelo para atualizar status
-            validated_data_copy = validated_data.copy()
-            validated_data_copy.pop('status')  # Remover para não duplicar
-            
-            # Atualizar outros campos primeiro
-            for attr, value in validated_data_copy.items():
-                setattr(instance, attr, value)
-            instance.save()
+            trace.debug("🚚 Mudança de status detectada: %s → %s", instance.status, novo_status)
             
-            # Atualizar status com validação e log
             user = self.context['request'].user
-            observacao = validated_data.get('observacao', '')
-            instance.atualizar_status(novo_status, user, observacao)
+            transicionar_status(instance, novo_status, user, observacao, campos=validated_data)
             
-        elif novo_status and novo_status == instance.status:
-            # 🔧 CORREÇÃO: Se status é igual, não tentar atualizar status
-            print(f"⚠️ Status já é {novo_status}, apenas atualizando outros campos")
-            validated_data_copy = validated_data.copy()
-            validated_data_copy.pop('status')  # Remover status duplicado
-            
-            # Atualizar apenas outros campos
-            for attr, value in validated_data_copy.items():
-                setattr(instance, attr, value)
-            instance.save()
-            
-        else:
-            # Atualização normal sem mudança de status
+        elif validated_data:
+            # Atualização sem mudança de status
             for attr, value in validated_data.items():
                 setattr(instance, attr, value)
-            instance.save()
+            instance.save(update_fields=[*validated_data, 'data_atualizacao'])
         
-        print(f"✅ OT {instance.numero_ot} atualizada com sucesso")
+        trace.debug("✅ OT %s atualizada com sucesso", instance.numero_ot)
         return instance
 
 
@@ -353,9 +358,9 @@ class ArquivoSerializer(serializers.ModelSerializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver upload
         """
-        print(f"📎 UPLOAD: Enviando arquivo")
-        print(f"📎 Tipo: {validated_data.get('tipo')}")
-        print(f"📎 Descrição: {validated_data.get('descricao', 'Sem descrição')}")
+        trace.debug("📎 UPLOAD: Enviando arquivo")
+        trace.debug(lambda: f"📎 Tipo: {validated_data.get('tipo')}")
+        trace.debug(lambda: f"📎 Descrição: {validated_data.get('descricao', 'Sem descrição')}")
         
         # Obter dados do contexto
         user = self.context['request'].user
@@ -368,7 +373,7 @@ class ArquivoSerializer(serializers.ModelSerializer):
             **validated_data
         )
         
-        print(f"✅ Arquivo enviado: {arquivo.nome_arquivo}")
+        trace.debug("✅ Arquivo enviado: %s", arquivo.nome_arquivo)
         
         # Criar registro de atualização
         AtualizacaoOT.objects.create(
@@ -402,7 +407,7 @@ class TransferenciaOTSerializer(serializers.ModelSerializer):
     class Meta:
         model = TransferenciaOT
         fields = [
-            'id', 'status', 'status_display', 'motivo',
+            'id', 'versao', 'status', 'status_display', 'motivo',
             'observacao_aprovacao', 'data_solicitacao', 'data_resposta',
             'motorista_origem', 'motorista_destino',
             'solicitado_por', 'aprovado_por',
@@ -432,14 +437,14 @@ class TransferenciaOTCreateSerializer(serializers.ModelSerializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver validação
         """
-        print(f"🔄 TRANSFER VALIDATION: Motorista destino ID: {value}")
+        trace.debug("🔄 TRANSFER VALIDATION: Motorista destino ID: %s", value)
         
         try:
             motorista = CustomUser.objects.get(id=value, role='motorista', is_active=True)
-            print(f"✅ Motorista encontrado: {motorista.email}")
+            trace.debug("✅ Motorista encontrado: %s", motorista.email)
             return value
         except CustomUser.DoesNotExist:
-            print(f"❌ Motorista não encontrado ou inativo: {value}")
+            trace.debug("❌ Motorista não encontrado ou inativo: %s", value)
             raise serializers.ValidationError("Motorista não encontrado ou inativo.")
     
     def create(self, validated_data):
@@ -448,7 +453,7 @@ class TransferenciaOTCreateSerializer(serializers.ModelSerializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo de transferência
         """
-        print(f"🔄 CREATE TRANSFER: Iniciando transferência")
+        trace.debug("🔄 CREATE TRANSFER: Iniciando transferência")
         
         # Obter dados do contexto
         ot = self.context['ordem_transporte']
@@ -458,14 +463,14 @@ class TransferenciaOTCreateSerializer(serializers.ModelSerializer):
         motorista_destino_id = validated_data.pop('motorista_destino_id')
         motorista_destino = CustomUser.objects.get(id=motorista_destino_id)
         
-        print(f"🔄 OT: {ot.numero_ot}")
-        print(f"🔄 De: {ot.motorista_atual.email}")
-        print(f"🔄 Para: {motorista_destino.email}")
-        print(f"🔄 Solicitado por: {user.email}")
+        trace.debug("🔄 OT: %s", ot.numero_ot)
+        trace.debug(lambda: f"🔄 De: {ot.motorista_atual.email}")
+        trace.debug("🔄 Para: %s", motorista_destino.email)
+        trace.debug("🔄 Solicitado por: %s", user.email)
         
         # Validar se OT pode ser transferida
         if not ot.pode_ser_transferida:
-            print(f"❌ OT não pode ser transferida no status: {ot.status}")
+            trace.debug("❌ OT não pode ser transferida no status: %s", ot.status)
             raise serializers.ValidationError("Esta OT não pode ser transferida no status atual.")
         
         # Usar método do modelo para criar transferência
@@ -485,7 +490,7 @@ class TransferenciaOTCreateSerializer(serializers.ModelSerializer):
         
         transferencia.save()
         
-        print(f"✅ Transferência criada: {transferencia.id} (Status: {transferencia.status})")
+        trace.debug("✅ Transferência criada: %s (Status: %s)", transferencia.id, transferencia.status)
         return transferencia
 
 
@@ -542,6 +547,77 @@ class OrdemTransporteBuscaSerializer(serializers.Serializer):
         return attrs
 
 
+class RoteirizacaoSerializer(serializers.Serializer):
+    """
+    📝 PROPÓSITO: Pedido de sequenciamento de entregas
+    
+    🎯 USADO EM: POST /api/ots/roteirizar/
+    
+    Valida IDs (únicos, com coordenadas de entrega), partida e prazo; as
+    OTs carregadas ficam em validated_data['ots'], na ordem recebida.
+    """
+    
+    ot_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        min_length=1,
+        max_length=LIMITE_PARADAS_ROTEIRO
+    )
+    latitude = serializers.FloatField(min_value=-90, max_value=90, help_text='Latitude da partida')
+    longitude = serializers.FloatField(min_value=-180, max_value=180, help_text='Longitude da partida')
+    retornar = serializers.BooleanField(default=False, help_text='Contar a volta até a partida')
+    tempo_limite_ms = serializers.IntegerField(
+        min_value=100,
+        max_value=TEMPO_LIMITE_MAXIMO_MS,
+        default=TEMPO_LIMITE_PADRAO_MS
+    )
+    
+    def validate_ot_ids(self, value):
+        """IDs repetidos viram uma parada só; todas precisam ter local de entrega."""
+        ids = list(dict.fromkeys(value))
+        ots = OrdemTransporte.objects.in_bulk(ids)
+        
+        inexistentes = [ot_id for ot_id in ids if ot_id not in ots]
+        if inexistentes:
+            raise serializers.ValidationError(f'OTs não encontradas: {inexistentes[:20]}')
+        
+        sem_coordenadas = [
+            ot_id for ot_id in ids
+            if ots[ot_id].latitude_entrega is None or ots[ot_id].longitude_entrega is None
+        ]
+        if sem_coordenadas:
+            raise serializers.ValidationError(
+                f'OTs sem coordenadas de entrega: {sem_coordenadas[:20]}'
+            )
+        
+        self.ots = [ots[ot_id] for ot_id in ids]
+        return ids
+    
+    def validate(self, attrs):
+        attrs['ots'] = self.ots
+        return attrs
+
+
+class ItemStatusLoteSerializer(serializers.Serializer):
+    """Uma transição do lote: OT, status de destino e observação."""
+    
+    ot_id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=OrdemTransporte.STATUS_CHOICES)
+    observacao = serializers.CharField(required=False, allow_blank=True, default='')
+
+
+class StatusEmLoteSerializer(serializers.Serializer):
+    """
+    📝 PROPÓSITO: Mudança de status de várias OTs
+    
+    🎯 USADO EM: POST /api/ots/status-em-lote/
+    
+    Só valida o formato; as transições são conferidas item a item por
+    core.transicoes.transicionar_em_lote.
+    """
+    
+    itens = ItemStatusLoteSerializer(many=True, allow_empty=False, max_length=LIMITE_LOTE_STATUS)
+
+
 # ==============================================================================
 # 🛠️ SERIALIZERS PARA AÇÕES ESPECÍFICAS
 # ==============================================================================
@@ -569,12 +645,12 @@ class OrdemTransporteStatusSerializer(serializers.ModelSerializer):
         return value
     
     def update(self, instance, validated_data):
-        """Atualiza status usando método do modelo."""
+        """Atualiza status pelo serviço de transição (core.transicoes)."""
         novo_status = validated_data['status']
         observacao = validated_data.get('observacao', '')
         user = self.context['request'].user
         
-        instance.atualizar_status(novo_status, user, observacao)
+        transicionar_status(instance, novo_status, user, observacao)
         return instance
 
 
@@ -597,17 +673,15 @@ class OrdemTransporteFinalizarSerializer(serializers.ModelSerializer):
     
     def update(self, instance, validated_data):
         """Finaliza OT como entregue."""
-        print(f"🚚 FINALIZANDO OT: {instance.numero_ot}")
+        trace.debug("🚚 FINALIZANDO OT: %s", instance.numero_ot)
         
-        # Atualizar dados de entrega
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        
-        # Atualizar status para entregue
+        # Dados de entrega e status ENTREGUE no mesmo UPDATE
         user = self.context['request'].user
-        instance.atualizar_status('ENTREGUE', user, "OT finalizada com sucesso")
+        transicionar_status(
+            instance, 'ENTREGUE', user, "OT finalizada com sucesso", campos=validated_data
+        )
         
-        print(f"✅ OT {instance.numero_ot} finalizada")
+        trace.debug("✅ OT %s finalizada", instance.numero_ot)
         return instance
 
 
@@ -635,7 +709,7 @@ class TransferenciaAceitarSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"✅ ACEITAR: Transferência {instance.id}")
+        trace.debug("✅ ACEITAR: Transferência %s", instance.id)
         
         user = self.context['request'].user
         observacao = validated_data.get('observacao', '')
@@ -665,7 +739,7 @@ class TransferenciaRecusarSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"❌ RECUSAR: Transferência {instance.id}")
+        trace.debug("❌ RECUSAR: Transferência %s", instance.id)
         
         user = self.context['request'].user
         observacao = validated_data['observacao']
@@ -696,7 +770,7 @@ class TransferenciaCancelarSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"🚫 CANCELAR: Transferência {instance.id}")
+        trace.debug("🚫 CANCELAR: Transferência %s", instance.id)
         
         user = self.context['request'].user
         observacao = validated_data.get('observacao', '')
@@ -727,7 +801,7 @@ class TransferenciaAprovarSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"✅ APROVAR LOGISTICA: Transferência {instance.id}")
+        trace.debug("✅ APROVAR LOGISTICA: Transferência %s", instance.id)
         
         user = self.context['request'].user
         observacao = validated_data.get('observacao', '')
@@ -757,7 +831,7 @@ class TransferenciaRejeitarSerializer(serializers.Serializer):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"❌ REJEITAR LOGISTICA: Transferência {instance.id}")
+        trace.debug("❌ REJEITAR LOGISTICA: Transferência %s", instance.id)
         
         user = self.context['request'].user
         observacao = validated_data['observacao']
@@ -776,40 +850,43 @@ def debug_ot_serializer_flow(serializer_instance, step=""):
     serializer = OrdemTransporteCreateSerializer(data=request.data)
     debug_ot_serializer_flow(serializer, "Serializer criado")
     """
-    print(f"\n{'='*60}")
-    print(f"🔍 DEBUG OT SERIALIZER: {step}")
-    print(f"{'='*60}")
+    if not trace.enabled():
+        return
+    
+    trace.debug("\n" + "=" * 60)
+    trace.debug("🔍 DEBUG OT SERIALIZER: %s", step)
+    trace.debug("=" * 60)
     
     # Dados iniciais
     initial_data = getattr(serializer_instance, 'initial_data', None)
-    print(f"📥 Dados iniciais: {initial_data}")
+    trace.debug("📥 Dados iniciais: %s", initial_data)
     
     # Dados validados (se disponíveis)
     try:
         if hasattr(serializer_instance, '_validated_data'):
             validated_data = serializer_instance.validated_data
-            print(f"✅ Dados validados: {validated_data}")
+            trace.debug("✅ Dados validados: %s", validated_data)
         else:
-            print(f"⏳ Dados validados: [Ainda não validado]")
+            trace.debug("⏳ Dados validados: [Ainda não validado]")
     except:
-        print(f"⏳ Dados validados: [Ainda não validado]")
+        trace.debug("⏳ Dados validados: [Ainda não validado]")
     
     # Erros
     try:
         if hasattr(serializer_instance, '_errors'):
             errors = serializer_instance.errors
-            print(f"❌ Erros: {errors}")
+            trace.debug("❌ Erros: %s", errors)
         else:
-            print(f"❌ Erros: [Nenhuma validação executada]")
+            trace.debug("❌ Erros: [Nenhuma validação executada]")
     except:
-        print(f"❌ Erros: [Nenhuma validação executada]")
+        trace.debug("❌ Erros: [Nenhuma validação executada]")
     
     # Contexto
     context = getattr(serializer_instance, 'context', {})
     user = context.get('request', {}).user if context.get('request') else None
-    print(f"👤 Usuário: {user.email if user and hasattr(user, 'email') else 'N/A'}")
+    trace.debug(lambda: f"👤 Usuário: {user.email if user and hasattr(user, 'email') else 'N/A'}")
     
     # Tipo do serializer
-    print(f"🏷️ Tipo: {type(serializer_instance).__name__}")
+    trace.debug(lambda: f"🏷️ Tipo: {type(serializer_instance).__name__}")
     
-    print(f"{'='*60}\n")
\ No newline at end of file
+    trace.debug("=" * 60 + "\n")
\ No newline at end of file
@@ -0,0 +1,151 @@
+# ==============================================================================
+# ESTATÍSTICAS DAS ORDENS DE TRANSPORTE
+# ==============================================================================
+
+# Arquivo: backend/core/stats.py
+
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import OrdemTransporte, ContadorStatusOT
+
+# ==============================================================================
+# 📋 GRUPOS DE STATUS
+# ==============================================================================
+
+STATUS_ATIVOS = ['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO']
+STATUS_FINALIZADOS = ['ENTREGUE', 'ENTREGUE_PARCIAL']
+STATUS_CANCELADOS = ['CANCELADA']
+
+
+# ==============================================================================
+# 📊 MOTOR DE ESTATÍSTICAS
+# ==============================================================================
+
+def calcular_estatisticas_ots(queryset, dias_recentes=30):
+    """
+    Calcula todas as contagens de OTs em uma única query.
+
+    🎯 PROPÓSITO: Substituir um COUNT por status por um único
+    aggregate com COUNT ... FILTER (WHERE ...) para cada bucket.
+
+    Args:
+        queryset: QuerySet de OrdemTransporte (já filtrado por usuário)
+        dias_recentes: Janela, em dias, das estatísticas recentes
+
+    Returns:
+        dict: {
+            'total', 'ativas', 'finalizadas', 'canceladas',
+            'por_status': {STATUS: quantidade},
+            'recentes': {'total', 'finalizadas', 'distancia_km'}
+        }
+    """
+    data_limite = timezone.now() - timedelta(days=dias_recentes)
+    recente = Q(data_criacao__gte=data_limite)
+
+    agregados = {
+        'recentes_total': Count('id', filter=recente),
+        'recentes_finalizadas': Count(
+            'id', filter=recente & Q(status__in=STATUS_FINALIZADOS)
+        ),
+        'recentes_distancia_km': Sum('distancia_km', filter=recente),
+    }
+    for status_code, _ in OrdemTransporte.STATUS_CHOICES:
+        agregados[f'status_{status_code}'] = Count('id', filter=Q(status=status_code))
+
+    resultado = queryset.order_by().aggregate(**agregados)
+
+    estatisticas = _resumir({
+        status_code: resultado[f'status_{status_code}']
+        for status_code, _ in OrdemTransporte.STATUS_CHOICES
+    })
+    estatisticas['recentes'] = {
+        'total': resultado['recentes_total'],
+        'finalizadas': resultado['recentes_finalizadas'],
+        'distancia_km': resultado['recentes_distancia_km'] or 0,
+    }
+    return estatisticas
+
+
+def estatisticas_de_contadores(motorista_id=None, status=None):
+    """
+    Lê as contagens por status dos contadores materializados.
+
+    🎯 PROPÓSITO: Custo proporcional ao número de status, não de OTs.
+    Não inclui a janela de recentes (use estatisticas_recentes).
+
+    Args:
+        motorista_id: Restringe às OTs atuais do motorista (None = todas)
+        status: Restringe a um único status (os demais ficam zerados)
+
+    Returns:
+        dict: Mesmo formato de calcular_estatisticas_ots, sem 'recentes'
+    """
+    contadores = ContadorStatusOT.objects.filter(motorista_id=motorista_id)
+    if status:
+        contadores = contadores.filter(status=status)
+
+    por_status = {status_code: 0 for status_code, _ in OrdemTransporte.STATUS_CHOICES}
+    for status_code, quantidade in contadores.values_list('status', 'quantidade'):
+        por_status[status_code] = quantidade
+
+    return _resumir(por_status)
+
+
+def estatisticas_recentes(queryset, dias_recentes=30):
+    """
+    Conta as OTs criadas e finalizadas na janela recente.
+
+    Varre apenas o intervalo de data_criacao (indexado). A distância
+    soma o percurso já calculado em cada OT (core/percurso.py).
+    """
+    data_limite = timezone.now() - timedelta(days=dias_recentes)
+
+    recentes = queryset.filter(data_criacao__gte=data_limite).order_by().aggregate(
+        total=Count('id'),
+        finalizadas=Count('id', filter=Q(status__in=STATUS_FINALIZADOS)),
+        distancia_km=Sum('distancia_km'),
+    )
+    recentes['distancia_km'] = recentes['distancia_km'] or 0
+    return recentes
+
+
+def ranking_motoristas(limite=10):
+    """
+    Motoristas com mais OTs atuais, lido dos contadores materializados.
+
+    Returns:
+        list: Dicts no mesmo formato do antigo values().annotate() sobre OTs
+    """
+    ranking = ContadorStatusOT.objects.filter(
+        motorista__isnull=False
+    ).values(
+        'motorista__first_name', 'motorista__last_name', 'motorista__email'
+    ).annotate(
+        total_ots=Sum('quantidade')
+    ).filter(
+        total_ots__gt=0
+    ).order_by('-total_ots')[:limite]
+
+    return [
+        {
+            'motorista_atual__first_name': item['motorista__first_name'],
+            'motorista_atual__last_name': item['motorista__last_name'],
+            'motorista_atual__email': item['motorista__email'],
+            'total_ots': item['total_ots'],
+        }
+        for item in ranking
+    ]
+
+
+def _resumir(por_status):
+    """Monta os totais agrupados a partir das contagens por status."""
+    return {
+        'total': sum(por_status.values()),
+        'ativas': sum(por_status[s] for s in STATUS_ATIVOS),
+        'finalizadas': sum(por_status[s] for s in STATUS_FINALIZADOS),
+        'canceladas': sum(por_status[s] for s in STATUS_CANCELADOS),
+        'por_status': por_status,
+    }
@@ -1,3 +1,1251 @@
-from django.test import TestCase
+# ==============================================================================
+# TESTES DO APP CORE
+# ==============================================================================
 
-# Create your tests here.
+# Arquivo: backend/core/tests.py
+
+"""
+Testes do app core: um TestCase por funcionalidade, na ordem das seções
+(sequência de numero_ot, contadores, paginação, busca, rastreamento,
+geo, concorrência, ETA...). Inclui uma rodada curta dos casos de
+benchmark.
+
+🚀 python manage.py test core
+"""
+
+import itertools
+import math
+import time
+from collections import Counter
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+import numpy as np
+from django.apps import apps
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .benchmarks import comparar, criar_casos, medir, popular_dataset
+from .compactacao import (
+    codificar_segmento, codificar_varints, de_ms, decodificar_segmento, decodificar_varints, para_ms
+)
+from .dados_sinteticos import GeradorDadosSinteticos
+from .geo import (
+    MAXIMO_CELULAS_BUSCA, RAIO_MAXIMO_KM, RAIO_TERRA_M, celulas_no_raio, codificar_geohash, codificar_geohashes,
+    filtrar_proximidade, filtro_geohash, haversine_m
+)
+from .management.commands.recalcular_contadores_ot import Command as RecalcularContadores
+from . import geocercas, mapa_calor, roteirizacao, search
+from .models import (
+    AtualizacaoOT, ContadorStatusOT, EstimativaETA, OrdemTransporte, PontoRastreamento, PosicaoAtual,
+    SequenciaDiariaOT
+)
+from .geocercas import (
+    DENTRO, FAIXA, FATOR_SAIDA_GEOCERCA, FORA, INTERVALO_MINIMO_RECARGA_GEOCERCAS_S, _transicoes,
+    processar_pontos
+)
+from .mapa_calor import (
+    GRADE_TILE, STATUS_MAPA_CALOR, TEMPO_CACHE_MAPA_CALOR, TEMPO_CACHE_MAPA_CALOR_LOCAL, limites_tile,
+    posicao_no_mundo
+)
+from .percurso import finalizar_percurso
+from .posicoes import RAIO_INICIAL_PROXIMOS_KM, atualizar_posicao, motoristas_proximos
+from .rastreamento import MAXIMO_ATRASO, registrar_pontos, validar_pontos
+from .roteirizacao import (
+    FOLGA_POOL_S, MINIMO_PARADAS_PROCESSOS, custo_rota, matriz_distancias, planejar_rota
+)
+from .trilha import codificar_polyline, simplificar
+
+
+class BaseOTTestCase(TestCase):
+    """Motoristas, um usuário de logística e um helper para criar OTs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        motoristas, logistica = GeradorDadosSinteticos(seed=7).criar_usuarios(3, 1)
+        cls.motorista, cls.outro_motorista, cls.terceiro_motorista = motoristas
+        cls.logistica = logistica[0]
+
+    def setUp(self):
+        # Totais da paginação e versões da trilha ficam no cache (locmem)
+        cache.clear()
+
+    def criar_ot(self, motorista=None, **campos):
+        campos.setdefault('cliente_nome', 'Cliente Teste')
+        campos.setdefault('endereco_entrega', 'Rua do Teste, 1')
+        campos.setdefault('cidade_entrega', 'São Paulo')
+        return OrdemTransporte.objects.create(motorista_criador=motorista or self.motorista, **campos)
+
+    def cliente(self, usuario):
+        cliente = APIClient()
+        cliente.force_authenticate(usuario)
+        return cliente
+
+    def assertContadoresConsistentes(self):
+        """Contadores gravados == contagem direta da tabela de OTs."""
+        reais = RecalcularContadores().contar_ots()
+        gravados = {
+            (motorista_id, status): quantidade
+            for motorista_id, status, quantidade in ContadorStatusOT.objects.values_list(
+                'motorista_id', 'status', 'quantidade'
+            )
+            if quantidade
+        }
+        self.assertEqual(gravados, {chave: total for chave, total in reais.items() if total})
+
+
+# ==============================================================================
+# 🔢 SEQUÊNCIA DIÁRIA DE numero_ot
+# ==============================================================================
+
+class SequenciaDiariaOTTest(BaseOTTestCase):
+
+    def test_reservas_sao_contiguas(self):
+        dia = date(2025, 6, 6)
+        self.assertEqual(SequenciaDiariaOT.reservar(dia), range(1, 2))
+        self.assertEqual(SequenciaDiariaOT.reservar(dia, 3), range(2, 5))
+        self.assertEqual(SequenciaDiariaOT.objects.get(data=dia).ultimo_numero, 4)
+
+    def test_quantidade_invalida(self):
+        with self.assertRaises(ValueError):
+            SequenciaDiariaOT.reservar(date(2025, 6, 6), 0)
+
+    def test_continua_numeracao_existente(self):
+        hoje = timezone.now().date()
+        self.criar_ot(numero_ot=f'{OrdemTransporte.prefixo_numero_ot(hoje)}041')
+        SequenciaDiariaOT.objects.filter(data=hoje).delete()
+
+        self.assertEqual(self.criar_ot().numero_ot, f'{OrdemTransporte.prefixo_numero_ot(hoje)}042')
+
+    def test_linha_criada_por_outro_processo(self):
+        """IntegrityError na criação da linha: incrementa a linha do outro processo."""
+        dia = date(2025, 6, 6)
+
+        def outro_processo_cria(data):
+            SequenciaDiariaOT.objects.create(data=data, ultimo_numero=5)
+            return 0
+
+        with mock.patch.object(SequenciaDiariaOT, '_ultimo_numero_existente', side_effect=outro_processo_cria):
+            reservados = SequenciaDiariaOT.reservar(dia, 2)
+
+        self.assertEqual(reservados, range(6, 8))
+        self.assertEqual(SequenciaDiariaOT.objects.get(data=dia).ultimo_numero, 7)
+        self.assertEqual(SequenciaDiariaOT.reservar(dia), range(8, 9))
+
+
+# ==============================================================================
+# 📊 CONTADORES POR STATUS
+# ==============================================================================
+
+class ContadorStatusOTTest(BaseOTTestCase):
+
+    def test_transicoes_e_exclusao(self):
+        ots = [self.criar_ot() for _ in range(3)]
+        ots[0].atualizar_status('EM_CARREGAMENTO', self.motorista)
+        ots[0].atualizar_status('EM_TRANSITO', self.motorista)
+        ots[1].atualizar_status('CANCELADA', self.motorista)
+        self.assertContadoresConsistentes()
+
+        ots[2].delete()
+        self.assertContadoresConsistentes()
+
+    def test_transferencias(self):
+        aprovada = self.criar_ot()
+        aprovada.transferir_para(self.outro_motorista, self.logistica, 'Rota nova')
+        self.assertContadoresConsistentes()
+
+        aguardando = self.criar_ot()
+        transferencia = aguardando.transferir_para(self.terceiro_motorista, self.motorista, 'Folga')
+        self.assertContadoresConsistentes()
+
+        transferencia.refresh_from_db()
+        transferencia.aceitar(self.terceiro_motorista)
+        self.assertContadoresConsistentes()
+        self.assertEqual(
+            ContadorStatusOT.objects.get(motorista=self.terceiro_motorista, status='INICIADA').quantidade, 1
+        )
+
+    def test_filtro_motorista_na_listagem(self):
+        self.criar_ot()
+        self.criar_ot(motorista=self.outro_motorista).atualizar_status('CANCELADA', self.outro_motorista)
+        api = self.cliente(self.logistica)
+
+        resposta = api.get(f'/api/ots/?motorista={self.outro_motorista.pk}')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['stats']['total'], 1)
+        self.assertEqual(resposta.data['stats']['por_status']['cancelada'], 1)
+        self.assertEqual(len(resposta.data['data']['results']), 1)
+
+        for url in ('/api/ots/?motorista=abc', '/api/ots/buscar/?motorista_id=1%3B'):
+            with self.subTest(url=url):
+                self.assertEqual(api.get(url).status_code, 400)
+
+
+# ==============================================================================
+# 📄 PAGINAÇÃO POR CURSOR
+# ==============================================================================
+
+class PaginacaoCursorOTTest(BaseOTTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(7):
+            self.criar_ot()
+        self.esperados = list(
+            OrdemTransporte.objects.order_by('-data_criacao', 'id').values_list('id', flat=True)
+        )
+        self.api = self.cliente(self.logistica)
+
+    def listar(self, url):
+        resposta = self.api.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.data['data']
+
+    def test_ida_e_volta(self):
+        vistos, paginas, url = [], [], '/api/ots/?page_size=3'
+        while url:
+            pagina = self.listar(url)
+            self.assertEqual(pagina['count'], 7)
+            paginas.append(pagina)
+            vistos.extend(item['id'] for item in pagina['results'])
+            url = pagina['next']
+
+        self.assertEqual(vistos, self.esperados)
+        self.assertEqual(len(paginas), 3)
+        self.assertIsNone(paginas[0]['previous'])
+
+        # "previous" da última página volta exatamente para a do meio
+        anterior = self.listar(paginas[-1]['previous'])
+        self.assertEqual([item['id'] for item in anterior['results']], self.esperados[3:6])
+        anterior = self.listar(anterior['previous'])
+        self.assertEqual([item['id'] for item in anterior['results']], self.esperados[:3])
+        self.assertIsNone(anterior['previous'])
+
+    def test_page_legado(self):
+        """?page=N (sem cursor) continua numerado, com o PAGE_SIZE padrão (20)."""
+        for _ in range(16):
+            self.criar_ot()
+        esperados = list(OrdemTransporte.objects.order_by('-data_criacao', 'id').values_list('id', flat=True))
+
+        pagina = self.listar('/api/ots/?page=2')
+        self.assertEqual(pagina['count'], 23)
+        self.assertEqual([item['id'] for item in pagina['results']], esperados[20:])
+        self.assertEqual(pagina['previous'], 'http://testserver/api/ots/')
+        self.assertIsNone(pagina['next'])
+
+    def test_cursor_invalido(self):
+        self.assertEqual(self.api.get('/api/ots/?cursor=nao-e-um-cursor').status_code, 404)
+
+
+# ==============================================================================
+# 🔍 BUSCA TEXTUAL
+# ==============================================================================
+
+class BuscaOTTest(BaseOTTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.mercado = self.criar_ot(cliente_nome='Mercado São Jorge', cidade_entrega='Campinas')
+        self.farmacia = self.criar_ot(
+            cliente_nome='Farmácia Central', observacoes='Entregar no mercado ao lado'
+        )
+        self.alheia = self.criar_ot(motorista=self.outro_motorista, cliente_nome='Mercadinho do Bairro')
+        self.api = self.cliente(self.logistica)
+
+    def buscar(self, consulta, api=None):
+        resposta = (api or self.api).get(f'/api/ots/buscar/?{consulta}')
+        self.assertEqual(resposta.status_code, 200)
+        return [ot['id'] for ot in resposta.data['data']]
+
+    def test_prefixo_e_acentos(self):
+        self.assertEqual(set(self.buscar('q=merc')), {self.mercado.pk, self.farmacia.pk, self.alheia.pk})
+        self.assertEqual(self.buscar('q=sao jor'), [self.mercado.pk])
+        self.assertEqual(self.buscar('q=FARMACIA'), [self.farmacia.pk])
+        self.assertEqual(self.buscar('q=mercado campinas'), [self.mercado.pk])
+
+    def test_ranking_por_campo(self):
+        """Termo no cliente_nome (peso 5) vem antes do mesmo termo nas observações (0,5)."""
+        self.assertEqual(self.buscar('q=mercado'), [self.mercado.pk, self.farmacia.pk])
+
+    def test_campo_especifico_e_numero(self):
+        self.assertEqual(self.buscar('cliente_nome=mercado'), [self.mercado.pk])
+        self.assertEqual(self.buscar(f'numero_ot={self.farmacia.numero_ot}'), [self.farmacia.pk])
+
+    def test_indice_acompanha_edicao_e_exclusao(self):
+        self.farmacia.cliente_nome = 'Drogaria Norte'
+        self.farmacia.save(update_fields=['cliente_nome'])
+        self.assertEqual(self.buscar('q=drogaria'), [self.farmacia.pk])
+        self.assertEqual(self.buscar('q=farmacia'), [])
+
+        self.mercado.delete()
+        self.assertEqual(self.buscar('cliente_nome=jorge'), [])
+
+    def test_motorista_so_ve_as_proprias(self):
+        self.assertEqual(
+            set(self.buscar('q=merc', api=self.cliente(self.motorista))),
+            {self.mercado.pk, self.farmacia.pk}
+        )
+
+    def test_backend_configurado_invalido(self):
+        self.addCleanup(setattr, search, '_backend', search._backend)
+        for caminho in ('core.search.BackendBusca', 'core.models.OrdemTransporte', 'core.inexistente.Backend'):
+            search._backend = None
+            with self.subTest(caminho=caminho), override_settings(LOGITRACK_BUSCA_BACKEND=caminho):
+                with self.assertRaises(ImproperlyConfigured):
+                    search.get_backend()
+
+
+# ==============================================================================
+# 📍 INGESTÃO DE RASTREAMENTO
+# ==============================================================================
+
+class RastreamentoOTTest(BaseOTTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.ot = self.criar_ot()
+        self.agora_ms = para_ms(timezone.now())
+
+    def pontos(self, timestamps):
+        return [
+            {'latitude': -23.55 + indice * 1e-4, 'longitude': -46.63, 'timestamp': ms, 'velocidade': 10.0}
+            for indice, ms in enumerate(timestamps)
+        ]
+
+    def enviar(self, pontos, usuario=None):
+        return self.cliente(usuario or self.motorista).post(
+            f'/api/ots/{self.ot.pk}/rastreamento/', {'pontos': pontos}, format='json'
+        )
+
+    def test_grava_e_ignora_reenvio(self):
+        timestamps = [self.agora_ms - 60_000 + passo * 1000 for passo in range(5)]
+
+        resposta = self.enviar(self.pontos(timestamps))
+        self.assertEqual(resposta.status_code, 201, resposta.data)
+        self.assertEqual(resposta.data['data']['gravados'], 5)
+
+        # App reenvia o lote com dois pontos novos no final
+        timestamps += [timestamps[-1] + 1000, timestamps[-1] + 2000]
+        resposta = self.enviar(self.pontos(timestamps))
+        self.assertEqual(resposta.status_code, 201)
+        self.assertEqual(
+            {chave: resposta.data['data'][chave] for chave in ('recebidos', 'gravados', 'ignorados')},
+            {'recebidos': 7, 'gravados': 2, 'ignorados': 5}
+        )
+        self.assertEqual(resposta.data['data']['ultimo_timestamp'], timestamps[-1])
+        self.assertEqual(PontoRastreamento.objects.filter(ordem_transporte=self.ot).count(), 7)
+
+    def test_timestamps_fora_da_janela(self):
+        """Valores que estouram o int64 ou viram datas absurdas são 400, não 500."""
+        timestamps = [
+            self.agora_ms - 3000, 1e20, -1e15, -5e13,
+            para_ms(timezone.now() - MAXIMO_ATRASO) - 1000,
+            self.agora_ms + 60 * 60 * 1000,
+        ]
+        resposta = self.enviar(self.pontos(timestamps))
+
+        self.assertEqual(resposta.status_code, 400)
+        self.assertIn('[1, 2, 3, 4, 5]', resposta.data['errors']['pontos'][0])
+        self.assertFalse(PontoRastreamento.objects.exists())
+
+    def test_validacao(self):
+        crescentes = [self.agora_ms - 5000, self.agora_ms - 4000, self.agora_ms - 4000, self.agora_ms - 3000]
+        casos = {
+            'fora de ordem': (self.pontos(crescentes), '[2]'),
+            'sem timestamp': ([{'latitude': -23.5, 'longitude': -46.6}], 'numéricos'),
+            'GPS nulo': ([{'latitude': 0, 'longitude': 0, 'timestamp': self.agora_ms}], '[0]'),
+            'velocidade negativa': ([{**self.pontos([self.agora_ms])[0], 'velocidade': -1}], '[0]'),
+            'lote grande': (self.pontos(range(self.agora_ms - 2000, self.agora_ms - 999)), 'Máximo'),
+            'vazio': ([], 'pelo menos um'),
+        }
+        for nome, (pontos, trecho) in casos.items():
+            with self.subTest(nome):
+                resposta = self.enviar(pontos)
+                self.assertEqual(resposta.status_code, 400)
+                self.assertIn(trecho, resposta.data['errors']['pontos'][0])
+
+    def test_so_motorista_atual_em_ot_ativa(self):
+        pontos = self.pontos([self.agora_ms - 1000])
+        self.assertEqual(self.enviar(pontos, self.outro_motorista).status_code, 403)
+
+        self.ot.status = 'ENTREGUE'
+        self.ot.save()
+        self.assertEqual(self.enviar(pontos).status_code, 400)
+
+
+# ==============================================================================
+# 📦 SEGMENTOS DE RASTREAMENTO
+# ==============================================================================
+
+class SegmentoRastreamentoTest(TestCase):
+
+    def test_varints(self):
+        valores = np.array([0, 1, 127, 128, 300, 2**32, 2**64 - 1], dtype=np.uint64)
+        buffer = codificar_varints(valores)
+        np.testing.assert_array_equal(decodificar_varints(buffer, len(valores)), valores)
+
+    def test_ida_e_volta(self):
+        aleatorio = np.random.default_rng(11)
+        quantidade = 500
+        colunas = {
+            'timestamp': 1_750_000_000_000 + np.cumsum(aleatorio.integers(500, 1500, quantidade)),
+            'latitude': -23.55 + np.cumsum(aleatorio.normal(0, 1e-4, quantidade)),
+            'longitude': -46.63 + np.cumsum(aleatorio.normal(0, 1e-4, quantidade)),
+            'precisao': aleatorio.uniform(3, 30, quantidade),
+            'velocidade': aleatorio.uniform(0, 25, quantidade),
+        }
+        colunas['precisao'][::7] = np.nan
+        colunas['velocidade'][::5] = np.nan
+
+        dados = codificar_segmento(colunas)
+        decodificado = decodificar_segmento(memoryview(dados), quantidade)
+
+        np.testing.assert_array_equal(decodificado['timestamp'], colunas['timestamp'])
+        np.testing.assert_allclose(decodificado['latitude'], colunas['latitude'], atol=5e-7)
+        np.testing.assert_allclose(decodificado['longitude'], colunas['longitude'], atol=5e-7)
+        np.testing.assert_allclose(decodificado['precisao'], colunas['precisao'], atol=0.05)
+        np.testing.assert_allclose(decodificado['velocidade'], colunas['velocidade'], atol=0.005)
+        np.testing.assert_array_equal(np.isnan(decodificado['velocidade']), np.isnan(colunas['velocidade']))
+
+    def test_formato_desconhecido(self):
+        with self.assertRaises(ValueError):
+            decodificar_segmento(b'', 0, formato=99)
+
+
+# ==============================================================================
+# 🗺️ TRILHA (DOUGLAS-PEUCKER E POLYLINE)
+# ==============================================================================
+
+def decodificar_polyline(texto, precisao=5):
+    """Decodificador de referência (laço simples, como o da documentação do Google)."""
+    valores, atual, deslocamento = [], 0, 0
+    for caractere in texto:
+        grupo = ord(caractere) - 63
+        atual |= (grupo & 0x1f) << deslocamento
+        deslocamento += 5
+        if grupo < 0x20:
+            valores.append(~(atual >> 1) if atual & 1 else atual >> 1)
+            atual, deslocamento = 0, 0
+    coordenadas = np.cumsum(np.array(valores, dtype=np.int64).reshape(-1, 2), axis=0)
+    return coordenadas / 10 ** precisao
+
+
+class TrilhaTest(BaseOTTestCase):
+
+    def test_polyline_exemplo_do_google(self):
+        self.assertEqual(
+            codificar_polyline(np.array([38.5, 40.7, 43.252]), np.array([-120.2, -120.95, -126.453])),
+            '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+        )
+        self.assertEqual(codificar_polyline(np.array([]), np.array([])), '')
+
+    def test_polyline_ida_e_volta(self):
+        aleatorio = np.random.default_rng(3)
+        latitude = -23.55 + np.cumsum(aleatorio.normal(0, 0.01, 300))
+        longitude = -46.63 + np.cumsum(aleatorio.normal(0, 0.01, 300))
+        latitude[50] = -89.99999  # deltas grandes usam mais grupos de 5 bits
+        longitude[51] = 179.99999
+
+        decodificado = decodificar_polyline(codificar_polyline(latitude, longitude))
+        np.testing.assert_allclose(decodificado[:, 0], latitude, atol=5e-6 + 1e-9)
+        np.testing.assert_allclose(decodificado[:, 1], longitude, atol=5e-6 + 1e-9)
+
+    def test_douglas_peucker(self):
+        # Reta para leste com ruído de ~1 m, curva de 90° e reta para norte
+        aleatorio = np.random.default_rng(5)
+        passo = 1e-4  # ~11 m
+        leste = np.arange(100) * passo
+        latitude = np.concatenate([np.zeros(100), np.arange(1, 100) * passo]) - 23.5
+        longitude = np.concatenate([leste, np.full(99, leste[-1])]) - 46.6
+        latitude = latitude + aleatorio.normal(0, 1e-5, len(latitude))
+
+        indices = simplificar(latitude, longitude, tolerancia_m=10)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(latitude) - 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertLessEqual(len(indices), 6)
+        self.assertTrue(np.any(np.abs(indices - 99) <= 1), indices)  # a curva é mantida
+
+        # Tolerância abaixo do ruído mantém todo o trecho com ruído lateral (o leste)
+        self.assertGreaterEqual(len(simplificar(latitude, longitude, tolerancia_m=0.01)), 100)
+
+        # Trecho fechado: volta ao ponto de partida
+        volta = simplificar(np.array([0.0, 0.001, 0.001, 0.0]), np.array([0.0, 0.0, 0.001, 0.0]), 1)
+        self.assertEqual(volta.tolist(), [0, 1, 2, 3])
+        self.assertEqual(simplificar(np.array([1.0, 2.0]), np.array([1.0, 2.0]), 1).tolist(), [0, 1])
+
+    def test_endpoint_e_invalidacao(self):
+        ot = self.criar_ot()
+        cliente = self.cliente(self.motorista)
+        agora_ms = para_ms(timezone.now())
+
+        def enviar(inicio, quantidade):
+            pontos = [
+                {'latitude': -23.55, 'longitude': -46.63 + indice * 1e-4, 'timestamp': agora_ms - 600_000 + indice * 1000}
+                for indice in range(inicio, inicio + quantidade)
+            ]
+            resposta = cliente.post(f'/api/ots/{ot.pk}/rastreamento/', {'pontos': pontos}, format='json')
+            self.assertEqual(resposta.status_code, 201)
+
+        enviar(0, 50)
+        dados = cliente.get(f'/api/ots/{ot.pk}/trilha/?zoom=15').data['data']
+        self.assertEqual((dados['pontos'], dados['pontos_originais']), (2, 50))
+        np.testing.assert_allclose(
+            decodificar_polyline(dados['polyline']), [[-23.55, -46.63], [-23.55, -46.6251]], atol=1e-5
+        )
+
+        # Novo lote muda a versão da trilha: o cache antigo não é servido
+        enviar(50, 10)
+        dados = cliente.get(f'/api/ots/{ot.pk}/trilha/?zoom=15').data['data']
+        self.assertEqual(dados['pontos_originais'], 60)
+
+        resposta = cliente.get(f'/api/ots/{ot.pk}/trilha/?zoom=abc&inicio=ontem')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(set(resposta.data['errors']), {'zoom', 'inicio'})
+
+
+# ==============================================================================
+# 📏 PERCURSO INCREMENTAL
+# ==============================================================================
+
+class PercursoIncrementalTest(BaseOTTestCase):
+
+    METROS_POR_GRAU = 111_195  # haversine com RAIO_TERRA_M
+
+    def viagem(self):
+        """10 min a 10 m/s para leste, 10 min parado (tremor de 3 m), 5 min a 10 m/s, 1 salto de GPS."""
+        aleatorio = np.random.default_rng(17)
+        inicio_ms = para_ms(timezone.now()) - 60 * 60 * 1000
+        longitude, instantes = [], []
+        for passo in range(150):
+            instantes.append(inicio_ms + passo * 10_000)
+            if passo <= 60:
+                longitude.append(passo * 100)
+            elif passo <= 120:
+                longitude.append(6000 + aleatorio.uniform(-3, 3))
+            else:
+                longitude.append(6000 + (passo - 120) * 100)
+        longitude = -46.6 + np.array(longitude) / (self.METROS_POR_GRAU * math.cos(math.radians(23.5)))
+        pontos = [
+            {'latitude': -23.5, 'longitude': float(lng), 'timestamp': ms}
+            for lng, ms in zip(longitude, instantes)
+        ]
+        pontos[135]['latitude'] = -23.45  # salto de ~5,5 km e volta
+        return pontos
+
+    def gravar(self, ot, pontos):
+        registrar_pontos(ot, ot.motorista_atual, validar_pontos(pontos))
+
+    def percurso(self, ot):
+        return OrdemTransporte.objects.values('distancia_km', 'tempo_movimento_s', 'paradas').get(pk=ot.pk)
+
+    def test_lotes_equivalem_a_um_lote_so(self):
+        pontos = self.viagem()
+
+        em_lotes = self.criar_ot()
+        for inicio in range(0, len(pontos), 17):
+            self.gravar(em_lotes, pontos[inicio:inicio + 17])
+        um_lote = self.criar_ot(self.outro_motorista)
+        self.gravar(um_lote, pontos)
+
+        # Últimos JANELA_PARADA_S ainda pendentes
+        parcial = self.percurso(em_lotes)
+        self.assertLess(parcial['distancia_km'], 9.0)
+
+        for ot in (em_lotes, um_lote):
+            finalizar_percurso(ot.pk)
+        final, referencia = self.percurso(em_lotes), self.percurso(um_lote)
+
+        self.assertAlmostEqual(final['distancia_km'], referencia['distancia_km'], places=6)
+        self.assertEqual(final['tempo_movimento_s'], referencia['tempo_movimento_s'])
+        self.assertEqual(final['paradas'], referencia['paradas'])
+
+        # 60 + 29 trechos de 100 m, menos os dois do salto (ida e volta)
+        self.assertAlmostEqual(final['distancia_km'], 8.7, delta=0.01)
+        self.assertEqual(final['tempo_movimento_s'], 870)
+        parada, = final['paradas']
+        self.assertAlmostEqual(parada['duracao_s'], 600, delta=130)
+        self.assertAlmostEqual(
+            parada['longitude'], -46.6 + 6000 / (self.METROS_POR_GRAU * math.cos(math.radians(23.5))), places=4
+        )
+
+    def test_finalizada_nao_acumula(self):
+        ot = self.criar_ot()
+        pontos = self.viagem()
+        self.gravar(ot, pontos[:100])
+        finalizar_percurso(ot.pk)
+        antes = self.percurso(ot)
+
+        self.gravar(ot, pontos[100:])
+        self.assertEqual(self.percurso(ot), antes)
+        self.assertEqual(finalizar_percurso(ot.pk), {})
+
+
+# ==============================================================================
+# 🔢 COORDENADAS INTEIRAS (CoordenadaField)
+# ==============================================================================
+
+class CoordenadaFieldTest(BaseOTTestCase):
+
+    def test_ida_e_volta(self):
+        aleatorio = np.random.default_rng(41)
+        valores = [
+            (90.0, 180.0), (-90.0, -180.0), (0.0, 0.0), (-23.5505123456, -46.6333987654),
+            (1e-8, -6e-8), (-0.00000005, 0.00000015),
+            *zip(aleatorio.uniform(-90, 90, 20).tolist(), aleatorio.uniform(-180, 180, 20).tolist()),
+        ]
+        for latitude, longitude in valores:
+            with self.subTest(latitude=latitude, longitude=longitude):
+                ot = self.criar_ot(latitude_origem=latitude, longitude_origem=longitude)
+                # pre_save já deixa a instância com o valor do banco
+                self.assertEqual((ot.latitude_origem, ot.longitude_origem), (round(latitude, 7), round(longitude, 7)))
+                ot.refresh_from_db()
+                self.assertEqual((ot.latitude_origem, ot.longitude_origem), (round(latitude, 7), round(longitude, 7)))
+                self.assertIsInstance(ot.latitude_origem, float)
+                ot.delete()
+
+    def test_coluna_inteira_e_filtros_em_graus(self):
+        ot = self.criar_ot(latitude_origem=-23.5505123, longitude_origem=-46.6333)
+        self.criar_ot(self.outro_motorista)  # sem coordenadas
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT latitude_origem, longitude_origem FROM {OrdemTransporte._meta.db_table} WHERE id = %s',
+                [ot.pk]
+            )
+            self.assertEqual(cursor.fetchone(), (-235505123, -466333000))
+
+        consultas = {
+            'exato': {'latitude_origem': -23.5505123},
+            'faixa': {'latitude_origem__gte': -23.6, 'latitude_origem__lt': -23.5505122},
+            'arredondado na consulta': {'longitude_origem': -46.63330000004},
+        }
+        for nome, filtro in consultas.items():
+            with self.subTest(nome):
+                self.assertEqual(list(OrdemTransporte.objects.filter(**filtro).values_list('pk', flat=True)), [ot.pk])
+        self.assertEqual(
+            OrdemTransporte.objects.filter(pk=ot.pk).values_list('latitude_origem', flat=True).get(), -23.5505123
+        )
+        self.assertEqual(OrdemTransporte.objects.filter(latitude_origem__isnull=True).count(), 1)
+
+    def test_limites_validados(self):
+        for campos, campo in (({'latitude_origem': 90.0000001}, 'latitude_origem'),
+                              ({'longitude_origem': -180.5}, 'longitude_origem')):
+            with self.subTest(campo):
+                resposta = self.cliente(self.terceiro_motorista).post('/api/ots/', {
+                    'cliente_nome': 'Cliente', 'endereco_entrega': 'Rua A, 1', 'cidade_entrega': 'São Paulo',
+                    'latitude_origem': -23.5, 'longitude_origem': -46.6, **campos
+                }, format='json')
+                self.assertEqual(resposta.status_code, 400)
+                self.assertIn(campo, resposta.data['errors'])
+
+
+# ==============================================================================
+# 📍 PROXIMIDADE (GEOHASH)
+# ==============================================================================
+
+class ProximidadeTest(BaseOTTestCase):
+
+    def test_geohash(self):
+        self.assertEqual(codificar_geohash(57.64911, 10.40744), 'u4pruydq')
+        self.assertEqual(codificar_geohash(-23.5505, -46.6333, precisao=5), '6gyf4')
+        self.assertEqual(codificar_geohash(None, -46.6), '')
+        self.assertEqual(codificar_geohashes([90.0, -90.0], [180.0, -180.0], 1), ['z', '0'])
+
+    def test_faixas_equivalem_a_prefixo(self):
+        aleatorio = np.random.default_rng(23)
+        geohashes = codificar_geohashes(aleatorio.uniform(-24, -23, 2000), aleatorio.uniform(-47, -46, 2000))
+        for prefixo in ('6gy', '6gyf', '6gyc'):
+            filtro = filtro_geohash('geohash', [prefixo])
+            (_, minimo), (_, maximo) = sorted(filtro.children)
+            esperado = {g for g in geohashes if g.startswith(prefixo)}
+            self.assertEqual({g for g in geohashes if minimo <= g <= maximo}, esperado)
+
+    def test_celulas_cobrem_o_circulo(self):
+        aleatorio = np.random.default_rng(29)
+        casos = [(-23.55, -46.63, 5_000), (-23.55, -46.63, 200_000), (10.0, 179.99, 50_000),
+                 (89.9, 0.0, 30_000), (0.0, 0.0, 100)]
+        for latitude, longitude, raio_m in casos:
+            with self.subTest(latitude=latitude, longitude=longitude, raio_m=raio_m):
+                prefixos = celulas_no_raio(latitude, longitude, raio_m)
+                self.assertLessEqual(len(prefixos), MAXIMO_CELULAS_BUSCA)
+
+                # Pontos a até raio_m do centro (direção e distância aleatórias)
+                direcao = aleatorio.uniform(0, 2 * math.pi, 500)
+                distancia = raio_m * np.sqrt(aleatorio.uniform(0, 0.999, 500)) / RAIO_TERRA_M
+                lat = np.degrees(np.radians(latitude) + distancia * np.cos(direcao))
+                lng = longitude + np.degrees(distancia * np.sin(direcao) / np.cos(np.radians(lat)))
+                lng = (lng + 180) % 360 - 180
+                dentro = haversine_m(latitude, longitude, lat, lng) <= raio_m
+                for geohash in codificar_geohashes(lat[dentro], lng[dentro]):
+                    self.assertTrue(geohash.startswith(tuple(prefixos)), geohash)
+
+    def test_filtro_igual_a_forca_bruta(self):
+        aleatorio = np.random.default_rng(31)
+        origens = np.column_stack([aleatorio.uniform(-24.0, -23.0, 60), aleatorio.uniform(-47.2, -46.2, 60)])
+        for latitude, longitude in origens:
+            self.criar_ot(latitude_origem=latitude, longitude_origem=longitude)
+
+        for raio_km in (1, 10, 40):
+            with self.subTest(raio_km=raio_km):
+                distancias = haversine_m(-23.55, -46.63, origens[:, 0], origens[:, 1])
+                filtradas = filtrar_proximidade(OrdemTransporte.objects.all(), -23.55, -46.63, raio_km)
+                self.assertEqual(filtradas.count(), int((distancias <= raio_km * 1000).sum()))
+
+        resposta = self.cliente(self.logistica).get('/api/ots/?near=-23.55,-46.63&radius=40&page_size=100')
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(len(resposta.data['data']['results']), filtradas.count())
+
+    def test_parametros_invalidos(self):
+        cliente = self.cliente(self.logistica)
+        for consulta, campo in (('near=-23.5', 'near'), ('near=91,0', 'near'),
+                                ('near=-23.5,-46.6&radius=0', 'radius'),
+                                ('near=-23.5,-46.6&radius=501', 'radius'),
+                                ('near=-23.5,-46.6&near_field=destino', 'near_field')):
+            with self.subTest(consulta):
+                resposta = cliente.get(f'/api/ots/?{consulta}')
+                self.assertEqual(resposta.status_code, 400)
+                self.assertIn(campo, resposta.data['errors'])
+
+
+# ==============================================================================
+# 🔥 MAPA DE CALOR
+# ==============================================================================
+
+class MapaCalorTest(BaseOTTestCase):
+
+    Z = 12
+
+    def tile_de(self, latitude, longitude, z=Z):
+        mundo_x, mundo_y = posicao_no_mundo(latitude, longitude)
+        return int(mundo_x * (1 << z)), int(mundo_y * (1 << z))
+
+    def entregar(self, latitude, longitude, status='ENTREGUE', motorista=None):
+        return self.criar_ot(
+            motorista, status=status, latitude_entrega=latitude, longitude_entrega=longitude
+        )
+
+    def buscar(self, z, x, y):
+        resposta = self.cliente(self.logistica).get(f'/api/ots/mapa-calor/{z}/{x}/{y}/')
+        self.assertEqual(resposta.status_code, 200)
+        return resposta.data['data']
+
+    def test_binning(self):
+        x, y = self.tile_de(-23.55, -46.63)
+        lat_min, lat_max, lng_min, lng_max = limites_tile(self.Z, x, y)
+        aleatorio = np.random.default_rng(37)
+        pontos = list(zip(aleatorio.uniform(lat_min, lat_max, 40), aleatorio.uniform(lng_min, lng_max, 40)))
+        pontos.append((-23.0, -46.63))  # fora do tile
+        motoristas = [self.motorista, self.outro_motorista, self.terceiro_motorista]
+        for indice, (latitude, longitude) in enumerate(pontos):
+            status = 'ENTREGUE_PARCIAL' if indice % 4 == 0 else 'ENTREGUE'
+            self.entregar(latitude, longitude, status, motoristas[indice % 3])
+
+        # Contagem de referência com a fórmula do Mercator ponto a ponto
+        esperado = {}
+        for latitude, longitude in pontos[:-1]:
+            guardada = OrdemTransporte.objects.get(latitude_entrega=latitude, longitude_entrega=longitude)
+            escala = (1 << self.Z) * GRADE_TILE
+            seno = math.sin(math.radians(float(guardada.latitude_entrega)))
+            mundo_y = 0.5 - math.log((1 + seno) / (1 - seno)) / (4 * math.pi)
+            mundo_x = (float(guardada.longitude_entrega) + 180) / 360
+            celula = (int(mundo_x * escala) - x * GRADE_TILE, int(mundo_y * escala) - y * GRADE_TILE)
+            esperado.setdefault(celula, Counter())[guardada.status] += 1
+
+        tile = self.buscar(self.Z, x, y)
+        self.assertEqual(tile['total'], 40)
+        colunas = tile['colunas']
+        obtido = {
+            (linha[0], linha[1]): Counter({
+                status: quantidade for status, quantidade in zip(colunas[3:], linha[3:]) if quantidade
+            })
+            for linha in tile['celulas']
+        }
+        self.assertEqual(obtido, esperado)
+        for linha in tile['celulas']:
+            self.assertEqual(linha[2], sum(linha[3:]))
+
+    def test_invalidacao(self):
+        x, y = self.tile_de(-23.55, -46.63)
+        ot = self.entregar(-23.55, -46.63)
+        self.assertEqual(self.buscar(self.Z, x, y)['total'], 1)
+
+        # UPDATE sem sinal não troca a versão: o tile vem do cache
+        OrdemTransporte.objects.filter(pk=ot.pk).update(status='CANCELADA')
+        self.assertEqual(self.buscar(self.Z, x, y)['total'], 1)
+        self.assertEqual(self.buscar(self.Z, x, y)['celulas'][0][3 + STATUS_MAPA_CALOR.index('ENTREGUE')], 1)
+
+        # Nova entrega no tile troca a versão em todos os zooms que contêm o ponto
+        tile_z5 = self.buscar(5, *self.tile_de(-23.55, -46.63, 5))
+        self.entregar(-23.5501, -46.6301, motorista=self.outro_motorista)
+        self.assertEqual(self.buscar(self.Z, x, y)['total'], 2)
+        self.assertEqual(self.buscar(5, *self.tile_de(-23.55, -46.63, 5))['total'], tile_z5['total'] + 1)
+
+        # Entrega em outro tile não mexe neste
+        with mock.patch('core.mapa_calor.agregar_tile') as agregar:
+            self.entregar(-22.9, -43.17, motorista=self.terceiro_motorista)
+            self.buscar(self.Z, x, y)
+        agregar.assert_not_called()
+
+    def test_cache_local_expira(self):
+        self.assertEqual(mapa_calor._tempos_cache(), (TEMPO_CACHE_MAPA_CALOR_LOCAL,) * 2)
+        compartilhado = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                     'LOCATION': 'logitrack_cache'}}
+        with override_settings(CACHES=compartilhado):
+            self.assertEqual(mapa_calor._tempos_cache(), (TEMPO_CACHE_MAPA_CALOR, None))
+
+        with mock.patch.object(cache, 'set', wraps=cache.set) as gravar:
+            self.buscar(0, 0, 0)
+        gravar.assert_called_once_with(mock.ANY, mock.ANY, TEMPO_CACHE_MAPA_CALOR_LOCAL)
+
+    def test_tile_invalido(self):
+        for z, x, y in ((19, 0, 0), (2, 4, 0), (2, 0, 4)):
+            resposta = self.cliente(self.logistica).get(f'/api/ots/mapa-calor/{z}/{x}/{y}/')
+            self.assertEqual(resposta.status_code, 400)
+
+
+# ==============================================================================
+# 🚚 MOTORISTAS PRÓXIMOS (k-NN)
+# ==============================================================================
+
+class MotoristasProximosTest(BaseOTTestCase):
+
+    CENTRO = (-23.55, -46.63)
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.frota, _ = GeradorDadosSinteticos(seed=43).criar_usuarios(12, 0)
+
+    def posicionar(self, motorista, latitude, longitude):
+        atualizar_posicao(motorista.pk, latitude, longitude, timezone.now(), 'RASTREAMENTO')
+
+    def test_igual_a_forca_bruta(self):
+        aleatorio = np.random.default_rng(47)
+        # Distâncias de poucos km a ~300 km: a busca precisa de várias rodadas
+        posicoes = {
+            motorista.pk: (self.CENTRO[0] + desvio_lat, self.CENTRO[1] + desvio_lng)
+            for motorista, desvio_lat, desvio_lng in zip(
+                self.frota, aleatorio.normal(0, 1.0, 12).tolist(), aleatorio.normal(0, 1.0, 12).tolist()
+            )
+        }
+        for motorista in self.frota:
+            self.posicionar(motorista, *posicoes[motorista.pk])
+        ocupado, excluido = self.frota[0], self.frota[1]
+        self.criar_ot(ocupado)  # OT ativa: indisponível
+
+        candidatos = {pk: posicao for pk, posicao in posicoes.items() if pk not in (ocupado.pk, excluido.pk)}
+        distancias = {
+            pk: float(haversine_m(*self.CENTRO, *posicao)) for pk, posicao in candidatos.items()
+        }
+        for k in (1, 3, 10):
+            with self.subTest(k=k):
+                busca = motoristas_proximos(*self.CENTRO, k=k, excluir=[excluido.pk])
+                esperados = sorted(distancias, key=distancias.get)[:k]
+                self.assertEqual([m['motorista']['id'] for m in busca['motoristas']], esperados)
+                self.assertFalse(busca['incompleto'])
+                self.assertGreaterEqual(busca['raio_km'] * 1000, distancias[esperados[-1]] - 1)
+                for item in busca['motoristas']:
+                    self.assertAlmostEqual(item['distancia_km'] * 1000, distancias[item['motorista']['id']], delta=1)
+
+    def test_incompleto_alem_do_raio_maximo(self):
+        self.posicionar(self.frota[0], -23.56, -46.64)
+        self.posicionar(self.frota[1], -22.9, -43.17)  # Rio, ~360 km
+        self.posicionar(self.frota[2], -3.73, -38.52)  # Fortaleza, > RAIO_MAXIMO_KM
+
+        busca = motoristas_proximos(*self.CENTRO, k=5)
+        self.assertEqual([m['motorista']['id'] for m in busca['motoristas']], [self.frota[0].pk, self.frota[1].pk])
+        self.assertTrue(busca['incompleto'])
+        self.assertEqual(busca['raio_km'], RAIO_MAXIMO_KM)
+
+        busca = motoristas_proximos(*self.CENTRO, k=1)
+        self.assertFalse(busca['incompleto'])
+        self.assertLessEqual(busca['raio_km'], RAIO_INICIAL_PROXIMOS_KM)
+
+    def test_endpoint(self):
+        ot = self.criar_ot(latitude_origem=self.CENTRO[0], longitude_origem=self.CENTRO[1])
+        self.posicionar(self.frota[0], -23.56, -46.64)
+        cliente = self.cliente(self.logistica)
+
+        # A criação com coordenadas gravou a posição do motorista atual; ele fica de fora
+        dados = cliente.get(f'/api/ots/{ot.pk}/motoristas-proximos/?k=2').data['data']
+        self.assertEqual(dados['referencia']['fonte'], 'motorista_atual')
+        self.assertEqual([m['motorista']['id'] for m in dados['motoristas']], [self.frota[0].pk])
+        self.assertTrue(dados['incompleto'])
+        self.assertEqual(dados['raio_km'], RAIO_MAXIMO_KM)
+
+        PosicaoAtual.objects.filter(usuario=self.motorista).delete()
+        dados = cliente.get(f'/api/ots/{ot.pk}/motoristas-proximos/?k=1').data['data']
+        self.assertEqual(dados['referencia']['fonte'], 'origem')
+        self.assertFalse(dados['incompleto'])
+
+        resposta = cliente.get(f'/api/ots/{ot.pk}/motoristas-proximos/?k=0&near=1')
+        self.assertEqual(resposta.status_code, 400)
+        self.assertEqual(set(resposta.data['errors']), {'k', 'near'})
+
+
+# ==============================================================================
+# 📍 GEOCERCAS
+# ==============================================================================
+
+class GeocercasTest(BaseOTTestCase):
+
+    ENTREGA = (-23.55, -46.63)
+
+    def setUp(self):
+        super().setUp()
+        # Índice em memória do processo: cada teste monta o seu
+        patcher = mock.patch.dict(geocercas._grade, {'indice': None, 'versao': None, 'montado_em': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.ot = self.criar_ot(latitude_entrega=self.ENTREGA[0], longitude_entrega=self.ENTREGA[1])
+        self.relogio = para_ms(timezone.now()) - 60 * 60 * 1000
+
+    def a_metros(self, *distancias):
+        """Pontos ao norte da entrega, às distâncias dadas (m)."""
+        return [self.ENTREGA[0] + math.degrees(d / RAIO_TERRA_M) for d in distancias]
+
+    def enviar(self, distancias, motorista=None):
+        latitudes = self.a_metros(*distancias)
+        timestamps = []
+        for _ in latitudes:
+            self.relogio += 10_000
+            timestamps.append(self.relogio)
+        return processar_pontos(
+            self.ot.pk, (motorista or self.motorista).pk, np.array(latitudes),
+            np.full(len(latitudes), self.ENTREGA[1]), np.array(timestamps)
+        )
+
+    def eventos(self):
+        return list(
+            AtualizacaoOT.objects.filter(ordem_transporte=self.ot, tipo_atualizacao='LOCALIZACAO')
+            .order_by('id').values_list('descricao', flat=True)
+        )
+
+    def test_transicoes(self):
+        codigos = np.array([FORA, FAIXA, DENTRO, FAIXA, DENTRO, FAIXA, FORA, FAIXA, DENTRO], dtype=np.int8)
+        self.assertEqual(_transicoes(codigos, False), [('ENTRADA', 2), ('SAIDA', 6), ('ENTRADA', 8)])
+        self.assertEqual(_transicoes(codigos, True), [('SAIDA', 0), ('ENTRADA', 2), ('SAIDA', 6), ('ENTRADA', 8)])
+        self.assertEqual(_transicoes(np.array([FAIXA, DENTRO, FAIXA], dtype=np.int8), True), [])
+
+    def test_histerese(self):
+        raio = self.ot.raio_geocerca_m
+        faixa = raio * (1 + FATOR_SAIDA_GEOCERCA) / 2
+
+        # Oscilando na faixa intermediária sem entrar: nada
+        self.assertEqual(self.enviar([2000, faixa, 1.3 * raio, faixa]), [])
+
+        # Entra e oscila entre dentro e a faixa: uma única chegada
+        eventos = self.enviar([faixa, 0.9 * raio, faixa, 0.5 * raio, faixa, 0.8 * raio])
+        self.assertEqual(len(eventos), 1)
+        self.ot.refresh_from_db()
+        self.assertEqual(self.ot.geocerca_entrada_em, de_ms(self.relogio - 40_000))
+
+        # Lote seguinte ainda na faixa: continua dentro
+        self.assertEqual(self.enviar([faixa, faixa]), [])
+
+        # Sai (além do raio × fator), volta e sai de novo no mesmo lote
+        self.enviar([FATOR_SAIDA_GEOCERCA * raio + 5, 0.2 * raio, 3000])
+        self.ot.refresh_from_db()
+        self.assertIsNone(self.ot.geocerca_entrada_em)
+        self.assertEqual(self.eventos(), [
+            'Motorista chegou ao local de entrega', 'Motorista saiu do local de entrega',
+            'Motorista chegou ao local de entrega', 'Motorista saiu do local de entrega',
+        ])
+
+    def test_so_motorista_atual(self):
+        self.assertEqual(self.enviar([0, 0], motorista=self.outro_motorista), [])
+        self.assertEqual(self.eventos(), [])
+
+        # OT finalizada deixa de ter cerca
+        self.ot.status = 'CANCELADA'
+        self.ot.save()
+        geocercas._grade['montado_em'] -= INTERVALO_MINIMO_RECARGA_GEOCERCAS_S
+        self.assertEqual(self.enviar([0]), [])
+
+    def test_lotes_simultaneos_nao_duplicam(self):
+        """
+        O lote B lê o estado (fora) antes de o lote A gravar a entrada:
+        o UPDATE condicional de B não troca nada e B não registra eventos.
+        """
+        transicoes = geocercas._transicoes
+        lote_a = self.a_metros(0, 0)
+
+        def a_grava_no_meio(codigos, dentro):
+            if not simulado:
+                simulado.append(True)
+                processar_pontos(self.ot.pk, self.motorista.pk, np.array(lote_a),
+                                 np.full(2, self.ENTREGA[1]), np.array([self.relogio + 1, self.relogio + 2]))
+            return transicoes(codigos, dentro)
+
+        simulado = []
+        with mock.patch.object(geocercas, '_transicoes', side_effect=a_grava_no_meio):
+            eventos_b = self.enviar([10, 10])
+
+        self.assertEqual(eventos_b, [])
+        self.assertEqual(self.eventos(), ['Motorista chegou ao local de entrega'])
+
+
+# ==============================================================================
+# 🧭 ROTEIRIZAÇÃO
+# ==============================================================================
+
+class RoteirizacaoTest(BaseOTTestCase):
+
+    PARTIDA = (-23.55, -46.63)
+
+    def paradas_aleatorias(self, quantidade, seed, espalhamento=0.2):
+        aleatorio = np.random.default_rng(seed)
+        return list(zip(
+            (self.PARTIDA[0] + aleatorio.uniform(-espalhamento, espalhamento, quantidade)).tolist(),
+            (self.PARTIDA[1] + aleatorio.uniform(-espalhamento, espalhamento, quantidade)).tolist(),
+        ))
+
+    def test_otimo_em_instancias_pequenas(self):
+        for seed, retornar in ((1, False), (2, False), (3, True), (4, True)):
+            with self.subTest(seed=seed, retornar=retornar):
+                paradas = self.paradas_aleatorias(7, seed)
+                matriz = matriz_distancias(*zip(self.PARTIDA, *paradas), retornar=retornar)
+                fim = len(paradas) + 1
+                otimo = min(
+                    custo_rota(matriz, np.array([0, *permutacao, fim]))
+                    for permutacao in itertools.permutations(range(1, fim))
+                )
+
+                plano = planejar_rota(self.PARTIDA, paradas, retornar=retornar)
+                self.assertEqual(sorted(plano['ordem']), list(range(len(paradas))))
+                self.assertLessEqual(plano['distancia_m'], plano['distancia_inicial_m'])
+                self.assertLessEqual(plano['distancia_m'], otimo * 1.02)
+
+                volta = matriz[plano['ordem'][-1] + 1, 0] if retornar else 0
+                self.assertAlmostEqual(sum(plano['trechos_m']) + volta, plano['distancia_m'], places=3)
+
+    def test_paradas_em_linha(self):
+        # Partida no começo da linha: a ordem é a da distância
+        posicoes = [5, 1, 9, 3, 7, 2, 8, 4, 6]
+        paradas = [(self.PARTIDA[0], self.PARTIDA[1] + 0.01 * posicao) for posicao in posicoes]
+        plano = planejar_rota(self.PARTIDA, paradas)
+        self.assertEqual([posicoes[indice] for indice in plano['ordem']], sorted(posicoes))
+
+    @mock.patch.object(roteirizacao, 'PROCESSOS_ROTEIRIZACAO', 2)
+    def test_prazo_respeitado(self):
+        """Com o pool de processos ainda subindo, a resposta sai no prazo."""
+        self.addCleanup(self.encerrar_pool)
+        paradas = self.paradas_aleatorias(MINIMO_PARADAS_PROCESSOS + 150, seed=5, espalhamento=1.0)
+        for tempo_limite_ms in (100, 300):
+            with self.subTest(tempo_limite_ms=tempo_limite_ms):
+                inicio = time.perf_counter()
+                plano = planejar_rota(self.PARTIDA, paradas, tempo_limite_ms=tempo_limite_ms)
+                decorrido_ms = (time.perf_counter() - inicio) * 1000
+
+                # Folga para a matriz, a recolha do pool e máquinas de CI lentas
+                self.assertLess(decorrido_ms, tempo_limite_ms + 250 + FOLGA_POOL_S * 1000)
+                self.assertEqual(sorted(plano['ordem']), list(range(len(paradas))))
+                self.assertLessEqual(plano['distancia_m'], plano['distancia_inicial_m'])
+
+    def encerrar_pool(self):
+        if roteirizacao._pool['executor'] is not None:
+            roteirizacao._pool['executor'].shutdown(cancel_futures=True)
+            roteirizacao._pool['executor'] = None
+
+    def test_endpoint(self):
+        motoristas = [self.motorista, self.outro_motorista, self.terceiro_motorista]
+        ots = [
+            self.criar_ot(motorista, status='ENTREGUE', latitude_entrega=latitude, longitude_entrega=longitude)
+            for motorista, (latitude, longitude) in zip(motoristas * 2, self.paradas_aleatorias(6, seed=9))
+        ]
+        ids = [ot.pk for ot in ots]
+        cliente = self.cliente(self.logistica)
+
+        resposta = cliente.post('/api/ots/roteirizar/', {
+            'ot_ids': ids + ids[:2], 'latitude': self.PARTIDA[0], 'longitude': self.PARTIDA[1], 'retornar': True,
+        }, format='json')
+        self.assertEqual(resposta.status_code, 200, resposta.data)
+        dados = resposta.data['data']
+        self.assertEqual(sorted(dados['ordem']), sorted(ids))
+        acumuladas = [parada['distancia_acumulada_km'] for parada in dados['paradas']]
+        self.assertEqual(acumuladas, sorted(acumuladas))
+        self.assertGreater(dados['distancia_total_km'], acumuladas[-1])  # inclui a volta
+
+        sem_entrega = self.criar_ot(self.motorista)
+        for corpo, campo in (({'ot_ids': [sem_entrega.pk]}, 'ot_ids'), ({'ot_ids': [999999]}, 'ot_ids'),
+                             ({'ot_ids': ids, 'tempo_limite_ms': 50}, 'tempo_limite_ms')):
+            with self.subTest(campo=campo, corpo=corpo):
+                resposta = cliente.post('/api/ots/roteirizar/', {
+                    'latitude': self.PARTIDA[0], 'longitude': self.PARTIDA[1], **corpo
+                }, format='json')
+                self.assertEqual(resposta.status_code, 400)
+                self.assertIn(campo, resposta.data['errors'])
+
+
+# ==============================================================================
+# 🔒 CONCORRÊNCIA OTIMISTA (If-Match)
+# ==============================================================================
+
+class IfMatchTest(BaseOTTestCase):
+
+    def test_versao_antiga_retorna_409(self):
+        ot = self.criar_ot()
+        api = self.cliente(self.motorista)
+        url = f'/api/ots/{ot.pk}/status/'
+
+        resposta = api.patch(url, {'status': 'EM_CARREGAMENTO'}, format='json', HTTP_IF_MATCH=f'"{ot.versao}"')
+        self.assertEqual(resposta.status_code, 200)
+
+        # Mesmo If-Match de antes: a OT já está em outra versão
+        resposta = api.patch(url, {'status': 'CANCELADA'}, format='json', HTTP_IF_MATCH=f'"{ot.versao}"')
+        self.assertEqual(resposta.status_code, 409)
+
+        ot.refresh_from_db()
+        self.assertEqual(ot.status, 'EM_CARREGAMENTO')
+        self.assertEqual(resposta['ETag'], f'"{ot.versao}"')
+
+
+# ==============================================================================
+# 🔄 STATUS EM LOTE
+# ==============================================================================
+
+class StatusEmLoteTest(BaseOTTestCase):
+
+    def test_itens_validos_e_invalidos(self):
+        carregar = [self.criar_ot() for _ in range(3)]
+        cancelar = self.criar_ot(motorista=self.outro_motorista)
+        entregue = self.criar_ot()
+        entregue.atualizar_status('CANCELADA', self.motorista)
+
+        itens = [{'ot_id': ot.pk, 'status': 'EM_CARREGAMENTO'} for ot in carregar] + [
+            {'ot_id': cancelar.pk, 'status': 'CANCELADA', 'observacao': 'Cliente desistiu'},
+            {'ot_id': carregar[0].pk, 'status': 'CANCELADA'},  # repetida
+            {'ot_id': 999999, 'status': 'CANCELADA'},          # inexistente
+            {'ot_id': entregue.pk, 'status': 'EM_TRANSITO'},   # estado final
+        ]
+        resposta = self.cliente(self.logistica).post('/api/ots/status-em-lote/', {'itens': itens}, format='json')
+
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.data['data']['atualizadas'], 4)
+        resultados = resposta.data['data']['resultados']
+        self.assertEqual([resultado['sucesso'] for resultado in resultados], [True] * 4 + [False] * 3)
+        self.assertEqual(resultados[4]['erro'], 'OT repetida no lote')
+        self.assertEqual(resultados[5]['erro'], 'OT não encontrada')
+
+        for ot in carregar:
+            ot.refresh_from_db()
+            self.assertEqual((ot.status, ot.versao), ('EM_CARREGAMENTO', 2))
+        cancelar.refresh_from_db()
+        self.assertEqual(cancelar.status, 'CANCELADA')
+        self.assertIsNotNone(cancelar.data_finalizacao)
+
+        self.assertEqual(
+            AtualizacaoOT.objects.filter(tipo_atualizacao='STATUS', usuario=self.logistica).count(), 4
+        )
+        self.assertContadoresConsistentes()
+
+    def test_motorista_nao_pode(self):
+        ot = self.criar_ot()
+        resposta = self.cliente(self.motorista).post(
+            '/api/ots/status-em-lote/', {'itens': [{'ot_id': ot.pk, 'status': 'CANCELADA'}]}, format='json'
+        )
+        self.assertEqual(resposta.status_code, 403)
+
+
+# ==============================================================================
+# 🕒 AJUSTE DA ETA
+# ==============================================================================
+
+class AjustarETATest(BaseOTTestCase):
+
+    def test_passagem_conta_para_quem_registrou(self):
+        """OT transferida no meio do caminho: o motorista que carregou e saiu leva as passagens."""
+        ot = self.criar_ot()
+        ot.atualizar_status('EM_CARREGAMENTO', self.motorista)
+        ot.atualizar_status('EM_TRANSITO', self.motorista)
+        ot.transferir_para(self.outro_motorista, self.logistica, 'Troca de veículo')
+        ot.refresh_from_db()
+        ot.atualizar_status('ENTREGUE', self.outro_motorista)
+
+        # Mudanças feitas pela logística não viram fator de motorista
+        lote = self.criar_ot(motorista=self.terceiro_motorista)
+        for status in ('EM_CARREGAMENTO', 'EM_TRANSITO', 'ENTREGUE'):
+            lote.atualizar_status(status, self.logistica)
+
+        call_command('ajustar_eta', stdout=StringIO())
+
+        por_motorista = set(EstimativaETA.objects.filter(tipo='MOTORISTA').values_list('etapa', 'chave'))
+        self.assertEqual(por_motorista, {
+            ('EM_CARREGAMENTO', str(self.motorista.pk)),
+            ('EM_TRANSITO', str(self.motorista.pk)),
+        })
+        self.assertEqual(EstimativaETA.objects.get(etapa='EM_TRANSITO', tipo='GLOBAL').amostras, 2)
+
+
+# ==============================================================================
+# 🗃️ CACHE
+# ==============================================================================
+
+class AvisoCacheLocalTest(SimpleTestCase):
+
+    LOCMEM = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    BANCO = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'logitrack_cache'}}
+
+    def test_avisa_sem_debug(self):
+        with override_settings(DEBUG=False, CACHES=self.LOCMEM), self.assertLogs('core.apps', 'WARNING'):
+            apps.get_app_config('core').ready()
+
+    def test_silencioso_com_cache_compartilhado_ou_debug(self):
+        for debug, caches in ((False, self.BANCO), (True, self.LOCMEM)):
+            with override_settings(DEBUG=debug, CACHES=caches), self.assertNoLogs('core.apps', 'WARNING'):
+                apps.get_app_config('core').ready()
+
+
+# ==============================================================================
+# ⏱️ BENCHMARKS
+# ==============================================================================
+
+class DadosSinteticosTest(TestCase):
+
+    def test_status_apos_transferencia_sao_do_novo_motorista(self):
+        gerador = GeradorDadosSinteticos(seed=5, taxa_transferencia=1.0)
+        motoristas, logistica = gerador.criar_usuarios(6, 1)
+        gerador.criar_ots(30, motoristas, logistica)
+
+        for ot in OrdemTransporte.objects.prefetch_related('transferencias', 'atualizacoes'):
+            transferencia, = ot.transferencias.all()
+            status = sorted(
+                (a for a in ot.atualizacoes.all() if a.tipo_atualizacao == 'STATUS'),
+                key=lambda a: a.data_criacao
+            )
+            self.assertEqual(status[0].usuario_id, ot.motorista_criador_id)
+            for atualizacao in status:
+                esperado = (
+                    ot.motorista_atual_id if atualizacao.data_criacao > transferencia.data_solicitacao
+                    else ot.motorista_criador_id
+                )
+                self.assertEqual(atualizacao.usuario_id, esperado)
+            if len(status) > 1:
+                self.assertLess(transferencia.data_solicitacao, status[1].data_criacao)
+                self.assertEqual(status[-1].usuario_id, ot.motorista_atual_id)
+
+
+class BenchmarksTest(TestCase):
+    """Rodada curta de todos os casos de `manage.py benchmark` (sem medir)."""
+
+    def test_casos_executam(self):
+        dataset = popular_dataset(40, seed=3)
+        for caso in criar_casos(dataset):
+            with self.subTest(caso=caso.nome):
+                self.assertEqual(len(medir(caso, repeticoes=1, aquecimento=0)), 3)
+
+    def test_comparar(self):
+        baseline = {'listar_ots': {'p50_ms': 10.0, 'p95_ms': 20.0}}
+        self.assertEqual(comparar({'listar_ots': {'p50_ms': 14.0, 'p95_ms': 20.5}}, baseline, 0.5, 1.0), [])
+        self.assertEqual(
+            comparar({'listar_ots': {'p50_ms': 16.0, 'p95_ms': 20.0}}, baseline, 0.5, 1.0),
+            [('listar_ots', 'p50_ms', 10.0, 16.0)]
+        )
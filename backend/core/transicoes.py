@@ -0,0 +1,321 @@
+# ==============================================================================
+# TRANSIÇÕES DE STATUS DA OT
+# ==============================================================================
+
+# Arquivo: backend/core/transicoes.py
+
+"""
+Serviço único para mudar o status de uma OT.
+
+🎯 PROPÓSITO: Todo caminho que muda status (view de status, finalização,
+PATCH da OT, admin) passa por aqui, com a mesma validação, o mesmo
+histórico e os mesmos contadores.
+
+📋 UMA TRANSAÇÃO:
+1. UPDATE ... WHERE id = ? AND status = ? AND motorista_atual = ?
+   AND versao = ? gravando só as colunas que mudam (status, instantes,
+   versão e os campos extras pedidos, como os dados de entrega)
+2. Nenhuma linha afetada → outra requisição mudou a OT desde a leitura
+   (TransicaoConcorrente, um ConflitoVersao); nada é gravado
+3. post_save com update_fields (índice de busca, percurso, mapa de
+   calor, geocercas continuam reagindo como a um save())
+4. ContadorStatusOT ajustado a partir do estado garantido pelo WHERE
+5. AtualizacaoOT de STATUS (com o local de entrega em ENTREGUE e
+   ENTREGUE_PARCIAL)
+
+⚡ DESEMPENHO: Sem reescrever a linha inteira nem o SELECT de
+conferência do save(); PATCH com status e dados de entrega vira um
+único UPDATE.
+
+📦 LOTE (transicionar_em_lote): validação em memória, um UPDATE por
+(status de origem, status de destino, versão lida), contadores somados
+por chave, um bulk_create do histórico e os efeitos dos receivers
+(percurso, mapa de calor, geocercas, posição) uma vez para o lote, tudo
+em uma transação.
+"""
+
+from collections import Counter, defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from logitrack_backend.tracing import get_tracer
+from .geo import codificar_geohash
+from .geocercas import afeta_geocercas, invalidar_geocercas
+from .mapa_calor import invalidar_tiles_pontos
+from .models import AtualizacaoOT, ConflitoVersao, ContadorStatusOT, OrdemTransporte
+from .percurso import finalizar_percursos
+from .posicoes import atualizar_posicao
+from .search import CAMPOS_BUSCA, indexar_ot
+
+trace = get_tracer(__name__)
+
+STATUS_COM_LOCAL_ENTREGA = ('ENTREGUE', 'ENTREGUE_PARCIAL')
+
+# Mesmos de OrdemTransporte.esta_finalizada
+STATUS_FINAIS = ('ENTREGUE', 'ENTREGUE_PARCIAL', 'CANCELADA')
+
+LIMITE_LOTE_STATUS = 500
+
+# Colunas gravadas por uma transição sem campos extras
+CAMPOS_TRANSICAO = ('status', 'versao', 'status_alterado_em', 'data_finalizacao', 'data_atualizacao')
+
+
+class TransicaoConcorrente(ConflitoVersao):
+    """O status, o motorista ou a versão da OT mudou no banco desde a leitura."""
+
+
+def transicionar_status(ot, novo_status, usuario, observacao='', campos=None):
+    """
+    Muda o status da OT com uma escrita condicional.
+
+    Args:
+        ot: OT lida do banco; o status dela é o status de origem
+        novo_status: Status de destino
+        usuario: Usuário que está fazendo a mudança
+        observacao: Observação do histórico
+        campos: Outros campos gravados no mesmo UPDATE ({campo: valor})
+
+    Returns:
+        AtualizacaoOT: Registro de histórico criado
+
+    Raises:
+        ValidationError: Se a transição não for válida
+        TransicaoConcorrente: Se a OT mudou desde a leitura (a instância
+            é recarregada do banco)
+    """
+    status_anterior = ot.status
+    if not ot.pode_transicionar_para(novo_status):
+        raise ValidationError(_mensagem_transicao_invalida(ot, novo_status))
+
+    campos = dict(campos or {})
+    campos.pop('status', None)
+    antes = (ot.motorista_atual_id, status_anterior)
+    versao_lida = ot.versao
+
+    with transaction.atomic():
+        for campo, valor in campos.items():
+            setattr(ot, campo, valor)
+
+        ot.status = novo_status
+        ot.versao = versao_lida + 1
+        ot.status_alterado_em = timezone.now()
+        if ot.esta_finalizada:
+            ot.data_finalizacao = ot.data_finalizacao or ot.status_alterado_em
+        else:
+            ot.data_finalizacao = None
+
+        gravar = [*campos, *CAMPOS_TRANSICAO]
+        for campo_geohash, coordenadas in ot.CAMPOS_GEOHASH.items():
+            if set(coordenadas) & set(campos):
+                setattr(ot, campo_geohash, codificar_geohash(*(getattr(ot, c) for c in coordenadas)))
+                gravar.append(campo_geohash)
+
+        # pre_save: auto_now de data_atualizacao e arredondamento das coordenadas
+        valores = {}
+        for campo in gravar:
+            field = ot._meta.get_field(campo)
+            valores[field.attname] = field.pre_save(ot, False)
+
+        atualizadas = OrdemTransporte.objects.filter(
+            pk=ot.pk, status=status_anterior, motorista_atual_id=antes[0], versao=versao_lida
+        ).update(**valores)
+        if not atualizadas:
+            trace.debug("⚠️ OT %s mudou desde a leitura (%s → %s)", ot.numero_ot, status_anterior, novo_status)
+            ot.refresh_from_db()
+            raise TransicaoConcorrente(
+                f'A OT {ot.numero_ot} foi alterada por outra operação (status atual: {ot.get_status_display()})'
+            )
+
+        post_save.send(
+            sender=OrdemTransporte, instance=ot, created=False,
+            update_fields=frozenset(gravar), raw=False, using=ot._state.db,
+        )
+
+        depois = (ot.motorista_atual_id, novo_status)
+        ContadorStatusOT.registrar_mudanca(antes, depois)
+        ot._estado_contador = depois
+
+        atualizacao = _registro_status(ot, usuario, observacao, status_anterior)
+        atualizacao.save()
+
+    trace.debug("✅ Status atualizado: %s %s → %s", ot.numero_ot, status_anterior, novo_status)
+    return atualizacao
+
+
+def transicionar_em_lote(itens, usuario):
+    """
+    Aplica várias transições de status em uma transação.
+
+    Args:
+        itens: Lista de {'ot_id', 'status', 'observacao'}
+        usuario: Usuário que está fazendo as mudanças
+
+    Returns:
+        list[dict]: Um resultado por item, na ordem recebida (ot_id,
+        numero_ot, status_anterior, status_novo, sucesso, erro)
+
+    Itens inválidos (OT inexistente ou repetida, transição não
+    permitida) e OTs alteradas por outra operação desde a leitura ficam
+    de fora com o erro no resultado; os demais são gravados.
+    """
+    ots = OrdemTransporte.objects.in_bulk([item['ot_id'] for item in itens])
+
+    resultados = []
+    grupos = defaultdict(list)  # (de, para, versão lida) → [(ot, resultado, observacao)]
+    vistos = set()
+    for item in itens:
+        ot = ots.get(item['ot_id'])
+        resultado = {
+            'ot_id': item['ot_id'],
+            'numero_ot': ot.numero_ot if ot else None,
+            'status_anterior': ot.status if ot else None,
+            'status_novo': item['status'],
+            'sucesso': False,
+            'erro': None,
+        }
+        resultados.append(resultado)
+
+        if ot is None:
+            resultado['erro'] = 'OT não encontrada'
+        elif item['ot_id'] in vistos:
+            resultado['erro'] = 'OT repetida no lote'
+        elif not ot.pode_transicionar_para(item['status']):
+            resultado['erro'] = _mensagem_transicao_invalida(ot, item['status'])
+        else:
+            grupos[(ot.status, item['status'], ot.versao)].append((ot, resultado, item.get('observacao', '')))
+        vistos.add(item['ot_id'])
+
+    if not grupos:
+        return resultados
+
+    agora = timezone.now()
+    with transaction.atomic():
+        deltas = Counter()
+        registros = []
+        gravadas = []
+        for (de, para, versao), membros in grupos.items():
+            final = para in STATUS_FINAIS
+            ids = _atualizar_grupo([ot.pk for ot, _, _ in membros], de, versao, {
+                'status': para,
+                'versao': versao + 1,
+                'status_alterado_em': agora,
+                'data_finalizacao': Coalesce('data_finalizacao', Value(agora)) if final else None,
+                'data_atualizacao': agora,
+            })
+
+            for ot, resultado, observacao in membros:
+                if ot.pk not in ids:
+                    resultado['erro'] = 'OT alterada por outra operação'
+                    continue
+
+                # Versão conferida no UPDATE: o resto da instância é o que está no banco
+                ot.status = para
+                ot.versao = versao + 1
+                ot.status_alterado_em = ot.data_atualizacao = agora
+                ot.data_finalizacao = (ot.data_finalizacao or agora) if final else None
+                ot._estado_contador = (ot.motorista_atual_id, para)
+                resultado['sucesso'] = True
+
+                for motorista_id in (ot.motorista_atual_id, None):
+                    deltas[(motorista_id, de)] -= 1
+                    deltas[(motorista_id, para)] += 1
+                registros.append(_registro_status(ot, usuario, observacao, de))
+                gravadas.append(ot)
+
+        for (motorista_id, status), delta in deltas.items():
+            ContadorStatusOT.incrementar(motorista_id, status, delta)
+        AtualizacaoOT.objects.bulk_create(registros)
+        _efeitos_lote(gravadas, registros)
+
+    trace.debug("📦 Status em lote: %s de %s OTs", len(registros), len(itens))
+    return resultados
+
+
+class _GrupoIncompleto(Exception):
+    """Alguma OT do grupo mudou desde a leitura (desfaz o UPDATE conjunto)."""
+
+
+def _atualizar_grupo(ids, status, versao, valores):
+    """
+    UPDATE de um grupo do lote, condicionado ao status e à versão lidos.
+
+    Returns:
+        set: IDs gravados. Se alguma OT do grupo mudou desde a leitura, o
+        UPDATE conjunto é desfeito (savepoint) e o grupo é refeito linha a
+        linha para saber quais passaram.
+    """
+    lidas = OrdemTransporte.objects.filter(status=status, versao=versao)
+    try:
+        with transaction.atomic():
+            if lidas.filter(pk__in=ids).update(**valores) != len(ids):
+                raise _GrupoIncompleto
+        return set(ids)
+    except _GrupoIncompleto:
+        return {pk for pk in ids if lidas.filter(pk=pk).update(**valores)}
+
+
+def _efeitos_lote(ots, registros):
+    """
+    O que os receivers de post_save fariam para cada OT, uma vez por lote.
+
+    - Percurso fechado só das OTs que chegaram a status final
+    - Tiles do mapa de calor e índice de geocercas invalidados uma vez
+    - Posição atual de quem registrou: a última atualização com local
+      (registrar_posicao_atualizacao não roda no bulk_create)
+    - Índice de busca: os campos da transição não são buscáveis; só
+      reindexa se CAMPOS_BUSCA passar a incluir algum deles
+    """
+    finalizadas = [ot.pk for ot in ots if ot.status in STATUS_FINAIS]
+    if finalizadas:
+        finalizar_percursos(finalizadas)
+
+    invalidar_tiles_pontos([
+        (ot.latitude_entrega, ot.longitude_entrega) for ot in ots
+        if ot.latitude_entrega is not None and ot.longitude_entrega is not None
+    ])
+    if any(afeta_geocercas(ot, CAMPOS_TRANSICAO) for ot in ots):
+        invalidar_geocercas()
+
+    if set(CAMPOS_TRANSICAO) & set(CAMPOS_BUSCA):
+        for ot in ots:
+            indexar_ot(ot)
+
+    com_local = [r for r in registros if r.latitude is not None and r.longitude is not None]
+    if com_local:
+        ultimo = com_local[-1]
+        atualizar_posicao(
+            ultimo.usuario_id, ultimo.latitude, ultimo.longitude,
+            ultimo.data_criacao, 'ATUALIZACAO', ultimo.ordem_transporte_id
+        )
+
+
+def _mensagem_transicao_invalida(ot, novo_status):
+    return f'Não é possível transicionar de {ot.get_status_display()} para {dict(ot.STATUS_CHOICES)[novo_status]}'
+
+
+def _registro_status(ot, usuario, observacao, status_anterior):
+    """AtualizacaoOT de STATUS (ainda não gravada) para a OT já transicionada."""
+    # 📍 Entrega registra o local informado na finalização
+    localizacao = {}
+    if ot.status in STATUS_COM_LOCAL_ENTREGA:
+        localizacao = {
+            'latitude': ot.latitude_entrega,
+            'longitude': ot.longitude_entrega,
+            'endereco': ot.endereco_entrega_real or '',
+        }
+
+    return AtualizacaoOT(
+        ordem_transporte=ot,
+        usuario=usuario,
+        tipo_atualizacao='STATUS',
+        descricao=f'Status alterado para {ot.get_status_display()}',
+        observacao=observacao,
+        status_anterior=status_anterior,
+        status_novo=ot.status,
+        **localizacao
+    )
@@ -0,0 +1,180 @@
+# ==============================================================================
+# TRILHA DA OT - SIMPLIFICAÇÃO E POLYLINE
+# ==============================================================================
+
+# Arquivo: backend/core/trilha.py
+
+"""
+Trajeto de uma OT pronto para o mapa.
+
+🎯 PROPÓSITO: Entregar a rota ao dashboard e ao DetalhesOTScreen sem
+baixar milhares de pontos em JSON.
+
+📋 ETAPAS:
+1. carregar_trilha (segmentos + pontos recentes) no intervalo pedido
+2. Douglas-Peucker com tolerância derivada do zoom do mapa
+3. Encoded polyline (formato do Google, precisão 5)
+
+⚡ CACHE: Resultado guardado por (OT, tolerância, intervalo). A chave
+inclui a versão da trilha da OT, incrementada a cada lote de pontos
+gravado (rastreamento.invalidar_trilha) — nada precisa ser apagado.
+"""
+
+import math
+
+import numpy as np
+from django.core.cache import cache
+
+from .compactacao import de_ms, para_ms
+from .geo import RAIO_TERRA_M
+from .rastreamento import carregar_trilha, versao_trilha
+
+ZOOM_MINIMO = 0
+ZOOM_MAXIMO = 22
+ZOOM_PADRAO = 15
+
+# Metros por pixel no zoom 0 (tiles de 256 px, no equador)
+METROS_POR_PIXEL_ZOOM_0 = 156543.03392
+
+TEMPO_CACHE_TRILHA = 60 * 60  # 1 hora
+
+
+# ==============================================================================
+# 📐 DOUGLAS-PEUCKER
+# ==============================================================================
+
+def tolerancia_para_zoom(zoom):
+    """Tolerância (m) equivalente a 1 pixel no zoom informado."""
+    return METROS_POR_PIXEL_ZOOM_0 / (2 ** zoom)
+
+
+def _projetar(latitude, longitude):
+    """Projeção equiretangular local em metros (boa para trechos de viagem)."""
+    latitude_media = math.radians(float(np.mean(latitude)))
+    x = np.radians(longitude) * math.cos(latitude_media) * RAIO_TERRA_M
+    y = np.radians(latitude) * RAIO_TERRA_M
+    return x, y
+
+
+def simplificar(latitude, longitude, tolerancia_m):
+    """
+    Douglas-Peucker iterativo.
+
+    A distância de todos os pontos de um trecho ao segmento que o
+    fecha é calculada de uma vez com NumPy; só a pilha de trechos é
+    percorrida em Python.
+
+    Returns:
+        np.ndarray: Índices dos pontos mantidos, em ordem
+    """
+    quantidade = len(latitude)
+    if quantidade <= 2:
+        return np.arange(quantidade)
+
+    x, y = _projetar(latitude, longitude)
+    manter = np.zeros(quantidade, dtype=bool)
+    manter[0] = manter[-1] = True
+
+    pilha = [(0, quantidade - 1)]
+    while pilha:
+        inicio, fim = pilha.pop()
+        if fim - inicio < 2:
+            continue
+
+        dx, dy = x[fim] - x[inicio], y[fim] - y[inicio]
+        px, py = x[inicio + 1:fim] - x[inicio], y[inicio + 1:fim] - y[inicio]
+        comprimento = math.hypot(dx, dy)
+        if comprimento == 0:
+            # Trecho fechado (volta ao mesmo lugar): distância ao ponto
+            distancias = np.hypot(px, py)
+        else:
+            distancias = np.abs(px * dy - py * dx) / comprimento
+
+        indice = int(np.argmax(distancias))
+        if distancias[indice] > tolerancia_m:
+            meio = inicio + 1 + indice
+            manter[meio] = True
+            pilha.append((inicio, meio))
+            pilha.append((meio, fim))
+
+    return np.flatnonzero(manter)
+
+
+# ==============================================================================
+# 🧵 ENCODED POLYLINE
+# ==============================================================================
+
+def codificar_polyline(latitude, longitude, precisao=5):
+    """
+    Codifica as coordenadas no formato encoded polyline do Google.
+
+    Vetorizado: deltas, zigzag e grupos de 5 bits para todos os valores
+    de uma vez (mesma ideia dos varints de compactacao.py).
+    """
+    if not len(latitude):
+        return ''
+
+    fator = 10 ** precisao
+    coordenadas = np.column_stack([
+        np.rint(np.asarray(latitude) * fator),
+        np.rint(np.asarray(longitude) * fator),
+    ]).astype(np.int64)
+    deltas = np.diff(coordenadas, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    valores = ((deltas << 1) ^ (deltas >> 63)).view(np.uint64)
+
+    tamanhos = np.ones(len(valores), dtype=np.int64)
+    for k in range(1, 13):
+        tamanhos += valores >= np.uint64(1 << (5 * k))
+
+    largura = int(tamanhos.max())
+    grupos = (valores[:, None] >> (np.arange(largura, dtype=np.uint64) * np.uint64(5))) & np.uint64(0x1f)
+
+    posicoes = np.arange(largura)
+    continua = (posicoes < (tamanhos - 1)[:, None]).astype(np.uint64) * np.uint64(0x20)
+    caracteres = (grupos | continua) + np.uint64(63)
+
+    return caracteres.astype(np.uint8)[posicoes < tamanhos[:, None]].tobytes().decode('ascii')
+
+
+# ==============================================================================
+# 🗺️ TRILHA SIMPLIFICADA (COM CACHE)
+# ==============================================================================
+
+def trilha_simplificada(ot_id, zoom=ZOOM_PADRAO, inicio=None, fim=None):
+    """
+    Trilha da OT simplificada para o zoom, como encoded polyline.
+
+    Args:
+        ot_id: ID da OT
+        zoom: Zoom do mapa (0 a 22); define a tolerância
+        inicio, fim: Intervalo opcional (datetime)
+
+    Returns:
+        dict: polyline, pontos, pontos_originais, tolerancia_m, inicio, fim
+    """
+    zoom = min(max(int(zoom), ZOOM_MINIMO), ZOOM_MAXIMO)
+    chave = 'trilha:{}:{}:{}:{}:{}'.format(
+        ot_id, versao_trilha(ot_id), zoom,
+        para_ms(inicio) if inicio else '', para_ms(fim) if fim else ''
+    )
+
+    resultado = cache.get(chave)
+    if resultado is not None:
+        return resultado
+
+    trilha = carregar_trilha(ot_id, inicio, fim)
+    tolerancia = tolerancia_para_zoom(zoom)
+    indices = simplificar(trilha['latitude'], trilha['longitude'], tolerancia)
+    timestamps = trilha['timestamp']
+
+    resultado = {
+        'polyline': codificar_polyline(trilha['latitude'][indices], trilha['longitude'][indices]),
+        'pontos': len(indices),
+        'pontos_originais': len(timestamps),
+        'zoom': zoom,
+        'tolerancia_m': round(tolerancia, 2),
+        'inicio': de_ms(int(timestamps[0])).isoformat() if len(timestamps) else None,
+        'fim': de_ms(int(timestamps[-1])).isoformat() if len(timestamps) else None,
+    }
+    cache.set(chave, resultado, TEMPO_CACHE_TRILHA)
+    return resultado
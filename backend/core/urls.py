@@ -13,6 +13,7 @@ from .views import (
     
     # Views de ações específicas
     TransferirOTView,
+    MotoristasProximosView,
     AtualizarStatusOTView,
     FinalizarOTView,
     UploadArquivoOTView,
@@ -29,6 +30,14 @@ from .views import (
     TransferenciaOTDetailView,
 
     PodeCreateOTView,
+
+    # Views de rastreamento GPS
+    RastreamentoOTView,
+    TrilhaOTView,
+    FrotaAoVivoView,
+    MapaCalorTileView,
+    RoteirizarOTsView,
+    StatusEmLoteView,
     
     # Views de debugging
     debug_ot_info,
@@ -51,10 +60,19 @@ CRUD BÁSICO:
 
 AÇÕES ESPECÍFICAS:
 - POST   /api/ots/{id}/transferir/     → TransferirOTView
+- GET    /api/ots/{id}/motoristas-proximos/ → MotoristasProximosView (sugestão de destino)
 - PATCH  /api/ots/{id}/status/         → AtualizarStatusOTView
 - POST   /api/ots/{id}/finalizar/      → FinalizarOTView
 - POST   /api/ots/{id}/arquivos/       → UploadArquivoOTView
 
+RASTREAMENTO GPS:
+- POST   /api/ots/{id}/rastreamento/   → RastreamentoOTView (lote de pontos)
+- GET    /api/ots/{id}/trilha/         → TrilhaOTView (polyline simplificada)
+- GET    /api/ots/frota/               → FrotaAoVivoView (mapa da frota ao vivo)
+- GET    /api/ots/mapa-calor/{z}/{x}/{y}/ → MapaCalorTileView (densidade de entregas)
+- POST   /api/ots/roteirizar/          → RoteirizarOTsView (sequência de entregas)
+- POST   /api/ots/status-em-lote/      → StatusEmLoteView (várias transições de status)
+
 TRANSFERÊNCIAS:
 - GET    /api/ots/transferencias/minhas/                → MinhasTransferenciasView
 - POST   /api/ots/transferencias/{id}/aceitar/         → AceitarTransferenciaView
@@ -106,6 +124,13 @@ urlpatterns = [
         name='ot_transferir'
     ),
     # POST /api/ots/{id}/transferir/ - Transferir OT para outro motorista
+
+    path(
+        '<int:pk>/motoristas-proximos/',
+        MotoristasProximosView.as_view(),
+        name='ot_motoristas_proximos'
+    ),
+    # GET /api/ots/{id}/motoristas-proximos/ - Motoristas disponíveis mais próximos (destino da transferência)
     
     path(
         '<int:pk>/status/',
@@ -127,6 +152,53 @@ urlpatterns = [
         name='ot_upload_arquivo'
     ),
     # POST /api/ots/{id}/arquivos/ - Upload de arquivos (canhotos, fotos, etc)
+
+    # ==============================================================================
+    # 📍 ENDPOINTS DE RASTREAMENTO GPS
+    # ==============================================================================
+
+    path(
+        '<int:pk>/rastreamento/',
+        RastreamentoOTView.as_view(),
+        name='ot_rastreamento'
+    ),
+    # POST /api/ots/{id}/rastreamento/ - Lote de pontos de GPS do motorista atual
+
+    path(
+        '<int:pk>/trilha/',
+        TrilhaOTView.as_view(),
+        name='ot_trilha'
+    ),
+    # GET /api/ots/{id}/trilha/ - Trajeto simplificado (encoded polyline)
+    # Query params: zoom, inicio, fim
+
+    path(
+        'frota/',
+        FrotaAoVivoView.as_view(),
+        name='ot_frota'
+    ),
+    # GET /api/ots/frota/ - OTs em andamento com última posição (logística/admin)
+
+    path(
+        'mapa-calor/<int:z>/<int:x>/<int:y>/',
+        MapaCalorTileView.as_view(),
+        name='ot_mapa_calor'
+    ),
+    # GET /api/ots/mapa-calor/{z}/{x}/{y}/ - Tile do mapa de calor de entregas (logística/admin)
+
+    path(
+        'roteirizar/',
+        RoteirizarOTsView.as_view(),
+        name='ot_roteirizar'
+    ),
+    # POST /api/ots/roteirizar/ - Ordem de visita das entregas (logística/admin)
+
+    path(
+        'status-em-lote/',
+        StatusEmLoteView.as_view(),
+        name='ot_status_lote'
+    ),
+    # POST /api/ots/status-em-lote/ - Mudança de status de várias OTs (logística/admin)
     
     # ==============================================================================
     # 🔄 ENDPOINTS DE TRANSFERÊNCIAS
@@ -13,9 +13,10 @@ from django.shortcuts import get_object_or_404
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import logging
 
-from .models import OrdemTransporte, Arquivo, TransferenciaOT, AtualizacaoOT
+from .models import OrdemTransporte, Arquivo, TransferenciaOT, AtualizacaoOT, PosicaoAtual, ConflitoVersao
 from .serializers import (
     OrdemTransporteCreateSerializer,
     OrdemTransporteListSerializer,
@@ -31,6 +32,8 @@ from .serializers import (
     TransferenciaCancelarSerializer,
     TransferenciaAprovarSerializer,
     TransferenciaRejeitarSerializer,
+    RoteirizacaoSerializer,
+    StatusEmLoteSerializer,
     debug_ot_serializer_flow
 )
 from .permissions import (
@@ -40,12 +43,109 @@ from .permissions import (
     CanUpdateOTStatus,
     CanViewAllOTs,
     CanApproveTransfer,
+    CanSendTracking,
+    CanViewFleet,
+    CanPlanRoutes,
+    CanBulkUpdateOTStatus,
     OTPermissionMixin,
     get_user_ots_queryset,
     debug_ot_permissions
 )
+from logitrack_backend.pagination import (
+    BuscaPagination,
+    OrdemTransporteKeysetPagination,
+    TransferenciaKeysetPagination
+)
+from logitrack_backend.tracing import get_tracer
+from .frota import INTERVALO_FROTA_S, snapshot_frota
+from .geo import filtrar_proximidade, ler_parametros_proximidade
+from .mapa_calor import ZOOM_MAXIMO_MAPA_CALOR, tile_mapa_calor, tile_valido
+from .posicoes import K_MAXIMO_PROXIMOS, K_PADRAO_PROXIMOS, motoristas_proximos
+from .roteirizacao import planejar_rota
+from .rastreamento import pode_receber_pontos, registrar_pontos, validar_pontos
+from .search import buscar_ots
+from .trilha import ZOOM_PADRAO, trilha_simplificada
+from .transicoes import transicionar_em_lote
+from .stats import (
+    calcular_estatisticas_ots,
+    estatisticas_de_contadores,
+    estatisticas_recentes,
+    ranking_motoristas
+)
 
 logger = logging.getLogger(__name__)
+trace = get_tracer(__name__)
+
+# ==============================================================================
+# 🔒 CONCORRÊNCIA OTIMISTA (ETag / If-Match)
+# ==============================================================================
+
+def etag(obj):
+    """ETag do registro versionado (OT ou transferência)."""
+    return f'"{obj.versao}"'
+
+
+def versao_esperada(request):
+    """
+    Versão que o cliente leu: cabeçalho If-Match ("3", W/"3") ou campo
+    `versao` do corpo. None se não informada (ou If-Match: *).
+    """
+    valor = request.headers.get('If-Match')
+    if valor is None:
+        valor = request.data.get('versao') if hasattr(request.data, 'get') else None
+    if valor is None:
+        return None
+
+    valor = str(valor).strip()
+    if valor == '*':
+        return None
+    valor = valor.removeprefix('W/').strip('"')
+    try:
+        return int(valor)
+    except ValueError:
+        return -1  # Nunca confere
+
+
+def resposta_conflito(obj, mensagem=None):
+    """Response 409 com a versão atual do banco (e o ETag para tentar de novo)."""
+    obj.refresh_from_db(fields=['versao', 'status'])
+    return Response({
+        'success': False,
+        'message': mensagem or 'O registro foi alterado por outra operação. Recarregue e tente novamente.',
+        'data': {'versao_atual': obj.versao, 'status_atual': obj.status}
+    }, status=status.HTTP_409_CONFLICT, headers={'ETag': etag(obj)})
+
+
+def conferir_versao(request, obj):
+    """Response 409 se a versão informada pelo cliente não for a atual; senão None."""
+    esperada = versao_esperada(request)
+    if esperada is not None and esperada != obj.versao:
+        trace.debug("⚠️ Versão %s informada, atual %s", esperada, obj.versao)
+        return resposta_conflito(obj)
+    return None
+
+
+def ler_id_parametro(parametros, nome):
+    """
+    Id inteiro positivo de um query param (ex: ?motorista=12).
+
+    Returns:
+        int | None: None se o parâmetro não foi enviado
+
+    Raises:
+        ValidationError: Valor não numérico (dict nome → mensagens)
+    """
+    valor = parametros.get(nome)
+    if not valor:
+        return None
+    try:
+        identificador = int(valor)
+        if identificador < 1:
+            raise ValueError
+    except ValueError:
+        raise ValidationError({nome: ['Informe o id numérico.']})
+    return identificador
+
 
 # ==============================================================================
 # 🚚 VIEWS PRINCIPAIS - CRUD DE ORDENS DE TRANSPORTE
@@ -62,8 +162,15 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
     1. Coloque breakpoint em get_queryset() para ver filtragem
     2. Coloque breakpoint em create() para ver criação
     3. Teste com diferentes tipos de usuário
+    
+    📄 PAGINAÇÃO: Cursor (keyset) em (-data_criacao, id) - use o link "next"
+    
+    📍 PROXIMIDADE: ?near=lat,lng&radius=km&near_field=origem|entrega
+    (pré-filtro por geohash + haversine, ver core/geo.py)
     """
     
+    pagination_class = OrdemTransporteKeysetPagination
+    
     def get_permissions(self):
         """
         Define permissões baseadas no método HTTP.
@@ -89,8 +196,8 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver filtragem
         """
-        print(f"🚚 LIST OTs: Listando OTs para {self.request.user.email}")
-        print(f"🚚 Role: {self.request.user.role}")
+        trace.debug("🚚 LIST OTs: Listando OTs para %s", self.request.user.email)
+        trace.debug("🚚 Role: %s", self.request.user.role)
         
         # Usar helper de permissões para filtrar
         queryset = get_user_ots_queryset(self.request.user)
@@ -99,20 +206,29 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
         status_filter = self.request.query_params.get('status')
         if status_filter:
             queryset = queryset.filter(status=status_filter)
-            print(f"🚚 Filtro status aplicado: {status_filter}")
+            trace.debug("🚚 Filtro status aplicado: %s", status_filter)
         
-        motorista_filter = self.request.query_params.get('motorista')
+        # Validado em list()
+        motorista_filter = getattr(self, 'motorista_filtro', None)
         if motorista_filter and self.request.user.role in ['logistica', 'admin']:
             queryset = queryset.filter(motorista_atual_id=motorista_filter)
-            print(f"🚚 Filtro motorista aplicado: {motorista_filter}")
+            trace.debug("🚚 Filtro motorista aplicado: %s", motorista_filter)
+        
+        # Filtro por raio (validado em list())
+        proximidade = getattr(self, 'proximidade', None)
+        if proximidade:
+            queryset = filtrar_proximidade(queryset, **proximidade)
+            trace.debug("🚚 Filtro de proximidade aplicado: %s", proximidade)
         
         # Ordenar por data de criação (mais recentes primeiro)
-        queryset = queryset.order_by('-data_criacao')
+        queryset = queryset.order_by('-data_criacao', 'id')
         
-        # Otimizar queries
-        queryset = queryset.select_related('motorista_criador', 'motorista_atual')
+        # Otimizar queries (a listagem não mostra paradas nem o estado do percurso)
+        queryset = queryset.select_related('motorista_criador', 'motorista_atual').defer(
+            'paradas', 'estado_percurso'
+        )
         
-        print(f"🚚 Total de OTs retornadas: {queryset.count()}")
+        trace.debug(lambda: f"🚚 Total de OTs retornadas: {queryset.count()}")
         return queryset
     
     def create(self, request, *args, **kwargs):
@@ -121,8 +237,8 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo completo
         """
-        print(f"🚚 CREATE OT: Usuário {request.user.email} criando nova OT")
-        print(f"🚚 Dados recebidos: {request.data}")
+        trace.debug("🚚 CREATE OT: Usuário %s criando nova OT", request.user.email)
+        trace.debug("🚚 Dados recebidos: %s", request.data)
         
         # Criar serializer
         serializer = self.get_serializer(data=request.data)
@@ -130,13 +246,13 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
         
         # Validar dados
         if serializer.is_valid():
-            print(f"✅ Dados válidos, criando OT...")
+            trace.debug("✅ Dados válidos, criando OT...")
             debug_ot_serializer_flow(serializer, "Após validação bem-sucedida")
             
             # Salvar OT
             ot = serializer.save()
             
-            print(f"✅ OT criada com sucesso: {ot.numero_ot}")
+            trace.debug("✅ OT criada com sucesso: %s", ot.numero_ot)
             
             # Retornar dados completos da OT criada
             response_serializer = OrdemTransporteDetailSerializer(ot)
@@ -147,7 +263,7 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
                 'data': response_serializer.data
             }, status=status.HTTP_201_CREATED)
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             debug_ot_serializer_flow(serializer, "Após validação com erros")
             
             return Response({
@@ -160,29 +276,60 @@ class OrdemTransporteListCreateView(generics.ListCreateAPIView, OTPermissionMixi
         """
         Lista OTs com metadados adicionais.
         """
-        print(f"🚚 LIST: Listando OTs para {request.user.email}")
+        trace.debug("🚚 LIST: Listando OTs para %s", request.user.email)
         
-        response = super().list(request, *args, **kwargs)
+        try:
+            self.proximidade = ler_parametros_proximidade(request.query_params)
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'message': 'Parâmetros de proximidade inválidos',
+                'errors': e.message_dict
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            self.motorista_filtro = ler_id_parametro(request.query_params, 'motorista')
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'message': 'Filtro de motorista inválido',
+                'errors': e.message_dict
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        
+        with trace.span('listar_ots.pagina'):
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                data = self.get_paginated_response(serializer.data).data
+            else:
+                data = self.get_serializer(queryset, many=True).data
         
         # Adicionar metadados à resposta
-        queryset = self.get_queryset()
+        with trace.span('listar_ots.estatisticas', role=request.user.role):
+            if request.user.role in ['logistica', 'admin'] and not self.proximidade:
+                # Visão global: ler dos contadores materializados
+                estatisticas = estatisticas_de_contadores(
+                    motorista_id=self.motorista_filtro,
+                    status=request.query_params.get('status') or None
+                )
+            else:
+                # Motorista ou filtro por raio: uma única query de agregação
+                estatisticas = calcular_estatisticas_ots(queryset)
         
         stats = {
-            'total': queryset.count(),
+            'total': estatisticas['total'],
             'por_status': {
-                'iniciada': queryset.filter(status='INICIADA').count(),
-                'em_carregamento': queryset.filter(status='EM_CARREGAMENTO').count(),
-                'em_transito': queryset.filter(status='EM_TRANSITO').count(),
-                'entregue': queryset.filter(status='ENTREGUE').count(),
-                'entregue_parcial': queryset.filter(status='ENTREGUE_PARCIAL').count(),
-                'cancelada': queryset.filter(status='CANCELADA').count(),
+                status_code.lower(): quantidade
+                for status_code, quantidade in estatisticas['por_status'].items()
             }
         }
         
         return Response({
             'success': True,
             'message': 'Lista de OTs recuperada',
-            'data': response.data,
+            'data': data,
             'stats': stats
         })
 
@@ -193,7 +340,11 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
     
     GET /api/ots/{id}/ - Visualizar OT completa
     PUT/PATCH /api/ots/{id}/ - Editar OT
-    
+
+    🔒 CONCORRÊNCIA: GET devolve ETag com a versão; PATCH, status,
+    finalizar e transferir aceitam If-Match (ou "versao" no corpo) e
+    respondem 409 se a OT mudou desde a leitura
+
     🔍 DEBUGGING:
     1. Coloque breakpoint em get_object() para ver recuperação
     2. Coloque breakpoint em update() para ver edições
@@ -231,8 +382,8 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
             pk=self.kwargs['pk']
         )
         
-        print(f"🚚 GET OT: Recuperando OT {obj.numero_ot}")
-        print(f"🚚 Solicitante: {self.request.user.email}")
+        trace.debug("🚚 GET OT: Recuperando OT %s", obj.numero_ot)
+        trace.debug("🚚 Solicitante: %s", self.request.user.email)
         
         # Debug de permissões
         debug_ot_permissions(self.request.user, obj, "Visualização de detalhes")
@@ -253,7 +404,7 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
             'success': True,
             'message': f'Detalhes da OT {instance.numero_ot} recuperados',
             'data': serializer.data
-        })
+        }, headers={'ETag': etag(instance)})
     
     def update(self, request, *args, **kwargs):
         """
@@ -263,13 +414,13 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
         """
         instance = self.get_object()
         
-        print(f"🚚 UPDATE OT: Atualizando {instance.numero_ot}")
-        print(f"🚚 Usuário: {request.user.email}")
-        print(f"🚚 Dados: {request.data}")
+        trace.debug("🚚 UPDATE OT: Atualizando %s", instance.numero_ot)
+        trace.debug("🚚 Usuário: %s", request.user.email)
+        trace.debug("🚚 Dados: %s", request.data)
         
         # Verificar se OT pode ser editada
         if not instance.pode_ser_editada:
-            print(f"❌ OT não pode ser editada (status: {instance.status})")
+            trace.debug("❌ OT não pode ser editada (status: %s)", instance.status)
             return Response({
                 'success': False,
                 'message': 'Esta OT não pode mais ser editada',
@@ -278,18 +429,27 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
         
         # Debug de permissões
         debug_ot_permissions(request.user, instance, "Edição de OT")
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, instance)
+        if conflito:
+            return conflito
         
         # Executar update
         partial = kwargs.pop('partial', False)
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, atualizando...")
+            trace.debug("✅ Dados válidos, atualizando...")
             debug_ot_serializer_flow(serializer, "Antes do update")
             
-            updated_instance = serializer.save()
+            try:
+                updated_instance = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(instance, str(e))
             
-            print(f"✅ OT {updated_instance.numero_ot} atualizada com sucesso")
+            trace.debug("✅ OT %s atualizada com sucesso", updated_instance.numero_ot)
             
             # Retornar dados completos atualizados
             response_serializer = OrdemTransporteDetailSerializer(updated_instance)
@@ -298,9 +458,9 @@ class OrdemTransporteDetailView(generics.RetrieveUpdateAPIView, OTPermissionMixi
                 'success': True,
                 'message': f'OT {updated_instance.numero_ot} atualizada com sucesso',
                 'data': response_serializer.data
-            })
+            }, headers={'ETag': etag(updated_instance)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             debug_ot_serializer_flow(serializer, "Erros de validação")
             
             return Response({
@@ -349,20 +509,25 @@ class TransferirOTView(APIView, OTPermissionMixin):
         
         🐛 DEBUGGING: Coloque breakpoint aqui
         """
-        print(f"🔄 TRANSFER OT: Iniciando transferência")
-        print(f"🔄 OT ID: {pk}")
-        print(f"🔄 Usuário: {request.user.email}")
-        print(f"🔄 Dados: {request.data}")
+        trace.debug("🔄 TRANSFER OT: Iniciando transferência")
+        trace.debug("🔄 OT ID: %s", pk)
+        trace.debug("🔄 Usuário: %s", request.user.email)
+        trace.debug("🔄 Dados: %s", request.data)
         
         # Recuperar OT
         ot = self.get_object()
         
-        print(f"🔄 OT: {ot.numero_ot}")
-        print(f"🔄 Motorista atual: {ot.motorista_atual.email}")
-        print(f"🔄 Status: {ot.status}")
+        trace.debug("🔄 OT: %s", ot.numero_ot)
+        trace.debug(lambda: f"🔄 Motorista atual: {ot.motorista_atual.email}")
+        trace.debug("🔄 Status: %s", ot.status)
         
         # Debug de permissões
         debug_ot_permissions(request.user, ot, "Transferência de OT")
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, ot)
+        if conflito:
+            return conflito
         
         # Criar serializer com contexto
         serializer = TransferenciaOTCreateSerializer(
@@ -376,14 +541,18 @@ class TransferirOTView(APIView, OTPermissionMixin):
         debug_ot_serializer_flow(serializer, "Serializer de transferência criado")
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, processando transferência...")
+            trace.debug("✅ Dados válidos, processando transferência...")
             debug_ot_serializer_flow(serializer, "Após validação bem-sucedida")
             
             # Salvar transferência
-            transferencia = serializer.save()
+            try:
+                transferencia = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(ot, str(e))
             
-            print(f"✅ Transferência criada: ID {transferencia.id}")
-            print(f"🔄 Status da transferência: {transferencia.status}")
+            trace.debug("✅ Transferência criada: ID %s", transferencia.id)
+            trace.debug("🔄 Status da transferência: %s", transferencia.status)
             
             # Preparar resposta baseada no tipo de transferência
             if transferencia.status == 'APROVADA':
@@ -399,9 +568,9 @@ class TransferirOTView(APIView, OTPermissionMixin):
                 'message': message,
                 'data': response_serializer.data,
                 'ot_atualizada': OrdemTransporteDetailSerializer(ot).data
-            }, status=status.HTTP_201_CREATED)
+            }, status=status.HTTP_201_CREATED, headers={'ETag': etag(ot)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             debug_ot_serializer_flow(serializer, "Erros de validação")
             
             return Response({
@@ -410,6 +579,94 @@ class TransferirOTView(APIView, OTPermissionMixin):
                 'errors': serializer.errors
             }, status=status.HTTP_400_BAD_REQUEST)
 
+class MotoristasProximosView(APIView, OTPermissionMixin):
+    """
+    🎯 PROPÓSITO: Sugerir o motorista destino de uma transferência
+
+    GET /api/ots/{id}/motoristas-proximos/?k=5
+    GET /api/ots/{id}/motoristas-proximos/?near=lat,lng&k=5
+
+    📋 REGRAS:
+    - Só motoristas ativos sem OT ativa (mesma regra do pode-criar)
+    - O motorista atual da OT fica de fora
+    - Ponto de referência: `near`, senão a última posição do motorista
+      atual, senão a origem da OT
+    - Busca limitada a RAIO_MAXIMO_KM: a resposta traz o raio buscado
+      (raio_km) e incompleto=true se achou menos de k motoristas
+
+    ⚡ Índice de geohash das posições atuais (ver core/posicoes.py);
+    disponibilidade verificada na mesma consulta
+    """
+
+    permission_classes = [CanTransferOT]
+
+    def get_object(self):
+        """Recupera a OT a ser transferida."""
+        obj = get_object_or_404(OrdemTransporte, pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def ponto_referencia(self, ot, proximidade):
+        """(latitude, longitude, fonte) ou None."""
+        if proximidade:
+            return proximidade['latitude'], proximidade['longitude'], 'near'
+
+        posicao = PosicaoAtual.objects.filter(usuario_id=ot.motorista_atual_id).values_list(
+            'latitude', 'longitude'
+        ).first()
+        if posicao:
+            return posicao[0], posicao[1], 'motorista_atual'
+
+        if ot.latitude_origem is not None and ot.longitude_origem is not None:
+            return float(ot.latitude_origem), float(ot.longitude_origem), 'origem'
+        return None
+
+    def get(self, request, pk):
+        """Retorna os k motoristas disponíveis mais próximos."""
+        ot = self.get_object()
+
+        erros = {}
+        try:
+            k = int(request.query_params.get('k', K_PADRAO_PROXIMOS))
+            if not 1 <= k <= K_MAXIMO_PROXIMOS:
+                raise ValueError
+        except ValueError:
+            erros['k'] = [f'Informe um inteiro de 1 a {K_MAXIMO_PROXIMOS}.']
+
+        try:
+            proximidade = ler_parametros_proximidade(request.query_params)
+        except ValidationError as e:
+            erros.update(e.message_dict)
+            proximidade = None
+
+        if erros:
+            return Response({
+                'success': False,
+                'message': 'Parâmetros inválidos',
+                'errors': erros
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        referencia = self.ponto_referencia(ot, proximidade)
+        if referencia is None:
+            return Response({
+                'success': False,
+                'message': 'Sem ponto de referência',
+                'errors': {'near': ['A OT não tem origem nem posição do motorista; informe near=latitude,longitude.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        latitude, longitude, fonte = referencia
+        with trace.span('motoristas_proximos', ot=ot.id, k=k):
+            busca = motoristas_proximos(latitude, longitude, k, excluir=[ot.motorista_atual_id])
+
+        return Response({
+            'success': True,
+            'data': {
+                'referencia': {'latitude': latitude, 'longitude': longitude, 'fonte': fonte},
+                **busca,
+            }
+        })
+
+
 class TransferenciaOTDetailView(generics.RetrieveAPIView, OTPermissionMixin):
     """
     🎯 PROPÓSITO: Visualizar detalhes de uma transferência específica
@@ -442,24 +699,24 @@ class TransferenciaOTDetailView(generics.RetrieveAPIView, OTPermissionMixin):
         
         🐛 DEBUGGING: Coloque breakpoint aqui para ver processo
         """
-        print(f"🔍 GET TRANSFERENCIA: ID {self.kwargs['pk']}")
-        print(f"🔍 Usuário: {self.request.user.email} ({self.request.user.role})")
+        trace.debug("🔍 GET TRANSFERENCIA: ID %s", self.kwargs['pk'])
+        trace.debug("🔍 Usuário: %s (%s)", self.request.user.email, self.request.user.role)
         
         # Recuperar transferência
         transferencia = get_object_or_404(TransferenciaOT, pk=self.kwargs['pk'])
         
-        print(f"🔍 Transferência encontrada:")
-        print(f"   - OT: {transferencia.ordem_transporte.numero_ot}")
-        print(f"   - De: {transferencia.motorista_origem.email}")
-        print(f"   - Para: {transferencia.motorista_destino.email}")
-        print(f"   - Status: {transferencia.status}")
-        print(f"   - Solicitada por: {transferencia.solicitado_por.email}")
+        trace.debug("🔍 Transferência encontrada:")
+        trace.debug(lambda: f"   - OT: {transferencia.ordem_transporte.numero_ot}")
+        trace.debug(lambda: f"   - De: {transferencia.motorista_origem.email}")
+        trace.debug(lambda: f"   - Para: {transferencia.motorista_destino.email}")
+        trace.debug("   - Status: %s", transferencia.status)
+        trace.debug(lambda: f"   - Solicitada por: {transferencia.solicitado_por.email}")
         
         user = self.request.user
         
         # Verificar permissões baseadas no role do usuário
         if user.role in ['logistica', 'admin']:
-            print(f"✅ Permissão concedida: {user.role} pode ver todas as transferências")
+            trace.debug("✅ Permissão concedida: %s pode ver todas as transferências", user.role)
             return transferencia
         
         # Motoristas só podem ver transferências relacionadas a eles
@@ -468,15 +725,15 @@ class TransferenciaOTDetailView(generics.RetrieveAPIView, OTPermissionMixin):
             if (user == transferencia.motorista_origem or 
                 user == transferencia.motorista_destino or 
                 user == transferencia.solicitado_por):
-                print(f"✅ Permissão concedida: motorista está relacionado à transferência")
+                trace.debug("✅ Permissão concedida: motorista está relacionado à transferência")
                 return transferencia
             else:
-                print(f"❌ Permissão negada: motorista não está relacionado à transferência")
+                trace.debug("❌ Permissão negada: motorista não está relacionado à transferência")
                 from rest_framework.exceptions import PermissionDenied
                 raise PermissionDenied("Você não tem permissão para ver esta transferência")
         
         # Fallback: negar acesso
-        print(f"❌ Permissão negada: role não reconhecido ou sem permissão")
+        trace.debug("❌ Permissão negada: role não reconhecido ou sem permissão")
         from rest_framework.exceptions import PermissionDenied
         raise PermissionDenied("Você não tem permissão para ver esta transferência")
     
@@ -486,7 +743,7 @@ class TransferenciaOTDetailView(generics.RetrieveAPIView, OTPermissionMixin):
         
         🔍 DEBUGGING: Coloque breakpoint aqui para ver resposta completa
         """
-        print(f"🔍 RETRIEVE: Buscando detalhes da transferência")
+        trace.debug("🔍 RETRIEVE: Buscando detalhes da transferência")
         
         # Recuperar transferência
         transferencia = self.get_object()
@@ -518,10 +775,10 @@ class TransferenciaOTDetailView(generics.RetrieveAPIView, OTPermissionMixin):
             ).total_seconds() / 3600,  # em horas
         }
         
-        print(f"✅ Transferência recuperada com sucesso")
-        print(f"   - Pode aceitar: {dados_extras['pode_aceitar']}")
-        print(f"   - Pode recusar: {dados_extras['pode_recusar']}")
-        print(f"   - Pode cancelar: {dados_extras['pode_cancelar']}")
+        trace.debug("✅ Transferência recuperada com sucesso")
+        trace.debug("   - Pode aceitar: %s", dados_extras['pode_aceitar'])
+        trace.debug("   - Pode recusar: %s", dados_extras['pode_recusar'])
+        trace.debug("   - Pode cancelar: %s", dados_extras['pode_cancelar'])
         
         return Response({
             'success': True,
@@ -557,18 +814,23 @@ class AtualizarStatusOTView(APIView, OTPermissionMixin):
             "observacao": "Saindo do CD"
         }
         """
-        print(f"🚚 UPDATE STATUS: Atualizando status da OT {pk}")
-        print(f"🚚 Usuário: {request.user.email}")
-        print(f"🚚 Dados: {request.data}")
+        trace.debug("🚚 UPDATE STATUS: Atualizando status da OT %s", pk)
+        trace.debug("🚚 Usuário: %s", request.user.email)
+        trace.debug("🚚 Dados: %s", request.data)
         
         # Recuperar OT
         ot = self.get_object()
         
-        print(f"🚚 OT: {ot.numero_ot}")
-        print(f"🚚 Status atual: {ot.status}")
+        trace.debug("🚚 OT: %s", ot.numero_ot)
+        trace.debug("🚚 Status atual: %s", ot.status)
         
         # Debug de permissões
         debug_ot_permissions(request.user, ot, "Atualização de status")
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, ot)
+        if conflito:
+            return conflito
         
         # Criar serializer
         serializer = OrdemTransporteStatusSerializer(
@@ -578,19 +840,23 @@ class AtualizarStatusOTView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, atualizando status...")
+            trace.debug("✅ Dados válidos, atualizando status...")
             
-            updated_ot = serializer.save()
+            try:
+                updated_ot = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(ot, str(e))
             
-            print(f"✅ Status atualizado: {updated_ot.status}")
+            trace.debug("✅ Status atualizado: %s", updated_ot.status)
             
             return Response({
                 'success': True,
                 'message': f'Status da OT {updated_ot.numero_ot} atualizado para {updated_ot.get_status_display()}',
                 'data': OrdemTransporteDetailSerializer(updated_ot).data
-            })
+            }, headers={'ETag': etag(updated_ot)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -630,20 +896,20 @@ class FinalizarOTView(APIView, OTPermissionMixin):
             "endereco_entrega_real": "Rua das Flores, 123"
         }
         """
-        print(f"🏁 FINALIZAR OT: Finalizando OT {pk}")
-        print(f"🏁 Usuário: {request.user.email}")
-        print(f"🏁 Dados: {request.data}")
+        trace.debug("🏁 FINALIZAR OT: Finalizando OT %s", pk)
+        trace.debug("🏁 Usuário: %s", request.user.email)
+        trace.debug("🏁 Dados: %s", request.data)
         
         # Recuperar OT
         ot = self.get_object()
         
-        print(f"🏁 OT: {ot.numero_ot}")
-        print(f"🏁 Status atual: {ot.status}")
-        print(f"📎 Arquivos anexados: {ot.arquivos.count()}")
+        trace.debug("🏁 OT: %s", ot.numero_ot)
+        trace.debug("🏁 Status atual: %s", ot.status)
+        trace.debug(lambda: f"📎 Arquivos anexados: {ot.arquivos.count()}")
         
         # 🔧 NOVA VALIDAÇÃO: Verificar arquivos ANTES de qualquer processamento
         if ot.arquivos.count() == 0:
-            print(f"❌ Tentativa de finalizar OT sem documentos")
+            trace.debug("❌ Tentativa de finalizar OT sem documentos")
             return Response({
                 'success': False,
                 'message': 'Não é possível finalizar a OT sem documentos anexados',
@@ -663,7 +929,7 @@ class FinalizarOTView(APIView, OTPermissionMixin):
         
         # Verificar se OT pode ser finalizada
         if not ot.pode_transicionar_para('ENTREGUE'):
-            print(f"❌ OT não pode ser finalizada no status atual: {ot.status}")
+            trace.debug("❌ OT não pode ser finalizada no status atual: %s", ot.status)
             return Response({
                 'success': False,
                 'message': f'OT não pode ser finalizada no status {ot.get_status_display()}',
@@ -672,6 +938,11 @@ class FinalizarOTView(APIView, OTPermissionMixin):
         
         # Debug de permissões
         debug_ot_permissions(request.user, ot, "Finalização de OT")
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, ot)
+        if conflito:
+            return conflito
         
         # Criar serializer
         serializer = OrdemTransporteFinalizarSerializer(
@@ -681,19 +952,23 @@ class FinalizarOTView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, finalizando OT...")
+            trace.debug("✅ Dados válidos, finalizando OT...")
             
-            finalized_ot = serializer.save()
+            try:
+                finalized_ot = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(ot, str(e))
             
-            print(f"✅ OT {finalized_ot.numero_ot} finalizada com sucesso")
+            trace.debug("✅ OT %s finalizada com sucesso", finalized_ot.numero_ot)
             
             return Response({
                 'success': True,
                 'message': f'OT {finalized_ot.numero_ot} finalizada com sucesso',
                 'data': OrdemTransporteDetailSerializer(finalized_ot).data
-            })
+            }, headers={'ETag': etag(finalized_ot)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -737,17 +1012,22 @@ class AceitarTransferenciaView(APIView, OTPermissionMixin):
             "observacao": "Observação sobre a aceitação (opcional)"
         }
         """
-        print(f"✅ ACEITAR TRANSFERENCIA: ID {pk}")
-        print(f"✅ Usuário: {request.user.email}")
-        print(f"✅ Dados: {request.data}")
+        trace.debug("✅ ACEITAR TRANSFERENCIA: ID %s", pk)
+        trace.debug("✅ Usuário: %s", request.user.email)
+        trace.debug("✅ Dados: %s", request.data)
         
         # Recuperar transferência
         transferencia = self.get_object()
         
-        print(f"✅ Transferência: OT {transferencia.ordem_transporte.numero_ot}")
-        print(f"✅ De: {transferencia.motorista_origem.email}")
-        print(f"✅ Para: {transferencia.motorista_destino.email}")
-        print(f"✅ Status: {transferencia.status}")
+        trace.debug(lambda: f"✅ Transferência: OT {transferencia.ordem_transporte.numero_ot}")
+        trace.debug(lambda: f"✅ De: {transferencia.motorista_origem.email}")
+        trace.debug(lambda: f"✅ Para: {transferencia.motorista_destino.email}")
+        trace.debug("✅ Status: %s", transferencia.status)
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, transferencia)
+        if conflito:
+            return conflito
         
         # Criar serializer
         serializer = TransferenciaAceitarSerializer(
@@ -757,20 +1037,24 @@ class AceitarTransferenciaView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, aceitando transferência...")
+            trace.debug("✅ Dados válidos, aceitando transferência...")
             
-            updated_transferencia = serializer.save()
+            try:
+                updated_transferencia = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(transferencia, str(e))
             
-            print(f"✅ Transferência aceita com sucesso!")
+            trace.debug("✅ Transferência aceita com sucesso!")
             
             return Response({
                 'success': True,
                 'message': f'Transferência aceita! Você agora é responsável pela OT {updated_transferencia.ordem_transporte.numero_ot}',
                 'data': TransferenciaOTSerializer(updated_transferencia).data,
                 'ot_atualizada': OrdemTransporteDetailSerializer(updated_transferencia.ordem_transporte).data
-            })
+            }, headers={'ETag': etag(updated_transferencia)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -810,17 +1094,22 @@ class RecusarTransferenciaView(APIView, OTPermissionMixin):
             "observacao": "Motivo da recusa (obrigatório)"
         }
         """
-        print(f"❌ RECUSAR TRANSFERENCIA: ID {pk}")
-        print(f"❌ Usuário: {request.user.email}")
-        print(f"❌ Dados: {request.data}")
+        trace.debug("❌ RECUSAR TRANSFERENCIA: ID %s", pk)
+        trace.debug("❌ Usuário: %s", request.user.email)
+        trace.debug("❌ Dados: %s", request.data)
         
         # Recuperar transferência
         transferencia = self.get_object()
         
-        print(f"❌ Transferência: OT {transferencia.ordem_transporte.numero_ot}")
-        print(f"❌ De: {transferencia.motorista_origem.email}")
-        print(f"❌ Para: {transferencia.motorista_destino.email}")
-        print(f"❌ Status: {transferencia.status}")
+        trace.debug(lambda: f"❌ Transferência: OT {transferencia.ordem_transporte.numero_ot}")
+        trace.debug(lambda: f"❌ De: {transferencia.motorista_origem.email}")
+        trace.debug(lambda: f"❌ Para: {transferencia.motorista_destino.email}")
+        trace.debug("❌ Status: %s", transferencia.status)
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, transferencia)
+        if conflito:
+            return conflito
         
         # Criar serializer
         serializer = TransferenciaRecusarSerializer(
@@ -830,19 +1119,23 @@ class RecusarTransferenciaView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, recusando transferência...")
+            trace.debug("✅ Dados válidos, recusando transferência...")
             
-            updated_transferencia = serializer.save()
+            try:
+                updated_transferencia = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(transferencia, str(e))
             
-            print(f"❌ Transferência recusada!")
+            trace.debug("❌ Transferência recusada!")
             
             return Response({
                 'success': True,
                 'message': f'Transferência recusada. A OT {updated_transferencia.ordem_transporte.numero_ot} continua com {updated_transferencia.motorista_origem.full_name}',
                 'data': TransferenciaOTSerializer(updated_transferencia).data
-            })
+            }, headers={'ETag': etag(updated_transferencia)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -878,15 +1171,20 @@ class CancelarTransferenciaView(APIView, OTPermissionMixin):
             "observacao": "Motivo do cancelamento (opcional)"
         }
         """
-        print(f"🚫 CANCELAR TRANSFERENCIA: ID {pk}")
-        print(f"🚫 Usuário: {request.user.email}")
-        print(f"🚫 Dados: {request.data}")
+        trace.debug("🚫 CANCELAR TRANSFERENCIA: ID %s", pk)
+        trace.debug("🚫 Usuário: %s", request.user.email)
+        trace.debug("🚫 Dados: %s", request.data)
         
         # Recuperar transferência
         transferencia = self.get_object()
         
-        print(f"🚫 Transferência: OT {transferencia.ordem_transporte.numero_ot}")
-        print(f"🚫 Status: {transferencia.status}")
+        trace.debug(lambda: f"🚫 Transferência: OT {transferencia.ordem_transporte.numero_ot}")
+        trace.debug("🚫 Status: %s", transferencia.status)
+
+        # 🔒 If-Match / versao: cliente agindo sobre uma versão antiga
+        conflito = conferir_versao(request, transferencia)
+        if conflito:
+            return conflito
         
         # Criar serializer
         serializer = TransferenciaCancelarSerializer(
@@ -896,19 +1194,23 @@ class CancelarTransferenciaView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, cancelando transferência...")
+            trace.debug("✅ Dados válidos, cancelando transferência...")
             
-            updated_transferencia = serializer.save()
+            try:
+                updated_transferencia = serializer.save()
+            except ConflitoVersao as e:
+                trace.debug("⚠️ Conflito: %s", e)
+                return resposta_conflito(transferencia, str(e))
             
-            print(f"🚫 Transferência cancelada!")
+            trace.debug("🚫 Transferência cancelada!")
             
             return Response({
                 'success': True,
                 'message': f'Transferência cancelada',
                 'data': TransferenciaOTSerializer(updated_transferencia).data
-            })
+            }, headers={'ETag': etag(updated_transferencia)})
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -924,10 +1226,13 @@ class MinhasTransferenciasView(generics.ListAPIView):
     GET /api/transferencias/minhas/
     
     🔍 DEBUGGING: Para ver transferências que aguardam ação do motorista
+    
+    📄 PAGINAÇÃO: Cursor (keyset) em (-data_solicitacao, id)
     """
     
     serializer_class = TransferenciaOTSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TransferenciaKeysetPagination
     
     def get_queryset(self):
         """
@@ -935,7 +1240,7 @@ class MinhasTransferenciasView(generics.ListAPIView):
         """
         user = self.request.user
         
-        print(f"📋 MINHAS TRANSFERENCIAS: Para {user.email}")
+        trace.debug("📋 MINHAS TRANSFERENCIAS: Para %s", user.email)
         
         # Filtrar transferências relevantes para o usuário
         queryset = TransferenciaOT.objects.filter(
@@ -948,9 +1253,9 @@ class MinhasTransferenciasView(generics.ListAPIView):
         queryset = queryset.select_related(
             'ordem_transporte', 'motorista_origem', 'motorista_destino',
             'solicitado_por', 'aprovado_por'
-        ).order_by('-data_solicitacao')
+        ).order_by('-data_solicitacao', 'id')
         
-        print(f"📋 Total encontradas: {queryset.count()}")
+        trace.debug(lambda: f"📋 Total encontradas: {queryset.count()}")
         
         return queryset
     
@@ -958,15 +1263,35 @@ class MinhasTransferenciasView(generics.ListAPIView):
         """
         Lista transferências com categorização.
         """
-        print(f"📋 LIST TRANSFERENCIAS: Para {request.user.email}")
+        trace.debug("📋 LIST TRANSFERENCIAS: Para %s", request.user.email)
         
+        user = request.user
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
         
-        # Categorizar transferências
-        para_aceitar = [t for t in serializer.data if t['status'] == 'AGUARDANDO_ACEITACAO' and t['motorista_destino']['id'] == request.user.id]
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        
+        # Categorizar transferências da página
+        para_aceitar = [t for t in serializer.data if t['status'] == 'AGUARDANDO_ACEITACAO' and t['motorista_destino']['id'] == user.id]
         aguardando_aprovacao = [t for t in serializer.data if t['status'] == 'PENDENTE']
-        minhas_aguardando_resposta = [t for t in serializer.data if t['status'] == 'AGUARDANDO_ACEITACAO' and t['motorista_origem']['id'] == request.user.id]
+        minhas_aguardando_resposta = [t for t in serializer.data if t['status'] == 'AGUARDANDO_ACEITACAO' and t['motorista_origem']['id'] == user.id]
+        
+        # Totais de todas as páginas em uma única query de agregação
+        stats = queryset.order_by().aggregate(
+            total=models.Count('id'),
+            para_aceitar=models.Count('id', filter=models.Q(
+                status='AGUARDANDO_ACEITACAO', motorista_destino=user
+            )),
+            aguardando_aprovacao=models.Count('id', filter=models.Q(status='PENDENTE')),
+            minhas_aguardando_resposta=models.Count('id', filter=models.Q(
+                status='AGUARDANDO_ACEITACAO', motorista_origem=user
+            )),
+        )
+        
+        paginacao = None
+        if page is not None:
+            paginacao = self.get_paginated_response(serializer.data).data
+            paginacao.pop('results')
         
         return Response({
             'success': True,
@@ -977,12 +1302,8 @@ class MinhasTransferenciasView(generics.ListAPIView):
                 'minhas_aguardando_resposta': minhas_aguardando_resposta,
                 'todas': serializer.data
             },
-            'stats': {
-                'total': len(serializer.data),
-                'para_aceitar': len(para_aceitar),
-                'aguardando_aprovacao': len(aguardando_aprovacao),
-                'minhas_aguardando_resposta': len(minhas_aguardando_resposta)
-            }
+            'stats': stats,
+            'paginacao': paginacao
         })
 
 class UploadArquivoOTView(APIView, OTPermissionMixin):
@@ -1011,15 +1332,15 @@ class UploadArquivoOTView(APIView, OTPermissionMixin):
         - tipo: CANHOTO|FOTO_ENTREGA|FOTO_OCORRENCIA|COMPROVANTE|OUTRO
         - descricao: String (opcional)
         """
-        print(f"📎 UPLOAD: Upload de arquivo para OT {pk}")
-        print(f"📎 Usuário: {request.user.email}")
-        print(f"📎 Arquivos: {request.FILES}")
-        print(f"📎 Dados: {request.data}")
+        trace.debug("📎 UPLOAD: Upload de arquivo para OT %s", pk)
+        trace.debug("📎 Usuário: %s", request.user.email)
+        trace.debug("📎 Arquivos: %s", request.FILES)
+        trace.debug("📎 Dados: %s", request.data)
         
         # Recuperar OT
         ot = self.get_object()
         
-        print(f"📎 OT: {ot.numero_ot}")
+        trace.debug("📎 OT: %s", ot.numero_ot)
         
         # Debug de permissões
         debug_ot_permissions(request.user, ot, "Upload de arquivo")
@@ -1034,11 +1355,11 @@ class UploadArquivoOTView(APIView, OTPermissionMixin):
         )
         
         if serializer.is_valid():
-            print(f"✅ Dados válidos, salvando arquivo...")
+            trace.debug("✅ Dados válidos, salvando arquivo...")
             
             arquivo = serializer.save()
             
-            print(f"✅ Arquivo salvo: {arquivo.nome_arquivo}")
+            trace.debug("✅ Arquivo salvo: %s", arquivo.nome_arquivo)
             
             return Response({
                 'success': True,
@@ -1046,7 +1367,7 @@ class UploadArquivoOTView(APIView, OTPermissionMixin):
                 'data': ArquivoSerializer(arquivo).data
             }, status=status.HTTP_201_CREATED)
         else:
-            print(f"❌ Dados inválidos: {serializer.errors}")
+            trace.debug("❌ Dados inválidos: %s", serializer.errors)
             
             return Response({
                 'success': False,
@@ -1063,91 +1384,131 @@ class BuscarOTView(APIView):
     """
     🎯 PROPÓSITO: Buscar OTs por diferentes critérios
     
+    GET /api/ots/buscar/?q=empresa centro
     GET /api/ots/buscar/?numero_ot=OT20250426001
     GET /api/ots/buscar/?cliente_nome=Empresa
-    GET /api/ots/buscar/?status=EM_TRANSITO
+    GET /api/ots/buscar/?status=EM_TRANSITO&page=2
+    
+    📋 Os critérios textuais usam o índice de busca (core/search.py):
+    resultados ordenados por relevância, cada termo casa por prefixo.
     """
     
     permission_classes = [CanViewAllOTs]
+    pagination_class = BuscaPagination
     
     def get(self, request):
         """
         Busca OTs por critérios.
         
         Query params:
-        - numero_ot: Número da OT
-        - cliente_nome: Nome do cliente (busca parcial)
+        - q: Texto livre (número, cliente, endereço, cidade, observações)
+        - numero_ot: Número da OT (prefixo)
+        - cliente_nome: Nome do cliente (busca parcial por prefixo)
         - status: Status da OT
         - motorista_id: ID do motorista
         - data_inicio: Data inicial (YYYY-MM-DD)
         - data_fim: Data final (YYYY-MM-DD)
+        - near, radius, near_field: OTs a até `radius` km de near=lat,lng,
+          pela origem (padrão) ou pela entrega
+        - page / page_size: Paginação dos resultados
         """
-        print(f"🔍 BUSCAR OT: Buscando OTs")
-        print(f"🔍 Usuário: {request.user.email}")
-        print(f"🔍 Parâmetros: {request.query_params}")
+        trace.debug("🔍 BUSCAR OT: Buscando OTs")
+        trace.debug("🔍 Usuário: %s", request.user.email)
+        trace.debug("🔍 Parâmetros: %s", request.query_params)
         
         # Começar com OTs que o usuário pode ver
         queryset = get_user_ots_queryset(request.user)
         
-        # Aplicar filtros
-        numero_ot = request.query_params.get('numero_ot')
-        if numero_ot:
-            queryset = queryset.filter(numero_ot__icontains=numero_ot)
-            print(f"🔍 Filtro numero_ot: {numero_ot}")
-        
-        cliente_nome = request.query_params.get('cliente_nome')
-        if cliente_nome:
-            queryset = queryset.filter(cliente_nome__icontains=cliente_nome)
-            print(f"🔍 Filtro cliente_nome: {cliente_nome}")
+        # Critérios textuais (índice de busca)
+        criterios = {
+            campo: request.query_params[campo]
+            for campo in ('q', 'numero_ot', 'cliente_nome')
+            if request.query_params.get(campo)
+        }
+        if criterios:
+            trace.debug("🔍 Critérios textuais: %s", criterios)
         
         status_param = request.query_params.get('status')
         if status_param:
             queryset = queryset.filter(status=status_param)
-            print(f"🔍 Filtro status: {status_param}")
+            trace.debug("🔍 Filtro status: %s", status_param)
         
-        motorista_id = request.query_params.get('motorista_id')
+        try:
+            motorista_id = ler_id_parametro(request.query_params, 'motorista_id')
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'message': 'Filtro de motorista inválido',
+                'errors': e.message_dict
+            }, status=status.HTTP_400_BAD_REQUEST)
         if motorista_id and request.user.role in ['logistica', 'admin']:
             queryset = queryset.filter(motorista_atual_id=motorista_id)
-            print(f"🔍 Filtro motorista_id: {motorista_id}")
+            trace.debug("🔍 Filtro motorista_id: %s", motorista_id)
         
         data_inicio = request.query_params.get('data_inicio')
         if data_inicio:
             queryset = queryset.filter(data_criacao__date__gte=data_inicio)
-            print(f"🔍 Filtro data_inicio: {data_inicio}")
+            trace.debug("🔍 Filtro data_inicio: %s", data_inicio)
         
         data_fim = request.query_params.get('data_fim')
         if data_fim:
             queryset = queryset.filter(data_criacao__date__lte=data_fim)
-            print(f"🔍 Filtro data_fim: {data_fim}")
+            trace.debug("🔍 Filtro data_fim: %s", data_fim)
+        
+        try:
+            proximidade = ler_parametros_proximidade(request.query_params)
+        except ValidationError as e:
+            return Response({
+                'success': False,
+                'message': 'Parâmetros de proximidade inválidos',
+                'errors': e.message_dict
+            }, status=status.HTTP_400_BAD_REQUEST)
+        if proximidade:
+            queryset = filtrar_proximidade(queryset, **proximidade)
+            trace.debug("🔍 Filtro de proximidade: %s", proximidade)
         
         # Verificar se há filtros
-        if not any([numero_ot, cliente_nome, status_param, motorista_id, data_inicio, data_fim]):
+        if not any([criterios, status_param, motorista_id, data_inicio, data_fim, proximidade]):
             return Response({
                 'success': False,
                 'message': 'Pelo menos um critério de busca deve ser fornecido',
                 'available_filters': [
-                    'numero_ot', 'cliente_nome', 'status', 
-                    'motorista_id', 'data_inicio', 'data_fim'
+                    'q', 'numero_ot', 'cliente_nome', 'status', 
+                    'motorista_id', 'data_inicio', 'data_fim', 'near'
                 ]
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Otimizar queries e ordenar
+        # Ordenar por relevância (com critérios textuais) ou por data
+        if criterios:
+            queryset = buscar_ots(queryset, criterios)
+        else:
+            queryset = queryset.order_by('-data_criacao', 'id')
+        
+        # Otimizar queries
         queryset = queryset.select_related('motorista_criador', 'motorista_atual')
-        queryset = queryset.order_by('-data_criacao')
         
-        # Limitar resultados
-        queryset = queryset[:50]  # Máximo 50 resultados
+        # Paginar resultados
+        paginator = self.pagination_class()
+        with trace.span('buscar_ots', textual=bool(criterios)) as span:
+            pagina = paginator.paginate_queryset(queryset, request, view=self)
+            total = paginator.page.paginator.count
+            span.set(total=total)
         
-        print(f"🔍 Resultados encontrados: {len(queryset)}")
+        trace.debug("🔍 Resultados encontrados: %s", total)
         
         # Serializar resultados
-        serializer = OrdemTransporteListSerializer(queryset, many=True)
+        serializer = OrdemTransporteListSerializer(pagina, many=True)
         
         return Response({
             'success': True,
-            'message': f'{len(queryset)} OTs encontradas',
+            'message': f'{total} OTs encontradas',
             'data': serializer.data,
-            'total': len(queryset)
+            'total': total,
+            'paginacao': {
+                'count': total,
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+            }
         })
 
 class PodeCreateOTView(APIView):
@@ -1180,7 +1541,7 @@ class PodeCreateOTView(APIView):
         """
         Verifica se motorista pode criar nova OT.
         """
-        print(f"🚫 PODE CRIAR OT: Verificação para {request.user.email}")
+        trace.debug("🚫 PODE CRIAR OT: Verificação para %s", request.user.email)
         
         # Buscar OTs ativas do motorista
         ots_ativas = OrdemTransporte.objects.filter(
@@ -1189,13 +1550,13 @@ class PodeCreateOTView(APIView):
             ativa=True
         ).select_related('motorista_atual', 'motorista_criador')
         
-        print(f"🚫 OTs ativas encontradas: {ots_ativas.count()}")
+        trace.debug(lambda: f"🚫 OTs ativas encontradas: {ots_ativas.count()}")
         
         if ots_ativas.exists():
             # Tem OT ativa - não pode criar
             ot_ativa = ots_ativas.first()
             
-            print(f"❌ Motorista já tem OT ativa: {ot_ativa.numero_ot}")
+            trace.debug("❌ Motorista já tem OT ativa: %s", ot_ativa.numero_ot)
             
             return Response({
                 'pode_criar': False,
@@ -1211,7 +1572,7 @@ class PodeCreateOTView(APIView):
             }, status=status.HTTP_200_OK)
         else:
             # Pode criar nova OT
-            print(f"✅ Motorista pode criar nova OT")
+            trace.debug("✅ Motorista pode criar nova OT")
             
             return Response({
                 'pode_criar': True,
@@ -1220,6 +1581,309 @@ class PodeCreateOTView(APIView):
             }, status=status.HTTP_200_OK)
 
 
+# ==============================================================================
+# 📍 VIEWS DE RASTREAMENTO GPS
+# ==============================================================================
+
+class RastreamentoOTView(APIView):
+    """
+    🎯 PROPÓSITO: Receber lotes de pontos de GPS do app durante a viagem
+
+    POST /api/ots/{id}/rastreamento/
+
+    ⚡ DESEMPENHO: Validação vetorizada e um único bulk_create por lote;
+    nenhuma AtualizacaoOT é criada por ponto (ver core/rastreamento.py)
+    """
+
+    permission_classes = [CanSendTracking]
+
+    def get_object(self):
+        """Recupera a OT (só os campos necessários para validar o envio)."""
+        obj = get_object_or_404(
+            OrdemTransporte.objects.only('id', 'numero_ot', 'status', 'motorista_atual_id'),
+            pk=self.kwargs['pk']
+        )
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def post(self, request, pk):
+        """
+        Grava um lote de pontos.
+
+        Body esperado:
+        {
+            "pontos": [
+                {"latitude": -23.5505, "longitude": -46.6333, "timestamp": 1760000000000,
+                 "precisao": 8.0, "velocidade": 13.2}
+            ]
+        }
+        """
+        ot = self.get_object()
+
+        if not pode_receber_pontos(ot):
+            return Response({
+                'success': False,
+                'message': f'OT não recebe rastreamento no status {ot.get_status_display()}',
+                'data': {'status_atual': ot.status}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            pontos = request.data.get('pontos') if isinstance(request.data, dict) else None
+            colunas = validar_pontos(pontos)
+        except ValidationError as e:
+            trace.debug("❌ Lote de rastreamento inválido: %s", e.message_dict)
+            return Response({
+                'success': False,
+                'message': 'Lote de pontos inválido',
+                'errors': e.message_dict
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        resultado = registrar_pontos(ot, request.user, colunas)
+
+        return Response({
+            'success': True,
+            'message': f"{resultado['gravados']} pontos registrados",
+            'data': resultado
+        }, status=status.HTTP_201_CREATED)
+
+
+class TrilhaOTView(APIView):
+    """
+    🎯 PROPÓSITO: Trajeto da OT para o mapa (web e DetalhesOTScreen)
+
+    GET /api/ots/{id}/trilha/?zoom=15&inicio=...&fim=...
+
+    📋 RESPOSTA: Encoded polyline simplificada por Douglas-Peucker com
+    tolerância de ~1 pixel no zoom pedido; em cache até chegarem novos
+    pontos (ver core/trilha.py)
+    """
+
+    permission_classes = [IsOwnerOrLogisticaOrAdmin]
+
+    def get_object(self):
+        """Recupera a OT."""
+        obj = get_object_or_404(OrdemTransporte, pk=self.kwargs['pk'])
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get(self, request, pk):
+        """
+        Retorna a trilha simplificada.
+
+        Query params:
+        - zoom: 0 a 22 (padrão: 15)
+        - inicio, fim: datas ISO 8601 (opcionais)
+        """
+        ot = self.get_object()
+
+        erros = {}
+        try:
+            zoom = int(request.query_params.get('zoom', ZOOM_PADRAO))
+        except ValueError:
+            erros['zoom'] = ['Informe um número inteiro.']
+            zoom = ZOOM_PADRAO
+
+        intervalo = {}
+        for campo in ('inicio', 'fim'):
+            valor = request.query_params.get(campo)
+            intervalo[campo] = parse_datetime(valor) if valor else None
+            if valor and intervalo[campo] is None:
+                erros[campo] = ['Data inválida. Use ISO 8601 (ex: 2025-06-09T14:30:00Z).']
+            elif intervalo[campo] and timezone.is_naive(intervalo[campo]):
+                intervalo[campo] = timezone.make_aware(intervalo[campo])
+
+        if erros:
+            return Response({
+                'success': False,
+                'message': 'Parâmetros inválidos',
+                'errors': erros
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        with trace.span('trilha', ot=ot.pk, zoom=zoom):
+            dados = trilha_simplificada(ot.pk, zoom, intervalo['inicio'], intervalo['fim'])
+
+        return Response({
+            'success': True,
+            'data': dados
+        })
+
+
+class FrotaAoVivoView(APIView):
+    """
+    🎯 PROPÓSITO: OTs em andamento com motorista, status e última posição
+    para o mapa do dashboard
+
+    GET /api/ots/frota/
+
+    📋 RESPOSTA: Colunas + linhas em arrays (ver core/frota.py)
+
+    ⚡ CACHE: Snapshot compartilhado reconstruído no máximo a cada
+    INTERVALO_FROTA_S segundos, independente de quantas abas consultam
+    """
+
+    permission_classes = [CanViewFleet]
+
+    def get(self, request):
+        """Retorna o snapshot atual da frota."""
+        response = Response({
+            'success': True,
+            'data': snapshot_frota()
+        })
+        response['Cache-Control'] = f'private, max-age={INTERVALO_FROTA_S}'
+        return response
+
+
+class MapaCalorTileView(APIView):
+    """
+    🎯 PROPÓSITO: Densidade de entregas por tile para o mapa do dashboard
+
+    GET /api/ots/mapa-calor/{z}/{x}/{y}/
+
+    📋 RESPOSTA: Células não vazias de uma grade 64×64 sobre o tile, com
+    total e contagem por status (ver core/mapa_calor.py); tamanho
+    limitado qualquer que seja o número de OTs
+
+    ⚡ CACHE: Por tile, até uma entrega nova cair nele
+    """
+
+    permission_classes = [CanViewFleet]
+
+    def get(self, request, z, x, y):
+        """Retorna o tile agregado."""
+        if not tile_valido(z, x, y):
+            return Response({
+                'success': False,
+                'message': 'Tile inválido',
+                'errors': {'tile': [f'Use zoom de 0 a {ZOOM_MAXIMO_MAPA_CALOR} e x, y de 0 a 2^zoom - 1.']}
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'success': True,
+            'data': tile_mapa_calor(z, x, y)
+        })
+
+
+class RoteirizarOTsView(APIView):
+    """
+    🎯 PROPÓSITO: Ordem de visita de um conjunto de entregas
+
+    POST /api/ots/roteirizar/
+
+    Body:
+    {
+        "ot_ids": [12, 15, 18],
+        "latitude": -23.55, "longitude": -46.63,   (partida)
+        "retornar": false,                          (opcional)
+        "tempo_limite_ms": 2000                     (opcional)
+    }
+
+    📋 RESPOSTA: paradas na ordem sugerida, com a distância de cada trecho
+    e acumulada, e a distância total antes/depois da otimização
+
+    ⚡ Vizinho mais próximo + 2-opt/Or-opt dentro do prazo; conjuntos
+    grandes usam também o pool de processos (ver core/roteirizacao.py)
+    """
+
+    permission_classes = [CanPlanRoutes]
+
+    def post(self, request):
+        """Calcula a sequência de entregas."""
+        serializer = RoteirizacaoSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Dados inválidos para roteirização',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        dados = serializer.validated_data
+        ots = dados['ots']
+        with trace.span('roteirizar', paradas=len(ots)):
+            plano = planejar_rota(
+                (dados['latitude'], dados['longitude']),
+                [(ot.latitude_entrega, ot.longitude_entrega) for ot in ots],
+                retornar=dados['retornar'],
+                tempo_limite_ms=dados['tempo_limite_ms'],
+            )
+
+        paradas = []
+        acumulada_m = 0.0
+        for indice, trecho_m in zip(plano['ordem'], plano['trechos_m']):
+            ot = ots[indice]
+            acumulada_m += trecho_m
+            paradas.append({
+                'id': ot.id,
+                'numero_ot': ot.numero_ot,
+                'cliente_nome': ot.cliente_nome,
+                'cidade_entrega': ot.cidade_entrega,
+                'latitude': ot.latitude_entrega,
+                'longitude': ot.longitude_entrega,
+                'distancia_trecho_km': round(trecho_m / 1000, 3),
+                'distancia_acumulada_km': round(acumulada_m / 1000, 3),
+            })
+
+        return Response({
+            'success': True,
+            'data': {
+                'ordem': [parada['id'] for parada in paradas],
+                'paradas': paradas,
+                'retornar': dados['retornar'],
+                'distancia_total_km': round(plano['distancia_m'] / 1000, 3),
+                'distancia_inicial_km': round(plano['distancia_inicial_m'] / 1000, 3),
+                'reinicios': plano['reinicios'],
+            }
+        })
+
+
+class StatusEmLoteView(APIView):
+    """
+    🎯 PROPÓSITO: Cancelar ou avançar várias OTs de uma vez (logística)
+
+    POST /api/ots/status-em-lote/
+
+    Body:
+    {
+        "itens": [
+            {"ot_id": 12, "status": "CANCELADA", "observacao": "Cliente desistiu"},
+            {"ot_id": 15, "status": "EM_TRANSITO"}
+        ]
+    }
+
+    📋 RESPOSTA: Um resultado por item (sucesso ou erro); itens inválidos
+    não impedem os demais
+
+    ⚡ Um UPDATE por par de status e um bulk_create do histórico, em uma
+    transação (ver core/transicoes.py)
+    """
+
+    permission_classes = [CanBulkUpdateOTStatus]
+
+    def post(self, request):
+        """Aplica as transições do lote."""
+        serializer = StatusEmLoteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'success': False,
+                'message': 'Dados inválidos para atualização em lote',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        itens = serializer.validated_data['itens']
+        with trace.span('status_em_lote', itens=len(itens)):
+            resultados = transicionar_em_lote(itens, request.user)
+
+        atualizadas = sum(1 for resultado in resultados if resultado['sucesso'])
+        return Response({
+            'success': True,
+            'message': f'{atualizadas} de {len(resultados)} OTs atualizadas',
+            'data': {
+                'atualizadas': atualizadas,
+                'falhas': len(resultados) - atualizadas,
+                'resultados': resultados,
+            }
+        })
+
+
 # ==============================================================================
 # 📊 VIEWS DE RELATÓRIOS E ESTATÍSTICAS
 # ==============================================================================
@@ -1232,65 +1896,52 @@ def estatisticas_ots(request):
     
     GET /api/ots/stats/
     """
-    print(f"📊 STATS: Gerando estatísticas para {request.user.email}")
+    trace.debug("📊 STATS: Gerando estatísticas para %s", request.user.email)
     
     # Usar queryset filtrado por usuário
     queryset = get_user_ots_queryset(request.user)
     
-    # Estatísticas gerais
-    total = queryset.count()
-    ativas = queryset.filter(status__in=['INICIADA', 'EM_CARREGAMENTO', 'EM_TRANSITO']).count()
-    finalizadas = queryset.filter(status__in=['ENTREGUE', 'ENTREGUE_PARCIAL']).count()
-    canceladas = queryset.filter(status='CANCELADA').count()
+    por_motorista = []
+    if request.user.role in ['logistica', 'admin']:
+        # Visão global: contagens lidas dos contadores materializados
+        estatisticas = estatisticas_de_contadores()
+        estatisticas['recentes'] = estatisticas_recentes(queryset, dias_recentes=30)
+        
+        # OTs por motorista (apenas para logística/admin)
+        por_motorista = ranking_motoristas(limite=10)
+    else:
+        # Motorista: uma única query de agregação sobre as suas OTs
+        estatisticas = calcular_estatisticas_ots(queryset, dias_recentes=30)
     
     # Estatísticas por status
-    por_status = {}
-    for status_code, status_name in OrdemTransporte.STATUS_CHOICES:
-        por_status[status_code] = {
+    por_status = {
+        status_code: {
             'nome': status_name,
-            'quantidade': queryset.filter(status=status_code).count()
+            'quantidade': estatisticas['por_status'][status_code]
         }
-    
-    # Estatísticas por período (últimos 30 dias)
-    from datetime import timedelta
-    data_limite = timezone.now() - timedelta(days=30)
-    recentes = queryset.filter(data_criacao__gte=data_limite)
-    
-    # OTs por motorista (apenas para logística/admin)
-    por_motorista = []
-    if request.user.role in ['logistica', 'admin']:
-        from django.db.models import Count
-        motoristas_stats = queryset.values(
-            'motorista_atual__first_name',
-            'motorista_atual__last_name',
-            'motorista_atual__email'
-        ).annotate(
-            total_ots=Count('id')
-        ).order_by('-total_ots')[:10]
-        
-        por_motorista = list(motoristas_stats)
+        for status_code, status_name in OrdemTransporte.STATUS_CHOICES
+    }
     
     stats = {
         'resumo': {
-            'total': total,
-            'ativas': ativas,
-            'finalizadas': finalizadas,
-            'canceladas': canceladas,
+            'total': estatisticas['total'],
+            'ativas': estatisticas['ativas'],
+            'finalizadas': estatisticas['finalizadas'],
+            'canceladas': estatisticas['canceladas'],
         },
         'por_status': por_status,
         'ultimos_30_dias': {
-            'total': recentes.count(),
-            'criadas': recentes.count(),
-            'finalizadas': recentes.filter(
-                status__in=['ENTREGUE', 'ENTREGUE_PARCIAL']
-            ).count(),
+            'total': estatisticas['recentes']['total'],
+            'criadas': estatisticas['recentes']['total'],
+            'finalizadas': estatisticas['recentes']['finalizadas'],
+            'distancia_km': round(estatisticas['recentes']['distancia_km'], 1),
         },
         'por_motorista': por_motorista,
         'generated_at': timezone.now().isoformat(),
         'user_role': request.user.role,
     }
     
-    print(f"📊 Estatísticas geradas: {stats['resumo']}")
+    trace.debug("📊 Estatísticas geradas: %s", stats['resumo'])
     
     return Response({
         'success': True,
@@ -1311,12 +1962,12 @@ def debug_ot_info(request, pk=None):
     
     GET /api/ots/debug/{id}/
     """
-    print("🔍 DEBUG OT: Informações de debugging")
+    trace.debug("🔍 DEBUG OT: Informações de debugging")
     
     if pk:
         try:
             ot = OrdemTransporte.objects.get(pk=pk)
-            print(f"🔍 OT encontrada: {ot.numero_ot}")
+            trace.debug("🔍 OT encontrada: %s", ot.numero_ot)
             
             # Debug de permissões
             debug_ot_permissions(request.user, ot, "Debug endpoint")
@@ -0,0 +1,467 @@
+# ==============================================================================
+# MÉTRICAS POR ENDPOINT (FORMATO PROMETHEUS)
+# ==============================================================================
+
+# Arquivo: backend/logitrack_backend/metrics.py
+
+"""
+Latência, queries, tempo de serializer e tamanho de resposta por endpoint.
+
+🎯 PROPÓSITO: Saber quais endpoints de /api/ots/ e /api/auth/ são lentos
+e por quê (banco, serialização ou payload).
+
+📊 SÉRIES (labels view e method; view = nome resolvido da URL):
+- logitrack_http_request_duration_seconds   histograma de latência
+- logitrack_http_responses_total            contador por status HTTP
+- logitrack_db_queries                      histograma de queries/requisição
+- logitrack_db_query_duration_seconds_total tempo gasto no banco
+- logitrack_serializer_duration_seconds_total tempo em serializer.data
+- logitrack_response_bytes                  histograma do tamanho da resposta
+
+🧮 MULTI-PROCESSO: Cada processo (worker do gunicorn/uwsgi) grava em um
+arquivo próprio, mapeado em memória (mmap), dentro de
+LOGITRACK_METRICS_DIR. Não há lock entre processos: cada arquivo tem um
+único escritor. O endpoint de scrape soma os arquivos de todos os
+processos.
+
+🧹 PROCESSOS ENCERRADOS: A cada scrape, os arquivos de PIDs que não
+existem mais são somados em metricas_encerrados.db e removidos (sob
+flock, só em POSIX). Os contadores não voltam para trás e o diretório
+não cresce a cada worker reciclado. Por isso o diretório deve ser local
+à máquina (mesmo namespace de PIDs), não um volume compartilhado.
+
+🔒 O endpoint /metrics/ responde com DEBUG ou com
+"Authorization: Bearer <LOGITRACK_METRICS_TOKEN>". Não há liberação por IP:
+atrás de um proxy reverso local todo acesso chega de 127.0.0.1.
+"""
+
+import glob
+import hmac
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, os arquivos encerrados não são recolhidos
+    fcntl = None
+
+# ==============================================================================
+# 📋 DEFINIÇÃO DAS MÉTRICAS
+# ==============================================================================
+
+# Label method: qualquer outro verbo vira OTHER para o cliente não criar séries
+METODOS_HTTP = frozenset({
+    'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT',
+})
+
+DIRETORIO_PADRAO = os.path.join(tempfile.gettempdir(), 'logitrack-metrics')
+ARQUIVO_ENCERRADOS = 'metricas_encerrados.db'
+
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_QUERIES = (1, 2, 5, 10, 20, 50, 100, 200)
+BUCKETS_BYTES = (512, 2048, 8192, 32768, 131072, 524288, 2097152, 8388608)
+
+HISTOGRAMAS = {
+    'logitrack_http_request_duration_seconds': (
+        BUCKETS_LATENCIA, 'Latência das requisições em segundos'
+    ),
+    'logitrack_db_queries': (
+        BUCKETS_QUERIES, 'Queries SQL por requisição'
+    ),
+    'logitrack_response_bytes': (
+        BUCKETS_BYTES, 'Tamanho do corpo da resposta em bytes'
+    ),
+}
+
+CONTADORES = {
+    'logitrack_http_responses_total': 'Respostas por status HTTP',
+    'logitrack_db_query_duration_seconds_total': 'Tempo gasto em queries SQL',
+    'logitrack_serializer_duration_seconds_total': 'Tempo gasto em serializer.data',
+}
+
+
+# ==============================================================================
+# 🗄️ ARMAZENAMENTO EM ARQUIVO MAPEADO (UM POR PROCESSO)
+# ==============================================================================
+
+class ArquivoMetricas:
+    """
+    Dicionário chave → float gravado direto em um arquivo mmap.
+
+    Layout: [uint32 bytes usados][4 bytes livres] e depois, para cada
+    entrada, [uint32 tamanho da chave][chave utf-8][padding até 8][double].
+    Os doubles ficam alinhados em 8 bytes, então um leitor de outro
+    processo nunca vê um valor pela metade.
+    """
+
+    TAMANHO_INICIAL = 64 * 1024
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        existia = os.path.exists(caminho)
+        self.arquivo = open(caminho, 'a+b')
+        if not existia or os.path.getsize(caminho) == 0:
+            self.arquivo.truncate(self.TAMANHO_INICIAL)
+        self.capacidade = os.path.getsize(caminho)
+        self.mapa = mmap.mmap(self.arquivo.fileno(), self.capacidade)
+
+        self.posicoes = {}
+        self.usado = struct.unpack_from('I', self.mapa, 0)[0] or 8
+        for chave, _valor, posicao in self._entradas(self.mapa, self.usado):
+            self.posicoes[chave] = posicao
+
+    @staticmethod
+    def _entradas(dados, usado):
+        """Percorre (chave, valor, posição do valor) de um buffer."""
+        posicao = 8
+        while posicao < usado:
+            tamanho = struct.unpack_from('I', dados, posicao)[0]
+            chave = bytes(dados[posicao + 4:posicao + 4 + tamanho]).decode('utf-8')
+            posicao += 4 + tamanho
+            posicao += (8 - posicao % 8) % 8
+            valor = struct.unpack_from('d', dados, posicao)[0]
+            yield chave, valor, posicao
+            posicao += 8
+
+    @classmethod
+    def ler(cls, caminho):
+        """Lê todas as entradas de um arquivo (de qualquer processo)."""
+        with open(caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        if len(dados) < 8:
+            return {}
+        usado = struct.unpack_from('I', dados, 0)[0]
+        return {chave: valor for chave, valor, _ in cls._entradas(dados, usado)}
+
+    def somar(self, chave, delta):
+        posicao = self.posicoes.get(chave)
+        if posicao is None:
+            posicao = self._criar(chave)
+        atual = struct.unpack_from('d', self.mapa, posicao)[0]
+        struct.pack_into('d', self.mapa, posicao, atual + delta)
+
+    def _criar(self, chave):
+        codificada = chave.encode('utf-8')
+        inicio = self.usado
+        posicao = inicio + 4 + len(codificada)
+        posicao += (8 - posicao % 8) % 8
+        fim = posicao + 8
+
+        while fim > self.capacidade:
+            self.capacidade *= 2
+            self.arquivo.truncate(self.capacidade)
+            self.mapa.close()
+            self.mapa = mmap.mmap(self.arquivo.fileno(), self.capacidade)
+
+        struct.pack_into(f'I{len(codificada)}s', self.mapa, inicio, len(codificada), codificada)
+        struct.pack_into('d', self.mapa, posicao, 0.0)
+        # Só depois da entrada completa o leitor passa a enxergá-la
+        self.usado = fim
+        struct.pack_into('I', self.mapa, 0, self.usado)
+
+        self.posicoes[chave] = posicao
+        return posicao
+
+    def fechar(self):
+        self.mapa.close()
+        self.arquivo.close()
+
+
+class Registro:
+    """
+    Acumulador das métricas deste processo.
+
+    Um lock por processo protege as threads do mesmo worker; cada
+    requisição o adquire uma única vez para gravar todas as séries.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = None
+        self.arquivo = None
+
+    def diretorio(self):
+        return str(getattr(settings, 'LOGITRACK_METRICS_DIR', DIRETORIO_PADRAO))
+
+    def _arquivo(self):
+        # Depois de um fork o filho precisa do próprio arquivo
+        pid = os.getpid()
+        if self.pid != pid:
+            diretorio = self.diretorio()
+            os.makedirs(diretorio, exist_ok=True)
+            self.arquivo = ArquivoMetricas(os.path.join(diretorio, f'metricas_{pid}.db'))
+            self.pid = pid
+        return self.arquivo
+
+    def registrar(self, view, method, status, duracao, queries, tempo_queries,
+                  tempo_serializer, tamanho):
+        labels = [['view', view], ['method', method]]
+        incrementos = [
+            (chave('logitrack_http_responses_total', labels + [['status', str(status)]]), 1),
+            (chave('logitrack_db_query_duration_seconds_total', labels), tempo_queries),
+            (chave('logitrack_serializer_duration_seconds_total', labels), tempo_serializer),
+        ]
+        for nome, valor in (
+            ('logitrack_http_request_duration_seconds', duracao),
+            ('logitrack_db_queries', queries),
+            ('logitrack_response_bytes', tamanho),
+        ):
+            incrementos.extend(observacao_histograma(nome, labels, valor))
+
+        with self.lock:
+            arquivo = self._arquivo()
+            for nome, delta in incrementos:
+                arquivo.somar(nome, delta)
+
+    def coletar(self):
+        """Soma os valores dos arquivos de todos os processos."""
+        self.recolher_encerrados()
+        totais = defaultdict(float)
+        for caminho in glob.glob(os.path.join(self.diretorio(), 'metricas_*.db')):
+            try:
+                valores = ArquivoMetricas.ler(caminho)
+            except (OSError, struct.error, UnicodeDecodeError):
+                continue
+            for nome, valor in valores.items():
+                totais[nome] += valor
+        return totais
+
+    def recolher_encerrados(self):
+        """
+        Soma os arquivos de processos encerrados em ARQUIVO_ENCERRADOS.
+
+        O flock no diretório impede que dois scrapes simultâneos somem o
+        mesmo arquivo duas vezes.
+        """
+        diretorio = self.diretorio()
+        if fcntl is None or not os.path.isdir(diretorio):
+            return
+
+        with open(os.path.join(diretorio, '.lock'), 'a') as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+            encerrados = [
+                caminho for caminho, pid in _arquivos_por_pid(diretorio)
+                if pid != os.getpid() and not _processo_ativo(pid)
+            ]
+            if not encerrados:
+                return
+
+            destino = ArquivoMetricas(os.path.join(diretorio, ARQUIVO_ENCERRADOS))
+            try:
+                for caminho in encerrados:
+                    try:
+                        valores = ArquivoMetricas.ler(caminho)
+                    except (OSError, struct.error, UnicodeDecodeError):
+                        valores = {}
+                    for nome, valor in valores.items():
+                        destino.somar(nome, valor)
+                    os.remove(caminho)
+            finally:
+                destino.fechar()
+
+
+def _arquivos_por_pid(diretorio):
+    """(caminho, pid) dos arquivos metricas_<pid>.db do diretório."""
+    for caminho in glob.glob(os.path.join(diretorio, 'metricas_*.db')):
+        pid = os.path.basename(caminho)[len('metricas_'):-len('.db')]
+        if pid.isdigit():
+            yield caminho, int(pid)
+
+
+def _processo_ativo(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Existe, mas é de outro usuário
+    return True
+
+
+def chave(nome, labels):
+    return json.dumps([nome, labels], separators=(',', ':'), ensure_ascii=False)
+
+
+def observacao_histograma(nome, labels, valor):
+    """Incrementos de uma observação: um bucket, _sum e _count."""
+    buckets = HISTOGRAMAS[nome][0]
+    limite = next((b for b in buckets if valor <= b), '+Inf')
+    return [
+        (chave(f'{nome}_bucket', labels + [['le', str(limite)]]), 1),
+        (chave(f'{nome}_sum', labels), valor),
+        (chave(f'{nome}_count', labels), 1),
+    ]
+
+
+registro = Registro()
+
+
+# ==============================================================================
+# 📝 FORMATO TEXTO DO PROMETHEUS
+# ==============================================================================
+
+def _labels_texto(labels):
+    partes = []
+    for nome, valor in labels:
+        valor = str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        partes.append(f'{nome}="{valor}"')
+    return '{' + ','.join(partes) + '}'
+
+
+def _numero(valor):
+    return str(int(valor)) if float(valor).is_integer() else repr(valor)
+
+
+def exportar(totais):
+    """Gera o texto de exposição (text/plain; version=0.0.4)."""
+    series = defaultdict(dict)
+    for texto, valor in totais.items():
+        nome, labels = json.loads(texto)
+        series[nome][tuple(map(tuple, labels))] = valor
+
+    linhas = []
+    for nome, (buckets, ajuda) in HISTOGRAMAS.items():
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} histogram')
+
+        # Buckets são gravados sem acumular; aqui viram cumulativos
+        por_serie = defaultdict(dict)
+        for labels, valor in series.get(f'{nome}_bucket', {}).items():
+            por_serie[labels[:-1]][labels[-1][1]] = valor
+
+        for labels in sorted(series.get(f'{nome}_count', {})):
+            acumulado = 0
+            for limite in [str(b) for b in buckets] + ['+Inf']:
+                acumulado += por_serie[labels].get(limite, 0)
+                linhas.append(
+                    f'{nome}_bucket{_labels_texto(labels + (("le", limite),))} {_numero(acumulado)}'
+                )
+            linhas.append(f'{nome}_sum{_labels_texto(labels)} {_numero(series[f"{nome}_sum"][labels])}')
+            linhas.append(f'{nome}_count{_labels_texto(labels)} {_numero(series[f"{nome}_count"][labels])}')
+
+    for nome, ajuda in CONTADORES.items():
+        linhas.append(f'# HELP {nome} {ajuda}')
+        linhas.append(f'# TYPE {nome} counter')
+        for labels, valor in sorted(series.get(nome, {}).items()):
+            linhas.append(f'{nome}{_labels_texto(labels)} {_numero(valor)}')
+
+    return '\n'.join(linhas) + '\n'
+
+
+# ==============================================================================
+# ⏱️ TEMPO DE SERIALIZER
+# ==============================================================================
+
+# [segundos acumulados, profundidade] da requisição atual
+_serializer_atual = ContextVar('logitrack_serializer_atual', default=None)
+
+
+def instrumentar_serializers():
+    """
+    Mede o tempo de BaseSerializer.data (to_representation).
+
+    Só a chamada mais externa conta: serializers aninhados e o
+    ListSerializer passam pelo mesmo property.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    original = BaseSerializer.data
+    if getattr(original.fget, '_logitrack_medido', False):
+        return
+
+    def data(self):
+        medicao = _serializer_atual.get()
+        if medicao is None or medicao[1]:
+            return original.fget(self)
+        medicao[1] = 1
+        inicio = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            medicao[0] += time.perf_counter() - inicio
+            medicao[1] = 0
+
+    data._logitrack_medido = True
+    BaseSerializer.data = property(data)
+
+
+# ==============================================================================
+# 🧩 MIDDLEWARE E ENDPOINT
+# ==============================================================================
+
+class MetricsMiddleware:
+    """
+    Registra as métricas de cada requisição.
+
+    Deve vir logo depois do CorsMiddleware para medir o restante da pilha.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrumentar_serializers()
+
+    def __call__(self, request):
+        queries = [0, 0.0]
+
+        def contar_query(execute, sql, params, many, context):
+            inicio = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                queries[0] += 1
+                queries[1] += time.perf_counter() - inicio
+
+        serializer = [0.0, 0]
+        token = _serializer_atual.set(serializer)
+        inicio = time.perf_counter()
+        try:
+            with ExitStack() as pilha:
+                for conexao in connections.all():
+                    pilha.enter_context(conexao.execute_wrapper(contar_query))
+                response = self.get_response(request)
+        finally:
+            _serializer_atual.reset(token)
+        duracao = time.perf_counter() - inicio
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else '<nao_resolvida>'
+        tamanho = 0 if response.streaming else len(response.content)
+
+        metodo = request.method if request.method in METODOS_HTTP else 'OTHER'
+
+        registro.registrar(
+            view, metodo, response.status_code, duracao,
+            queries[0], queries[1], serializer[0], tamanho,
+        )
+        return response
+
+
+def metrics_view(request):
+    """
+    GET /metrics/ - Métricas de todos os processos em formato Prometheus.
+    """
+    token = getattr(settings, 'LOGITRACK_METRICS_TOKEN', '')
+    autorizado = settings.DEBUG or (
+        token and hmac.compare_digest(
+            request.headers.get('Authorization', '').encode(), f'Bearer {token}'.encode()
+        )
+    )
+    if not autorizado:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        exportar(registro.coletar()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
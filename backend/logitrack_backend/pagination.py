@@ -0,0 +1,251 @@
+# ==============================================================================
+# PAGINAÇÃO POR CURSOR (KEYSET)
+# ==============================================================================
+
+# Arquivo: backend/logitrack_backend/pagination.py
+
+"""
+Paginação por cursor para as listagens grandes da API.
+
+🎯 PROPÓSITO: Custo constante por página. Em vez de COUNT(*) + OFFSET,
+cada página filtra a partir da última linha vista, por exemplo
+WHERE (data_criacao, id) vem depois de (cursor), usando o índice composto
+da ordenação.
+
+📋 RESPOSTA (mesmas chaves da PageNumberPagination):
+{
+    "count": 1234,        # total em cache (ou null com ?total=0)
+    "next": "...?cursor=eyJ2Ijog...",
+    "previous": null,
+    "results": [...]
+}
+
+🔁 COMPATIBILIDADE: Requisições com ?page=N (sem cursor) continuam sendo
+atendidas pela PageNumberPagination, para clientes antigos.
+"""
+
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginação keyset com cursores opacos.
+
+    Subclasses definem `ordering` com os campos de ordenação; o último
+    campo deve ser único (normalmente 'id') para desempatar.
+    """
+
+    ordering = ('-id',)
+    page_size = api_settings.PAGE_SIZE or 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    cursor_query_param = 'cursor'
+    total_query_param = 'total'
+    legacy_page_query_param = 'page'
+
+    # Tempo (segundos) que o total fica em cache por queryset
+    total_cache_timeout = 30
+
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Retorna a página de resultados a partir do cursor da requisição.
+        """
+        self.request = request
+        self.legacy = None
+
+        if (self.legacy_page_query_param in request.query_params
+                and self.cursor_query_param not in request.query_params):
+            self.legacy = PageNumberPagination()
+            return self.legacy.paginate_queryset(queryset.order_by(*self.ordering), request, view)
+
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_total(queryset, request)
+
+        posicao, reverso = self.decode_cursor(request, queryset.model)
+        self.cursor_recebido = posicao is not None
+        self.reverso = reverso
+
+        ordering = self.ordering
+        if reverso:
+            ordering = tuple(self._inverter(campo) for campo in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if posicao is not None:
+            queryset = queryset.filter(self._filtro_apos(ordering, posicao))
+
+        resultados = list(queryset[:self.page_size + 1])
+        self.tem_mais = len(resultados) > self.page_size
+        self.page = resultados[:self.page_size]
+
+        if reverso:
+            self.page.reverse()
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        """Monta a resposta com count/next/previous/results."""
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+
+        return Response({
+            'count': self.count,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    # ==============================================================================
+    # LINKS E CURSORES
+    # ==============================================================================
+
+    def get_next_link(self):
+        """Link para a página seguinte (a partir do último item)."""
+        tem_proxima = self.cursor_recebido if self.reverso else self.tem_mais
+        if not tem_proxima or not self.page:
+            return None
+        return self.encode_cursor(self._posicao(self.page[-1]), reverso=False)
+
+    def get_previous_link(self):
+        """Link para a página anterior (a partir do primeiro item)."""
+        tem_anterior = self.tem_mais if self.reverso else self.cursor_recebido
+        if not tem_anterior or not self.page:
+            return None
+        return self.encode_cursor(self._posicao(self.page[0]), reverso=True)
+
+    def encode_cursor(self, posicao, reverso):
+        """Codifica a posição em um cursor opaco (base64 de JSON)."""
+        conteudo = json.dumps({'p': posicao, 'r': int(reverso)}, separators=(',', ':'))
+        cursor = urlsafe_b64encode(conteudo.encode('utf-8')).decode('ascii')
+        url = remove_query_param(self.base_url, self.legacy_page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """
+        Decodifica o cursor da requisição.
+
+        Returns:
+            tuple: (valores da posição ou None, reverso)
+        """
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+
+        try:
+            conteudo = json.loads(urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            posicao = conteudo['p']
+            if len(posicao) != len(self.ordering):
+                raise ValueError('Cursor com número de campos incorreto')
+
+            valores = [
+                model._meta.get_field(campo.lstrip('-')).to_python(valor)
+                for campo, valor in zip(self.ordering, posicao)
+            ]
+            return valores, bool(conteudo.get('r'))
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # ==============================================================================
+    # TOTAL E TAMANHO DE PÁGINA
+    # ==============================================================================
+
+    def get_page_size(self, request):
+        """Tamanho da página, limitado a max_page_size."""
+        try:
+            tamanho = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(tamanho, self.max_page_size))
+
+    def get_total(self, queryset, request):
+        """
+        Total de itens, guardado em cache por `total_cache_timeout` segundos.
+
+        O COUNT roda no máximo uma vez por intervalo para cada queryset
+        distinto. Com ?total=0 o total não é calculado (retorna None).
+        """
+        if request.query_params.get(self.total_query_param) in ('0', 'false'):
+            return None
+
+        sql, params = queryset.order_by().query.sql_with_params()
+        chave = 'keyset_total:' + hashlib.md5(f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+
+        return cache.get_or_set(chave, queryset.order_by().count, self.total_cache_timeout)
+
+    # ==============================================================================
+    # HELPERS
+    # ==============================================================================
+
+    def _posicao(self, instancia):
+        """Valores dos campos de ordenação de um item, como strings."""
+        valores = []
+        for campo in self.ordering:
+            nome = campo.lstrip('-')
+            valor = instancia[nome] if isinstance(instancia, dict) else getattr(instancia, nome)
+            valores.append(str(valor))
+        return valores
+
+    @staticmethod
+    def _inverter(campo):
+        return campo[1:] if campo.startswith('-') else f'-{campo}'
+
+    @staticmethod
+    def _filtro_apos(ordering, posicao):
+        """
+        Condição keyset "vem depois de `posicao` na ordenação".
+
+        Para ('-data_criacao', 'id'):
+        data_criacao < v1 OR (data_criacao = v1 AND id > v2)
+        """
+        filtro = Q()
+        iguais = {}
+        for campo, valor in zip(ordering, posicao):
+            nome = campo.lstrip('-')
+            lookup = 'lt' if campo.startswith('-') else 'gt'
+            filtro |= Q(**iguais, **{f'{nome}__{lookup}': valor})
+            iguais[nome] = valor
+        return filtro
+
+
+# ==============================================================================
+# PAGINAÇÕES DAS LISTAGENS
+# ==============================================================================
+
+class OrdemTransporteKeysetPagination(KeysetPagination):
+    """Listagem de OTs: mais recentes primeiro."""
+    ordering = ('-data_criacao', 'id')
+
+
+class TransferenciaKeysetPagination(KeysetPagination):
+    """Listagem de transferências: solicitações mais recentes primeiro."""
+    ordering = ('-data_solicitacao', 'id')
+
+
+class UsuarioKeysetPagination(KeysetPagination):
+    """Listagem de usuários: cadastros mais recentes primeiro."""
+    ordering = ('-date_joined', 'id')
+
+
+class BuscaPagination(PageNumberPagination):
+    """
+    Paginação por número de página para resultados ranqueados.
+
+    A ordem da busca é por relevância (não é um campo do modelo), então
+    aqui não há keyset; as páginas são pequenas e limitadas a max_page_size.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
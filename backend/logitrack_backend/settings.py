@@ -20,6 +20,7 @@ from pathlib import Path
 from datetime import timedelta
 from decouple import config
 import os
+import tempfile
 
 # Diretório base do projeto
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -87,6 +88,8 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # CORS deve ser o primeiro
+    'logitrack_backend.metrics.MetricsMiddleware',  # Latência/queries por endpoint
+    'logitrack_backend.tracing.TracingMiddleware',  # Id da requisição + X-Trace
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -302,10 +305,81 @@ CORS_ALLOW_HEADERS = [
 # Usar nosso modelo de usuário personalizado
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# ==============================================================================
+# BUSCA DE OTs
+# ==============================================================================
+
+# Backend do índice de busca textual (core/search.py). Vazio = automático:
+# FTS5 no SQLite, icontains nos demais bancos.
+LOGITRACK_BUSCA_BACKEND = config('LOGITRACK_BUSCA_BACKEND', default='')
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+
+# Cache usado pela trilha das OTs, pelo snapshot da frota (core/frota.py),
+# pelos tiles do mapa de calor e pela versão das geocercas.
+#
+# ⚠️ Com mais de um processo (gunicorn/uwsgi) o cache PRECISA ser
+# compartilhado: snapshot da frota, invalidações e versões gravadas por um
+# worker têm de ser vistas pelos outros. Por isso o padrão fora de DEBUG é
+# o banco.
+# - locmem (padrão com DEBUG): um cache por processo, só para
+#   desenvolvimento; escolhido com DEBUG desligado, o core avisa na
+#   inicialização (core/apps.py)
+# - banco (padrão sem DEBUG): compartilhado via tabela logitrack_cache,
+#   criada pelo `migrate` (ou `python manage.py createcachetable`)
+# - redis: compartilhado via Redis (LOGITRACK_REDIS_URL; requer o pacote redis)
+LOGITRACK_CACHE_BACKEND = config('LOGITRACK_CACHE_BACKEND', default='locmem' if DEBUG else 'banco')
+
+if LOGITRACK_CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('LOGITRACK_REDIS_URL', default='redis://127.0.0.1:6379/1'),
+        }
+    }
+elif LOGITRACK_CACHE_BACKEND == 'banco':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'logitrack_cache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# ==============================================================================
+# MÉTRICAS (logitrack_backend/metrics.py)
+# ==============================================================================
+
+# Diretório dos arquivos de métricas (um por processo), fora do repositório.
+# Os arquivos de processos encerrados são recolhidos a cada scrape; use um
+# diretório local da máquina (ex: /run/logitrack-metrics), não compartilhado.
+LOGITRACK_METRICS_DIR = config(
+    'LOGITRACK_METRICS_DIR', default=os.path.join(tempfile.gettempdir(), 'logitrack-metrics')
+)
+
+# Token exigido no scrape de /metrics/ fora de DEBUG (Authorization: Bearer).
+# Vazio: o endpoint só responde com DEBUG.
+LOGITRACK_METRICS_TOKEN = config('LOGITRACK_METRICS_TOKEN', default='')
+
 # ==============================================================================
 # CONFIGURAÇÕES DE LOGGING
 # ==============================================================================
 
+# Nível do tracing (logitrack_backend/tracing.py) dos apps core e accounts.
+# DEBUG mostra todos os eventos de depuração; INFO desliga os de DEBUG.
+LOGITRACK_TRACE_LEVEL = config('LOGITRACK_TRACE_LEVEL', default='INFO')
+
+# Token que liga o tracing de uma requisição via header X-Trace.
+# Vazio: só vale com DEBUG=True.
+LOGITRACK_TRACE_TOKEN = config('LOGITRACK_TRACE_TOKEN', default='')
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
@@ -344,7 +418,12 @@ LOGGING = {
         },
         'accounts': {  # ← NOVO: Logger específico para nossa app
             'handlers': ['file', 'console'],
-            'level': 'DEBUG',
+            'level': LOGITRACK_TRACE_LEVEL,
+            'propagate': False,
+        },
+        'core': {
+            'handlers': ['file', 'console'],
+            'level': LOGITRACK_TRACE_LEVEL,
             'propagate': False,
         },
         'rest_framework': {  # ← NOVO: Logger para DRF
@@ -0,0 +1,111 @@
+# ==============================================================================
+# TESTES DE MÉTRICAS E TRACING
+# ==============================================================================
+
+# Arquivo: backend/logitrack_backend/tests.py
+
+"""
+Métricas por processo (logitrack_backend/metrics.py) e tracing
+(logitrack_backend/tracing.py).
+
+🚀 python manage.py test logitrack_backend
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from . import metrics, tracing
+from .metrics import ARQUIVO_ENCERRADOS, ArquivoMetricas, Registro, fcntl
+
+
+@unittest.skipIf(fcntl is None, 'recolhimento dos arquivos encerrados requer flock (POSIX)')
+class RecolherEncerradosTest(SimpleTestCase):
+
+    def setUp(self):
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.diretorio = diretorio.name
+        configuracao = override_settings(LOGITRACK_METRICS_DIR=self.diretorio)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def gravar(self, pid, valores):
+        arquivo = ArquivoMetricas(os.path.join(self.diretorio, f'metricas_{pid}.db'))
+        for nome, valor in valores.items():
+            arquivo.somar(nome, valor)
+        arquivo.fechar()
+
+    def pid_encerrado(self):
+        processo = subprocess.Popen([sys.executable, '-c', 'pass'])
+        processo.wait()
+        return processo.pid
+
+    def test_soma_preservada_e_arquivos_removidos(self):
+        self.gravar(os.getpid(), {'a': 1, 'b': 2})
+        self.gravar(self.pid_encerrado(), {'a': 10})
+        self.gravar(self.pid_encerrado(), {'a': 100, 'c': 5})
+
+        registro = Registro()
+        self.assertEqual(registro.coletar(), {'a': 111, 'b': 2, 'c': 5})
+        self.assertEqual(
+            sorted(nome for nome in os.listdir(self.diretorio) if nome.endswith('.db')),
+            sorted([f'metricas_{os.getpid()}.db', ARQUIVO_ENCERRADOS])
+        )
+
+        # Um segundo scrape não soma os encerrados de novo
+        self.gravar(self.pid_encerrado(), {'a': 1000})
+        self.assertEqual(registro.coletar(), {'a': 1111, 'b': 2, 'c': 5})
+
+
+class MetricsEndpointTest(SimpleTestCase):
+
+    def test_metodo_fora_do_padrao_vira_other(self):
+        with mock.patch.object(metrics.registro, 'registrar') as registrar:
+            self.client.generic('PROPFIND', '/api/ots/')
+            self.client.get('/api/ots/')
+        self.assertEqual([chamada.args[1] for chamada in registrar.call_args_list], ['OTHER', 'GET'])
+
+    @override_settings(DEBUG=False, LOGITRACK_METRICS_TOKEN='segredo')
+    def test_fora_de_debug_exige_token(self):
+        self.assertEqual(self.client.get('/metrics/', REMOTE_ADDR='127.0.0.1').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer outro').status_code, 403)
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer segredo').status_code, 200)
+
+    @override_settings(DEBUG=False, LOGITRACK_METRICS_TOKEN='')
+    def test_sem_token_configurado_nega(self):
+        self.assertEqual(self.client.get('/metrics/', HTTP_AUTHORIZATION='Bearer ').status_code, 403)
+
+
+class TracingRequestIdTest(SimpleTestCase):
+
+    def test_header_reaproveitado_so_se_valido(self):
+        resposta = self.client.get('/api/ots/', HTTP_X_REQUEST_ID='proxy-0a1b2c')
+        self.assertEqual(resposta['X-Request-ID'], 'proxy-0a1b2c')
+
+        for invalido in ('%s%d', 'a' * 65, 'id com espaço', ''):
+            with self.subTest(invalido=invalido):
+                resposta = self.client.get('/api/ots/', HTTP_X_REQUEST_ID=invalido)
+                self.assertRegex(resposta['X-Request-ID'], r'^[0-9a-f]{12}$')
+
+    def test_id_e_mensagem_com_porcentagem(self):
+        """O id entra como argumento: '%' no id ou na mensagem não quebra a formatação."""
+        trace = tracing.get_tracer('core.tests_tracing')
+        token = tracing._request_id.set('a%sb')
+        try:
+            with self.assertLogs('core.tests_tracing', 'DEBUG') as logs:
+                trace.warning('progresso %s%%', 50)
+                trace.warning('100% concluído')
+                trace.warning(lambda: 'lazy 10%')
+        finally:
+            tracing._request_id.reset(token)
+
+        self.assertEqual(
+            [registro.getMessage() for registro in logs.records],
+            ['[a%sb] progresso 50%', '[a%sb] 100% concluído', '[a%sb] lazy 10%']
+        )
@@ -0,0 +1,217 @@
+# ==============================================================================
+# TRACING - MENSAGENS DE DEPURAÇÃO COM CUSTO ZERO QUANDO DESLIGADAS
+# ==============================================================================
+
+# Arquivo: backend/logitrack_backend/tracing.py
+
+"""
+Tracing estruturado por módulo, no lugar de print() nos caminhos quentes.
+
+🎯 PROPÓSITO: Mensagens de depuração só custam alguma coisa quando alguém
+vai lê-las. Desligado, cada chamada é um teste de nível e nada mais:
+a mensagem não é formatada e os argumentos preguiçosos não são avaliados.
+
+📋 USO:
+    from logitrack_backend.tracing import get_tracer
+
+    trace = get_tracer(__name__)
+
+    trace.debug('🔍 Usuário: %s', request.user.email)        # formatação adiada
+    trace.debug(lambda: f'Total: {queryset.count()}')       # avaliação adiada
+    with trace.span('listar_ots', role=request.user.role):
+        ...
+
+🔧 LIGAR E DESLIGAR:
+- Por módulo: nível do logger no LOGGING (ex.: 'core.views': DEBUG) ou
+  LOGITRACK_TRACE_LEVEL para os apps core e accounts
+- Por requisição: header X-Trace (ver TracingMiddleware)
+
+🆔 Todo evento carrega o id da requisição (header X-Request-ID), no texto
+e no atributo `request_id` do LogRecord.
+"""
+
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Id da requisição atual e se ela pediu tracing completo
+_request_id = ContextVar('logitrack_request_id', default=None)
+_trace_forcado = ContextVar('logitrack_trace_forcado', default=False)
+
+_REQUEST_ID_VALIDO = re.compile(r'[A-Za-z0-9-]{1,64}')
+
+
+def get_request_id():
+    """Id da requisição em andamento (None fora de uma requisição)."""
+    return _request_id.get()
+
+
+class _SpanNulo:
+    """Span usado quando o tracing está desligado: não faz nada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **atributos):
+        pass
+
+
+_SPAN_NULO = _SpanNulo()
+
+
+class Span:
+    """Trecho nomeado: registra início, fim e duração em ms."""
+
+    __slots__ = ('tracer', 'nome', 'atributos', 'inicio')
+
+    def __init__(self, tracer, nome, atributos):
+        self.tracer = tracer
+        self.nome = nome
+        self.atributos = atributos
+        self.inicio = None
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        self.tracer._emitir(logging.DEBUG, '▶ %s %s', (self.nome, self.atributos))
+        return self
+
+    def __exit__(self, tipo, erro, tb):
+        duracao = (time.perf_counter() - self.inicio) * 1000
+        if erro is None:
+            self.tracer._emitir(
+                logging.DEBUG, '◀ %s %.1fms %s', (self.nome, duracao, self.atributos)
+            )
+        else:
+            self.tracer._emitir(
+                logging.WARNING, '◀ %s %.1fms falhou: %r', (self.nome, duracao, erro)
+            )
+        return False
+
+    def set(self, **atributos):
+        """Acrescenta atributos ao span (aparecem no evento de fim)."""
+        self.atributos.update(atributos)
+
+
+class Tracer:
+    """
+    Emissor de eventos de um módulo, sobre um logger padrão.
+
+    A mensagem pode ser uma string com argumentos no estilo %, formatada
+    só na emissão, ou um callable sem argumentos que devolve a string.
+    """
+
+    __slots__ = ('logger',)
+
+    def __init__(self, nome):
+        self.logger = logging.getLogger(nome)
+
+    def enabled(self, nivel=logging.DEBUG):
+        """True se um evento deste nível seria emitido agora."""
+        return _trace_forcado.get() or self.logger.isEnabledFor(nivel)
+
+    def debug(self, mensagem, *args):
+        if _trace_forcado.get() or self.logger.isEnabledFor(logging.DEBUG):
+            self._emitir(logging.DEBUG, mensagem, args)
+
+    def info(self, mensagem, *args):
+        if _trace_forcado.get() or self.logger.isEnabledFor(logging.INFO):
+            self._emitir(logging.INFO, mensagem, args)
+
+    def warning(self, mensagem, *args):
+        if _trace_forcado.get() or self.logger.isEnabledFor(logging.WARNING):
+            self._emitir(logging.WARNING, mensagem, args)
+
+    def error(self, mensagem, *args):
+        if _trace_forcado.get() or self.logger.isEnabledFor(logging.ERROR):
+            self._emitir(logging.ERROR, mensagem, args)
+
+    def span(self, nome, **atributos):
+        """Context manager que mede um trecho; no-op se desligado."""
+        if _trace_forcado.get() or self.logger.isEnabledFor(logging.DEBUG):
+            return Span(self, nome, atributos)
+        return _SPAN_NULO
+
+    def _emitir(self, nivel, mensagem, args):
+        if callable(mensagem):
+            mensagem = mensagem()
+        request_id = _request_id.get()
+        if request_id:
+            # O id vai como argumento, nunca dentro do formato
+            if not args:
+                mensagem = str(mensagem).replace('%', '%%')
+            mensagem = '[%s] ' + str(mensagem)
+            args = (request_id, *args)
+
+        # handle() direto: numa requisição com X-Trace o nível do logger
+        # não deve barrar o evento (os handlers ainda aplicam o deles)
+        registro = self.logger.makeRecord(
+            self.logger.name, nivel, '(trace)', 0, mensagem, args, None,
+            extra={'request_id': request_id},
+        )
+        self.logger.handle(registro)
+
+
+_tracers = {}
+
+
+def get_tracer(nome):
+    """Tracer do módulo `nome` (use __name__)."""
+    tracer = _tracers.get(nome)
+    if tracer is None:
+        tracer = _tracers[nome] = Tracer(nome)
+    return tracer
+
+
+# ==============================================================================
+# 🆔 MIDDLEWARE
+# ==============================================================================
+
+class TracingMiddleware:
+    """
+    Atribui um id a cada requisição e permite tracing por requisição.
+
+    - X-Request-ID: reaproveitado se enviado pelo cliente/proxy e válido
+      (letras, dígitos e hífen, até 64), senão gerado; devolvido no
+      header da resposta
+    - X-Trace: liga todos os eventos desta requisição, independente do
+      nível configurado. Em produção o valor precisa ser igual a
+      LOGITRACK_TRACE_TOKEN; com DEBUG qualquer valor serve
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.token = getattr(settings, 'LOGITRACK_TRACE_TOKEN', '')
+
+    def __call__(self, request):
+        request_id = request.headers.get('X-Request-ID', '')
+        if not _REQUEST_ID_VALIDO.fullmatch(request_id):
+            request_id = uuid.uuid4().hex[:12]
+        request.request_id = request_id
+
+        token_request_id = _request_id.set(request_id)
+        token_forcado = _trace_forcado.set(self.trace_solicitado(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_id.reset(token_request_id)
+            _trace_forcado.reset(token_forcado)
+
+        response['X-Request-ID'] = request_id
+        return response
+
+    def trace_solicitado(self, request):
+        valor = request.headers.get('X-Trace')
+        if not valor:
+            return False
+        if self.token:
+            return valor == self.token
+        return settings.DEBUG
@@ -25,6 +25,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
+from .metrics import metrics_view
+
 # ==============================================================================
 # 🏠 VIEW RAIZ - INFORMAÇÕES DA API
 # ==============================================================================
@@ -59,6 +61,9 @@ urlpatterns = [
     # Interface de administração Django
     path('admin/', admin.site.urls),
     
+    # Métricas para o Prometheus (acesso interno)
+    path('metrics/', metrics_view, name='metrics'),
+    
     # URLs de autenticação
     path('api/auth/', include('accounts.urls')),
         # URLs de Ordens de Transporte